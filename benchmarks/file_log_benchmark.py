@@ -0,0 +1,81 @@
+"""Measure what logging to a file costs the thread that logs.
+
+Usage:
+    python -m benchmarks.file_log_benchmark [--messages 20000] [--threads 1 4]
+
+Times each handler call on the logging threads: the old handler that opens,
+appends to and closes the file on every message, and FileLogHandler, which
+only queues the message for its writer thread. The queued handler's
+flush at the end is timed separately, since callers don't wait for it.
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from src.logging.file_log_handler import FileLogHandler
+
+MESSAGE = "Transcribed in 0.84s (3.2s of audio): run the tests and show me what failed"
+
+
+def open_per_message_handler(log_file: Path):
+    """The handler FileLogHandler replaced: one open/append/close per message."""
+    def handler(level: str, message: str) -> None:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(log_file, "a") as f:
+            f.write(f"[{timestamp}] {level}: {message}\n")
+    return handler
+
+
+def time_calls(handler, messages: int, threads: int) -> list[float]:
+    """Call handler from several threads at once, returning each call's duration in seconds."""
+    durations: list[list[float]] = [[] for _ in range(threads)]
+
+    def log(index: int) -> None:
+        own = durations[index]
+        for _ in range(messages // threads):
+            start = time.perf_counter()
+            handler('DEBUG', MESSAGE)
+            own.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=log, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return [duration for own in durations for duration in own]
+
+
+def report(name: str, threads: int, durations: list[float], extra: str = '') -> None:
+    durations.sort()
+    p99 = durations[int(len(durations) * 0.99)]
+    print(f"{name:<24} {threads:>7}  {statistics.mean(durations) * 1e6:>8.2f}µs  {p99 * 1e6:>8.2f}µs  {extra}")
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Time file logging calls on the logging thread.")
+    parser.add_argument('--messages', type=int, default=20000, help="Messages logged per run")
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4], help="Logging thread counts to try")
+    args = parser.parse_args(argv)
+
+    print(f"{'Handler':<24} {'Threads':>7}  {'Mean':>10}  {'p99':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for threads in args.threads:
+            log_file = Path(directory) / f"open-{threads}.log"
+            report('open per message', threads, time_calls(open_per_message_handler(log_file), args.messages, threads))
+
+            handler = FileLogHandler(Path(directory) / f"queued-{threads}.log", debug_mode=True, max_bytes=0)
+            durations = time_calls(handler, args.messages, threads)
+            start = time.perf_counter()
+            handler.close()
+            report('queued (FileLogHandler)', threads, durations, f"(final flush {(time.perf_counter() - start) * 1000:.1f}ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
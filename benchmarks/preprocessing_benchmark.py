@@ -0,0 +1,66 @@
+"""Measure the CPU cost of the audio preprocessing stage.
+
+Usage:
+    python -m benchmarks.preprocessing_benchmark [CORPUS_DIR] [--seconds 5] [--repeat 50]
+
+Processes the recordings in CORPUS_DIR (name.wav files, read via ffmpeg) or, without
+a corpus, synthetic speech-like audio, and reports processing time per second
+of audio. The share of one core is that ratio expressed as a percentage.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.transcribers.audio_preprocessor import SAMPLE_RATE, AudioPreprocessor
+
+
+def synthetic_utterance(seconds: float, seed: int = 0) -> np.ndarray:
+    """Tone bursts over hum and broadband noise, followed by a silent pause."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = (np.sin(2 * np.pi * 3 * t) > 0) & (t < seconds * 0.7)
+    speech = 0.05 * envelope * np.sin(2 * np.pi * (200 + 300 * t) * t)
+    noise = 0.003 * rng.standard_normal(t.size) + 0.01 * np.sin(2 * np.pi * 50 * t)
+    return (speech + noise).astype(np.float32)
+
+
+def load_recordings(corpus_dir: Path) -> list[np.ndarray]:
+    import whisper
+    return [whisper.load_audio(str(path)) for path in sorted(corpus_dir.rglob('*.wav'))]
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Time noise suppression, high-pass and AGC.")
+    parser.add_argument('corpus_dir', type=Path, nargs='?', help="Directory of .wav recordings")
+    parser.add_argument('--seconds', type=float, default=5.0, help="Synthetic utterance length")
+    parser.add_argument('--repeat', type=int, default=50, help="Passes over the audio")
+    args = parser.parse_args(argv)
+
+    utterances = load_recordings(args.corpus_dir) if args.corpus_dir else [synthetic_utterance(args.seconds)]
+    if not utterances:
+        print(f"No .wav files found in {args.corpus_dir}", file=sys.stderr)
+        return 1
+    audio_seconds = sum(u.size for u in utterances) / SAMPLE_RATE
+
+    preprocessor = AudioPreprocessor()
+    for utterance in utterances:
+        preprocessor.process(utterance)  # Warm up FFT plans and the noise profile
+
+    start = time.process_time()
+    for _ in range(args.repeat):
+        for utterance in utterances:
+            preprocessor.process(utterance)
+    cpu_seconds = (time.process_time() - start) / args.repeat
+
+    print(f"Audio:       {audio_seconds:.1f}s in {len(utterances)} utterance(s)")
+    print(f"CPU time:    {cpu_seconds * 1000:.2f} ms per pass")
+    print(f"Core share:  {100 * cpu_seconds / audio_seconds:.3f}% of one core in real time")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
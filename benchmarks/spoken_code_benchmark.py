@@ -0,0 +1,61 @@
+"""Measure how fast the spoken-code grammar rewrites transcripts.
+
+Usage:
+    python -m benchmarks.spoken_code_benchmark [--rules 0 1000 10000 100000] [--repeat 2000]
+
+Adds the given numbers of synthetic symbol rules on top of the built-in and
+everyday symbols and reports the rewrite time per utterance for each grammar size. Since all
+rules are compiled into one trie, the time should stay flat as rules are added.
+"""
+
+import argparse
+import sys
+import time
+
+from src.postprocessors.spoken_code import SpokenCodeGrammar
+
+UTTERANCES = [
+    "snake case user id equals number forty two",
+    "if self dot name double equals open quote admin close quote colon",
+    "camel case get value open paren close paren",
+    "run the tests and show me what failed",
+    "for i in range open paren number one hundred close paren colon",
+    "pascal case http client dot send open paren request comma timeout equals number thirty close paren",
+]
+
+
+def synthetic_rules(count: int, seed_word: str = 'word') -> dict[str, dict[str, str]]:
+    """Symbol rules with two- and three-word phrases sharing prefixes, like real vocabularies."""
+    symbols = {}
+    for i in range(count):
+        phrase = f"{seed_word}{i % 97} {seed_word}{i // 97}" + (f" {seed_word}{i}" if i % 3 == 0 else '')
+        symbols[phrase] = f"<{i}>"
+    return {'symbols': symbols}
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Time spoken-code rewriting as the grammar grows.")
+    parser.add_argument('--rules', type=int, nargs='+', default=[0, 1000, 10000, 100000], help="Extra rule counts to try")
+    parser.add_argument('--repeat', type=int, default=2000, help="Passes over the sample utterances")
+    args = parser.parse_args(argv)
+
+    print(f"{'Rules':>8}  {'Build':>9}  {'Per utterance':>13}")
+    for count in args.rules:
+        start = time.perf_counter()
+        grammar = SpokenCodeGrammar({**synthetic_rules(count), 'everyday_symbols': True})
+        build_seconds = time.perf_counter() - start
+
+        for utterance in UTTERANCES:
+            grammar.process(utterance)  # Warm up
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for utterance in UTTERANCES:
+                grammar.process(utterance)
+        per_utterance = (time.perf_counter() - start) / (args.repeat * len(UTTERANCES))
+
+        print(f"{len(grammar):>8}  {build_seconds * 1000:>7.1f}ms  {per_utterance * 1e6:>11.1f}µs")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
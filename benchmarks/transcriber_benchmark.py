@@ -0,0 +1,67 @@
+"""Benchmark transcriber backends on a corpus of recorded dictation.
+
+Usage:
+    python -m benchmarks.transcriber_benchmark CORPUS_DIR \
+        [--backends whisper_mic] [--models tiny base large] \
+        [--profiles default greedy] [--preprocess] [--json results.json]
+
+CORPUS_DIR holds name.wav recordings, each with a name.txt reference transcript.
+Defaults come from config.py, so running without options measures the current
+setup.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from src.benchmarking.corpus import load_corpus
+from src.benchmarking.runner import create_decoder, format_table, results_to_json, run_benchmark
+from src.benchmarking.whisper_decoder import DECODING_PROFILES
+from src.utils.config_manager import ConfigManager
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    ConfigManager.initialize()
+    config = ConfigManager.get()
+    
+    parser = argparse.ArgumentParser(description="Score transcriber backends for WER, latency and memory.")
+    parser.add_argument('corpus_dir', type=Path, help="Directory of .wav recordings with .txt transcripts")
+    parser.add_argument('--backends', nargs='+', default=[config.get('transcriber_type', 'whisper_mic')])
+    parser.add_argument('--models', nargs='+', default=[config.get('model', 'large')])
+    parser.add_argument('--profiles', nargs='+', default=['default'], choices=sorted(DECODING_PROFILES))
+    parser.add_argument('--preprocess', action='store_true',
+                        help="Also score each configuration with audio preprocessing enabled")
+    parser.add_argument('--json', type=Path, help="Write full results (including per-utterance scores) here")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    corpus = load_corpus(args.corpus_dir)
+    print(f"Loaded {len(corpus)} recordings from {args.corpus_dir}", file=sys.stderr)
+    
+    results = []
+    for backend in args.backends:
+        for model in args.models:
+            for profile in args.profiles:
+                for preprocess in ([False, True] if args.preprocess else [False]):
+                    label = f"{profile}+preprocess" if preprocess else profile
+                    print(f"Running {backend}/{model}/{label}...", file=sys.stderr)
+                    decoder = create_decoder(backend, model, profile, preprocess=preprocess)
+                    results.append(run_benchmark(
+                        corpus, decoder, backend, model, label,
+                        on_progress=lambda u: print(
+                            f"  {u.name}: {u.errors}/{u.reference_words} errors, {u.decode_seconds:.2f}s",
+                            file=sys.stderr,
+                        ),
+                    ))
+    
+    print(format_table(results))
+    if args.json:
+        args.json.write_text(results_to_json(results))
+        print(f"Wrote {args.json}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
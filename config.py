@@ -1,5 +1,7 @@
 # Voice-to-Code Configuration
 
+from pathlib import Path
+
 CONFIG = {
     # Transcriber type: which speech-to-text implementation to use
     'transcriber_type': 'whisper_mic',
@@ -7,6 +9,32 @@ CONFIG = {
     # Processor type: where to send transcribed text
     'processor_type': 'tmux',
 
+    # Fan-out: allow several comma-separated targets in the session dropdown, delivered to concurrently
+    # Targets may be tmux sessions or panes, 'socket:<path>' or webhook URLs
+    'fanout': True,
+
+    # Session discovery: list running tmux sessions and panes in the session dropdown, updated live
+    'session_discovery': True,
+
+    # Paste threshold: transcripts longer than this many characters are pasted into tmux instead of typed
+    # Pasting is faster for long dictations and arrives as one bracketed paste (0 = always type)
+    'paste_threshold': 200,
+
+    # Socket path: Unix socket or FIFO the 'socket' processor writes JSON lines to
+    'socket_path': Path("~/.voice-to-code/voice.sock"),
+
+    # Webhook URL: where the 'webhook' processor POSTs JSON records
+    'webhook_url': 'http://127.0.0.1:8765/transcripts',
+
+    # Webhook timeout: seconds to wait for the webhook to connect or respond
+    'webhook_timeout': 5.0,
+
+    # Webhook retries: retries after a failed request (connection errors, 429 and 5xx), with jittered backoff
+    'webhook_retries': 3,
+
+    # Webhook batch window: seconds to collect rapid utterances into one request (0 = send each immediately)
+    'webhook_batch_window': 0.0,
+
     # Whisper model: tiny, base, small, medium, large
     # Trade-off: larger = more accurate but slower
     'model': 'large',
@@ -24,14 +52,110 @@ CONFIG = {
     # Dynamic energy: auto-adjust energy threshold based on ambient noise
     'dynamic_energy': True,
 
+    # Audio preprocessing: noise suppression, high-pass filter and automatic gain control before decoding
+    # Makes accuracy less dependent on the mic input volume
+    'audio_preprocessing': False,
+
+    # Speech filter: drop non-speech and hallucinated results (e.g. "Thank you." from a cough)
+    # Decoding stops after the first decoder step when no speech is detected
+    'speech_filter': True,
+
+    # No-speech threshold: Whisper's no-speech probability above which audio is dropped
+    # (only when the text is also below logprob_threshold, as in Whisper)
+    'no_speech_threshold': 0.6,
+
+    # Log-probability threshold: average token log probability below which text is dropped
+    'logprob_threshold': -1.0,
+
+    # Calibration cache: seed the energy threshold from a per-device, time-of-day noise calibration
+    # Only used with dynamic_energy; calibrations are stored in ~/.voice-to-code/calibration.json
+    'calibration_cache': True,
+
+    # Calibration seconds: how long to measure ambient noise when calibrating
+    'calibration_seconds': 1.5,
+
+    # Agent gate: watch the target pane's output and hold transcripts while the agent is still responding
+    'agent_gate': False,
+
+    # Agent idle patterns: regular expressions, one of which the pane's latest output must match
+    # for the agent to count as idle (empty = quiet output is enough), e.g. [r'\? for shortcuts']
+    'agent_idle_patterns': [],
+
+    # Agent max wait: seconds to hold a transcript for a busy agent before sending it anyway
+    'agent_max_wait': 60.0,
+
+    # Spoken code: rewrite dictated symbols, casing and numbers into code before delivery
+    # ("camel case get value open paren number forty two close paren" -> "getValue(42)"), extra rules in ~/.voice-to-code/spoken_code.json
+    'spoken_code': False,
+
+    # Voice macros: replace trigger phrases with their expansion from ~/.voice-to-code/macros.json
+    # The file is reloaded when it changes; multi-line expansions are pasted into tmux as a whole
+    'voice_macros': False,
+
+    # Outbox: record every transcript in ~/.voice-to-code/outbox.db until it is delivered
+    # Failed deliveries are retried automatically and listed under Settings → Undelivered Transcripts
+    'outbox': False,
+
+    # Delivery queue: send transcripts from a background thread so a slow target doesn't delay listening
+    'delivery_queue': True,
+
+    # Delivery queue size: transcripts that may wait for delivery before delivery_overflow applies
+    'delivery_queue_size': 32,
+
+    # Delivery overflow: what to do when the queue is full
+    # 'block' = wait for room, 'drop_oldest' = discard the oldest transcript, 'merge' = append to the newest one
+    'delivery_overflow': 'block',
+
     # Vocalize AI agent responses using text-to-speech
     'vocalize_response': False,
 
+    # Vocalize mode: how responses are vocalized (tmux only)
+    # 'local' = read the end of each response from the pane output, 'agent' = ask the agent to run say (macOS)
+    # None = 'agent' on macOS, 'local' elsewhere
+    'vocalize_mode': None,
+
     # Log handler type: where to send log messages
     'log_handler_type': 'ui',
 
+    # Log max lines: lines kept in the log view, older ones are removed
+    'log_max_lines': 5000,
+
+    # Log max bytes: start a new log file once it reaches this size (0 = no size limit)
+    # Only used with the 'file' log handler type
+    'log_max_bytes': 5000000,
+
+    # Log max age: start a new log file after this many hours (0 = no age limit)
+    'log_max_age_hours': 0,
+
+    # Log backups: rotated log files kept as voice_input.log.1, .2, ...
+    'log_backup_count': 5,
+
+    # Log compress: gzip rotated log files
+    'log_compress': True,
+
     # Debug mode: log detailed operation info
     # False = only log start/stop/errors/transcriptions
     # True = log all operational details
     'debug': True,
+
+    # Metrics: expose counters and gauges for monitoring
+    'metrics_enabled': False,
+
+    # Metrics port: serve http://127.0.0.1:<port>/metrics (0 = no HTTP endpoint)
+    'metrics_port': 9464,
+
+    # Metrics textfile: periodically rewrite ~/.voice-to-code/voice_to_code.prom
+    'metrics_textfile': False,
+
+    # Memory watchdog: shed memory when the system runs low instead of swapping
+    'memory_watchdog': False,
+
+    # Memory limit: process RSS in MB that counts as memory pressure (0 = no limit)
+    'memory_max_rss_mb': 6144,
+
+    # Memory floor: system available memory in MB that counts as memory pressure (0 = no floor, Linux only)
+    'memory_min_available_mb': 1024,
+
+    # Fallback model: smaller Whisper model to switch to under memory pressure
+    'memory_fallback_model': 'base',
 }
@@ -0,0 +1,48 @@
+"""Benchmark corpus loading: WAV recordings with reference transcripts."""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class CorpusItem:
+    """One recorded utterance and its expected transcript."""
+    audio_path: Path
+    reference: str
+    
+    @property
+    def name(self) -> str:
+        return self.audio_path.stem
+
+
+def load_corpus(corpus_dir: Path | str) -> list[CorpusItem]:
+    """
+    Load every WAV file in a directory that has a reference transcript.
+    
+    Each `name.wav` is paired with a sibling `name.txt` holding the words that
+    were actually spoken. Subdirectories are searched too, so recordings can be
+    grouped by speaker or accent.
+    
+    Args:
+        corpus_dir: Directory containing .wav and .txt files
+    
+    Returns:
+        Corpus items sorted by path
+    
+    Raises:
+        FileNotFoundError: If the directory doesn't exist or holds no usable pairs
+    """
+    corpus_dir = Path(corpus_dir)
+    if not corpus_dir.is_dir():
+        raise FileNotFoundError(f"Corpus directory not found: {corpus_dir}")
+    
+    items = []
+    for audio_path in sorted(corpus_dir.rglob('*.wav')):
+        transcript_path = audio_path.with_suffix('.txt')
+        if not transcript_path.exists():
+            continue
+        items.append(CorpusItem(audio_path, transcript_path.read_text().strip()))
+    
+    if not items:
+        raise FileNotFoundError(f"No .wav files with matching .txt transcripts in {corpus_dir}")
+    return items
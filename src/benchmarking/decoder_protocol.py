@@ -0,0 +1,38 @@
+"""Protocol for benchmark decoder implementations."""
+
+from pathlib import Path
+from typing import Any, Protocol
+
+
+class DecoderProtocol(Protocol):
+    """Protocol for decoders measured by the benchmark runner."""
+    
+    def load(self) -> None:
+        """Load the model. Timed separately from decoding."""
+        ...
+    
+    def load_audio(self, audio_path: Path) -> Any:
+        """Read a recording into 16 kHz mono samples.
+        
+        Args:
+            audio_path: Path to audio file
+        
+        Returns:
+            Sequence of samples accepted by decode()
+        """
+        ...
+    
+    def decode(self, audio: Any) -> str:
+        """Transcribe samples returned by load_audio().
+        
+        Args:
+            audio: Audio samples
+        
+        Returns:
+            Transcribed text
+        """
+        ...
+    
+    def close(self) -> None:
+        """Release the model."""
+        ...
@@ -0,0 +1,232 @@
+"""Benchmark runner: scores decoders on a corpus for accuracy, speed and memory."""
+
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+
+from src.benchmarking.corpus import CorpusItem
+from src.benchmarking.decoder_protocol import DecoderProtocol
+from src.benchmarking.wer import word_errors
+from src.benchmarking.whisper_decoder import WhisperDecoder
+from src.utils.memory_info import get_process_rss_bytes
+
+# Decoders feed whisper 16 kHz mono samples
+SAMPLE_RATE = 16000
+
+
+@dataclass
+class UtteranceResult:
+    """Score for one recording."""
+    name: str
+    reference: str
+    hypothesis: str
+    errors: int
+    reference_words: int
+    audio_seconds: float
+    decode_seconds: float
+
+
+@dataclass
+class BenchmarkResult:
+    """Aggregated scores for one backend/model/profile combination."""
+    backend: str
+    model: str
+    profile: str
+    load_seconds: float = 0.0
+    peak_rss_bytes: int = 0
+    utterances: list[UtteranceResult] = field(default_factory=list)
+    
+    @property
+    def word_error_rate(self) -> float:
+        """Corpus-level WER: total errors over total reference words."""
+        total = sum(u.reference_words for u in self.utterances)
+        return sum(u.errors for u in self.utterances) / total if total else 0.0
+    
+    @property
+    def real_time_factor(self) -> float:
+        """Total decode time over total audio duration (below 1.0 is faster than real time)."""
+        audio = sum(u.audio_seconds for u in self.utterances)
+        return sum(u.decode_seconds for u in self.utterances) / audio if audio else 0.0
+    
+    @property
+    def p50_latency(self) -> float:
+        return percentile([u.decode_seconds for u in self.utterances], 50)
+    
+    @property
+    def p95_latency(self) -> float:
+        return percentile([u.decode_seconds for u in self.utterances], 95)
+    
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dict including aggregates."""
+        data = asdict(self)
+        data.update(
+            word_error_rate=self.word_error_rate,
+            real_time_factor=self.real_time_factor,
+            p50_latency=self.p50_latency,
+            p95_latency=self.p95_latency,
+        )
+        return data
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Compute a percentile with linear interpolation between samples.
+    
+    Args:
+        values: Samples
+        pct: Percentile between 0 and 100
+    
+    Returns:
+        Percentile value, or 0.0 for no samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class PeakRssSampler:
+    """Context manager tracking the highest RSS seen while it is active.
+    
+    getrusage's peak never decreases within a process, so comparing several
+    models in one run needs its own sampling.
+    """
+    
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def _sample(self) -> None:
+        rss = get_process_rss_bytes()
+        if rss is not None:
+            self.peak_bytes = max(self.peak_bytes, rss)
+    
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+    
+    def __enter__(self) -> 'PeakRssSampler':
+        self._sample()
+        self._thread = threading.Thread(target=self._run, name='rss-sampler', daemon=True)
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._stop_event.set()
+        self._thread.join()
+        self._sample()
+
+
+def create_decoder(backend: str, model: str, profile: str, preprocess: bool = False) -> DecoderProtocol:
+    """
+    Create a benchmark decoder for a transcriber backend.
+    
+    Args:
+        backend: Transcriber type, as in config['transcriber_type']
+        model: Model name
+        profile: Decoding profile name
+        preprocess: Apply audio preprocessing before decoding
+    
+    Returns:
+        Decoder instance
+    
+    Raises:
+        ValueError: If backend is unknown
+    """
+    if backend == 'whisper_mic':
+        return WhisperDecoder(model, profile, preprocess=preprocess)
+    else:
+        raise ValueError(f"Unknown transcriber type: {backend}")
+
+
+def run_benchmark(
+    corpus: list[CorpusItem],
+    decoder: DecoderProtocol,
+    backend: str,
+    model: str,
+    profile: str,
+    on_progress: Callable[[UtteranceResult], None] | None = None,
+) -> BenchmarkResult:
+    """
+    Decode every corpus item and score the results.
+    
+    Args:
+        corpus: Recordings with reference transcripts
+        decoder: Decoder to measure
+        backend: Backend name (for reporting)
+        model: Model name (for reporting)
+        profile: Decoding profile name (for reporting)
+        on_progress: Optional callback(result) after each utterance
+    
+    Returns:
+        Benchmark result with per-utterance scores
+    """
+    result = BenchmarkResult(backend, model, profile)
+    
+    with PeakRssSampler() as rss:
+        start = time.perf_counter()
+        decoder.load()
+        result.load_seconds = time.perf_counter() - start
+        
+        try:
+            for item in corpus:
+                audio = decoder.load_audio(item.audio_path)
+                
+                start = time.perf_counter()
+                hypothesis = decoder.decode(audio)
+                decode_seconds = time.perf_counter() - start
+                
+                errors, reference_words = word_errors(item.reference, hypothesis)
+                utterance = UtteranceResult(
+                    name=item.name,
+                    reference=item.reference,
+                    hypothesis=hypothesis,
+                    errors=errors,
+                    reference_words=reference_words,
+                    audio_seconds=len(audio) / SAMPLE_RATE,
+                    decode_seconds=decode_seconds,
+                )
+                result.utterances.append(utterance)
+                if on_progress:
+                    on_progress(utterance)
+        finally:
+            decoder.close()
+    
+    result.peak_rss_bytes = rss.peak_bytes
+    return result
+
+
+def format_table(results: list[BenchmarkResult]) -> str:
+    """Format results as a fixed-width text table."""
+    headers = ['backend', 'model', 'profile', 'utts', 'WER', 'RTF', 'p50 s', 'p95 s', 'peak RSS MB', 'load s']
+    rows = [
+        [
+            r.backend,
+            r.model,
+            r.profile,
+            str(len(r.utterances)),
+            f"{r.word_error_rate:.1%}",
+            f"{r.real_time_factor:.2f}",
+            f"{r.p50_latency:.2f}",
+            f"{r.p95_latency:.2f}",
+            f"{r.peak_rss_bytes / (1024 * 1024):.0f}",
+            f"{r.load_seconds:.1f}",
+        ]
+        for r in results
+    ]
+    widths = [max(len(row[i]) for row in [headers] + rows) for i in range(len(headers))]
+    lines = ['  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in [headers] + rows]
+    lines.insert(1, '  '.join('-' * width for width in widths))
+    return '\n'.join(lines)
+
+
+def results_to_json(results: list[BenchmarkResult]) -> str:
+    """Serialize results, including per-utterance scores, as JSON."""
+    return json.dumps({'results': [r.to_dict() for r in results]}, indent=2)
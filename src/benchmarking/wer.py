@@ -0,0 +1,67 @@
+"""Word error rate scoring for transcription benchmarks."""
+
+import re
+
+_PUNCTUATION = re.compile(r"[^\w\s']")
+
+
+def normalize_text(text: str) -> list[str]:
+    """
+    Normalize a transcript into comparable words.
+    
+    Lowercases, drops punctuation (keeping apostrophes) and splits on whitespace,
+    so "Open the file, please." and "open the file please" compare equal.
+    
+    Args:
+        text: Transcript text
+    
+    Returns:
+        List of normalized words
+    """
+    return _PUNCTUATION.sub(' ', text.lower()).split()
+
+
+def word_errors(reference: str, hypothesis: str) -> tuple[int, int]:
+    """
+    Count word-level edit operations between two transcripts.
+    
+    Args:
+        reference: Ground-truth transcript
+        hypothesis: Transcriber output
+    
+    Returns:
+        Tuple of (substitutions + deletions + insertions, reference word count)
+    """
+    ref = normalize_text(reference)
+    hyp = normalize_text(hypothesis)
+    
+    # Single-row Levenshtein distance over words
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, start=1):
+            current[j] = min(
+                previous[j] + 1,                             # deletion
+                current[j - 1] + 1,                          # insertion
+                previous[j - 1] + (ref_word != hyp_word),    # substitution
+            )
+        previous = current
+    
+    return previous[-1], len(ref)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Compute the word error rate of a single transcript.
+    
+    Args:
+        reference: Ground-truth transcript
+        hypothesis: Transcriber output
+    
+    Returns:
+        Errors divided by reference word count (0.0 for two empty transcripts)
+    """
+    errors, total = word_errors(reference, hypothesis)
+    if total == 0:
+        return 0.0 if errors == 0 else 1.0
+    return errors / total
@@ -0,0 +1,68 @@
+"""Benchmark decoder using the same Whisper models as WhisperMicTranscriber."""
+
+import gc
+from pathlib import Path
+from typing import Any
+
+from src.transcribers.model_names import whisper_model_id
+
+# Named decode option sets passed to whisper's transcribe()
+DECODING_PROFILES: dict[str, dict[str, Any]] = {
+    # Same options as WhisperMic: temperature fallback, conditioned on previous text
+    'default': {},
+    # Single greedy pass, no fallback
+    'greedy': {'temperature': 0.0, 'condition_on_previous_text': False},
+    # Beam search: slower, usually more accurate
+    'beam5': {'temperature': 0.0, 'beam_size': 5},
+    # Greedy without timestamp tokens
+    'fast': {'temperature': 0.0, 'condition_on_previous_text': False, 'without_timestamps': True},
+}
+
+
+class WhisperDecoder:
+    """Decodes recordings with an openai-whisper model."""
+    
+    def __init__(self, model_name: str, profile: str = 'default', preprocess: bool = False) -> None:
+        """
+        Initialize decoder.
+        
+        Args:
+            model_name: Whisper model name (tiny, base, small, medium, large)
+            profile: Key of DECODING_PROFILES
+            preprocess: Run the transcriber's audio preprocessing stage before decoding
+        
+        Raises:
+            ValueError: If profile is unknown
+        """
+        if profile not in DECODING_PROFILES:
+            raise ValueError(f"Unknown decoding profile: {profile}")
+        self.model_name = model_name
+        self.options = DECODING_PROFILES[profile]
+        self.preprocess = preprocess
+        self.preprocessor = None
+        self.model = None
+    
+    def load(self) -> None:
+        """Load the Whisper model, the English-only variant below large like the app."""
+        import whisper
+        self.model = whisper.load_model(whisper_model_id(self.model_name))
+        if self.preprocess:
+            from src.transcribers.audio_preprocessor import AudioPreprocessor
+            self.preprocessor = AudioPreprocessor()
+    
+    def load_audio(self, audio_path: Path) -> Any:
+        """Read a recording into 16 kHz mono float samples (via ffmpeg)."""
+        import whisper
+        return whisper.load_audio(str(audio_path))
+    
+    def decode(self, audio: Any) -> str:
+        """Transcribe samples with the configured profile."""
+        if self.preprocessor:
+            audio = self.preprocessor.process(audio)
+        result = self.model.transcribe(audio, language='english', suppress_tokens="", **self.options)
+        return result['text'].strip()
+    
+    def close(self) -> None:
+        """Drop the model so the next configuration starts from a clean RSS."""
+        self.model = None
+        gc.collect()
@@ -8,6 +8,27 @@ DEFAULT_AI_AGENT_SESSION = 'ai-voice-input'
 # Default log file name
 DEFAULT_LOG_FILE = 'voice_input.log'
 
+# Default metrics textfile-collector file name
+DEFAULT_METRICS_FILE = 'voice_to_code.prom'
+
+# Default per-device noise calibration cache file name
+DEFAULT_CALIBRATION_FILE = 'calibration.json'
+
+# Default Unix socket or FIFO file name for the socket processor
+DEFAULT_SOCKET_FILE = 'voice.sock'
+
+# Default outbox database file name
+DEFAULT_OUTBOX_FILE = 'outbox.db'
+
+# Custom spoken-code grammar rules file name
+DEFAULT_SPOKEN_CODE_FILE = 'spoken_code.json'
+
+# Voice macros file name
+DEFAULT_MACROS_FILE = 'macros.json'
+
+# Directory for cached synthesized speech
+DEFAULT_TTS_CACHE_DIR = 'tts_cache'
+
 # Default output directory
 DEFAULT_OUTPUT_DIR = Path.home() / '.voice-to-code'
 
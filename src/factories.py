@@ -1,42 +1,270 @@
-"""Factory functions for creating transcribers, processors, and log handlers."""
+"""Factory functions for creating transcribers, processors, session discovery, log handlers, metrics exporters, and watchdogs."""
 
+from functools import partial
 from pathlib import Path
 from typing import Any
 
-from src.logging.file_log_handler import create_file_handler
-from src.logging.gui_log_handler import create_gui_handler
+from src.constants import DEFAULT_MACROS_FILE, DEFAULT_OUTBOX_FILE, DEFAULT_OUTPUT_DIR, DEFAULT_SOCKET_FILE, DEFAULT_SPOKEN_CODE_FILE
+from src.logging.file_log_handler import (
+    DEFAULT_BACKUP_COUNT as DEFAULT_LOG_BACKUP_COUNT,
+    DEFAULT_MAX_BYTES as DEFAULT_LOG_MAX_BYTES,
+    create_file_handler,
+)
+from src.logging.gui_log_handler import DEFAULT_MAX_LINES as DEFAULT_LOG_MAX_LINES, create_gui_handler
 from src.logging.log_handler_protocol import LogHandlerProtocol
 from src.logging.logger_protocol import LoggerProtocol
+from src.metrics.metrics_exporter import MetricsExporter, collect_process_metrics
+from src.metrics.metrics_registry import MetricsRegistry, get_metrics
+from src.processors.fanout_processor import SOCKET_PREFIX, WEBHOOK_PREFIXES, FanoutProcessor, parse_targets
+from src.postprocessors.postprocessor_protocol import PostprocessorProtocol
+from src.postprocessors.spoken_code import SpokenCodeGrammar
+from src.postprocessors.voice_macros import VoiceMacros
+from src.processors.outbox_processor import OutboxProcessor
+from src.processors.postprocessing_processor import PostprocessingProcessor
 from src.processors.processor_protocol import ProcessorProtocol
+from src.processors.queued_processor import QueuedProcessor
+from src.processors.socket_processor import SocketProcessor
 from src.processors.tmux_processor import TmuxProcessor
+from src.processors.webhook_processor import WebhookProcessor
 from src.transcribers.transcriber_protocol import TranscriberProtocol
 from src.transcribers.whisper_mic_transcriber import WhisperMicTranscriber
+from src.utils.agent_state import AgentStateTracker
+from src.utils.feedback import speak
+from src.utils.memory_watchdog import MemoryWatchdog
+from src.utils.noise_calibration import CalibrationCache
+from src.utils.os_detection import OSType, get_os_type
+from src.utils.outbox import Outbox
+from src.utils.response_vocalizer import ResponseVocalizer
+from src.utils.tmux_client import get_tmux_client
+from src.utils.tmux_sessions import TmuxSessionRegistry
 
 
-def create_processor(config: dict[str, Any], get_session_name, logger: LoggerProtocol) -> ProcessorProtocol:
+def create_processor(
+    config: dict[str, Any],
+    get_session_name,
+    logger: LoggerProtocol,
+    sessions: TmuxSessionRegistry | None = None,
+    outbox: Outbox | None = None,
+) -> ProcessorProtocol:
     """
     Create processor based on config.
     
     Args:
-        config: Configuration dict with 'processor_type' key
+        config: Configuration dict with 'processor_type' key, and optionally
+            'fanout', 'paste_threshold', 'socket_path', the 'webhook_*' settings,
+            'vocalize_response', 'vocalize_mode', 'agent_gate', 'agent_idle_patterns', 'agent_max_wait',
+            'spoken_code', 'voice_macros', 'delivery_queue', 'delivery_queue_size' and 'delivery_overflow'
         get_session_name: Callable returning current session name
         logger: Logger instance
+        sessions: Live tmux session list for validating targets (tmux only)
+        outbox: Outbox to record transcripts in until delivered (see create_outbox)
     
     Returns:
-        Processor instance
+        Processor instance (wrapped in a QueuedProcessor when 'delivery_queue' is on)
     
     Raises:
-        ValueError: If processor_type is unknown
+        ValueError: If processor_type, vocalize_mode or delivery_overflow is unknown, or an
+            agent idle pattern is not a valid regular expression
     """
     proc_type = config.get('processor_type', 'tmux')
     
-    if proc_type == 'tmux':
-        return TmuxProcessor(get_session_name, logger)
+    if proc_type == 'tmux' and (config.get('fanout', False) or outbox):
+        # One processor per target, so each can be retried from the outbox on its own.
+        # With fanout, the session dropdown may name several targets, including sockets and webhooks
+        fanout = config.get('fanout', False)
+        processor = FanoutProcessor(
+            lambda: parse_targets(get_session_name()) if fanout else [get_session_name()],
+            lambda target: _create_target_processor(config, target, logger, sessions, outbox),
+            logger,
+        )
+    elif proc_type == 'tmux':
+        processor = _create_tmux_processor(config, get_session_name, logger, sessions)
+    elif proc_type == 'socket':
+        socket_path = config.get('socket_path') or DEFAULT_OUTPUT_DIR / DEFAULT_SOCKET_FILE
+        processor = SocketProcessor(socket_path, logger)
+        if outbox:
+            processor = OutboxProcessor(processor, f"{SOCKET_PREFIX}{socket_path}", outbox, logger)
+    elif proc_type == 'webhook':
+        processor = _create_webhook_processor(config, config.get('webhook_url', ''), logger)
+        if outbox:
+            processor = OutboxProcessor(processor, processor.url, outbox, logger)
     else:
         raise ValueError(f"Unknown processor type: {proc_type}")
+    
+    postprocessors = create_postprocessors(config, logger)
+    if postprocessors:
+        processor = PostprocessingProcessor(processor, postprocessors, logger)
+    
+    if not config.get('delivery_queue', False):
+        return processor
+    return QueuedProcessor(
+        processor,
+        logger,
+        max_queue_size=config.get('delivery_queue_size', 32),
+        overflow=config.get('delivery_overflow', 'block'),
+    )
+
+
+def _create_target_processor(
+    config: dict[str, Any],
+    target: str,
+    logger: LoggerProtocol,
+    sessions: TmuxSessionRegistry | None,
+    outbox: Outbox | None = None,
+) -> ProcessorProtocol:
+    """Create the processor for one session dropdown target: socket path, webhook URL or tmux session."""
+    is_available = None
+    if target.startswith(SOCKET_PREFIX):
+        processor = SocketProcessor(target[len(SOCKET_PREFIX):], logger)
+    elif target.startswith(WEBHOOK_PREFIXES):
+        processor = _create_webhook_processor(config, target, logger)
+    else:
+        processor = _create_tmux_processor(config, lambda: target, logger, sessions)
+        if sessions:
+            is_available = partial(sessions.is_known, target)
+    if not outbox:
+        return processor
+    return OutboxProcessor(processor, target, outbox, logger, is_available=is_available)
+
+
+def _create_tmux_processor(
+    config: dict[str, Any],
+    get_session_name,
+    logger: LoggerProtocol,
+    sessions: TmuxSessionRegistry | None,
+) -> TmuxProcessor:
+    vocalize_locally = _get_vocalize_mode(config) == 'local'
+    response_vocalizer = None
+    if vocalize_locally and config.get('vocalize_response', False):
+        # A new response cuts off one still being read out
+        response_vocalizer = ResponseVocalizer(partial(speak, interrupt=True, cache=False), logger)
+    agent_state = None
+    if config.get('agent_gate', False) or response_vocalizer:
+        agent_state = AgentStateTracker(
+            get_tmux_client(),
+            logger,
+            idle_patterns=config.get('agent_idle_patterns', []),
+            max_wait=config.get('agent_max_wait', 60.0),
+            on_turn_end=response_vocalizer.on_turn_end if response_vocalizer else None,
+        )
+    return TmuxProcessor(
+        get_session_name,
+        logger,
+        sessions=sessions,
+        paste_threshold=config.get('paste_threshold', 200),
+        keep_line_breaks=_produces_line_breaks(config),
+        agent_state=agent_state,
+        wait_for_agent=config.get('agent_gate', False),
+        response_vocalizer=response_vocalizer,
+        vocalize_locally=vocalize_locally,
+    )
+
+
+def vocalizes_responses_locally(config: dict[str, Any]) -> bool:
+    """
+    Whether tmux targets read responses out themselves instead of asking the agent to.
+    
+    Responses are then only watched from a Start with 'vocalize_response' on, so turning
+    it on later needs a restart.
+    
+    Raises:
+        ValueError: If vocalize_mode is unknown
+    """
+    return config.get('processor_type', 'tmux') == 'tmux' and _get_vocalize_mode(config) == 'local'
+
+
+def _get_vocalize_mode(config: dict[str, Any]) -> str:
+    """Configured vocalize mode; unset means 'agent' on macOS (where agents can run say) and 'local' elsewhere."""
+    vocalize_mode = config.get('vocalize_mode')
+    if vocalize_mode is None:
+        return 'agent' if get_os_type() == OSType.MACOS else 'local'
+    if vocalize_mode not in ('local', 'agent'):
+        raise ValueError(f"Unknown vocalize mode: {vocalize_mode}")
+    return vocalize_mode
+
+
+def _produces_line_breaks(config: dict[str, Any]) -> bool:
+    """Whether post-processing may put line breaks in transcripts ("new line", multi-line macros)."""
+    return bool(config.get('spoken_code', False) or config.get('voice_macros', False))
+
+
+def _create_webhook_processor(config: dict[str, Any], url: str, logger: LoggerProtocol) -> WebhookProcessor:
+    return WebhookProcessor(
+        url,
+        logger,
+        timeout=config.get('webhook_timeout', 5.0),
+        retries=config.get('webhook_retries', 3),
+        batch_window=config.get('webhook_batch_window', 0.0),
+    )
+
+
+def create_postprocessors(config: dict[str, Any], logger: LoggerProtocol) -> list[PostprocessorProtocol]:
+    """
+    Create the text post-processors based on config.
+    
+    Args:
+        config: Configuration dict with 'spoken_code' and 'voice_macros' keys
+        logger: Logger instance
+    
+    Returns:
+        Post-processors to apply in order (empty if none are enabled). Macros come
+        last, so their expansions are delivered as written
+    """
+    postprocessors: list[PostprocessorProtocol] = []
+    if config.get('spoken_code', False):
+        rules_path = DEFAULT_OUTPUT_DIR / DEFAULT_SPOKEN_CODE_FILE
+        try:
+            grammar = SpokenCodeGrammar.from_file(rules_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring spoken-code rules in {rules_path}: {e}")
+            grammar = SpokenCodeGrammar()
+        postprocessors.append(grammar)
+    if config.get('voice_macros', False):
+        postprocessors.append(VoiceMacros(DEFAULT_OUTPUT_DIR / DEFAULT_MACROS_FILE, logger))
+    return postprocessors
+
+
+def create_outbox(config: dict[str, Any]) -> Outbox | None:
+    """
+    Create the durable transcript outbox based on config.
+    
+    Args:
+        config: Configuration dict with 'outbox' key
+    
+    Returns:
+        Outbox stored in the output directory, or None if disabled
+    
+    Raises:
+        sqlite3.Error: If the outbox database can't be opened
+    """
+    if not config.get('outbox', False):
+        return None
+    return Outbox(DEFAULT_OUTPUT_DIR / DEFAULT_OUTBOX_FILE)
+
+
+def create_session_registry(config: dict[str, Any], on_change=None) -> TmuxSessionRegistry | None:
+    """
+    Create live tmux session discovery based on config.
+    
+    Args:
+        config: Configuration dict with 'processor_type' and 'session_discovery' keys
+        on_change: Callable receiving the new target list whenever it changes
+    
+    Returns:
+        Session registry (not yet started), or None if discovery is disabled
+        or the processor doesn't send to tmux
+    """
+    if config.get('processor_type', 'tmux') != 'tmux' or not config.get('session_discovery', True):
+        return None
+    return TmuxSessionRegistry(get_tmux_client(), on_change=on_change)
 
 
-def create_transcriber(config: dict[str, Any], logger: LoggerProtocol, processor: ProcessorProtocol) -> TranscriberProtocol:
+def create_transcriber(
+    config: dict[str, Any],
+    logger: LoggerProtocol,
+    processor: ProcessorProtocol,
+    calibration_cache: CalibrationCache | None = None,
+) -> TranscriberProtocol:
     """
     Create transcriber based on config.
     
@@ -44,6 +272,7 @@ def create_transcriber(config: dict[str, Any], logger: LoggerProtocol, processor
         config: Configuration dict with 'transcriber_type' key
         logger: Logger instance
         processor: Processor instance to receive transcribed text
+        calibration_cache: Optional per-device noise calibration cache
     
     Returns:
         Transcriber instance
@@ -54,7 +283,7 @@ def create_transcriber(config: dict[str, Any], logger: LoggerProtocol, processor
     trans_type = config.get('transcriber_type', 'whisper_mic')
     
     if trans_type == 'whisper_mic':
-        return WhisperMicTranscriber(config, logger, processor)
+        return WhisperMicTranscriber(config, logger, processor, calibration_cache=calibration_cache)
     else:
         raise ValueError(f"Unknown transcriber type: {trans_type}")
 
@@ -80,10 +309,90 @@ def create_log_handler(config: dict[str, Any], log_file_path: Path | str | None
     if handler_type == 'file':
         if not log_file_path:
             raise ValueError("log_file_path required for 'file' handler type")
-        return create_file_handler(log_file_path, debug_mode, capture_stdlib_logs=debug_mode)
+        return create_file_handler(
+            log_file_path,
+            debug_mode,
+            capture_stdlib_logs=debug_mode,
+            max_bytes=config.get('log_max_bytes', DEFAULT_LOG_MAX_BYTES),
+            max_age=config.get('log_max_age_hours', 0) * 3600,
+            backup_count=config.get('log_backup_count', DEFAULT_LOG_BACKUP_COUNT),
+            compress=config.get('log_compress', True),
+        )
     elif handler_type == 'ui':
         if not log_widget:
             raise ValueError("log_widget required for 'ui' handler type")
-        return create_gui_handler(log_widget, debug_mode, capture_stdlib_logs=debug_mode)
+        return create_gui_handler(
+            log_widget,
+            debug_mode,
+            capture_stdlib_logs=debug_mode,
+            max_lines=config.get('log_max_lines', DEFAULT_LOG_MAX_LINES),
+        )
     else:
         raise ValueError(f"Unknown log handler type: {handler_type}")
+
+
+def create_metrics_exporter(config: dict[str, Any], textfile_path: Path | str | None = None, registry: MetricsRegistry | None = None) -> MetricsExporter | None:
+    """
+    Create metrics exporter based on config.
+    
+    Args:
+        config: Configuration dict with 'metrics_enabled', 'metrics_port' and 'metrics_textfile' keys
+        textfile_path: Path to textfile-collector file (used when 'metrics_textfile' is True)
+        registry: Registry to export (defaults to the process-wide registry)
+    
+    Returns:
+        Metrics exporter, or None if metrics export is disabled
+    
+    Raises:
+        ValueError: If neither HTTP nor textfile export is configured
+    """
+    if not config.get('metrics_enabled', False):
+        return None
+    
+    port = config.get('metrics_port', 9464)
+    write_textfile = config.get('metrics_textfile', False)
+    if not port and not write_textfile:
+        raise ValueError("metrics_enabled requires 'metrics_port' or 'metrics_textfile'")
+    if write_textfile and not textfile_path:
+        raise ValueError("textfile_path required when 'metrics_textfile' is enabled")
+    
+    registry = registry or get_metrics()
+    registry.add_collector(collect_process_metrics)
+    return MetricsExporter(
+        registry,
+        port=port or None,
+        textfile_path=textfile_path if write_textfile else None,
+    )
+
+
+def create_memory_watchdog(config: dict[str, Any], transcriber: TranscriberProtocol, logger: LoggerProtocol) -> MemoryWatchdog | None:
+    """
+    Create memory watchdog based on config.
+    
+    Args:
+        config: Configuration dict with 'memory_watchdog', 'memory_max_rss_mb',
+            'memory_min_available_mb' and 'memory_fallback_model' keys
+        transcriber: Transcriber whose model the watchdog may switch
+        logger: Logger instance
+    
+    Returns:
+        Memory watchdog, or None if the watchdog is disabled
+    
+    Raises:
+        ValueError: If no memory threshold is configured
+    """
+    if not config.get('memory_watchdog', False):
+        return None
+    
+    max_rss_mb = config.get('memory_max_rss_mb', 0)
+    min_available_mb = config.get('memory_min_available_mb', 0)
+    if not max_rss_mb and not min_available_mb:
+        raise ValueError("memory_watchdog requires 'memory_max_rss_mb' or 'memory_min_available_mb'")
+    
+    return MemoryWatchdog(
+        transcriber,
+        logger,
+        fallback_model=config.get('memory_fallback_model') or None,
+        max_rss_bytes=max_rss_mb * 1024 * 1024 or None,
+        min_available_bytes=min_available_mb * 1024 * 1024 or None,
+    )
@@ -12,7 +12,7 @@ class SettingsViewModel:
         self.transcriber_options = ['whisper_mic']
         self.transcriber_type = tk.StringVar(value='whisper_mic')
         
-        self.processor_options = ['tmux']
+        self.processor_options = ['tmux', 'socket', 'webhook']
         self.processor_type = tk.StringVar(value='tmux')
         
         # Whisper model options
@@ -32,6 +32,9 @@ class SettingsViewModel:
         self.log_handler_options = ['ui', 'file']
         self.log_handler_type = tk.StringVar(value='ui')
         self.debug = tk.BooleanVar(value=False)
+        
+        # Settings without a form field (edited in config.py), kept on save
+        self.other_settings: dict[str, Any] = {}
     
     def load_from_config(self, config: dict[str, Any]) -> None:
         """Load values from config into form fields."""
@@ -45,9 +48,16 @@ class SettingsViewModel:
         self.vocalize_response.set(config.get('vocalize_response', False))
         self.log_handler_type.set(config.get('log_handler_type', 'ui'))
         self.debug.set(config.get('debug', False))
+        
+        form_keys = self._get_form_dict().keys()
+        self.other_settings = {k: v for k, v in config.items() if k not in form_keys}
     
     def get_config_dict(self) -> dict[str, Any]:
         """Get current settings as a dictionary."""
+        return {**self._get_form_dict(), **self.other_settings}
+    
+    def _get_form_dict(self) -> dict[str, Any]:
+        """Settings that have a form field."""
         return {
             'transcriber_type': self.transcriber_type.get(),
             'processor_type': self.processor_type.get(),
@@ -1,20 +1,45 @@
 """Main window form."""
 
+import sqlite3
 import threading
 import tkinter as tk
 from tkinter import scrolledtext, ttk
 from typing import Any
 
-from src.constants import DEFAULT_LOG_FILE, DEFAULT_OUTPUT_DIR, DEFAULT_AI_AGENT_SESSION
-from src.factories import create_log_handler, create_processor, create_transcriber
+from src.constants import (
+    DEFAULT_AI_AGENT_SESSION,
+    DEFAULT_CALIBRATION_FILE,
+    DEFAULT_LOG_FILE,
+    DEFAULT_METRICS_FILE,
+    DEFAULT_OUTPUT_DIR,
+)
+from src.factories import (
+    create_log_handler,
+    create_memory_watchdog,
+    create_metrics_exporter,
+    create_outbox,
+    create_processor,
+    create_session_registry,
+    create_transcriber,
+    vocalizes_responses_locally,
+)
 from src.gui.models.main_view_model import MainViewModel
 from src.gui.models.settings_view_model import SettingsViewModel
 from src.gui.views.input_dialog_form import InputDialogForm
 from src.gui.views.help_form import HelpForm
+from src.gui.views.outbox_form import OutboxForm
+from src.gui.views.session_picker_form import SessionPickerForm
 from src.gui.views.settings_form import SettingsForm
 from src.logging.logger import Logger
+from src.logging.metrics_log_handler import create_metrics_handler
+from src.metrics.metrics_registry import get_metrics
+from src.processors.fanout_processor import is_tmux_target, parse_targets
 from src.utils.config_manager import ConfigManager
 from src.utils.feedback import speak
+from src.utils.noise_calibration import CalibrationCache
+from src.utils.outbox import Outbox, OutboxItem
+from src.utils.sampling_profiler import ProfileResult, SamplingProfiler
+from src.utils.tts_worker import URGENT
 
 
 class MainForm:
@@ -34,6 +59,7 @@ class MainForm:
         # Window setup
         root.title("Voice to Code")
         root.configure(bg="#f0f0f0")
+        root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Menu bar
         menubar = tk.Menu(root)
@@ -43,10 +69,14 @@ class MainForm:
         settings_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Settings", menu=settings_menu)
         settings_menu.add_command(label="Preferences...", command=self.open_settings)
+        settings_menu.add_command(label="Recalibrate Microphone", command=self.recalibrate)
+        settings_menu.add_command(label="Undelivered Transcripts...", command=self.open_outbox)
         
         # Help menu
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Help", menu=help_menu)
+        help_menu.add_command(label="Record Profile...", command=self.record_profile)
+        help_menu.add_separator()
         help_menu.add_command(label="About", command=self.show_help)
         
         # Main content frame
@@ -84,7 +114,8 @@ class MainForm:
         
         tk.Label(session_frame, text="AI Agent Session:", bg="#f0f0f0", font=("Arial", 10)).pack(side="left")
         
-        self.sessions = [DEFAULT_AI_AGENT_SESSION]  # Default session list
+        self.sessions = [DEFAULT_AI_AGENT_SESSION]  # Session names added by hand
+        self.discovered_sessions = []  # Targets found on the tmux server
         self.session_combo = ttk.Combobox(session_frame, values=self.sessions, width=20, state="readonly")
         self.session_combo.set(self.sessions[0])
         self.session_combo.pack(side="left", padx=(5, 5))
@@ -95,7 +126,11 @@ class MainForm:
         
         # Remove session button
         remove_btn = tk.Button(session_frame, text="-", command=self._remove_session, width=3, bg="#e0e0e0")
-        remove_btn.pack(side="left")
+        remove_btn.pack(side="left", padx=(0, 2))
+        
+        # Select several sessions button
+        select_btn = tk.Button(session_frame, text="⋯", command=self._select_sessions, width=3, bg="#e0e0e0")
+        select_btn.pack(side="left")
         
         # Buttons frame
         button_frame = tk.Frame(main_frame, bg="#f0f0f0")
@@ -142,12 +177,22 @@ class MainForm:
         self.transcriber = None
         self.processor = None
         self.worker_thread = None
+        self.metrics_exporter = None
+        self.memory_watchdog = None
+        self.session_config = None
+        self.vocalization_is_live = False  # Whether vocalize_response can be switched without a restart
+        self.recalibrate_on_start = False
+        self.profiler = SamplingProfiler()
         self.stop_event = threading.Event()
         config = ConfigManager.get()
         self.logger = self._initialize_logger(config)
+        # Started on the first Start, so launching the window doesn't touch the tmux server
+        self.tmux_sessions = create_session_registry(config, on_change=self._on_sessions_changed)
+        self.outbox = self._open_outbox(config)
 
     def start(self) -> None:
         """Start button handler."""
+        self.logger.flush()  # Otherwise messages still queued from the last session show up after the clear
         self.log_text.delete("1.0", tk.END)
         self.vm.is_running.set(True)
         self.vm.status_text.set("Loading the model...")
@@ -156,9 +201,15 @@ class MainForm:
 
         # Get fresh config on each start
         config = ConfigManager.get()
+        self.session_config = dict(config)
         
         # Reset logger just in case user changed logging destination
-        self.logger = self._initialize_logger(config)
+        previous_logger, self.logger = self.logger, self._initialize_logger(config)
+        previous_logger.close()
+        if self.tmux_sessions:
+            self.tmux_sessions.start()  # Does nothing once running
+        self._warn_if_session_missing()
+        self._start_metrics_exporter(config)
         
         # Start loading indicator animation
         self.loading_dots = 0
@@ -168,6 +219,7 @@ class MainForm:
         self.worker_thread = threading.Thread(
             target=self._run_voice_session,
             args=(config,),
+            name='voice-session',
             daemon=False,
         )
         self.worker_thread.start()
@@ -184,6 +236,17 @@ class MainForm:
         self.loading_dots = 0
         self._display_load_indicator()
     
+    def on_close(self) -> None:
+        """Window close handler: stop delivery and close the outbox before exiting."""
+        self.stop_event.set()
+        self._close_processor()
+        if self.tmux_sessions:
+            self.tmux_sessions.stop()
+        if self.outbox:
+            self.outbox.close()
+            self.outbox = None
+        self.root.destroy()
+    
     def update_button_states(self, *args: Any) -> None:
         """Called automatically when is_running changes."""
         if self.vm.is_running.get():
@@ -218,7 +281,49 @@ class MainForm:
         
         # Use factory to respect log_handler_type from config
         handler = create_log_handler(config, log_file_path=log_file, log_widget=self.log_text)
-        return Logger([handler])
+        return Logger([handler, create_metrics_handler(get_metrics())])
+
+    def _start_metrics_exporter(self, config) -> None:
+        """Start exporting metrics if enabled in config."""
+        self._stop_metrics_exporter()
+        try:
+            self.metrics_exporter = create_metrics_exporter(
+                config, textfile_path=DEFAULT_OUTPUT_DIR / DEFAULT_METRICS_FILE
+            )
+            if not self.metrics_exporter:
+                return
+            self.metrics_exporter.start()
+            if self.metrics_exporter.url:
+                self.logger.info(f"Metrics available at {self.metrics_exporter.url}")
+            if self.metrics_exporter.textfile_path:
+                self.logger.info(f"Writing metrics to {self.metrics_exporter.textfile_path}")
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Failed to start metrics exporter: {e}")
+            self.metrics_exporter = None
+
+    def _stop_metrics_exporter(self) -> None:
+        """Stop the metrics exporter if one is running."""
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+            self.metrics_exporter = None
+
+    def _start_memory_watchdog(self, config) -> None:
+        """Start watching memory pressure if enabled in config."""
+        self._stop_memory_watchdog()
+        try:
+            self.memory_watchdog = create_memory_watchdog(config, self.transcriber, self.logger)
+        except ValueError as e:
+            self.logger.error(f"Failed to start memory watchdog: {e}")
+            return
+        if self.memory_watchdog:
+            self.memory_watchdog.start()
+            self.logger.debug("Memory watchdog started")
+
+    def _stop_memory_watchdog(self) -> None:
+        """Stop the memory watchdog if one is running."""
+        if self.memory_watchdog:
+            self.memory_watchdog.stop()
+            self.memory_watchdog = None
 
     def _run_voice_session(self, config) -> None:
         try:
@@ -228,26 +333,37 @@ class MainForm:
             self.processor = create_processor(
                 config=config,
                 get_session_name=self.session_combo.get,
-                logger=self.logger
+                logger=self.logger,
+                sessions=self.tmux_sessions,
+                outbox=self.outbox,
             )
 
-            # Toggle vocalization (only works on macOS)
+            # Toggle vocalization (only works on macOS, or when vocalizing locally)
             self.processor.toggle_vocalization(config['vocalize_response'])
+            # Local vocalization only watches responses when it was on at Start
+            self.vocalization_is_live = config['vocalize_response'] or not vocalizes_responses_locally(config)
             
             # Init transcriber (SLOW - GUI will freeze)
             self.logger.info(f"Initializing transcriber with '{config['model']}' model...")
             
-            self.transcriber = create_transcriber(config, self.logger, self.processor)
+            calibration_cache = None
+            if config.get('calibration_cache', True):
+                calibration_cache = CalibrationCache(DEFAULT_OUTPUT_DIR / DEFAULT_CALIBRATION_FILE)
+            self.transcriber = create_transcriber(config, self.logger, self.processor, calibration_cache)
+            if self.recalibrate_on_start:
+                self.recalibrate_on_start = False
+                self.transcriber.request_calibration()
             if not self.transcriber.initialize():
                 self._show_error("Failed to initialize transcriber")
                 self._reset_to_stopped()
                 return
+            self._start_memory_watchdog(config)
             
             # Start streaming
             self.vm.status_text.set("Listening...")
             self.vm.status_color.set("green")
             self.logger.info("Ready. Listening for speech...")
-            speak("Voice to Code starting")
+            speak("Voice to Code starting", priority=URGENT)
             
             # Start listening indicator animation
             self.loading_dots = 0
@@ -263,17 +379,29 @@ class MainForm:
         """Run streaming loop in background thread."""
         try:
             self.transcriber.do_streaming(lambda: not self.stop_event.is_set())
+            self._close_processor()
             
             self.logger.info("=== Voice to Code Stopped ===")
+            self.logger.flush()
             self._reset_to_stopped()
-            speak("Voice to Code ending")
+            speak("Voice to Code ending", priority=URGENT)
             
         except Exception as e:
             self.logger.error(f"Streaming error: {e}")
             self._reset_to_stopped()
     
+    def _close_processor(self) -> None:
+        """Deliver transcripts still queued for the processor, then release it."""
+        if self.processor:
+            processor, self.processor = self.processor, None
+            if not processor.close():
+                self.logger.warning("Some transcripts were not delivered before Stop")
+
     def _reset_to_stopped(self) -> None:
         """Reset UI to stopped state."""
+        self._close_processor()
+        self._stop_memory_watchdog()
+        self._stop_metrics_exporter()
         self.vm.is_running.set(False)
         self.vm.status_text.set("Stopped")
         self.vm.status_color.set("red")
@@ -290,21 +418,150 @@ class MainForm:
         self.logger.info("=== Settings Saved ===")
         for key, value in config.items():
             self.logger.info(f"  {key}: {value}")
-        self.logger.info("Settings will take effect on next Start.")
+        
+        if not (self.vm.is_running.get() and self.transcriber and self.session_config):
+            self.logger.info("Settings will take effect on next Start.")
+            return
+        
+        changed = {key for key, value in config.items() if self.session_config.get(key) != value}
+        applied = set(self.transcriber.update_settings(config))
+        if 'vocalize_response' in changed and self.processor and self.vocalization_is_live:
+            self.processor.toggle_vocalization(config['vocalize_response'])
+            applied.add('vocalize_response')
+        self.session_config = {**self.session_config, **{key: config[key] for key in applied}}
+        
+        if 'model' in applied:
+            self.logger.info(f"Loading '{config['model']}' model in the background; dictation continues meanwhile.")
+        if applied:
+            self.logger.info(f"Applied to running session: {', '.join(sorted(applied))}")
+        restart_needed = changed - applied
+        if restart_needed:
+            self.logger.info(f"Will take effect on next Start: {', '.join(sorted(restart_needed))}")
+    
+    def recalibrate(self) -> None:
+        """Re-measure ambient noise between utterances, or at the next Start."""
+        if self.vm.is_running.get() and self.transcriber:
+            self.transcriber.request_calibration()
+            self.logger.info("Microphone will be recalibrated before the next utterance, please stay quiet")
+        else:
+            self.recalibrate_on_start = True
+            self.logger.info("Microphone will be recalibrated on next Start")
+    
+    def open_outbox(self) -> None:
+        """Show transcripts that haven't been delivered yet."""
+        if not self.outbox:
+            self.logger.warning("The outbox is disabled, enable 'outbox' in config.py to keep undelivered transcripts")
+            return
+        OutboxForm(self.root, self.outbox, on_resend=self._resend)
+    
+    def _open_outbox(self, config) -> Outbox | None:
+        """Open the transcript outbox if enabled in config."""
+        try:
+            outbox = create_outbox(config)
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to open the outbox, undelivered transcripts won't be kept: {e}")
+            return None
+        if outbox and outbox.pending_count():
+            self.logger.warning(f"{outbox.pending_count()} transcript(s) from earlier were not delivered, see Settings → Undelivered Transcripts")
+        return outbox
+    
+    def _resend(self, items: list[OutboxItem]) -> None:
+        """Retry undelivered transcripts to the targets they were recorded for, off the Tk thread."""
+        processor = self.processor
+        if not (self.vm.is_running.get() and processor):
+            self.logger.warning("Press Start before re-sending transcripts")
+            return
+        
+        def resend_all() -> None:
+            for item in items:
+                self.logger.info(f"Re-sending to '{item.target}': {item.text}")
+                try:
+                    delivered = processor.resend(item)
+                except Exception as e:
+                    self.logger.error(f"Re-sending to '{item.target}' failed: {e}")
+                    delivered = False
+                if not delivered:
+                    self.logger.warning("Transcript kept in the outbox, later ones were not re-sent")
+                    return
+        
+        threading.Thread(target=resend_all, name='outbox-resend', daemon=True).start()
+    
+    def record_profile(self) -> None:
+        """Sample all threads for a user-chosen duration and save the profile."""
+        if self.profiler.is_running():
+            self.logger.warning("A profile is already being recorded")
+            return
+        
+        dialog = InputDialogForm(self.root, "Record Profile", "Seconds to profile:")
+        value = dialog.get_result()
+        if value is None:
+            return
+        
+        try:
+            duration = float(value.strip() or 10)
+            self.profiler.start(duration, on_complete=self._on_profile_complete)
+        except ValueError as e:
+            self.logger.error(f"Invalid profile duration '{value}': {e}")
+            return
+        self.logger.info(f"Recording profile for {duration:g}s...")
+    
+    def _on_profile_complete(self, result: ProfileResult) -> None:
+        """Called from the profiler thread when a profile has been written."""
+        self.logger.info(f"Profile recorded ({result.sample_count} samples)")
+        self.logger.info(f"  Flamegraph stacks: {result.collapsed_path}")
+        self.logger.info(f"  Summary: {result.summary_path}")
     
     def show_help(self) -> None:
         """Display help dialog."""
         HelpForm(self.root)
     
+    def _on_sessions_changed(self, targets: list[str]) -> None:
+        """Called from the session registry thread when tmux sessions change."""
+        try:
+            self.root.after(0, self._update_session_list, targets)
+        except (RuntimeError, tk.TclError):
+            pass  # Window already closed
+    
+    def _update_session_list(self, targets: list[str]) -> None:
+        """Show discovered tmux targets in the dropdown, after any missing hand-added names."""
+        self.discovered_sessions = targets
+        self.session_combo['values'] = self._session_values()
+        if self.vm.is_running.get():
+            self._warn_if_session_missing()
+    
+    def _session_values(self) -> list[str]:
+        """Dropdown entries: discovered targets plus hand-added names not running yet."""
+        return self.discovered_sessions + [name for name in self.sessions if name not in self.discovered_sessions]
+    
+    def _warn_if_session_missing(self) -> None:
+        """Warn about selected sessions known not to exist on the tmux server."""
+        if not self.tmux_sessions:
+            return
+        for target in parse_targets(self.session_combo.get()):
+            if is_tmux_target(target) and self.tmux_sessions.is_known(target) is False:
+                self.logger.warning(f"tmux session '{target}' is not running. Start it or select another session before dictating")
+    
+    def _select_sessions(self) -> None:
+        """Pick several sessions to send each transcript to."""
+        if not ConfigManager.get().get('fanout', False):
+            self.logger.warning("Sending to several sessions needs 'fanout' enabled in config.py")
+            return
+        
+        dialog = SessionPickerForm(self.root, self._session_values(), parse_targets(self.session_combo.get()))
+        selected = dialog.get_result()
+        if selected:
+            self.session_combo.set(", ".join(selected))
+            self.logger.info(f"Sending to: {', '.join(selected)}")
+    
     def _add_session(self) -> None:
         """Add new AI Agent session to dropdown."""
-        dialog = InputDialogForm(self.root, "Add Session", "Enter AI Agent session name:")
+        dialog = InputDialogForm(self.root, "Add Session", "Session name, socket:<path> or URL:")
         name = dialog.get_result()
         if name and name.strip():
             name = name.strip()
             if name not in self.sessions:
                 self.sessions.append(name)
-                self.session_combo['values'] = self.sessions
+                self.session_combo['values'] = self._session_values()
                 self.session_combo.set(name)
                 self.logger.info(f"Added session: {name}")
     
@@ -317,6 +574,6 @@ class MainForm:
         current = self.session_combo.get()
         if current in self.sessions:
             self.sessions.remove(current)
-            self.session_combo['values'] = self.sessions
+            self.session_combo['values'] = self._session_values()
             self.session_combo.set(self.sessions[0])
             self.logger.info(f"Removed session: {current}")
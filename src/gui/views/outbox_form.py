@@ -0,0 +1,87 @@
+"""Undelivered transcripts window."""
+
+import sqlite3
+import tkinter as tk
+from datetime import datetime
+from typing import Callable
+
+from src.utils.outbox import Outbox, OutboxItem
+
+# Milliseconds between checks for transcripts delivered in the background
+REFRESH_INTERVAL_MS = 1000
+
+
+class OutboxForm:
+    """Window listing transcripts still in the outbox, to re-send or discard."""
+
+    def __init__(self, parent: tk.Tk, outbox: Outbox, on_resend: Callable[[list[OutboxItem]], None]):
+        """
+        Create and show the outbox window.
+
+        Args:
+            parent: Parent window
+            outbox: Outbox to list pending transcripts from
+            on_resend: Starts retrying items to their targets; each leaves the list once delivered
+        """
+        self.outbox = outbox
+        self.on_resend = on_resend
+        self.items: list[OutboxItem] = []
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Undelivered Transcripts")
+        self.window.geometry("560x320")
+        self.window.transient(parent)
+
+        # Pending list
+        list_frame = tk.Frame(self.window)
+        list_frame.pack(fill="both", expand=True, padx=10, pady=(10, 5))
+        scrollbar = tk.Scrollbar(list_frame)
+        scrollbar.pack(side="right", fill="y")
+        self.listbox = tk.Listbox(list_frame, selectmode=tk.EXTENDED, yscrollcommand=scrollbar.set, font=("Courier", 10))
+        self.listbox.pack(side="left", fill="both", expand=True)
+        scrollbar.config(command=self.listbox.yview)
+
+        # Buttons
+        btn_frame = tk.Frame(self.window)
+        btn_frame.pack(pady=10)
+        tk.Button(btn_frame, text="Re-send", command=self._on_resend, width=10).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="Discard", command=self._on_discard, width=10).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="Close", command=self.window.destroy, width=10).pack(side="left", padx=5)
+
+        self._refresh()
+        self.window.after(REFRESH_INTERVAL_MS, self._poll)
+
+    def _poll(self) -> None:
+        """Drop items delivered in the background from the list (keeps the selection otherwise)."""
+        try:
+            pending = self.outbox.pending()
+        except sqlite3.Error:
+            return  # Outbox closed on exit
+        if [item.id for item in pending] != [item.id for item in self.items]:
+            self._refresh(pending)
+        self.window.after(REFRESH_INTERVAL_MS, self._poll)
+
+    def _refresh(self, pending: list[OutboxItem] | None = None) -> None:
+        """Reload pending transcripts from the outbox."""
+        self.items = self.outbox.pending() if pending is None else pending
+        self.listbox.delete(0, tk.END)
+        for item in self.items:
+            created = datetime.fromtimestamp(item.created_at).strftime("%m-%d %H:%M")
+            self.listbox.insert(tk.END, f"{created}  [{item.target}]  {item.text}")
+        if not self.items:
+            self.listbox.insert(tk.END, "Nothing pending, every transcript was delivered.")
+
+    def _selected(self) -> list[OutboxItem]:
+        return [self.items[index] for index in self.listbox.curselection() if index < len(self.items)]
+
+    def _on_resend(self) -> None:
+        """Re-send button handler: retry selected items; they leave the list once delivered."""
+        items = self._selected()
+        if items:
+            self.on_resend(items)
+
+    def _on_discard(self) -> None:
+        """Discard button handler."""
+        for item in self._selected():
+            self.outbox.discard(item.id)
+        self._refresh()
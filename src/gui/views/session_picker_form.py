@@ -0,0 +1,66 @@
+"""Multi-select dialog for choosing delivery targets."""
+
+import tkinter as tk
+
+
+class SessionPickerForm:
+    """Dialog listing targets with multi-select."""
+
+    def __init__(self, parent: tk.Tk | tk.Toplevel, targets: list[str], selected: list[str]):
+        """
+        Create and show target picker dialog.
+
+        Args:
+            parent: Parent window
+            targets: Targets to choose from
+            selected: Targets selected initially
+        """
+        self.result = None
+        self.targets = targets + [target for target in selected if target not in targets]
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Select Sessions")
+        self.dialog.geometry("320x300")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+
+        # Center on parent
+        parent.update_idletasks()
+        x = parent.winfo_x() + (parent.winfo_width() - 320) // 2
+        y = parent.winfo_y() + (parent.winfo_height() - 300) // 2
+        self.dialog.geometry(f"+{x}+{y}")
+
+        tk.Label(self.dialog, text="Send each transcript to:").pack(pady=(10, 5))
+
+        # Target list
+        self.listbox = tk.Listbox(self.dialog, selectmode=tk.MULTIPLE, exportselection=False, height=10)
+        for index, target in enumerate(self.targets):
+            self.listbox.insert(tk.END, target)
+            if target in selected:
+                self.listbox.selection_set(index)
+        self.listbox.pack(fill="both", expand=True, padx=10)
+
+        # Buttons
+        btn_frame = tk.Frame(self.dialog)
+        btn_frame.pack(pady=10)
+        tk.Button(btn_frame, text="OK", command=self._on_ok, width=10).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="Cancel", command=self._on_cancel, width=10).pack(side="left", padx=5)
+
+        self.dialog.wait_window()
+
+    def _on_ok(self) -> None:
+        """OK button handler."""
+        self.result = [self.targets[index] for index in self.listbox.curselection()]
+        self.dialog.destroy()
+
+    def _on_cancel(self) -> None:
+        """Cancel button handler."""
+        self.dialog.destroy()
+
+    def get_result(self) -> list[str] | None:
+        """Get selected targets.
+
+        Returns:
+            Selected targets in list order, or None if cancelled
+        """
+        return self.result
@@ -1,50 +1,288 @@
-"""File logging handler for voice-to-code."""
+"""File logging handler for voice-to-code.
 
+Messages are timestamped and queued by the caller, then written by a
+background thread in batches to a file kept open between writes, so logging
+from the decode or delivery threads never waits on the disk. The queue is
+written every second, right away for ERROR messages, and on flush() or
+close() (also run at exit).
+
+The log file can be rotated by size and age: the current file becomes
+<name>.1 (gzipped to <name>.1.gz when compressing), older segments move up
+one number and those beyond the backup count are removed. A file's age is
+counted from the timestamp of its first line, so restarting the app
+doesn't restart the clock.
+"""
+
+import atexit
+import collections
+import gzip
+import os
+import shutil
+import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
 from src.logging.log_handler_protocol import LogHandlerProtocol
 
+# Seconds between writes of queued messages
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Rotate the log file once it reaches this many bytes (0 = never by size)
+DEFAULT_MAX_BYTES = 5_000_000
+
+# Rotated segments kept
+DEFAULT_BACKUP_COUNT = 5
+
+# Queued messages that trigger a write before the interval is up
+MAX_PENDING = 10_000
+
+# Timestamp at the start of each line
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class FileLogHandler:
+    """Log handler appending to a file from a background writer thread."""
+
+    def __init__(
+        self,
+        log_file_path: Path | str,
+        debug_mode: bool = False,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = 0,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+        compress: bool = False,
+    ) -> None:
+        """
+        Initialize handler and start its writer thread.
+
+        Args:
+            log_file_path: Path to log file
+            debug_mode: If True, log DEBUG messages; if False, only INFO
+            flush_interval: Seconds between writes of queued messages
+            max_bytes: Rotate once the file reaches this size (0 = never by size)
+            max_age: Rotate once the file's first line is this many seconds old (0 = never by age)
+            backup_count: Rotated segments kept (0 = the file is truncated when rotated)
+            compress: Gzip rotated segments
+        """
+        self.log_file = Path(log_file_path)
+        self.debug_mode = debug_mode
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.backup_count = backup_count
+        self.compress = compress
+
+        self._pending: collections.deque[tuple[float, str, str]] = collections.deque()
+        self._condition = threading.Condition()
+        self._wake = False
+        self._writing = False
+        self._closed = False
+        self._file = None
+        self._started_at: float | None = None  # When the current file got its first line
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __call__(self, level: str, message: str) -> None:
+        """Queue a message for the writer thread."""
+        # Skip DEBUG messages if not in debug mode
+        if level == 'DEBUG' and not self.debug_mode:
+            return
+        if self._closed:
+            self._write_now(level, message)
+            return
+        self._pending.append((time.time(), level, message))
+        if level == 'ERROR' or len(self._pending) >= MAX_PENDING:
+            with self._condition:
+                self._wake = True
+                self._condition.notify_all()
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """
+        Write all queued messages to the file.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if nothing is left queued
+        """
+        with self._condition:
+            self._wake = True
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: self._closed or (not self._pending and not self._writing), timeout)
+
+    def close(self) -> None:
+        """Write queued messages and stop the writer thread. Later messages are written directly."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=5.0)
+        atexit.unregister(self.close)
+        # Messages queued while the writer was finishing
+        while self._pending:
+            _created, level, message = self._pending.popleft()
+            self._write_now(level, message)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._wake or self._closed, self.flush_interval)
+                self._wake = False
+                self._writing = True
+                closing = self._closed
+            try:
+                self._write_pending()
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+            if closing:
+                self._close_file()
+                return
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+        entries = []
+        created_first = self._pending[0][0]
+        while self._pending:
+            created, level, message = self._pending.popleft()
+            entries.append(_format(created, level, message))
+        text = ''.join(entries)
+        try:
+            self._rotate_if_due(len(text.encode('utf-8')))
+            if self._file is None:
+                self._file = open(self.log_file, 'a', encoding='utf-8')
+            self._file.write(text)
+            self._file.flush()
+            if self._started_at is None:
+                self._started_at = created_first
+        except Exception as e:
+            self._close_file()
+            print(f"WARNING: File log handler failed: {e}", file=sys.stderr)
+            print(f"  {len(entries)} message(s) lost, the last was: {entries[-1].rstrip()}", file=sys.stderr)
+
+    def _rotate_if_due(self, incoming: int) -> None:
+        """Rotate before a write that would take the file past max_bytes, or once it is older than max_age."""
+        try:
+            size = self.log_file.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if not size:
+            self._started_at = None
+            return
+        if self._started_at is None:
+            # Left by an earlier run (None if its first line has no timestamp: counted from now)
+            self._started_at = _first_timestamp(self.log_file)
+        too_big = self.max_bytes and size + incoming > self.max_bytes
+        too_old = self.max_age and self._started_at is not None and time.time() - self._started_at >= self.max_age
+        if too_big or too_old:
+            self._close_file()
+            self._rotate()
+            self._started_at = None
+
+    def _rotate(self) -> None:
+        if self.backup_count <= 0:
+            self.log_file.unlink()
+            return
+        for suffix in ('', '.gz'):
+            self._segment(self.backup_count, suffix).unlink(missing_ok=True)
+        for number in range(self.backup_count - 1, 0, -1):
+            for suffix in ('', '.gz'):
+                segment = self._segment(number, suffix)
+                if segment.exists():
+                    segment.replace(self._segment(number + 1, suffix))
+        first = self._segment(1, '')
+        self.log_file.replace(first)
+        if self.compress:
+            with open(first, 'rb') as source, gzip.open(self._segment(1, '.gz'), 'wb') as target:
+                shutil.copyfileobj(source, target)
+            os.unlink(first)
+
+    def _segment(self, number: int, suffix: str) -> Path:
+        return self.log_file.with_name(f"{self.log_file.name}.{number}{suffix}")
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def _write_now(self, level: str, message: str) -> None:
+        """Append one message directly, for messages logged after close()."""
+        try:
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(_format(time.time(), level, message))
+        except Exception as e:
+            print(f"WARNING: File log handler failed: {e}", file=sys.stderr)
+            print(f"  Message was: [{level}] {message}", file=sys.stderr)
+
+
+def _format(created: float, level: str, message: str) -> str:
+    timestamp = datetime.fromtimestamp(created).strftime(TIMESTAMP_FORMAT)
+    return f"[{timestamp}] {level}: {message}\n"
+
+
+def _first_timestamp(log_file: Path) -> float | None:
+    """Read the timestamp of a log file's first line, None if there is none."""
+    try:
+        with open(log_file, encoding='utf-8', errors='replace') as f:
+            line = f.readline(64)
+        return datetime.strptime(line[1:20], TIMESTAMP_FORMAT).timestamp()
+    except (OSError, ValueError):
+        return None
 
-def create_file_handler(log_file_path: Path | str, debug_mode: bool = False, capture_stdlib_logs: bool = False) -> LogHandlerProtocol:
+
+def create_file_handler(
+    log_file_path: Path | str,
+    debug_mode: bool = False,
+    capture_stdlib_logs: bool = False,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    max_age: float = 0,
+    backup_count: int = DEFAULT_BACKUP_COUNT,
+    compress: bool = False,
+) -> LogHandlerProtocol:
     """
     Create a file logging handler.
-    
+
     Args:
         log_file_path: Path to log file
         debug_mode: If True, log DEBUG messages; if False, only INFO
         capture_stdlib_logs: If True, capture WhisperMic stdlib logging (requires debug_mode)
-    
+        max_bytes: Rotate once the file reaches this size (0 = never by size)
+        max_age: Rotate once the file's first line is this many seconds old (0 = never by age)
+        backup_count: Rotated segments kept
+        compress: Gzip rotated segments
+
     Returns:
-        Handler function(level, message)
+        Handler function(level, message), with flush() and close()
     """
-    log_file = Path(log_file_path)
-    
-    def handler(level: str, message: str) -> None:
-        # Skip DEBUG messages if not in debug mode
-        if level == 'DEBUG' and not debug_mode:
-            return
-        
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] {level}: {message}\n"
-        
-        try:
-            with open(log_file, "a") as f:
-                f.write(log_entry)
-        except Exception as e:
-            import sys
-            print(f"WARNING: File log handler failed: {e}", file=sys.stderr)
-            print(f"  Message was: [{level}] {message}", file=sys.stderr)
-    
+    handler = FileLogHandler(
+        log_file_path,
+        debug_mode,
+        max_bytes=max_bytes,
+        max_age=max_age,
+        backup_count=backup_count,
+        compress=compress,
+    )
+
     # Set up stdlib logging bridge if requested
     from src.logging.logging_bridge import (
         clear_stdlib_logging_bridge,
         setup_stdlib_logging_bridge,
     )
-    
+
     if capture_stdlib_logs and debug_mode:
         setup_stdlib_logging_bridge(handler)
     else:
         clear_stdlib_logging_bridge()
-    
+
     return handler
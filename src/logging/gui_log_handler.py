@@ -1,50 +1,157 @@
-"""GUI logging handler for voice-to-code."""
+"""GUI logging handler for voice-to-code.
 
+Tk widgets may only be touched from the thread running the main loop, while
+most messages are logged from the worker, decode and delivery threads. The
+handler therefore only queues messages; the main loop drains the queue every
+100 ms with after(), inserting each batch with a single insert() call and
+scrolling once. Levels are colored by tags configured once on the widget,
+and the oldest lines are deleted in bulk once the view holds more than
+max_lines, so a day-long session doesn't slow the GUI down.
+"""
+
+import collections
+import threading
+import time
 import tkinter as tk
 from datetime import datetime
 from typing import Any
 
 from src.logging.log_handler_protocol import LogHandlerProtocol
 
+# Lines kept in the log view
+DEFAULT_MAX_LINES = 5000
+
+# Milliseconds between drains of the queue
+DRAIN_INTERVAL_MS = 100
+
+# Messages inserted per drain; a larger backlog continues on the next main loop turn
+BATCH_SIZE = 500
+
+# Foreground color by level (INFO keeps the widget's color)
+LEVEL_COLORS = {
+    'DEBUG': 'gray45',
+    'WARNING': 'darkorange3',
+    'ERROR': 'red3',
+}
+
+
+class GuiLogHandler:
+    """Log handler showing messages in a Text widget, safe to call from any thread."""
+
+    def __init__(self, log_widget: Any, debug_mode: bool = False, max_lines: int = DEFAULT_MAX_LINES) -> None:
+        """
+        Initialize handler and start draining on the widget's main loop. Must be created on the Tk thread.
+
+        Args:
+            log_widget: tkinter Text widget (e.g., ScrolledText)
+            debug_mode: If True, log DEBUG messages; if False, only INFO
+            max_lines: Lines kept in the widget; older lines are deleted (0 = no limit)
+        """
+        self.log_widget = log_widget
+        self.debug_mode = debug_mode
+        self.max_lines = max_lines
+
+        self._pending: collections.deque[tuple[float, str, str]] = collections.deque()
+        self._tk_thread = threading.current_thread()
+        self._closed = False
+        for level, color in LEVEL_COLORS.items():
+            log_widget.tag_configure(level, foreground=color)
+        self._after_id = log_widget.after(DRAIN_INTERVAL_MS, self._drain)
+
+    def __call__(self, level: str, message: str) -> None:
+        """Queue a message for the main loop."""
+        # Skip DEBUG messages if not in debug mode
+        if level == 'DEBUG' and not self.debug_mode:
+            return
+        self._pending.append((time.time(), level, message))
+
+    def flush(self) -> None:
+        """Show all queued messages now. Does nothing off the Tk thread, where the next drain shows them."""
+        if threading.current_thread() is not self._tk_thread:
+            return
+        while self._pending:
+            self._insert_batch()
+
+    def close(self) -> None:
+        """Show queued messages and stop draining (on the Tk thread; elsewhere after the next drain)."""
+        self._closed = True
+        if threading.current_thread() is not self._tk_thread:
+            return
+        try:
+            self.log_widget.after_cancel(self._after_id)
+        except Exception:
+            pass  # Widget already destroyed
+        self.flush()
+
+    def _drain(self) -> None:
+        try:
+            self._insert_batch()
+        finally:
+            if self._closed:
+                self.flush()
+            else:
+                self._after_id = self.log_widget.after(0 if self._pending else DRAIN_INTERVAL_MS, self._drain)
+
+    def _insert_batch(self) -> None:
+        if not self._pending:
+            return
+        # Messages that would be trimmed straight away are never inserted
+        while self.max_lines and len(self._pending) > self.max_lines:
+            self._pending.popleft()
+
+        chunks: list[str] = []
+        for _ in range(min(BATCH_SIZE, len(self._pending))):
+            created, level, message = self._pending.popleft()
+            timestamp = datetime.fromtimestamp(created).strftime("%H:%M:%S")
+            chunks += [f"[{timestamp}] {level}: {message}\n", level]
+        try:
+            # One insert for the batch: text, tag, text, tag, ...
+            self.log_widget.insert(tk.END, *chunks)
+            self._trim()
+            self.log_widget.see(tk.END)  # Auto-scroll to bottom
+        except Exception as e:
+            import sys
+            print(f"WARNING: GUI log handler failed: {e}", file=sys.stderr)
+            print(f"  {len(chunks) // 2} message(s) not shown, the last was: {chunks[-2].rstrip()}", file=sys.stderr)
+
+    def _trim(self) -> None:
+        """Delete the oldest lines once the view is 10% over max_lines, so trimming happens in bulk."""
+        if not self.max_lines:
+            return
+        lines = int(self.log_widget.index('end-1c').split('.')[0]) - 1  # Text ends with a newline
+        if lines > self.max_lines + max(1, self.max_lines // 10):
+            self.log_widget.delete('1.0', f"{lines - self.max_lines + 1}.0")
 
-def create_gui_handler(log_widget: Any, debug_mode: bool = False, capture_stdlib_logs: bool = False) -> LogHandlerProtocol:
+
+def create_gui_handler(
+    log_widget: Any,
+    debug_mode: bool = False,
+    capture_stdlib_logs: bool = False,
+    max_lines: int = DEFAULT_MAX_LINES,
+) -> LogHandlerProtocol:
     """
     Create a GUI logging handler.
-    
+
     Args:
-        log_widget: tkinter widget with insert() and see() methods (e.g., ScrolledText)
+        log_widget: tkinter Text widget (e.g., ScrolledText)
         debug_mode: If True, log DEBUG messages; if False, only INFO
         capture_stdlib_logs: If True, capture WhisperMic stdlib logging (requires debug_mode)
-    
+        max_lines: Lines kept in the widget (0 = no limit)
+
     Returns:
-        Handler function(level, message)
+        Handler function(level, message), with flush() and close()
     """
-    
-    def handler(level: str, message: str) -> None:
-        # Skip DEBUG messages if not in debug mode
-        if level == 'DEBUG' and not debug_mode:
-            return
-        
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {level}: {message}\n"
-        
-        try:
-            log_widget.insert(tk.END, log_entry)
-            log_widget.see(tk.END)  # Auto-scroll to bottom
-        except Exception as e:
-            import sys
-            print(f"WARNING: GUI log handler failed: {e}", file=sys.stderr)
-            print(f"  Message was: [{level}] {message}", file=sys.stderr)
-    
+    handler = GuiLogHandler(log_widget, debug_mode, max_lines)
+
     # Set up stdlib logging bridge if requested
     from src.logging.logging_bridge import (
         clear_stdlib_logging_bridge,
         setup_stdlib_logging_bridge,
     )
-    
+
     if capture_stdlib_logs and debug_mode:
         setup_stdlib_logging_bridge(handler)
     else:
         clear_stdlib_logging_bridge()
-    
+
     return handler
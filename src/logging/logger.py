@@ -35,3 +35,17 @@ class Logger:
         """Log error message to all handlers."""
         for handler in self.handlers:
             handler('ERROR', message)
+    
+    def flush(self) -> None:
+        """Write out messages buffered by handlers (e.g. the file handler's queue)."""
+        for handler in self.handlers:
+            flush = getattr(handler, 'flush', None)
+            if flush:
+                flush()
+    
+    def close(self) -> None:
+        """Release handlers holding resources, writing out their buffered messages first."""
+        for handler in self.handlers:
+            close = getattr(handler, 'close', None)
+            if close:
+                close()
@@ -0,0 +1,21 @@
+"""Metrics logging handler for voice-to-code."""
+
+from src.logging.log_handler_protocol import LogHandlerProtocol
+from src.metrics.metrics_registry import MetricsRegistry
+
+
+def create_metrics_handler(registry: MetricsRegistry) -> LogHandlerProtocol:
+    """
+    Create a handler that counts log messages by level.
+
+    Args:
+        registry: Metrics registry to record counts in
+
+    Returns:
+        Handler function(level, message)
+    """
+
+    def handler(level: str, message: str) -> None:
+        registry.inc('voice_to_code_log_messages_total', labels={'level': level})
+
+    return handler
@@ -0,0 +1,139 @@
+"""Local metrics export over HTTP and to a textfile-collector file."""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.metrics.metrics_registry import MetricsRegistry
+from src.utils.memory_info import get_process_rss_bytes
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsExporter:
+    """Serves metrics on localhost and/or periodically rewrites a .prom file.
+
+    Endpoints:
+        /metrics       Prometheus text format
+        /metrics.json  JSON document
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        port: int | None = None,
+        textfile_path: Path | str | None = None,
+        interval: float = 15.0,
+        host: str = '127.0.0.1',
+    ) -> None:
+        """
+        Initialize exporter.
+
+        Args:
+            registry: Registry to export
+            port: HTTP port to listen on (0 picks a free port, None disables HTTP)
+            textfile_path: File to rewrite every interval (None disables)
+            interval: Seconds between textfile rewrites
+            host: Address to bind the HTTP server to
+        """
+        self.registry = registry
+        self.port = port
+        self.textfile_path = Path(textfile_path) if textfile_path else None
+        self.interval = interval
+        self.host = host
+        self._server = None
+        self._threads: list[threading.Thread] = []
+        self._stop_event = threading.Event()
+
+    @property
+    def url(self) -> str | None:
+        """URL of the Prometheus endpoint, or None if HTTP is disabled."""
+        if not self._server:
+            return None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> None:
+        """Start serving and/or writing metrics in background threads."""
+        self._stop_event.clear()
+
+        if self.port is not None:
+            self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+            self._server.daemon_threads = True
+            self._start_thread(self._server.serve_forever, 'metrics-http')
+
+        if self.textfile_path:
+            self._start_thread(self._write_textfile_loop, 'metrics-textfile')
+
+    def stop(self) -> None:
+        """Stop background threads and write a final textfile snapshot."""
+        self._stop_event.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+
+        try:
+            self.write_textfile()
+        except OSError as e:
+            import sys
+            print(f"WARNING: Metrics textfile write failed: {e}", file=sys.stderr)
+
+    def write_textfile(self) -> None:
+        """Atomically rewrite the textfile-collector file."""
+        if not self.textfile_path:
+            return
+        self.textfile_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.textfile_path.with_name(self.textfile_path.name + '.tmp')
+        tmp_path.write_text(self.registry.to_prometheus())
+        os.replace(tmp_path, self.textfile_path)
+
+    def _start_thread(self, target, name: str) -> None:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _write_textfile_loop(self) -> None:
+        while True:
+            try:
+                self.write_textfile()
+            except OSError as e:
+                import sys
+                print(f"WARNING: Metrics textfile write failed: {e}", file=sys.stderr)
+            if self._stop_event.wait(self.interval):
+                return
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        registry = self.registry
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path == '/metrics':
+                    body, content_type = registry.to_prometheus(), PROMETHEUS_CONTENT_TYPE
+                elif self.path == '/metrics.json':
+                    body, content_type = registry.to_json(), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                payload = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args) -> None:
+                pass  # Keep scrapes out of stderr
+
+        return MetricsRequestHandler
+
+
+def collect_process_metrics(registry: MetricsRegistry) -> None:
+    """Collector that refreshes process-level gauges such as RSS."""
+    rss = get_process_rss_bytes()
+    if rss is not None:
+        registry.set('voice_to_code_process_rss_bytes', rss)
@@ -0,0 +1,204 @@
+"""Thread-safe in-process metrics registry for voice-to-code.
+
+Recording a value is a dict update under a lock, so it is safe to call from
+the transcriber and processor hot paths. Rendering (Prometheus text or JSON)
+happens on the exporter's own thread.
+"""
+
+import json
+import threading
+import time
+from typing import Any, Callable
+
+# Metric name -> (type, help). Names not listed here are exported as untyped.
+METRIC_DESCRIPTIONS = {
+    'voice_to_code_utterances_total': ('counter', 'Utterances transcribed and handed to the processor'),
+    'voice_to_code_utterances_skipped_total': ('counter', 'Utterances dropped as non-speech or hallucination, by reason'),
+    'voice_to_code_decode_seconds': ('summary', 'Wall-clock time spent decoding captured audio'),
+    'voice_to_code_preprocess_seconds': ('summary', 'Time spent on noise suppression and gain control before decoding'),
+    'voice_to_code_audio_seconds': ('summary', 'Duration of audio handed to the decoder'),
+    'voice_to_code_decode_realtime_factor': ('gauge', 'Decode time divided by audio duration for the last utterance'),
+    'voice_to_code_audio_queue_depth': ('gauge', 'Captured audio chunks waiting to be decoded'),
+    'voice_to_code_model_load_seconds': ('gauge', 'Time taken to load the transcription model'),
+    'voice_to_code_tmux_sends_total': ('counter', 'Transcripts delivered to tmux, by method (send_keys or paste)'),
+    'voice_to_code_tmux_send_failures_total': ('counter', 'Transcripts that failed to reach tmux'),
+    'voice_to_code_socket_records_total': ('counter', 'JSON records written to the socket or FIFO'),
+    'voice_to_code_socket_records_dropped_total': ('counter', 'JSON records dropped because the reader fell too far behind'),
+    'voice_to_code_socket_buffered_records': ('gauge', 'JSON records waiting for the socket or FIFO reader'),
+    'voice_to_code_socket_connects_total': ('counter', 'Connections made to the socket or FIFO'),
+    'voice_to_code_webhook_requests_total': ('counter', 'HTTP requests answered by the webhook, by status'),
+    'voice_to_code_webhook_records_total': ('counter', 'JSON records delivered to the webhook'),
+    'voice_to_code_webhook_retries_total': ('counter', 'Webhook requests retried after a failure'),
+    'voice_to_code_webhook_failures_total': ('counter', 'Webhook deliveries given up on after all retries'),
+    'voice_to_code_fanout_delivery_seconds': ('summary', 'Time each selected target took to take a transcript, by target'),
+    'voice_to_code_fanout_failures_total': ('counter', 'Transcripts a selected target failed to take, by target'),
+    'voice_to_code_agent_wait_seconds': ('summary', 'Time transcripts were held while the agent in the target pane was busy'),
+    'voice_to_code_agent_wait_timeouts_total': ('counter', 'Transcripts sent to a still-busy agent after agent_max_wait'),
+    'voice_to_code_tts_messages_total': ('counter', 'Messages spoken, by source (cache or synthesized)'),
+    'voice_to_code_tts_synthesis_seconds': ('summary', 'Time spent synthesizing speech for messages not in the cache'),
+    'voice_to_code_tts_interrupted_total': ('counter', 'Messages cut off or dropped by a newer message'),
+    'voice_to_code_postprocess_seconds': ('summary', 'Time spent rewriting transcripts before delivery'),
+    'voice_to_code_macros': ('gauge', 'Voice macros loaded from the macro file'),
+    'voice_to_code_macro_expansions_total': ('counter', 'Trigger phrases replaced with their macro expansion'),
+    'voice_to_code_outbox_pending': ('gauge', 'Transcripts recorded in the outbox and not delivered yet'),
+    'voice_to_code_outbox_redelivered_total': ('counter', 'Transcripts delivered from the outbox after failing at first'),
+    'voice_to_code_delivery_seconds': ('summary', 'Time spent delivering a transcript to its target, by method'),
+    'voice_to_code_delivery_latency_seconds': ('summary', 'Time from queueing a transcript to finishing its delivery'),
+    'voice_to_code_delivery_queue_depth': ('gauge', 'Transcripts waiting for the delivery worker'),
+    'voice_to_code_delivery_overflow_total': ('counter', 'Transcripts queued while the delivery queue was full, by overflow policy'),
+    'voice_to_code_log_messages_total': ('counter', 'Log messages emitted, by level'),
+    'voice_to_code_process_rss_bytes': ('gauge', 'Resident set size of the voice-to-code process'),
+    'voice_to_code_memory_available_bytes': ('gauge', 'System memory available without swapping'),
+    'voice_to_code_memory_actions_total': ('counter', 'Actions taken by the memory watchdog, by action'),
+}
+
+MetricKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+class MetricsRegistry:
+    """Collection of counters, gauges and summaries keyed by name and labels."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: dict[MetricKey, float] = {}
+        self._families: dict[str, str] = {}
+        self._collectors: list[Callable[['MetricsRegistry'], None]] = []
+
+    @staticmethod
+    def _key(name: str, labels: dict[str, Any] | None) -> MetricKey:
+        if not labels:
+            return (name, ())
+        return (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+
+    def inc(self, name: str, amount: float = 1.0, labels: dict[str, Any] | None = None) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            name: Metric name
+            amount: Amount to add
+            labels: Optional label values
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set(self, name: str, value: float, labels: dict[str, Any] | None = None) -> None:
+        """
+        Set a gauge to a value.
+
+        Args:
+            name: Metric name
+            value: New value
+            labels: Optional label values
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def observe(self, name: str, value: float, labels: dict[str, Any] | None = None) -> None:
+        """
+        Record one observation of a summary (exported as name_sum and name_count).
+
+        Args:
+            name: Metric name
+            value: Observed value
+            labels: Optional label values
+        """
+        sum_key = self._key(f"{name}_sum", labels)
+        count_key = self._key(f"{name}_count", labels)
+        with self._lock:
+            self._families[sum_key[0]] = name
+            self._families[count_key[0]] = name
+            self._values[sum_key] = self._values.get(sum_key, 0.0) + value
+            self._values[count_key] = self._values.get(count_key, 0.0) + 1
+
+    def get(self, name: str, labels: dict[str, Any] | None = None, default: float = 0.0) -> float:
+        """Get the current value of a metric."""
+        with self._lock:
+            return self._values.get(self._key(name, labels), default)
+
+    def add_collector(self, collector: Callable[['MetricsRegistry'], None]) -> None:
+        """
+        Register a callable that refreshes gauges right before each export.
+
+        Adding the same collector twice has no effect.
+        """
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[['MetricsRegistry'], None]) -> None:
+        """Unregister a collector added with add_collector()."""
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def collect(self) -> list[tuple[str, dict[str, str], float]]:
+        """
+        Run collectors and return a sorted snapshot of all values.
+
+        Returns:
+            List of (name, labels, value) tuples
+        """
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                collector(self)
+            except Exception as e:
+                import sys
+                print(f"WARNING: Metrics collector failed: {e}", file=sys.stderr)
+
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(name, dict(labels), value) for (name, labels), value in items]
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        described = set()
+        for name, labels, value in self.collect():
+            family = self._families.get(name, name)
+            if family not in described:
+                described.add(family)
+                metric_type, help_text = METRIC_DESCRIPTIONS.get(family, ('untyped', ''))
+                if help_text:
+                    lines.append(f"# HELP {family} {help_text}")
+                lines.append(f"# TYPE {family} {metric_type}")
+            if labels:
+                label_text = ','.join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_text}}} {_format_number(value)}")
+            else:
+                lines.append(f"{name} {_format_number(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self) -> str:
+        """Render all metrics as a JSON document."""
+        metrics: dict[str, list[dict[str, Any]]] = {}
+        for name, labels, value in self.collect():
+            metrics.setdefault(name, []).append({'labels': labels, 'value': value})
+        return json.dumps({'timestamp': time.time(), 'metrics': metrics}, indent=2)
+
+    def reset(self) -> None:
+        """Clear all values and collectors (useful for testing)."""
+        with self._lock:
+            self._values.clear()
+            self._families.clear()
+            self._collectors.clear()
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return _registry
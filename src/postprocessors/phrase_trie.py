@@ -0,0 +1,146 @@
+"""Word-level trie for matching many phrases in one pass over a transcript.
+
+Phrases are stored as sequences of normalized words. Finding the longest
+phrase starting at a position walks at most as many trie levels as the
+longest phrase has words, so the cost of a lookup depends on phrase length,
+not on how many phrases are stored.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Generic, Iterator, TypeVar
+
+T = TypeVar('T')
+
+# Punctuation Whisper attaches to words ("Paren.", "case,")
+_STRIP = '.,!?;:"\'()[]{}'
+
+# Hyphen between two word characters, as in "camel-case" (but not "--flag" or "->")
+_WORD_HYPHEN = re.compile(r'(?<=\w)-(?=\w)')
+
+# Key under which a node stores the value of the phrase ending there
+_VALUE = object()
+
+
+def normalize_word(word: str) -> str:
+    """Lowercase a word and strip surrounding punctuation for matching."""
+    return word.strip(_STRIP).lower()
+
+
+def split_words(text: str) -> list[str]:
+    """Split a phrase into normalized words (hyphens separate words, as Whisper writes 'camel-case')."""
+    return [word for word in (normalize_word(w) for w in re.split(r'[\s-]+', text)) if word]
+
+
+@dataclass
+class Token:
+    """One word of a transcript."""
+    raw: str  # As transcribed
+    key: str  # Normalized for matching
+    hyphenated: bool  # Joined to the previous token by a hyphen
+
+
+def tokenize(text: str) -> list[Token]:
+    """Split a transcript into tokens, splitting hyphenated words the way split_words does."""
+    tokens = []
+    for word in text.split():
+        for index, part in enumerate(_WORD_HYPHEN.split(word)):
+            if part:
+                tokens.append(Token(part, normalize_word(part), index > 0))
+    return tokens
+
+
+class PhraseTrie(Generic[T]):
+    """Mapping from word sequences to values with longest-match lookup."""
+
+    def __init__(self) -> None:
+        self._root: dict = {}
+        self._size = 0
+        self.max_words = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, phrase: str, value: T) -> None:
+        """
+        Add or replace a phrase.
+
+        Args:
+            phrase: Words to match, compared after normalization
+            value: Value returned when the phrase matches
+
+        Raises:
+            ValueError: If the phrase has no words
+        """
+        words = split_words(phrase)
+        if not words:
+            raise ValueError(f"Phrase has no words: {phrase!r}")
+        node = self._root
+        for word in words:
+            node = node.setdefault(word, {})
+        if _VALUE not in node:
+            self._size += 1
+        node[_VALUE] = value
+        self.max_words = max(self.max_words, len(words))
+
+    def remove(self, phrase: str) -> bool:
+        """
+        Remove a phrase.
+
+        Args:
+            phrase: Words of the phrase to remove
+
+        Returns:
+            True if the phrase was present
+        """
+        node = self._root
+        for word in split_words(phrase):
+            node = node.get(word)
+            if node is None:
+                return False
+        if _VALUE not in node:
+            return False
+        del node[_VALUE]
+        self._size -= 1
+        return True
+
+    def get(self, phrase: str) -> T | None:
+        """Get the value of an exact phrase, or None."""
+        node = self._root
+        for word in split_words(phrase):
+            node = node.get(word)
+            if node is None:
+                return None
+        return node.get(_VALUE)
+
+    def longest_match(self, words: list[str], start: int) -> tuple[int, T] | None:
+        """
+        Find the longest phrase beginning at words[start].
+
+        Args:
+            words: Normalized words of the transcript
+            start: Index to match from
+
+        Returns:
+            (end index, value) for the longest match, or None
+        """
+        node = self._root
+        match = None
+        for index in range(start, len(words)):
+            node = node.get(words[index])
+            if node is None:
+                break
+            if _VALUE in node:
+                match = (index + 1, node[_VALUE])
+        return match
+
+    def items(self) -> Iterator[tuple[str, T]]:
+        """Iterate over (phrase, value) pairs, phrases as normalized words joined by spaces."""
+        stack = [((), self._root)]
+        while stack:
+            words, node = stack.pop()
+            for key, child in node.items():
+                if key is _VALUE:
+                    yield ' '.join(words), child
+                else:
+                    stack.append((words + (key,), child))
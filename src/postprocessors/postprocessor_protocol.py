@@ -0,0 +1,18 @@
+"""Protocol for transcript post-processors."""
+
+from typing import Protocol
+
+
+class PostprocessorProtocol(Protocol):
+    """Protocol for post-processor implementations."""
+
+    def process(self, text: str) -> str:
+        """Rewrite a transcript before it is delivered.
+
+        Args:
+            text: Transcribed text
+
+        Returns:
+            Rewritten text (empty to drop the transcript)
+        """
+        ...
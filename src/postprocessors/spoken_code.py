@@ -0,0 +1,361 @@
+"""Rewrite spoken programming phrases into code.
+
+Whisper writes what was said, so dictating code produces "open paren",
+"snake case user id" or "number forty two" as words. The grammar turns them
+into "(", "user_id" and "42":
+
+    symbols     phrase -> text, with how it joins its neighbours
+                ("close paren" -> ")" with no space before it)
+    formatters  phrase that formats the words after it, up to the next
+                command or the end of the utterance
+                ("camel case get value" -> "getValue")
+    numbers     "number" followed by number words ("number four oh four" -> "404")
+    end         "end case" stops a formatter early without emitting anything
+
+All phrases are compiled into one PhraseTrie, so a transcript is rewritten
+in a single left-to-right pass whose cost doesn't grow with the number of
+rules. Extra rules are read from a JSON file:
+
+    {
+        "everyday_symbols": true,
+        "symbols": {"walrus": ":=", "spread": {"text": "...", "join": "right"}},
+        "formatters": {"dunder": "snake"},
+        "remove": ["dot"]
+    }
+
+'join' is one of 'none' (spaces on both sides, the default for custom
+symbols), 'left', 'right' or 'both' (no space on that side).
+
+Built-in phrases are ones nobody says in ordinary speech. Symbols named by
+everyday words (comma, dot, colon, equals, plus, hash, arrow, new line, ...)
+would rewrite plain instructions such as "hash the password", so they are
+only added with "everyday_symbols"; others (times, star, pipe, space,
+percent, smash, dotted, lower case, no space) are left for users to add.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from src.postprocessors.phrase_trie import PhraseTrie, tokenize
+
+# Rule kinds
+SYMBOL = 'symbol'
+FORMAT = 'format'
+NUMBER = 'number'
+END = 'end'
+
+# Which sides of a symbol attach to its neighbour without a space
+JOINS = {'none': (False, False), 'left': (True, False), 'right': (False, True), 'both': (True, True)}
+
+FORMATTERS: dict[str, Callable[[list[str]], str]] = {
+    'snake': lambda words: '_'.join(words),
+    'camel': lambda words: words[0] + ''.join(w.capitalize() for w in words[1:]),
+    'pascal': lambda words: ''.join(w.capitalize() for w in words),
+    'kebab': lambda words: '-'.join(words),
+    'constant': lambda words: '_'.join(words).upper(),
+    'upper': lambda words: ' '.join(words).upper(),
+    'lower': lambda words: ' '.join(words),
+    'title': lambda words: ' '.join(w.capitalize() for w in words),
+    'smash': lambda words: ''.join(words),
+    'dotted': lambda words: '.'.join(words),
+}
+
+# Built-in symbols: phrase -> (text, join)
+DEFAULT_SYMBOLS = {
+    'open paren': ('(', 'both'),
+    'open parenthesis': ('(', 'both'),
+    'left paren': ('(', 'both'),
+    'close paren': (')', 'left'),
+    'close parenthesis': (')', 'left'),
+    'right paren': (')', 'left'),
+    'open bracket': ('[', 'both'),
+    'left bracket': ('[', 'both'),
+    'close bracket': (']', 'left'),
+    'right bracket': (']', 'left'),
+    'open brace': ('{', 'right'),
+    'open curly': ('{', 'right'),
+    'close brace': ('}', 'left'),
+    'close curly': ('}', 'left'),
+    'open angle': ('<', 'both'),
+    'close angle': ('>', 'left'),
+    'open quote': ('"', 'right'),
+    'close quote': ('"', 'left'),
+    'triple backtick': ('```', 'none'),
+    'double equals': ('==', 'none'),
+    'triple equals': ('===', 'none'),
+    'not equals': ('!=', 'none'),
+    'plus equals': ('+=', 'none'),
+    'vertical bar': ('|', 'none'),
+    'fat arrow': ('=>', 'none'),
+    'percent sign': ('%', 'none'),
+}
+
+# Symbols named by words that also come up in plain English ("hash the password",
+# "the arrow key"), only added with "everyday_symbols": true in the rules file
+EVERYDAY_SYMBOLS = {
+    'single quote': ("'", 'none'),
+    'backtick': ('`', 'none'),
+    'comma': (',', 'left'),
+    'colon': (':', 'left'),
+    'semicolon': (';', 'left'),
+    'period': ('.', 'left'),
+    'full stop': ('.', 'left'),
+    'dot': ('.', 'both'),
+    'question mark': ('?', 'left'),
+    'exclamation mark': ('!', 'left'),
+    'bang': ('!', 'right'),
+    'equals': ('=', 'none'),
+    'less than': ('<', 'none'),
+    'greater than': ('>', 'none'),
+    'plus': ('+', 'none'),
+    'minus': ('-', 'none'),
+    'asterisk': ('*', 'none'),
+    'slash': ('/', 'both'),
+    'backslash': ('\\', 'both'),
+    'ampersand': ('&', 'none'),
+    'arrow': ('->', 'none'),
+    'underscore': ('_', 'both'),
+    'hyphen': ('-', 'both'),
+    'at sign': ('@', 'right'),
+    'hash': ('#', 'right'),
+    'dollar sign': ('$', 'right'),
+    'caret': ('^', 'none'),
+    'tilde': ('~', 'right'),
+    'new line': ('\n', 'both'),
+    'newline': ('\n', 'both'),
+}
+
+# Built-in formatter phrases -> FORMATTERS name
+DEFAULT_FORMATTERS = {
+    'snake case': 'snake',
+    'camel case': 'camel',
+    'pascal case': 'pascal',
+    'kebab case': 'kebab',
+    'constant case': 'constant',
+    'screaming snake': 'constant',
+    'all caps': 'upper',
+    'upper case': 'upper',
+    'title case': 'title',
+}
+
+DEFAULT_NUMBER_PHRASES = ('number', 'numeral')
+DEFAULT_END_PHRASES = ('end case', 'stop case')
+
+_UNITS = {
+    'zero': 0, 'oh': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9,
+}
+_TEENS = {
+    'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14, 'fifteen': 15,
+    'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19,
+}
+_TENS = {
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
+    'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90,
+}
+_SCALES = {'thousand': 1000, 'million': 1000000}
+
+
+@dataclass(frozen=True)
+class _Rule:
+    kind: str
+    text: str = ''
+    join_left: bool = False
+    join_right: bool = False
+    formatter: Callable[[list[str]], str] | None = None
+
+
+def parse_number(keys: list[str], start: int) -> tuple[int, str] | None:
+    """
+    Read number words from keys[start].
+
+    A run of single digits is read digit by digit ("four oh four" -> "404"),
+    anything else as a spoken number ("two hundred fifty six" -> "256").
+    Words that are already digits are taken as they are.
+
+    Args:
+        keys: Normalized words
+        start: Index of the first number word
+
+    Returns:
+        (end index, digits), or None if keys[start] is not a number word
+    """
+    end = start
+    while end < len(keys) and keys[end] in _UNITS:
+        end += 1
+    if end - start >= 2:
+        return end, ''.join(str(_UNITS[key]) for key in keys[start:end])
+    if start < len(keys) and keys[start].isdigit():
+        return start + 1, keys[start]
+
+    total = current = 0
+    index = start
+    previous = None
+    while index < len(keys):
+        key = keys[index]
+        if key in _UNITS and previous not in ('unit', 'teen'):
+            current += _UNITS[key]
+            previous = 'unit'
+        elif key in _TEENS and previous not in ('unit', 'teen', 'tens'):
+            current += _TEENS[key]
+            previous = 'teen'
+        elif key in _TENS and previous not in ('unit', 'teen', 'tens'):
+            current += _TENS[key]
+            previous = 'tens'
+        elif key == 'hundred' and previous in ('unit', 'teen', 'tens', None):
+            current = (current or 1) * 100
+            previous = 'hundred'
+        elif key in _SCALES and previous is not None:
+            total += (current or 1) * _SCALES[key]
+            current = 0
+            previous = 'scale'
+        elif key == 'and' and previous in ('hundred', 'scale') and index + 1 < len(keys) \
+                and (keys[index + 1] in _UNITS or keys[index + 1] in _TEENS or keys[index + 1] in _TENS):
+            previous = 'and'
+        else:
+            break
+        index += 1
+    if index == start:
+        return None
+    return index, str(total + current)
+
+
+class SpokenCodeGrammar:
+    """Compiled spoken-programming grammar."""
+
+    def __init__(self, rules: dict[str, Any] | None = None) -> None:
+        """
+        Compile the built-in rules plus extra ones.
+
+        Args:
+            rules: Extra rules in the JSON file format (see module docstring)
+
+        Raises:
+            ValueError: If a rule is malformed
+        """
+        self._trie: PhraseTrie[_Rule] = PhraseTrie()
+        for phrase, (text, join) in DEFAULT_SYMBOLS.items():
+            self._add_symbol(phrase, text, join)
+        for phrase, name in DEFAULT_FORMATTERS.items():
+            self._add_formatter(phrase, name)
+        for phrase in DEFAULT_NUMBER_PHRASES:
+            self._trie.add(phrase, _Rule(NUMBER))
+        for phrase in DEFAULT_END_PHRASES:
+            self._trie.add(phrase, _Rule(END))
+        if rules:
+            self._add_rules(rules)
+
+    @classmethod
+    def from_file(cls, path: Path | str) -> 'SpokenCodeGrammar':
+        """
+        Compile the built-in rules plus those in a JSON file.
+
+        Args:
+            path: Rules file; a missing file means built-in rules only
+
+        Returns:
+            Compiled grammar
+
+        Raises:
+            ValueError: If the file is not valid JSON or a rule is malformed
+            OSError: If the file exists but can't be read
+        """
+        path = Path(path).expanduser()
+        if not path.exists():
+            return cls()
+        try:
+            rules = json.loads(path.read_text(encoding='utf-8'))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path} is not valid JSON: {e}") from e
+        return cls(rules)
+
+    def __len__(self) -> int:
+        return len(self._trie)
+
+    def process(self, text: str) -> str:
+        """
+        Rewrite spoken programming phrases in a transcript.
+
+        Args:
+            text: Transcribed text
+
+        Returns:
+            Text with phrases replaced; unchanged words keep their original spelling
+        """
+        tokens = tokenize(text)
+        keys = [token.key for token in tokens]
+        out: list[str] = []
+        glue = True  # Nothing before the first piece needs a space
+        i = 0
+        while i < len(tokens):
+            match = self._trie.longest_match(keys, i)
+            if match is None:
+                token = tokens[i]
+                piece, join_left = (f"-{token.raw}", True) if token.hyphenated and out else (token.raw, False)
+                glue = self._emit(out, piece, join_left, False, glue)
+                i += 1
+                continue
+
+            end, rule = match
+            if rule.kind == SYMBOL:
+                glue = self._emit(out, rule.text, rule.join_left, rule.join_right, glue)
+            elif rule.kind == NUMBER:
+                number = parse_number(keys, end)
+                if number is None:
+                    # "number" not followed by a number: keep the word
+                    glue = self._emit(out, ' '.join(t.raw for t in tokens[i:end]), False, False, glue)
+                else:
+                    end, digits = number
+                    glue = self._emit(out, digits, False, False, glue)
+            elif rule.kind == FORMAT:
+                words_end = end
+                while words_end < len(tokens) and self._trie.longest_match(keys, words_end) is None:
+                    words_end += 1
+                words = [key for key in keys[end:words_end] if key]
+                if words:
+                    glue = self._emit(out, rule.formatter(words), False, False, glue)
+                end = words_end
+            i = end
+        return ''.join(out)
+
+    @staticmethod
+    def _emit(out: list[str], piece: str, join_left: bool, join_right: bool, glue: bool) -> bool:
+        """Append a piece, with a space unless either side joins. Returns whether the next piece joins."""
+        if not piece:
+            return glue
+        if out and not glue and not join_left:
+            out.append(' ')
+        out.append(piece)
+        return join_right
+
+    def _add_rules(self, rules: dict[str, Any]) -> None:
+        if not isinstance(rules, dict):
+            raise ValueError("Spoken code rules must be a JSON object")
+        if rules.get('everyday_symbols', False):
+            for phrase, (text, join) in EVERYDAY_SYMBOLS.items():
+                self._add_symbol(phrase, text, join)
+        for phrase in rules.get('remove', []):
+            self._trie.remove(phrase)
+        for phrase, spec in rules.get('symbols', {}).items():
+            if isinstance(spec, str):
+                self._add_symbol(phrase, spec, 'none')
+            elif isinstance(spec, dict) and isinstance(spec.get('text'), str):
+                self._add_symbol(phrase, spec['text'], spec.get('join', 'none'))
+            else:
+                raise ValueError(f"Symbol '{phrase}' must be a string or {{\"text\": ..., \"join\": ...}}")
+        for phrase, name in rules.get('formatters', {}).items():
+            self._add_formatter(phrase, name)
+
+    def _add_symbol(self, phrase: str, text: str, join: str) -> None:
+        if join not in JOINS:
+            raise ValueError(f"Symbol '{phrase}' has unknown join '{join}' (expected one of {', '.join(JOINS)})")
+        join_left, join_right = JOINS[join]
+        self._trie.add(phrase, _Rule(SYMBOL, text, join_left, join_right))
+
+    def _add_formatter(self, phrase: str, name: str) -> None:
+        if name not in FORMATTERS:
+            raise ValueError(f"Formatter '{phrase}' uses unknown style '{name}' (expected one of {', '.join(FORMATTERS)})")
+        self._trie.add(phrase, _Rule(FORMAT, formatter=FORMATTERS[name]))
+
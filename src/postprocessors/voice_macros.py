@@ -0,0 +1,164 @@
+"""Expand spoken trigger phrases into canned text.
+
+Macros are read from a JSON file mapping trigger phrases to their expansion,
+a string or a list of lines:
+
+    {
+        "review mode": "Review the last commit for bugs and missing tests.",
+        "ship it": ["Run the full test suite.", "If it passes, commit and push."]
+    }
+
+Trigger phrases are compiled into a PhraseTrie, so a transcript is expanded
+in one pass whose cost doesn't grow with the number of macros. The file is
+checked for changes at most once a second and reloaded while the app runs;
+a file that can't be loaded is logged and the previous macros are kept.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from src.logging.logger_protocol import LoggerProtocol
+from src.metrics.metrics_registry import MetricsRegistry, get_metrics
+from src.postprocessors.phrase_trie import PhraseTrie, tokenize
+
+# Seconds between checks of the macro file for changes
+DEFAULT_CHECK_INTERVAL = 1.0
+
+
+def load_macros(path: Path) -> PhraseTrie[str]:
+    """
+    Compile the macros in a JSON file.
+
+    Args:
+        path: Macro file
+
+    Returns:
+        Trigger phrases mapped to their expansion (lines joined with newlines)
+
+    Raises:
+        OSError: If the file can't be read
+        ValueError: If the file is not valid JSON or a macro is malformed
+    """
+    try:
+        macros = json.loads(path.read_text(encoding='utf-8'))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{path} is not valid JSON: {e}") from e
+    if not isinstance(macros, dict):
+        raise ValueError(f"{path} must hold a JSON object of phrase: expansion")
+
+    trie: PhraseTrie[str] = PhraseTrie()
+    for phrase, expansion in macros.items():
+        if isinstance(expansion, list) and all(isinstance(line, str) for line in expansion):
+            expansion = '\n'.join(expansion)
+        if not isinstance(expansion, str):
+            raise ValueError(f"Macro '{phrase}' must expand to a string or a list of strings")
+        trie.add(phrase, expansion)
+    return trie
+
+
+class VoiceMacros:
+    """Post-processor replacing trigger phrases with their expansion, reloaded when the file changes."""
+
+    def __init__(
+        self,
+        path: Path | str,
+        logger: LoggerProtocol,
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """
+        Initialize voice macros and load the macro file.
+
+        Args:
+            path: Macro file; a missing file means no macros until it is created
+            logger: Logger instance for logging
+            check_interval: Seconds between checks of the file for changes
+            metrics: Registry to record expansions in (defaults to the process-wide registry)
+        """
+        self.path = Path(path).expanduser()
+        self.logger = logger
+        self.check_interval = check_interval
+        self.metrics = metrics or get_metrics()
+
+        self._macros: PhraseTrie[str] = PhraseTrie()
+        self._signature: tuple[int, int] | None = None
+        self._checked_at = time.monotonic()
+        self.reload()
+
+    def __len__(self) -> int:
+        return len(self._macros)
+
+    def process(self, text: str) -> str:
+        """
+        Replace trigger phrases in a transcript with their expansion.
+
+        Args:
+            text: Transcribed text
+
+        Returns:
+            Text with macros expanded; text without triggers is returned unchanged
+        """
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.reload()
+        macros = self._macros  # Reloads swap in a new trie, so keep using this one
+        if not macros:
+            return text
+
+        tokens = tokenize(text)
+        keys = [token.key for token in tokens]
+        pieces: list[str] = []
+        expanded = 0
+        i = 0
+        while i < len(tokens):
+            match = macros.longest_match(keys, i)
+            if match is None:
+                token = tokens[i]
+                if token.hyphenated and pieces:
+                    pieces[-1] += f"-{token.raw}"
+                else:
+                    pieces.append(token.raw)
+                i += 1
+                continue
+            i, expansion = match
+            pieces.append(expansion)
+            expanded += 1
+        if not expanded:
+            return text
+        self.metrics.inc('voice_to_code_macro_expansions_total', expanded)
+        return ' '.join(pieces)
+
+    def reload(self) -> bool:
+        """
+        Load the macro file again if it changed since it was last loaded.
+
+        Returns:
+            True if the macros were replaced
+        """
+        self._checked_at = time.monotonic()
+        try:
+            stat = os.stat(self.path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = None
+        except OSError as e:
+            self.logger.warning(f"Cannot check voice macros in {self.path}: {e}")
+            return False
+        if signature == self._signature:
+            return False
+        self._signature = signature
+
+        if signature is None:
+            macros: PhraseTrie[str] = PhraseTrie()
+        else:
+            try:
+                macros = load_macros(self.path)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Keeping previous voice macros, {self.path} could not be loaded: {e}")
+                return False
+        self._macros = macros
+        self.metrics.set('voice_to_code_macros', len(macros))
+        if signature is not None:
+            self.logger.info(f"Loaded {len(macros)} voice macro(s) from {self.path}")
+        return True
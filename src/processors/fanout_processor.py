@@ -0,0 +1,195 @@
+"""Deliver one transcript to several targets at once.
+
+The session dropdown may hold several comma-separated targets, e.g.
+"coding, review" to drive two agent sessions with the same instruction.
+Each target gets its own processor, created on first use, and a transcript
+is handed to all of them concurrently, so a slow target adds its own
+latency instead of delaying the others. accept() returns once every target
+has finished, which keeps transcripts in order per target.
+
+A target is a tmux session or pane, 'socket:<path>' for a Unix socket or
+FIFO, or an http:// or https:// URL for a webhook.
+
+Duck-typed interface:
+    Implements accept(text: str, event), toggle_vocalization(is_on: bool), resend(item) and close(timeout)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from src.logging.logger_protocol import LoggerProtocol
+from src.metrics.metrics_registry import MetricsRegistry, get_metrics
+from src.processors.processor_protocol import ProcessorProtocol
+from src.transcribers.transcription_events import TranscriptionEvent
+from src.utils.outbox import OutboxItem
+
+# Prefix for socket targets in the session dropdown
+SOCKET_PREFIX = 'socket:'
+
+# URL schemes for webhook targets in the session dropdown
+WEBHOOK_PREFIXES = ('http://', 'https://')
+
+# Targets delivered to at the same time at most
+DEFAULT_MAX_WORKERS = 4
+
+
+def parse_targets(value: str) -> list[str]:
+    """
+    Split a dropdown value into targets.
+
+    Args:
+        value: One target, or several separated by commas
+
+    Returns:
+        Targets in order, without blanks and duplicates
+    """
+    targets = []
+    for target in (value or '').split(','):
+        target = target.strip()
+        if target and target not in targets:
+            targets.append(target)
+    return targets
+
+
+def is_tmux_target(target: str) -> bool:
+    """Check whether a target names a tmux session or pane rather than a socket or URL."""
+    return not target.startswith((SOCKET_PREFIX, *WEBHOOK_PREFIXES))
+
+
+class FanoutProcessor:
+    """Processor that delivers to every selected target concurrently."""
+
+    def __init__(
+        self,
+        get_targets: Callable[[], list[str]],
+        create_target: Callable[[str], ProcessorProtocol],
+        logger: LoggerProtocol,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """
+        Initialize fan-out processor.
+
+        Args:
+            get_targets: Callable returning the currently selected targets
+            create_target: Creates the processor for a target, called once per target
+            logger: Logger instance for logging
+            max_workers: Targets delivered to at the same time at most
+            metrics: Registry to record per-target metrics in (defaults to the process-wide registry)
+        """
+        self.get_targets = get_targets
+        self.create_target = create_target
+        self.logger = logger
+        self.max_workers = max_workers
+        self.metrics = metrics or get_metrics()
+        self._lock = threading.Lock()
+        self._processors: dict[str, ProcessorProtocol] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    def accept(self, text: str, event: TranscriptionEvent | None = None) -> bool:
+        """
+        Deliver transcribed text to every selected target.
+
+        Args:
+            text: Transcribed text to send
+            event: Event the text came from, passed on to each target
+
+        Returns:
+            True if every target took the text
+        """
+        if not text:
+            return False
+        results = self._each(lambda processor: processor.accept(text, event), measure=True)
+        failed = [target for target, ok in results.items() if not ok]
+        if failed and len(results) > 1:
+            self.logger.warning(f"Delivered to {len(results) - len(failed)} of {len(results)} targets, failed: {', '.join(failed)}")
+        return bool(results) and not failed
+
+    def toggle_vocalization(self, is_on: bool) -> None:
+        """
+        Toggle response vocalization on every selected target.
+
+        Args:
+           is_on: Flag to indicate whether response vocalization should be turn on or not
+        """
+        self._each(lambda processor: processor.toggle_vocalization(is_on))
+
+    def resend(self, item: OutboxItem) -> bool:
+        """
+        Retry a transcript from the outbox through the processor for the target it was recorded for.
+
+        Args:
+            item: Pending outbox item
+
+        Returns:
+            What that target's resend() returned
+        """
+        return self._get_processor(item.target).resend(item)
+
+    def close(self, timeout: float | None = None) -> bool:
+        """
+        Close every target used so far.
+
+        Args:
+            timeout: Passed on to each target's close()
+
+        Returns:
+            True if every target delivered everything it had pending
+        """
+        with self._lock:
+            processors, self._processors = self._processors, {}
+            executor, self._executor = self._executor, None
+        delivered = True
+        for target, processor in processors.items():
+            try:
+                delivered = processor.close(timeout) and delivered
+            except Exception as e:
+                self.logger.error(f"Failed to close target '{target}': {e}")
+                delivered = False
+        if executor:
+            executor.shutdown(wait=False)
+        return delivered
+
+    def _each(self, action: Callable[[ProcessorProtocol], Any], measure: bool = False) -> dict[str, bool]:
+        """
+        Run action against each selected target, concurrently when there are several.
+
+        Returns:
+            Target -> whether the action succeeded (raised no exception and didn't return False)
+        """
+        targets = self.get_targets()
+        if len(targets) == 1:
+            # Nothing to overlap with: skip the hand-off to a worker thread
+            return {targets[0]: self._run(targets[0], action, measure)}
+        executor = self._get_executor()
+        futures = {target: executor.submit(self._run, target, action, measure) for target in targets}
+        return {target: future.result() for target, future in futures.items()}
+
+    def _run(self, target: str, action: Callable[[ProcessorProtocol], Any], measure: bool) -> bool:
+        start = time.perf_counter()
+        try:
+            ok = action(self._get_processor(target)) is not False
+        except Exception as e:
+            self.logger.error(f"Delivery to '{target}' failed: {e}")
+            ok = False
+        if measure:
+            elapsed = time.perf_counter() - start
+            self.metrics.observe('voice_to_code_fanout_delivery_seconds', elapsed, labels={'target': target})
+            if not ok:
+                self.metrics.inc('voice_to_code_fanout_failures_total', labels={'target': target})
+        return ok
+
+    def _get_processor(self, target: str) -> ProcessorProtocol:
+        with self._lock:
+            processor = self._processors.get(target)
+            if processor is None:
+                processor = self._processors[target] = self.create_target(target)
+            return processor
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fanout')
+            return self._executor
@@ -0,0 +1,270 @@
+"""Record transcripts in the outbox before delivery and retry those that failed.
+
+Wraps the processor for one target. Each transcript is written to the
+outbox first, then delivered together with anything still pending for the
+same target, oldest first, so a transcript never overtakes one that failed
+before it. Pending transcripts are retried in the background, with growing
+intervals while delivery keeps failing, for up to ten minutes after they
+were dictated: text typed into an agent long after it was said would be
+out of context, so older transcripts are left for the user to re-send or
+discard from the outbox window, where resend() retries them on request
+(through the same row, so it is marked delivered only once the target has
+it). While the target is known to be missing
+(a tmux session that isn't running), retries wait quietly and go out
+within one interval of it coming back.
+
+A transcript is only marked delivered once the target has it. Processors
+that buffer or batch records (socket, webhook) set confirms_delivery and
+report through accept()'s on_done callback when a record was really
+written or posted; until then it stays pending but is not sent again.
+
+Duck-typed interface:
+    Implements accept(text: str, event), toggle_vocalization(is_on: bool), resend(item) and close(timeout)
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+from src.logging.logger_protocol import LoggerProtocol
+from src.metrics.metrics_registry import MetricsRegistry, get_metrics
+from src.processors.processor_protocol import ProcessorProtocol
+from src.processors.transcript_records import transcript_record
+from src.transcribers.transcription_events import EventType, TranscriptionEvent
+from src.utils.outbox import Outbox, OutboxItem
+
+# Seconds before the first retry of a failed transcript
+DEFAULT_RETRY_INTERVAL = 5.0
+
+# Retry interval doubles after each failed retry, up to this many seconds
+MAX_RETRY_INTERVAL = 300.0
+
+# Transcripts older than this many seconds are no longer delivered automatically
+DEFAULT_MAX_RETRY_AGE = 600.0
+
+
+class OutboxProcessor:
+    """Processor that makes delivery to one target durable."""
+
+    def __init__(
+        self,
+        processor: ProcessorProtocol,
+        target: str,
+        outbox: Outbox,
+        logger: LoggerProtocol,
+        is_available: Callable[[], bool | None] | None = None,
+        retry_interval: float = DEFAULT_RETRY_INTERVAL,
+        max_retry_age: float = DEFAULT_MAX_RETRY_AGE,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """
+        Initialize outbox processor and start retrying recent transcripts left pending.
+
+        Args:
+            processor: Processor that delivers to target
+            target: Target name transcripts are recorded under
+            outbox: Shared outbox
+            logger: Logger instance for logging
+            is_available: Returns False while the target is known to be missing, so
+                retries wait quietly instead of failing (None if that can't be told)
+            retry_interval: Seconds before the first retry of a failed transcript
+            max_retry_age: Seconds after being recorded that a transcript is still
+                delivered automatically; older ones wait in the outbox for the user
+            metrics: Registry to record outbox metrics in (defaults to the process-wide registry)
+        """
+        self.processor = processor
+        self.target = target
+        self.outbox = outbox
+        self.logger = logger
+        self.is_available = is_available
+        self.retry_interval = retry_interval
+        self.max_retry_age = max_retry_age
+        self.metrics = metrics or get_metrics()
+
+        self._lock = threading.Lock()
+        self._confirms_delivery = getattr(processor, 'confirms_delivery', False) is True
+        self._in_flight: set[int] = set()  # Items handed over, waiting for on_done
+        self._in_flight_lock = threading.Lock()
+        self._requested: set[int] = set()  # Items the user asked to re-send, retried whatever their age
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='outbox-retry', daemon=True)
+        self._thread.start()
+
+    def accept(self, text: str, event: TranscriptionEvent | None = None) -> bool | None:
+        """
+        Record transcribed text, then deliver it after anything pending for the target.
+
+        Args:
+            text: Transcribed text to send
+            event: Event the text came from, passed on to the wrapped processor
+
+        Returns:
+            True if the text was delivered, False if it stays in the outbox, None for empty text
+        """
+        if not text:
+            return None
+        try:
+            self.outbox.add(self.target, text, transcript_record(text, event))
+        except sqlite3.Error as e:
+            # Better to deliver without a record than not at all
+            self.logger.error(f"Failed to record transcript in the outbox: {e}")
+            return self.processor.accept(text, event)
+        if self.is_available and self.is_available() is False:
+            pending = len(self._retryable())
+            self.metrics.set('voice_to_code_outbox_pending', self.outbox.pending_count())
+            self.logger.warning(f"'{self.target}' is not available, transcript kept in the outbox ({pending} pending): {text}")
+            return False
+        with self._lock:
+            return self._deliver_pending()
+
+    def toggle_vocalization(self, is_on: bool) -> None:
+        """
+        Toggle response vocalization on the target (not recorded).
+
+        Args:
+           is_on: Flag to indicate whether response vocalization should be turn on or not
+        """
+        self.processor.toggle_vocalization(is_on)
+
+    def resend(self, item: OutboxItem) -> bool:
+        """
+        Retry a pending transcript now, however old, after anything older still pending for the target.
+
+        Until it is delivered it is retried in the background like a recent transcript.
+
+        Args:
+            item: Pending outbox item recorded for this target
+
+        Returns:
+            True if it was delivered or handed over, False if it stays in the outbox
+        """
+        if item.target != self.target:
+            self.logger.warning(f"Transcript was recorded for '{item.target}', not '{self.target}': {item.text}")
+            return False
+        self._requested.add(item.id)
+        if self.is_available and self.is_available() is False:
+            self.logger.warning(f"'{self.target}' is not available, transcript will be re-sent when it is: {item.text}")
+            return False
+        with self._lock:
+            self._deliver_pending()
+        return item.id not in self._requested or item.id in self._in_flight
+
+    def retry(self) -> bool:
+        """
+        Deliver what is pending for the target now (transcripts within max_retry_age).
+
+        Returns:
+            True if nothing of that is left pending
+        """
+        with self._lock:
+            return self._deliver_pending()
+
+    def close(self, timeout: float | None = None) -> bool:
+        """
+        Stop retrying and close the wrapped processor. Pending transcripts stay in the outbox.
+
+        Args:
+            timeout: Passed on to the wrapped processor's close()
+
+        Returns:
+            True if nothing was left undelivered
+        """
+        self._stopped.set()
+        self._thread.join(timeout=2.0)
+        delivered = self.processor.close(timeout)
+        left = len(self.outbox.pending(self.target))
+        if left:
+            self.logger.warning(f"{left} transcript(s) for '{self.target}' kept in the outbox, see Settings → Undelivered Transcripts")
+        return delivered and not left
+
+    def _deliver_pending(self) -> bool:
+        """Deliver pending items oldest first, stopping at the first failure (caller holds the lock)."""
+        delivered = True
+        for item in self._retryable():
+            with self._in_flight_lock:
+                if item.id in self._in_flight:
+                    continue  # Already with the processor, waiting for it to confirm
+            if not self._hand_over(item):
+                delivered = False
+                break
+        self.metrics.set('voice_to_code_outbox_pending', self.outbox.pending_count())
+        return delivered
+
+    def _retryable(self) -> list[OutboxItem]:
+        """Pending items for the target that are recent enough to deliver automatically, or were asked for."""
+        since = time.time() - self.max_retry_age
+        if not self._requested:
+            return self.outbox.pending(self.target, since=since)
+        return [item for item in self.outbox.pending(self.target) if item.created_at >= since or item.id in self._requested]
+
+    def _hand_over(self, item: OutboxItem) -> bool:
+        """
+        Pass an item to the processor.
+
+        Returns:
+            False if delivery failed, True if it succeeded or is still under way
+        """
+        outcome: list[bool] = []
+
+        def on_done(ok: bool) -> None:
+            outcome.append(ok)
+            self._finish(item, ok)
+
+        if self._confirms_delivery:
+            with self._in_flight_lock:
+                self._in_flight.add(item.id)
+        try:
+            if self._confirms_delivery:
+                self.processor.accept(item.text, _event_from(item), on_done=on_done)
+            else:
+                on_done(self.processor.accept(item.text, _event_from(item)) is not False)
+        except Exception as e:
+            self.logger.error(f"Delivery to '{self.target}' failed: {e}")
+            if not outcome:
+                on_done(False)
+        return outcome != [False]
+
+    def _finish(self, item: OutboxItem, ok: bool) -> None:
+        """Record how delivery of an item ended (on the processor's thread for confirmed deliveries)."""
+        with self._in_flight_lock:
+            self._in_flight.discard(item.id)
+        if not ok:
+            self.outbox.record_attempt(item.id)
+            return
+        self.outbox.mark_delivered(item.id)
+        self._requested.discard(item.id)
+        if item.attempts:
+            self.metrics.inc('voice_to_code_outbox_redelivered_total')
+            self.logger.info(f"Delivered transcript from the outbox to '{self.target}': {item.text}")
+        self.metrics.set('voice_to_code_outbox_pending', self.outbox.pending_count())
+
+    def _run(self) -> None:
+        interval = self.retry_interval
+        while not self._stopped.wait(interval):
+            if not self._retryable():
+                interval = self.retry_interval
+                continue
+            if self.is_available and self.is_available() is False:
+                # Known to be missing: check again soon, without logging a failure
+                interval = self.retry_interval
+                continue
+            if self.retry():
+                interval = self.retry_interval
+            else:
+                interval = min(interval * 2, MAX_RETRY_INTERVAL)
+
+
+def _event_from(item: OutboxItem) -> TranscriptionEvent:
+    """Rebuild the FINAL event of a recorded transcript."""
+    record = item.record
+    return TranscriptionEvent(
+        EventType.FINAL,
+        record.get('utterance_id') or 0,
+        item.text,
+        timestamp=record.get('timestamp') or item.created_at,
+        speech_started_at=record.get('speech_started_at'),
+        audio_seconds=record.get('audio_seconds'),
+        decode_seconds=record.get('decode_seconds'),
+        confidence=record.get('confidence'),
+    )
@@ -0,0 +1,100 @@
+"""Rewrite transcripts with post-processors before they are delivered.
+
+Wraps another processor: each transcript runs through the post-processors
+in order (e.g. the spoken-code grammar) and the result is handed on. A
+transcript rewritten to nothing is not delivered.
+
+Duck-typed interface:
+    Implements accept(text: str, event), toggle_vocalization(is_on: bool) and close(timeout)
+"""
+
+import time
+
+from src.logging.logger_protocol import LoggerProtocol
+from src.metrics.metrics_registry import MetricsRegistry, get_metrics
+from src.postprocessors.postprocessor_protocol import PostprocessorProtocol
+from src.processors.processor_protocol import ProcessorProtocol
+from src.transcribers.transcription_events import TranscriptionEvent
+from src.utils.outbox import OutboxItem
+
+
+class PostprocessingProcessor:
+    """Processor that rewrites text before passing it to another processor."""
+
+    def __init__(
+        self,
+        processor: ProcessorProtocol,
+        postprocessors: list[PostprocessorProtocol],
+        logger: LoggerProtocol,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """
+        Initialize post-processing processor.
+
+        Args:
+            processor: Processor that receives the rewritten text
+            postprocessors: Applied in order to each transcript
+            logger: Logger instance for logging
+            metrics: Registry to record rewrite time in (defaults to the process-wide registry)
+        """
+        self.processor = processor
+        self.postprocessors = postprocessors
+        self.logger = logger
+        self.metrics = metrics or get_metrics()
+
+    def accept(self, text: str, event: TranscriptionEvent | None = None) -> bool | None:
+        """
+        Rewrite transcribed text and pass it on.
+
+        Args:
+            text: Transcribed text
+            event: Event the text came from, passed on unchanged
+
+        Returns:
+            What the wrapped processor returned, None if nothing was left to deliver
+        """
+        if not text:
+            return None
+        start = time.perf_counter()
+        rewritten = text
+        for postprocessor in self.postprocessors:
+            rewritten = postprocessor.process(rewritten)
+        self.metrics.observe('voice_to_code_postprocess_seconds', time.perf_counter() - start)
+        if rewritten != text:
+            self.logger.debug(f"Rewrote '{text}' as '{rewritten}'")
+        if not rewritten.strip():
+            return None
+        return self.processor.accept(rewritten, event)
+
+    def toggle_vocalization(self, is_on: bool) -> None:
+        """
+        Pass a vocalization change on.
+
+        Args:
+           is_on: Flag to indicate whether response vocalization should be turn on or not
+        """
+        self.processor.toggle_vocalization(is_on)
+
+    def resend(self, item: OutboxItem) -> bool:
+        """
+        Retry a transcript from the outbox, bypassing the postprocessors: recorded text was already rewritten.
+
+        Args:
+            item: Pending outbox item, retried by the wrapped OutboxProcessor
+
+        Returns:
+            What the wrapped processor's resend() returned
+        """
+        return self.processor.resend(item)
+
+    def close(self, timeout: float | None = None) -> bool:
+        """
+        Close the wrapped processor.
+
+        Args:
+            timeout: Passed on to the wrapped processor
+
+        Returns:
+            What the wrapped processor's close() returned
+        """
+        return self.processor.close(timeout)
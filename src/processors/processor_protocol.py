@@ -1,16 +1,36 @@
 """Protocol for processor implementations."""
 
-from typing import Protocol
+from typing import Callable, Protocol
+
+from src.transcribers.transcription_events import TranscriptionEvent
+
+# Called with True once a record handed over for later sending was delivered, False if it was dropped
+DeliveryCallback = Callable[[bool], None]
+
+
+def report_delivery(on_done: DeliveryCallback | None, delivered: bool) -> None:
+    """Tell a record's sender how delivery ended; a faulty callback must not break the processor."""
+    if on_done is None:
+        return
+    try:
+        on_done(delivered)
+    except Exception as e:
+        import sys
+        print(f"WARNING: delivery callback failed: {e}", file=sys.stderr)
 
 
 class ProcessorProtocol(Protocol):
     """Protocol for processor implementations."""
     
-    def accept(self, text: str) -> None:
+    def accept(self, text: str, event: TranscriptionEvent | None = None) -> bool | None:
         """Process transcribed text.
         
         Args:
             text: Transcribed text to process
+            event: FINAL event the text came from, with timing and confidence (when available)
+        
+        Returns:
+            False if the text could not be delivered; True or None otherwise
             
         Raises:
             Exception if processing fails (e.g., session not found)
@@ -25,3 +45,14 @@ class ProcessorProtocol(Protocol):
            is_on: Flag to indicate whether response vocalization should be turn on or not.
         """
         ...
+
+    def close(self, timeout: float | None = None) -> bool:
+        """Deliver anything still pending and release resources (called on Stop).
+
+        Args:
+            timeout: Maximum seconds to wait for pending text (None for the processor's default)
+
+        Returns:
+            True if all pending text was delivered
+        """
+        ...
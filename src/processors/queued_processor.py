@@ -0,0 +1,244 @@
+"""Background delivery of transcripts so a slow target never stalls listening.
+
+Wraps another processor: accept() only queues the text and returns, and a
+worker thread hands queued items to the wrapped processor one at a time, in
+order. The queue is bounded; when it is full the overflow policy decides
+what happens:
+
+    block        accept() waits for room (backpressure on the transcriber)
+    drop_oldest  the oldest queued item is discarded
+    merge        the text is appended to the newest queued transcript
+
+Duck-typed interface:
+    Implements accept(text: str), toggle_vocalization(is_on: bool) and close(timeout)
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from src.logging.logger_protocol import LoggerProtocol
+from src.metrics.metrics_registry import MetricsRegistry, get_metrics
+from src.processors.processor_protocol import ProcessorProtocol
+from src.transcribers.transcription_events import TranscriptionEvent
+from src.utils.outbox import OutboxItem
+
+# Overflow policies
+OVERFLOW_BLOCK = 'block'
+OVERFLOW_DROP_OLDEST = 'drop_oldest'
+OVERFLOW_MERGE = 'merge'
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_MERGE)
+
+# Transcripts that may wait for delivery before the overflow policy applies
+DEFAULT_QUEUE_SIZE = 32
+
+# Seconds close() waits for queued items to be delivered
+DEFAULT_FLUSH_TIMEOUT = 5.0
+
+# Queued item kinds
+_TEXT = 'text'
+_VOCALIZATION = 'vocalization'
+
+
+@dataclass
+class _Item:
+    kind: str
+    payload: Any
+    submitted_at: float
+    event: TranscriptionEvent | None = None
+
+
+class QueuedProcessor:
+    """Processor that delivers to another processor from a background thread."""
+
+    def __init__(
+        self,
+        processor: ProcessorProtocol,
+        logger: LoggerProtocol,
+        max_queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow: str = OVERFLOW_BLOCK,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """
+        Initialize queued processor and start its delivery thread.
+
+        Args:
+            processor: Processor that performs the actual delivery
+            logger: Logger instance for logging
+            max_queue_size: Items that may be queued before the overflow policy applies
+            overflow: One of OVERFLOW_POLICIES
+            metrics: Registry to record queue metrics in (defaults to the process-wide registry)
+
+        Raises:
+            ValueError: If max_queue_size is below 1 or overflow is unknown
+        """
+        if max_queue_size < 1:
+            raise ValueError(f"max_queue_size must be at least 1, got {max_queue_size}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow} (expected one of {', '.join(OVERFLOW_POLICIES)})")
+        self.processor = processor
+        self.logger = logger
+        self.max_queue_size = max_queue_size
+        self.overflow = overflow
+        self.metrics = metrics or get_metrics()
+
+        self._queue: deque[_Item] = deque()
+        self._condition = threading.Condition()
+        self._delivering = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='delivery', daemon=True)
+        self._thread.start()
+
+    def accept(self, text: str, event: TranscriptionEvent | None = None) -> bool:
+        """
+        Queue transcribed text for delivery.
+
+        Args:
+            text: Transcribed text to send
+            event: Event the text came from, passed on to the wrapped processor
+
+        Returns:
+            True if the text was queued or merged, False if it was rejected
+        """
+        return self.submit(text, event)
+
+    def submit(self, text: str, event: TranscriptionEvent | None = None) -> bool:
+        """
+        Queue transcribed text for delivery without waiting for it to be sent.
+
+        Only blocks when the queue is full and the overflow policy is 'block'.
+        Merged transcripts keep the event of the first one.
+
+        Args:
+            text: Transcribed text to send
+            event: Event the text came from, passed on to the wrapped processor
+
+        Returns:
+            True if the text was queued or merged, False if it was rejected
+        """
+        if not text:
+            return False
+        return self._put(_Item(_TEXT, text, time.perf_counter(), event))
+
+    def toggle_vocalization(self, is_on: bool) -> None:
+        """
+        Queue a vocalization change, keeping its order relative to transcripts.
+
+        Args:
+           is_on: Flag to indicate whether response vocalization should be turn on or not
+        """
+        self._put(_Item(_VOCALIZATION, is_on, time.perf_counter()))
+
+    def resend(self, item: OutboxItem) -> bool:
+        """
+        Retry a transcript from the outbox, bypassing the queue: the outbox keeps transcripts in order.
+
+        Args:
+            item: Pending outbox item, retried by the wrapped OutboxProcessor
+
+        Returns:
+            What the wrapped processor's resend() returned
+        """
+        return self.processor.resend(item)
+
+    def pending(self) -> int:
+        """Get the number of items not yet delivered, including one in progress."""
+        with self._condition:
+            return len(self._queue) + self._delivering
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait until everything queued so far has been delivered.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the queue drained within the timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._queue and not self._delivering, timeout)
+
+    def close(self, timeout: float | None = None) -> bool:
+        """
+        Deliver what is still queued, stop the delivery thread and close the wrapped processor.
+
+        Args:
+            timeout: Maximum seconds to wait for queued items (None for DEFAULT_FLUSH_TIMEOUT);
+                what is left of it is passed on to the wrapped processor's close()
+
+        Returns:
+            True if everything was delivered, False if items had to be discarded
+            or the wrapped processor had text left
+        """
+        timeout = DEFAULT_FLUSH_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            discarded = len(self._queue)
+            self._queue.clear()
+            self._condition.notify_all()
+        self.metrics.set('voice_to_code_delivery_queue_depth', 0)
+        if discarded:
+            self.logger.warning(f"Discarded {discarded} undelivered item(s) after waiting {timeout}s on Stop")
+        try:
+            delivered = self.processor.close(max(0.0, deadline - time.monotonic()))
+        except Exception as e:
+            self.logger.error(f"Failed to close the delivery target: {e}")
+            delivered = False
+        return flushed and delivered is not False
+
+    def _put(self, item: _Item) -> bool:
+        with self._condition:
+            if self._closed:
+                self.logger.warning("Delivery queue is closed, dropping item")
+                return False
+
+            if len(self._queue) >= self.max_queue_size:
+                self.metrics.inc('voice_to_code_delivery_overflow_total', labels={'policy': self.overflow})
+                if self.overflow == OVERFLOW_BLOCK:
+                    self.logger.warning("Delivery queue full, waiting for the target to catch up")
+                    self._condition.wait_for(lambda: len(self._queue) < self.max_queue_size or self._closed)
+                    if self._closed:
+                        return False
+                elif self.overflow == OVERFLOW_MERGE and item.kind == _TEXT and self._queue[-1].kind == _TEXT:
+                    newest = self._queue[-1]
+                    newest.payload = f"{newest.payload} {item.payload}"
+                    self.logger.debug("Delivery queue full, merged transcript into the newest queued one")
+                    return True
+                else:
+                    dropped = self._queue.popleft()
+                    self.logger.warning(f"Delivery queue full, dropped oldest {dropped.kind}")
+
+            self._queue.append(item)
+            self.metrics.set('voice_to_code_delivery_queue_depth', len(self._queue))
+            self._condition.notify_all()
+            return True
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                item = self._queue.popleft()
+                self._delivering = True
+                self.metrics.set('voice_to_code_delivery_queue_depth', len(self._queue))
+                # Wake a submitter blocked on a full queue
+                self._condition.notify_all()
+
+            try:
+                if item.kind == _TEXT:
+                    self.processor.accept(item.payload, item.event)
+                else:
+                    self.processor.toggle_vocalization(item.payload)
+            except Exception as e:
+                self.logger.error(f"Delivery failed: {e}")
+            finally:
+                self.metrics.observe('voice_to_code_delivery_latency_seconds', time.perf_counter() - item.submitted_at)
+                with self._condition:
+                    self._delivering = False
+                    self._condition.notify_all()
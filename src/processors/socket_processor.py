@@ -0,0 +1,237 @@
+"""Newline-delimited JSON processor for local integrations.
+
+Each transcript is written as one JSON object per line to a Unix domain
+socket or a named pipe (FIFO), so editor plugins and agent wrappers can
+consume voice input without tmux in the path:
+
+    {"type": "transcript", "utterance_id": 3, "text": "run the tests",
+     "timestamp": 1760000000.5, "speech_started_at": 1760000996.1,
+     "audio_seconds": 3.2, "decode_seconds": 0.8, "confidence": 0.91}
+
+The connection stays open between transcripts and writes never block:
+whatever the reader hasn't taken yet stays in a bounded buffer and goes out
+with the next record or on close(). When the reader goes away, records are
+kept and the connection is retried with the next one. Callers that need to
+know when a record actually reached the reader pass on_done to accept().
+
+Duck-typed interface:
+    Implements accept(text: str, event) method expected by transcribers
+"""
+
+import json
+import os
+import select
+import socket
+import stat
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from src.logging.logger_protocol import LoggerProtocol
+from src.metrics.metrics_registry import MetricsRegistry, get_metrics
+from src.processors.processor_protocol import DeliveryCallback, report_delivery
+from src.processors.transcript_records import transcript_record, vocalization_record
+from src.transcribers.transcription_events import TranscriptionEvent
+
+# Seconds between connection attempts while the reader is away
+DEFAULT_RECONNECT_INTERVAL = 1.0
+
+# Records kept while the reader is away or slow; the oldest are dropped beyond this
+DEFAULT_MAX_BUFFERED_RECORDS = 1000
+
+# Seconds close() keeps trying to hand over buffered records
+DEFAULT_CLOSE_TIMEOUT = 2.0
+
+# Seconds to wait for a socket connection to be accepted
+CONNECT_TIMEOUT = 0.5
+
+
+class SocketProcessor:
+    """Processor that writes transcripts as JSON lines to a Unix socket or FIFO."""
+
+    # accept() takes on_done and reports when each record was written
+    confirms_delivery = True
+
+    def __init__(
+        self,
+        path: Path | str,
+        logger: LoggerProtocol,
+        reconnect_interval: float = DEFAULT_RECONNECT_INTERVAL,
+        max_buffered_records: int = DEFAULT_MAX_BUFFERED_RECORDS,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """
+        Initialize socket processor. Nothing is opened until the first record.
+
+        Args:
+            path: Unix domain socket to connect to, or FIFO to write to
+            logger: Logger instance for logging
+            reconnect_interval: Seconds between connection attempts while the reader is away
+            max_buffered_records: Records kept for a slow or absent reader
+            metrics: Registry to record delivery metrics in (defaults to the process-wide registry)
+        """
+        self.path = Path(path).expanduser()
+        self.logger = logger
+        self.reconnect_interval = reconnect_interval
+        self.max_buffered_records = max_buffered_records
+        self.metrics = metrics or get_metrics()
+
+        self._lock = threading.Lock()
+        self._records: deque[tuple[bytes, DeliveryCallback | None]] = deque()
+        self._offset = 0  # Bytes of the first record already written
+        self._sock: socket.socket | None = None
+        self._fifo: int | None = None
+        self._retry_at = 0.0
+        self._unreachable_logged = False
+
+    def accept(
+        self,
+        text: str,
+        event: TranscriptionEvent | None = None,
+        on_done: DeliveryCallback | None = None,
+    ) -> bool | None:
+        """
+        Write a transcript record.
+
+        Args:
+            text: Transcribed text to send
+            event: FINAL event the text came from; its timing and confidence are included
+            on_done: Called with True once the whole record was written to the reader,
+                or False if it was dropped from the buffer or still unwritten at close()
+
+        Returns:
+            True if the record was written or kept for the reader, None for empty text
+        """
+        if not text:
+            return None
+        self._send(transcript_record(text, event), on_done)
+        return True
+
+    def toggle_vocalization(self, is_on: bool) -> None:
+        """
+        Write a vocalization record; the reader decides what to do with it.
+
+        Args:
+           is_on: Flag to indicate whether response vocalization should be turn on or not
+        """
+        self._send(vocalization_record(is_on))
+
+    def close(self, timeout: float | None = None) -> bool:
+        """
+        Hand over buffered records, then disconnect.
+
+        Args:
+            timeout: Maximum seconds to keep trying (None for DEFAULT_CLOSE_TIMEOUT)
+
+        Returns:
+            True if every record was written
+        """
+        deadline = time.monotonic() + (DEFAULT_CLOSE_TIMEOUT if timeout is None else timeout)
+        with self._lock:
+            while self._records and time.monotonic() < deadline:
+                if not self._connected():
+                    self._retry_at = 0.0
+                self._flush()
+                if self._records:
+                    remaining = max(0.0, deadline - time.monotonic())
+                    if self._connected():
+                        select.select([], [self._fileno()], [], min(remaining, 0.1))
+                    else:
+                        time.sleep(min(remaining, 0.05))
+            delivered = not self._records
+            if not delivered:
+                self.logger.warning(f"{len(self._records)} record(s) not delivered to {self.path}")
+            for _data, on_done in self._records:
+                report_delivery(on_done, False)
+            self._records.clear()
+            self._offset = 0
+            self.metrics.set('voice_to_code_socket_buffered_records', 0)
+            self._disconnect()
+        return delivered
+
+    def _send(self, record: dict[str, Any], on_done: DeliveryCallback | None = None) -> None:
+        data = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock:
+            if len(self._records) >= self.max_buffered_records:
+                # Never drop a record that is partly written: the reader would get half a line
+                dropped = 1 if self._offset else 0
+                report_delivery(self._records[dropped][1], False)
+                del self._records[dropped]
+                self.metrics.inc('voice_to_code_socket_records_dropped_total')
+                self.logger.warning(f"Too many records waiting for {self.path}, dropped the oldest")
+            self._records.append((data, on_done))
+            self._flush()
+            self.metrics.set('voice_to_code_socket_buffered_records', len(self._records))
+
+    def _flush(self) -> None:
+        """Write as much buffered data as the reader takes without blocking (caller holds the lock)."""
+        if not self._connected() and not self._connect():
+            return
+        while self._records:
+            record, on_done = self._records[0]
+            try:
+                written = self._write(memoryview(record)[self._offset:])
+            except BlockingIOError:
+                return  # Reader is behind; the rest goes out with the next record
+            except OSError as e:
+                self.logger.warning(f"Lost connection to {self.path}: {e.strerror or e}")
+                self._disconnect()
+                # Resend the whole record on the next connection
+                self._offset = 0
+                return
+            self._offset += written
+            if self._offset == len(record):
+                self._records.popleft()
+                self._offset = 0
+                self.metrics.inc('voice_to_code_socket_records_total')
+                report_delivery(on_done, True)
+
+    def _connected(self) -> bool:
+        return self._sock is not None or self._fifo is not None
+
+    def _connect(self) -> bool:
+        now = time.monotonic()
+        if now < self._retry_at:
+            return False
+        try:
+            if stat.S_ISFIFO(os.stat(self.path).st_mode):
+                # Fails with ENXIO while no reader has the FIFO open
+                self._fifo = os.open(self.path, os.O_WRONLY | os.O_NONBLOCK)
+            else:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                try:
+                    sock.settimeout(CONNECT_TIMEOUT)
+                    sock.connect(str(self.path))
+                    sock.setblocking(False)
+                except OSError:
+                    sock.close()
+                    raise
+                self._sock = sock
+        except OSError as e:
+            self._retry_at = now + self.reconnect_interval
+            if not self._unreachable_logged:
+                self._unreachable_logged = True
+                self.logger.warning(f"Can't write to {self.path}: {e.strerror or e}. Keeping transcripts until a reader connects")
+            return False
+        self._unreachable_logged = False
+        self.metrics.inc('voice_to_code_socket_connects_total')
+        self.logger.info(f"Connected to {self.path}")
+        return True
+
+    def _write(self, data: memoryview) -> int:
+        if self._sock is not None:
+            return self._sock.send(data)
+        return os.write(self._fifo, data)
+
+    def _fileno(self) -> int:
+        return self._sock.fileno() if self._sock is not None else self._fifo
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._fifo is not None:
+            os.close(self._fifo)
+            self._fifo = None
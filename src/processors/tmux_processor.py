@@ -5,10 +5,27 @@ Duck-typed interface:
 """
 
 import subprocess
+import time
 
 from typing import Callable
 from src.logging.logger_protocol import LoggerProtocol
+from src.metrics.metrics_registry import get_metrics
+from src.transcribers.transcription_events import TranscriptionEvent
+from src.utils.agent_state import AgentStateTracker
 from src.utils.os_detection import get_os_type, OSType
+from src.utils.response_vocalizer import ResponseVocalizer
+from src.utils.tmux_client import TmuxClient, get_tmux_client
+from src.utils.tmux_sessions import TmuxSessionRegistry
+
+# Delivery methods, also used as metric label values
+SEND_KEYS = 'send_keys'
+PASTE = 'paste'
+
+# Text longer than this many characters is pasted instead of typed
+DEFAULT_PASTE_THRESHOLD = 200
+
+# Named tmux buffer used for pasting (deleted again by the paste)
+PASTE_BUFFER = 'voice-to-code'
 
 
 class TmuxProcessor:
@@ -24,75 +41,192 @@ class TmuxProcessor:
         "Do not use say commands anymore."
     )
     
-    def __init__(self, get_session_name: Callable[[], str], logger: LoggerProtocol) -> None:
+    def __init__(
+        self,
+        get_session_name: Callable[[], str],
+        logger: LoggerProtocol,
+        client: TmuxClient | None = None,
+        sessions: TmuxSessionRegistry | None = None,
+        paste_threshold: int = DEFAULT_PASTE_THRESHOLD,
+        keep_line_breaks: bool = False,
+        agent_state: AgentStateTracker | None = None,
+        wait_for_agent: bool = True,
+        response_vocalizer: ResponseVocalizer | None = None,
+        vocalize_locally: bool = False,
+    ) -> None:
         """
         Initialize tmux processor.
         
         Args:
             get_session_name: Callable returning current session name
             logger: Logger instance for logging
+            client: tmux connection to send commands over (defaults to the shared one)
+            sessions: Live session list used to reject sends to missing sessions up front
+            paste_threshold: Text longer than this is pasted from a tmux buffer instead of
+                typed with send-keys (0 always types)
+            keep_line_breaks: Send multi-line text (e.g. macro expansions) as one paste with its
+                line breaks, instead of replacing them with spaces
+            agent_state: Watches the target pane, so text is only sent while its agent is idle
+                and responses can be read out
+            wait_for_agent: Hold text while the agent is busy (needs agent_state)
+            response_vocalizer: Speaks responses locally instead of asking the agent to
+                (needs agent_state created with its on_turn_end)
+            vocalize_locally: Never ask the agent to vocalize responses, even without a
+                response_vocalizer
         """
         self.get_session_name = get_session_name
         self.logger = logger
+        self.client = client or get_tmux_client()
+        self.sessions = sessions
+        self.paste_threshold = paste_threshold
+        self.keep_line_breaks = keep_line_breaks
+        self.agent_state = agent_state
+        self.wait_for_agent = wait_for_agent
+        self.response_vocalizer = response_vocalizer
+        self.vocalize_locally = vocalize_locally
+        self.metrics = get_metrics()
     
-    def accept(self, text: str) -> None:
+    def accept(self, text: str, event: TranscriptionEvent | None = None) -> bool | None:
         """
         Send transcribed text to tmux session.
         
         Args:
             text: Transcribed text to send
+            event: Event the text came from (unused, tmux only receives the text)
+        
+        Returns:
+            True if the text was sent, False if it could not be sent, None for empty text
             
         Raises:
             subprocess.CalledProcessError if tmux command fails
         """
         if not text:
-            return
+            return None
         
         session_name = self.get_session_name()
         
-        # Sanitize: remove newlines to prevent command injection
-        clean_text = text.replace('\n', ' ').replace('\r', ' ')
+        if self.keep_line_breaks and ('\n' in text or '\r' in text):
+            # Pasted as a whole, so line breaks can't submit part of the text early
+            clean_text = text.replace('\r\n', '\n').replace('\r', '\n').strip('\n')
+        else:
+            # Sanitize: remove newlines to prevent command injection
+            clean_text = text.replace('\n', ' ').replace('\r', ' ')
+        
+        if self.sessions and self.sessions.is_known(session_name) is False:
+            # Known to be missing: log the text so the dictation can be recovered
+            self.metrics.inc('voice_to_code_tmux_send_failures_total')
+            self.logger.error(f"tmux session '{session_name}' does not exist, not sent: {clean_text}")
+            self.logger.info("Fix: Change session in dropdown or start tmux session")
+            return False
+        
+        if self.agent_state and self.wait_for_agent:
+            self._wait_for_agent(session_name)
+        elif self.agent_state and self.response_vocalizer and self.response_vocalizer.enabled:
+            # Watch from before the prompt goes out, so the whole response is heard
+            self.agent_state.watch(session_name)
         
+        start = time.perf_counter()
         try:
             self.logger.info(f"Sending to tmux session '{session_name}'")
             
-            # Use -l flag for literal text (prevents control sequence interpretation)
-            subprocess.run([
-                "tmux", "send-keys", "-t", session_name, "-l", clean_text
-            ], check=True)
+            method = self._send_text(session_name, clean_text)
             
-            # Send Enter separately
-            subprocess.run([
-                "tmux", "send-keys", "-t", session_name, "Enter"
-            ], check=True)
+            elapsed = time.perf_counter() - start
+            self.metrics.inc('voice_to_code_tmux_sends_total', labels={'method': method})
+            self.metrics.observe('voice_to_code_delivery_seconds', elapsed, labels={'method': method})
+            self.logger.debug(f"Delivered {len(clean_text)} characters via {method} in {elapsed * 1000:.1f} ms")
+            return True
         except subprocess.CalledProcessError as e:
+            self.metrics.inc('voice_to_code_tmux_send_failures_total')
             # Swallow exception - user can fix by changing session dropdown dynamically
             # Transcription continues, no need to restart
             self.logger.error(f"Failed to send to tmux session '{session_name}': {e}")
             self.logger.info("Fix: Change session in dropdown or start tmux session")
+            return False
 
     def toggle_vocalization(self, is_on: bool) -> None:
-        """Toggle vocalization settings on AI Agent side
-        Note: This is a noop on non-macOS system
+        """Toggle vocalization settings, locally or on AI Agent side
+        Note: Without a response vocalizer, this is a noop on non-macOS system or when
+        vocalizing locally
 
         Args:
            is_on: Flag to indicate whether response vocalization should be turn on or not
         """
 
-        if get_os_type() != OSType.MACOS:
+        if self.response_vocalizer:
+            self.response_vocalizer.set_enabled(is_on)
+            return
+
+        if self.vocalize_locally or get_os_type() != OSType.MACOS:
             return
         
         session_name = self.get_session_name()
         prompt_to_send = self.__START_RESPONSE_VOCALIZATION_PROMPT if is_on else self.__STOP_RESPONSE_VOCALIZATION_PROMPT
 
         try:
-            subprocess.run([
-                "tmux", "send-keys", "-t", session_name, "-l", prompt_to_send
-            ], check=True)
-
-            subprocess.run([
-                "tmux", "send-keys", "-t", session_name, "Enter"
-            ], check=True)
+            self._send_text(session_name, prompt_to_send)
 
         except subprocess.CalledProcessError as e:
             self.logger.error(f"Failed to set response vocalization to {is_on}: {e}")
+
+    def _wait_for_agent(self, session_name: str) -> None:
+        """Hold the text until the agent in the session is idle, or the wait times out."""
+        start = time.perf_counter()
+        idle = self.agent_state.wait_until_idle(session_name)
+        waited = time.perf_counter() - start
+        self.metrics.observe('voice_to_code_agent_wait_seconds', waited)
+        if not idle:
+            self.metrics.inc('voice_to_code_agent_wait_timeouts_total')
+            self.logger.warning(f"Agent in '{session_name}' still busy after {waited:.0f}s, sending anyway")
+        elif waited >= 1.0:
+            self.logger.info(f"Waited {waited:.1f}s for the agent in '{session_name}' to finish")
+
+    def _send_text(self, session_name: str, text: str) -> str:
+        """
+        Type or paste text into the session and press Enter.
+        
+        All commands go out in one write, so concurrent senders can't interleave
+        between loading the paste buffer and pasting it.
+        
+        Args:
+            session_name: Target session
+            text: Text, with line breaks only when it is to be pasted
+        
+        Returns:
+            Delivery method used (SEND_KEYS or PASTE)
+        
+        Raises:
+            subprocess.CalledProcessError if a tmux command fails
+        """
+        if '\n' in text or (self.paste_threshold and len(text) > self.paste_threshold):
+            method = PASTE
+            commands = [
+                # "--" so text starting with "-" isn't read as an option
+                ["set-buffer", "-b", PASTE_BUFFER, "--", text],
+                # -p: bracketed paste when the application enabled it; -d: delete the buffer afterwards
+                ["paste-buffer", "-d", "-p", "-b", PASTE_BUFFER, "-t", session_name],
+            ]
+        else:
+            method = SEND_KEYS
+            # Use -l flag for literal text (prevents control sequence interpretation)
+            commands = [["send-keys", "-t", session_name, "-l", text]]
+        
+        if self.agent_state:
+            # Before sending, so the echo of the text is already part of the agent's turn
+            self.agent_state.mark_busy(session_name, text)
+        # Send Enter separately
+        self.client.run_many(commands + [["send-keys", "-t", session_name, "Enter"]])
+        return method
+
+    def close(self, timeout: float | None = None) -> bool:
+        """Nothing to flush: text is sent before accept() returns. Stops watching the agent.
+
+        Args:
+            timeout: Unused
+
+        Returns:
+            Always True
+        """
+        if self.agent_state:
+            self.agent_state.close()
+        return True
@@ -0,0 +1,42 @@
+"""JSON records describing transcripts, shared by the structured-output processors."""
+
+import time
+from typing import Any
+
+from src.transcribers.transcription_events import TranscriptionEvent
+
+
+def transcript_record(text: str, event: TranscriptionEvent | None = None) -> dict[str, Any]:
+    """
+    Build the record for one transcript.
+
+    Args:
+        text: Transcribed text
+        event: FINAL event the text came from; its timing and confidence are included
+
+    Returns:
+        JSON-serializable dict with 'type' set to 'transcript'
+    """
+    return {
+        'type': 'transcript',
+        'utterance_id': event.utterance_id if event else None,
+        'text': text,
+        'timestamp': event.timestamp if event else time.time(),
+        'speech_started_at': event.speech_started_at if event else None,
+        'audio_seconds': event.audio_seconds if event else None,
+        'decode_seconds': event.decode_seconds if event else None,
+        'confidence': event.confidence if event else None,
+    }
+
+
+def vocalization_record(is_on: bool) -> dict[str, Any]:
+    """
+    Build the record for a response vocalization change.
+
+    Args:
+        is_on: Whether response vocalization was turned on
+
+    Returns:
+        JSON-serializable dict with 'type' set to 'vocalization'
+    """
+    return {'type': 'vocalization', 'enabled': is_on, 'timestamp': time.time()}
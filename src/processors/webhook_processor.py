@@ -0,0 +1,294 @@
+"""HTTP webhook processor for agents that take prompts over a local HTTP API.
+
+Each transcript is POSTed as a JSON record (see transcript_records) to the
+configured URL. Connections are kept alive and reused from a small pool, so
+a transcript costs one request rather than a new TCP connection. With a
+batch window, utterances that arrive close together are collected and sent
+as a JSON array in one request.
+
+Failed requests (connection errors, timeouts, 429 and 5xx responses) are
+retried with exponential backoff and full jitter; other 4xx responses are
+not retried. Callers that need to know when a batched transcript was
+actually posted pass on_done to accept().
+
+Duck-typed interface:
+    Implements accept(text: str, event) method expected by transcribers
+"""
+
+import http.client
+import json
+import random
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+from src.logging.logger_protocol import LoggerProtocol
+from src.metrics.metrics_registry import MetricsRegistry, get_metrics
+from src.processors.processor_protocol import DeliveryCallback, report_delivery
+from src.processors.transcript_records import transcript_record, vocalization_record
+from src.transcribers.transcription_events import TranscriptionEvent
+
+# Seconds to wait for a connection or a response
+DEFAULT_TIMEOUT = 5.0
+
+# Retries after the first attempt
+DEFAULT_RETRIES = 3
+
+# Backoff before retry n is a random delay up to RETRY_BACKOFF * 2**n seconds
+RETRY_BACKOFF = 0.2
+
+# Idle keep-alive connections kept for reuse
+DEFAULT_POOL_SIZE = 2
+
+# Records sent in one batched request at most
+MAX_BATCH_SIZE = 50
+
+
+class WebhookError(Exception):
+    """Request was answered with a status that won't succeed on retry."""
+
+
+class _ConnectionPool:
+    """Idle keep-alive HTTP connections to one host."""
+
+    def __init__(self, scheme: str, host: str, port: int | None, timeout: float, size: int) -> None:
+        self._connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._size = size
+        self._lock = threading.Lock()
+        self._idle: list[http.client.HTTPConnection] = []
+
+    def get(self) -> tuple[http.client.HTTPConnection, bool]:
+        """Get an idle connection, or a new one. The flag tells whether it was reused."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connection_class(self._host, self._port, timeout=self._timeout), False
+
+    def put(self, connection: http.client.HTTPConnection) -> None:
+        """Return a connection whose response was read completely."""
+        with self._lock:
+            if len(self._idle) < self._size:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+class WebhookProcessor:
+    """Processor that POSTs transcripts to an HTTP endpoint."""
+
+    # accept() takes on_done and reports when each transcript was posted
+    confirms_delivery = True
+
+    def __init__(
+        self,
+        url: str,
+        logger: LoggerProtocol,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        batch_window: float = 0.0,
+        headers: dict[str, str] | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """
+        Initialize webhook processor. Connections are opened on first use.
+
+        Args:
+            url: http:// or https:// URL to POST records to
+            logger: Logger instance for logging
+            timeout: Seconds to wait for a connection or a response
+            retries: Retries after a failed first attempt
+            batch_window: Seconds to collect further transcripts before sending
+                them together (0 sends each one as it arrives)
+            headers: Extra request headers, e.g. Authorization
+            pool_size: Idle keep-alive connections kept for reuse
+            metrics: Registry to record request metrics in (defaults to the process-wide registry)
+
+        Raises:
+            ValueError: If url is not an http or https URL
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Webhook URL must be an http:// or https:// URL, got: {url}")
+        self.url = url
+        self.logger = logger
+        self.retries = retries
+        self.batch_window = batch_window
+        self.headers = {'Content-Type': 'application/json', **(headers or {})}
+        self.metrics = metrics or get_metrics()
+
+        self._path = parts.path or '/'
+        if parts.query:
+            self._path += f'?{parts.query}'
+        self._pool = _ConnectionPool(parts.scheme, parts.hostname, parts.port, timeout, pool_size)
+        self._batch_lock = threading.Lock()
+        self._batch: list[tuple[dict[str, Any], DeliveryCallback | None]] = []
+        self._timer: threading.Timer | None = None
+        self._send_lock = threading.Lock()
+
+    def accept(
+        self,
+        text: str,
+        event: TranscriptionEvent | None = None,
+        on_done: DeliveryCallback | None = None,
+    ) -> bool | None:
+        """
+        Send a transcript, or add it to the current batch.
+
+        Args:
+            text: Transcribed text to send
+            event: FINAL event the text came from; its timing and confidence are included
+            on_done: Called with whether the transcript was delivered, once its request
+                is finished (for batched transcripts, when the batch is sent)
+
+        Returns:
+            False if the transcript could not be delivered (batched ones count as delivered,
+            see on_done), None for empty text
+        """
+        if not text:
+            return None
+        record = transcript_record(text, event)
+        if self.batch_window <= 0:
+            delivered = self._deliver([record])
+            report_delivery(on_done, delivered)
+            return delivered
+
+        with self._batch_lock:
+            self._batch.append((record, on_done))
+            full = len(self._batch) >= MAX_BATCH_SIZE
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.batch_window, self.flush)
+                self._timer.name = 'webhook-batch'
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            return self.flush()
+        return True
+
+    def toggle_vocalization(self, is_on: bool) -> None:
+        """
+        Send a vocalization record after any batched transcripts.
+
+        Args:
+           is_on: Flag to indicate whether response vocalization should be turn on or not
+        """
+        self.flush()
+        self._deliver([vocalization_record(is_on)])
+
+    def flush(self) -> bool:
+        """
+        Send the current batch now.
+
+        Returns:
+            True if the batch was empty or delivered
+        """
+        with self._batch_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            batch, self._batch = self._batch, []
+        if not batch:
+            return True
+        delivered = self._deliver([record for record, _on_done in batch])
+        for _record, on_done in batch:
+            report_delivery(on_done, delivered)
+        return delivered
+
+    def close(self, timeout: float | None = None) -> bool:
+        """
+        Send the current batch, then close pooled connections.
+
+        Args:
+            timeout: Unused, requests are bounded by the processor's own timeout and retries
+
+        Returns:
+            True if the batch was empty or delivered
+        """
+        delivered = self.flush()
+        self._pool.close()
+        return delivered
+
+    def _deliver(self, records: list[dict[str, Any]]) -> bool:
+        """Send records, retrying failures. Errors are logged, not raised."""
+        # Batches are always arrays so the receiver doesn't depend on how many arrived together
+        payload = records if self.batch_window > 0 else records[0]
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        # One request at a time keeps records in order when the batch timer and accept() race
+        with self._send_lock:
+            start = time.perf_counter()
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    self.metrics.inc('voice_to_code_webhook_retries_total')
+                    time.sleep(random.uniform(0, RETRY_BACKOFF * 2 ** (attempt - 1)))
+                try:
+                    status = self._post(body)
+                except WebhookError as e:
+                    self.logger.error(f"Webhook rejected {len(records)} record(s): {e}")
+                    break
+                except (OSError, http.client.HTTPException) as e:
+                    status = None
+                    error = str(e) or type(e).__name__
+                else:
+                    error = f"HTTP {status}"
+                    if status < 300:
+                        elapsed = time.perf_counter() - start
+                        self.metrics.inc('voice_to_code_webhook_records_total', len(records))
+                        self.metrics.observe('voice_to_code_delivery_seconds', elapsed, labels={'method': 'webhook'})
+                        self.logger.debug(f"Posted {len(records)} record(s) to {self.url} in {elapsed * 1000:.1f} ms")
+                        return True
+                self.logger.warning(f"Webhook request to {self.url} failed ({error}), attempt {attempt + 1} of {self.retries + 1}")
+            self.metrics.inc('voice_to_code_webhook_failures_total')
+            texts = ' | '.join(record['text'] for record in records if record.get('text'))
+            if texts:
+                # Log the text so the dictation can be recovered
+                self.logger.error(f"Not delivered to {self.url}: {texts}")
+            return False
+
+    def _post(self, body: bytes) -> int:
+        """
+        POST body over a pooled connection.
+
+        Returns:
+            Response status for retryable or successful responses
+
+        Raises:
+            WebhookError: For responses that won't succeed on retry
+            OSError, http.client.HTTPException: If the request could not be completed
+        """
+        connection, reused = self._pool.get()
+        try:
+            try:
+                connection.request('POST', self._path, body=body, headers=self.headers)
+                response = connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # The server closed an idle keep-alive connection; that's not a failed attempt
+                connection.close()
+                connection.request('POST', self._path, body=body, headers=self.headers)
+                response = connection.getresponse()
+            detail = response.read()
+        except BaseException:
+            connection.close()
+            raise
+
+        self.metrics.inc('voice_to_code_webhook_requests_total', labels={'status': response.status})
+        if response.will_close:
+            connection.close()
+        else:
+            self._pool.put(connection)
+        if 400 <= response.status < 500 and response.status != 429:
+            reason = detail.decode('utf-8', 'replace').strip()[:200]
+            raise WebhookError(f"HTTP {response.status} {reason or response.reason}")
+        return response.status
@@ -0,0 +1,182 @@
+"""Noise suppression, high-pass filtering and automatic gain control for captured audio.
+
+Everything runs as whole-array NumPy operations over a short-time Fourier
+transform of the utterance, so cleaning several seconds of audio takes a few
+milliseconds. State that should outlast one utterance (the noise profile and
+the AGC gain) is kept on the instance and carried into the next one.
+
+Requires NumPy, which is already installed as a dependency of Whisper.
+"""
+
+import numpy as np
+
+# Whisper models consume 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+# STFT frame length and hop (32 ms frames, 50% overlap)
+FRAME_SIZE = 512
+HOP_SIZE = FRAME_SIZE // 2
+
+# Fraction of the quietest frames used to estimate the noise profile
+NOISE_FRAME_FRACTION = 0.2
+
+# Weight of the newest utterance when updating the persisted noise profile
+NOISE_PROFILE_SMOOTHING = 0.5
+
+# Bins louder than this multiple of the noise profile pass through the gate
+GATE_THRESHOLD = 2.0
+
+# Gain applied to gated-out bins (-20 dB rather than silence, to avoid artifacts)
+GATE_ATTENUATION = 0.1
+
+# Frames louder than this multiple of the noise energy count as speech for AGC
+SPEECH_FRAME_RATIO = 4.0
+
+# Weight of the newest utterance when updating the persisted AGC gain
+GAIN_SMOOTHING = 0.7
+
+# Output peaks are limited to this level to avoid clipping
+PEAK_LIMIT = 0.99
+
+
+class AudioPreprocessor:
+    """Cleans float32 audio at SAMPLE_RATE before it reaches the decoder."""
+
+    def __init__(
+        self,
+        highpass_hz: float = 100.0,
+        noise_suppression: bool = True,
+        agc: bool = True,
+        target_level_db: float = -20.0,
+        max_gain_db: float = 20.0,
+    ) -> None:
+        """
+        Initialize preprocessor.
+
+        Args:
+            highpass_hz: Cutoff below which rumble and mains hum are removed (0 disables)
+            noise_suppression: Apply spectral gating against the learned noise profile
+            agc: Normalize speech loudness to target_level_db
+            target_level_db: Target RMS level of speech in dBFS
+            max_gain_db: Largest boost or cut AGC may apply
+        """
+        self.highpass_hz = highpass_hz
+        self.noise_suppression = noise_suppression
+        self.agc = agc
+        self.target_rms = 10 ** (target_level_db / 20)
+        self.max_gain = 10 ** (max_gain_db / 20)
+
+        # sqrt-Hann analysis/synthesis windows reconstruct exactly at 50% overlap
+        self._window = np.sqrt(np.hanning(FRAME_SIZE + 1)[:FRAME_SIZE]).astype(np.float32)
+        freqs = np.fft.rfftfreq(FRAME_SIZE, d=1.0 / SAMPLE_RATE)
+        self._highpass_mask = self._make_highpass_mask(freqs, highpass_hz)
+
+        self.noise_profile = None
+        self.gain = 1.0
+
+    def process(self, audio) -> np.ndarray:
+        """
+        Clean one utterance.
+
+        Args:
+            audio: Mono samples in [-1, 1] at SAMPLE_RATE (NumPy array or CPU tensor)
+
+        Returns:
+            Processed float32 samples of the same length
+        """
+        samples = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if samples.size < FRAME_SIZE:
+            return samples
+
+        spectrum = self._stft(samples)
+        magnitude = np.abs(spectrum)
+        frame_energy = np.mean(magnitude ** 2, axis=1)
+        quiet_frames = self._quietest_frames(frame_energy)
+
+        mask = self._highpass_mask[np.newaxis, :]
+        if self.noise_suppression:
+            self._update_noise_profile(magnitude[quiet_frames])
+            mask = mask * self._gate_mask(magnitude)
+
+        cleaned = self._istft(spectrum * mask, samples.size)
+
+        if self.agc:
+            noise_energy = np.mean(frame_energy[quiet_frames])
+            cleaned = self._apply_gain(cleaned, frame_energy > noise_energy * SPEECH_FRAME_RATIO)
+
+        peak = np.max(np.abs(cleaned))
+        if peak > PEAK_LIMIT:
+            cleaned *= PEAK_LIMIT / peak
+        return cleaned.astype(np.float32, copy=False)
+
+    @staticmethod
+    def _make_highpass_mask(freqs: np.ndarray, cutoff: float) -> np.ndarray:
+        """Frequency-domain high-pass with a raised-cosine transition one octave wide."""
+        if cutoff <= 0:
+            return np.ones_like(freqs, dtype=np.float32)
+        position = np.clip((freqs - cutoff / 2) / (cutoff / 2), 0.0, 1.0)
+        return (0.5 - 0.5 * np.cos(np.pi * position)).astype(np.float32)
+
+    def _stft(self, samples: np.ndarray) -> np.ndarray:
+        """Short-time Fourier transform, one row per frame."""
+        # Pad so every sample is covered by two frames, then frame without copying
+        padded_length = samples.size + 2 * HOP_SIZE
+        padded_length += -padded_length % HOP_SIZE
+        padded = np.zeros(padded_length, dtype=np.float32)
+        padded[HOP_SIZE:HOP_SIZE + samples.size] = samples
+        frames = np.lib.stride_tricks.sliding_window_view(padded, FRAME_SIZE)[::HOP_SIZE]
+        return np.fft.rfft(frames * self._window, axis=1)
+
+    def _istft(self, spectrum: np.ndarray, length: int) -> np.ndarray:
+        """Inverse of _stft() by overlap-adding frame halves."""
+        frames = np.fft.irfft(spectrum, n=FRAME_SIZE, axis=1).astype(np.float32) * self._window
+        # With 50% overlap each hop-sized block is the tail of one frame plus the head of the next
+        heads, tails = frames[:, :HOP_SIZE], frames[:, HOP_SIZE:]
+        blocks = np.zeros((len(frames) + 1, HOP_SIZE), dtype=np.float32)
+        blocks[:-1] += heads
+        blocks[1:] += tails
+        return blocks.reshape(-1)[HOP_SIZE:HOP_SIZE + length]
+
+    @staticmethod
+    def _quietest_frames(frame_energy: np.ndarray) -> np.ndarray:
+        """Indices of the quietest frames (WhisperMic captures include the trailing pause)."""
+        count = max(1, int(len(frame_energy) * NOISE_FRAME_FRACTION))
+        return np.argpartition(frame_energy, count - 1)[:count]
+
+    def _update_noise_profile(self, quiet_magnitude: np.ndarray) -> None:
+        estimate = np.mean(quiet_magnitude, axis=0)
+        if self.noise_profile is None:
+            self.noise_profile = estimate
+        else:
+            self.noise_profile = (NOISE_PROFILE_SMOOTHING * estimate
+                                  + (1 - NOISE_PROFILE_SMOOTHING) * self.noise_profile)
+
+    def _gate_mask(self, magnitude: np.ndarray) -> np.ndarray:
+        """Soft gate per time-frequency bin, smoothed across neighbours to avoid musical noise."""
+        threshold = GATE_THRESHOLD * self.noise_profile[np.newaxis, :]
+        mask = np.where(magnitude > threshold, 1.0, GATE_ATTENUATION).astype(np.float32)
+        padded = np.pad(mask, 1, mode='edge')
+        # 3x3 box average over (time, frequency)
+        smoothed = sum(
+            padded[1 + dt:padded.shape[0] - 1 + dt, 1 + df:padded.shape[1] - 1 + df]
+            for dt in (-1, 0, 1) for df in (-1, 0, 1)
+        ) / 9.0
+        return smoothed
+
+    def _apply_gain(self, samples: np.ndarray, speech_frames: np.ndarray) -> np.ndarray:
+        """Scale speech towards the target level, smoothing the gain across utterances."""
+        if not np.any(speech_frames):
+            return samples * self.gain
+        # Map speech frames back to samples (frame i is centred on sample i * HOP_SIZE)
+        centres = np.flatnonzero(speech_frames) * HOP_SIZE
+        starts = np.clip(centres - HOP_SIZE, 0, samples.size)
+        ends = np.clip(centres + HOP_SIZE, 0, samples.size)
+        in_speech = np.zeros(samples.size + 1, dtype=np.int32)
+        np.add.at(in_speech, starts, 1)
+        np.add.at(in_speech, ends, -1)
+        speech = samples[np.cumsum(in_speech)[:-1] > 0]
+        speech_rms = float(np.sqrt(np.mean(speech ** 2))) if speech.size else 0.0
+        if speech_rms > 0:
+            target_gain = float(np.clip(self.target_rms / speech_rms, 1 / self.max_gain, self.max_gain))
+            self.gain = GAIN_SMOOTHING * target_gain + (1 - GAIN_SMOOTHING) * self.gain
+        return samples * self.gain
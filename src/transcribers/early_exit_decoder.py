@@ -0,0 +1,106 @@
+"""Whisper decoding that stops after the first decoder step when there is no speech.
+
+Whisper predicts a no-speech probability alongside the first token. Running
+the encoder plus that single step costs a fraction of a full transcribe(),
+so audio that is clearly not speech can be rejected before any text is
+generated. For utterances up to 30 seconds the encoder output is then reused
+for the real decode, so speech pays no extra encoder pass.
+
+Requires openai-whisper; imported lazily by WhisperMicTranscriber.
+"""
+
+import dataclasses
+from typing import Any, Callable
+
+import torch
+from whisper.audio import N_FRAMES, N_SAMPLES, log_mel_spectrogram, pad_or_trim
+from whisper.decoding import DecodingOptions, decode
+
+# transcribe() falls back to sampling when the greedy result crosses these
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+
+_DECODING_FIELDS = {f.name for f in dataclasses.fields(DecodingOptions)}
+
+
+class EarlyExitDecoder:
+    """Drop-in replacement for a Whisper model's transcribe() with a no-speech precheck."""
+
+    def __init__(
+        self,
+        model: Any,
+        transcribe: Callable[..., dict],
+        no_speech_threshold: float = 0.6,
+        logprob_threshold: float = LOGPROB_THRESHOLD,
+    ) -> None:
+        """
+        Initialize decoder.
+
+        Args:
+            model: Loaded openai-whisper model
+            transcribe: The model's original transcribe(), used for long audio and fallbacks
+            no_speech_threshold: No-speech probability above which decoding stops, if the
+                first token's log probability is also below logprob_threshold
+            logprob_threshold: Log probability of the first token below which it is unreliable
+        """
+        self.model = model
+        self.full_transcribe = transcribe
+        self.no_speech_threshold = no_speech_threshold
+        self.logprob_threshold = logprob_threshold
+
+    def transcribe(self, audio: Any, *args: Any, **kwargs: Any) -> dict:
+        """
+        Transcribe audio, stopping early when the first decoder step sees no speech.
+
+        Args:
+            audio: 16 kHz mono samples (tensor or array), as passed to transcribe()
+            *args, **kwargs: transcribe() options (language, suppress_tokens, ...)
+
+        Returns:
+            Result dict in transcribe() format; early exits have empty text and
+            a top-level 'no_speech_prob'
+        """
+        model = self.model
+        fp16 = kwargs.get('fp16', model.device.type != 'cpu')
+        mel = log_mel_spectrogram(audio, model.dims.n_mels, padding=N_SAMPLES)
+        content_frames = mel.shape[-1] - N_FRAMES
+        segment = pad_or_trim(mel[:, :N_FRAMES], N_FRAMES).to(model.device)
+        segment = segment.to(torch.float16 if fp16 else torch.float32)
+
+        options = {k: v for k, v in kwargs.items() if k in _DECODING_FIELDS}
+        options.update(fp16=fp16, temperature=0.0, without_timestamps=True)
+
+        with torch.no_grad():
+            audio_features = model.embed_audio(segment.unsqueeze(0))
+            probe = decode(model, audio_features, DecodingOptions(**{**options, 'sample_len': 1}))[0]
+            # Like transcribe(), a confident first token overrides the no-speech probability
+            if probe.no_speech_prob > self.no_speech_threshold and probe.avg_logprob < self.logprob_threshold:
+                return {'text': '', 'segments': [], 'language': probe.language, 'no_speech_prob': probe.no_speech_prob}
+
+            if content_frames > N_FRAMES or args:
+                # Longer than one window: let transcribe() handle seeking
+                return self.full_transcribe(audio, *args, **kwargs)
+
+            result = decode(model, audio_features, DecodingOptions(**options))[0]
+
+        if (result.compression_ratio > COMPRESSION_RATIO_THRESHOLD
+                or result.avg_logprob < LOGPROB_THRESHOLD):
+            # Greedy result looks unreliable: use transcribe()'s temperature fallback
+            return self.full_transcribe(audio, *args, **kwargs)
+
+        return {
+            'text': result.text,
+            'segments': [{
+                'id': 0,
+                'seek': 0,
+                'start': 0.0,
+                'end': content_frames * 0.01,  # 10 ms per mel frame
+                'text': result.text,
+                'tokens': result.tokens,
+                'temperature': result.temperature,
+                'avg_logprob': result.avg_logprob,
+                'compression_ratio': result.compression_ratio,
+                'no_speech_prob': result.no_speech_prob,
+            }],
+            'language': result.language,
+        }
@@ -0,0 +1,20 @@
+"""Whisper model names as the app loads them."""
+
+
+def whisper_model_id(model_name: str, english: bool = True) -> str:
+    """
+    Get the checkpoint whisper.load_model() should load for a configured model.
+
+    WhisperMic runs with english=True, which selects the English-only .en
+    variants; those exist for every model below large.
+
+    Args:
+        model_name: Whisper model name (tiny, base, small, medium, large)
+        english: Use the English-only variant where there is one
+
+    Returns:
+        Name to pass to whisper.load_model()
+    """
+    if not english or model_name.startswith('large') or model_name.endswith('.en'):
+        return model_name
+    return f"{model_name}.en"
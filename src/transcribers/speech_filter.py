@@ -0,0 +1,119 @@
+"""Detection of Whisper results that should not be sent anywhere.
+
+Whisper turns coughs, fan noise and silence into confident-looking phantom
+text ("Thank you.", "Bye.", "[Music]"). Such results are recognized from the
+decoder's own statistics and from the phrases it is known to invent.
+
+As in Whisper's transcribe(), audio only counts as silence when the
+no-speech probability is high and the text is also decoded with low
+confidence; a confident "Yes." over a noisy room is kept. Short phrases
+that are also real answers ("Thank you.", "Bye.", "You") are only treated
+as phantom text when the decoder thought there was no speech.
+"""
+
+import math
+import re
+from typing import Any
+
+# Skip reasons, also used as metric label values
+NO_SPEECH = 'no_speech'
+LOW_CONFIDENCE = 'low_confidence'
+HALLUCINATION = 'hallucination'
+
+# Whole-utterance texts Whisper produces from non-speech audio (matched after normalization)
+HALLUCINATION_PATTERNS = [
+    r"(thank you|thanks)( (so|very) much)? for (watching|listening)",
+    r"(please )?(like and )?subscribe( to (my|the|our) channel)?",
+    r"(uh|um|hmm|mm|ah|oh)+",
+    r"subtitles by .*",
+    r"",
+]
+_HALLUCINATION_RE = re.compile(r"^(?:" + "|".join(HALLUCINATION_PATTERNS) + r")$")
+
+# Phantom phrases that are also real answers: only dropped when the decoder saw no speech
+AMBIGUOUS_PATTERNS = [
+    r"(thank you|thanks)( (so|very) much)?",
+    r"(bye|bye bye|goodbye)",
+    r"you",
+]
+_AMBIGUOUS_RE = re.compile(r"^(?:" + "|".join(AMBIGUOUS_PATTERNS) + r")$")
+
+# Bracketed or symbol-only captions such as "[Music]", "(silence)" or "♪ ♪"
+_CAPTION_RE = re.compile(r"^(\s*(\[[^\]]*\]|\([^)]*\)|\*[^*]*\*|[♪♫#.…-]+))+\s*$")
+
+
+def normalize_phrase(text: str) -> str:
+    """Lowercase and strip punctuation so phrases compare regardless of formatting."""
+    text = re.sub(r"[^\w\s']", " ", text.lower())
+    return " ".join(text.split())
+
+
+def is_hallucination(text: str, no_speech: bool = False) -> bool:
+    """
+    Check whether a transcript is one of Whisper's stock phantom phrases.
+
+    Args:
+        text: Transcribed text
+        no_speech: Whether the decoder thought the audio held no speech, which
+            makes phrases in AMBIGUOUS_PATTERNS count as well
+
+    Returns:
+        True if the whole text is a known hallucination or a non-speech caption
+    """
+    if _CAPTION_RE.match(text):
+        return True
+    phrase = normalize_phrase(text)
+    return bool(_HALLUCINATION_RE.match(phrase) or (no_speech and _AMBIGUOUS_RE.match(phrase)))
+
+
+def skip_reason(result: dict[str, Any], no_speech_threshold: float, logprob_threshold: float) -> str | None:
+    """
+    Decide whether a Whisper transcribe() result should be dropped.
+
+    Args:
+        result: Result dict with 'text' and optionally 'segments' (each with
+            'no_speech_prob' and 'avg_logprob') or a top-level 'no_speech_prob'
+        no_speech_threshold: No-speech probability above which audio counts as silence,
+            if the text's average log probability is also below logprob_threshold
+        logprob_threshold: Average token log probability below which text is unreliable
+
+    Returns:
+        NO_SPEECH, LOW_CONFIDENCE or HALLUCINATION, or None to keep the result
+    """
+    text = (result.get('text') or '').strip()
+    segments = result.get('segments') or []
+
+    no_speech_prob = result.get('no_speech_prob')
+    if no_speech_prob is None and segments:
+        no_speech_prob = min(segment.get('no_speech_prob', 0.0) for segment in segments)
+    no_speech = no_speech_prob is not None and no_speech_prob > no_speech_threshold
+
+    logprobs = [segment['avg_logprob'] for segment in segments if 'avg_logprob' in segment]
+    low_confidence = bool(logprobs) and sum(logprobs) / len(logprobs) < logprob_threshold
+
+    # Without log probabilities the no-speech probability is all there is to go on
+    if not text or (no_speech and (low_confidence or not logprobs)):
+        return NO_SPEECH
+
+    if is_hallucination(text, no_speech):
+        return HALLUCINATION
+
+    if low_confidence:
+        return LOW_CONFIDENCE
+    return None
+
+
+def transcript_confidence(result: dict[str, Any]) -> float | None:
+    """
+    Estimate how sure Whisper is of a transcript.
+
+    Args:
+        result: Result dict with 'segments', each with 'avg_logprob'
+
+    Returns:
+        Geometric mean token probability (0 to 1), or None without segment statistics
+    """
+    logprobs = [segment['avg_logprob'] for segment in result.get('segments') or [] if 'avg_logprob' in segment]
+    if not logprobs:
+        return None
+    return math.exp(sum(logprobs) / len(logprobs))
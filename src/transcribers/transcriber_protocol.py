@@ -1,11 +1,15 @@
 """Protocol for transcriber implementations."""
 
-from typing import Callable, Protocol
+from typing import Any, AsyncIterator, Callable, Protocol
+
+from src.transcribers.transcription_events import TranscriptionEvent
 
 
 class TranscriberProtocol(Protocol):
     """Protocol for transcriber implementations."""
     
+    model_name: str | None
+    
     def initialize(self) -> bool:
         """Initialize the transcriber (load models, setup audio).
         
@@ -24,3 +28,37 @@ class TranscriberProtocol(Protocol):
             True if streaming completed successfully, False otherwise
         """
         ...
+    
+    def events(self, should_continue: Callable[[], bool] | None = None) -> AsyncIterator[TranscriptionEvent]:
+        """Listen continuously and yield structured transcription events.
+        
+        Args:
+            should_continue: Optional callable checked before each listen
+            
+        Yields:
+            TranscriptionEvent for each stage of each utterance
+        """
+        ...
+    
+    def request_calibration(self) -> None:
+        """Re-measure ambient noise before the next utterance."""
+        ...
+    
+    def switch_model(self, model_name: str) -> None:
+        """Load another model in the background and use it from the next utterance.
+        
+        Args:
+            model_name: Name of the model to switch to
+        """
+        ...
+    
+    def update_settings(self, config: dict[str, Any]) -> list[str]:
+        """Apply new settings while streaming, without restarting.
+        
+        Args:
+            config: Full configuration dict
+            
+        Returns:
+            Names of changed settings that will be applied live
+        """
+        ...
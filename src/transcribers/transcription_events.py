@@ -0,0 +1,50 @@
+"""Structured events produced by streaming transcribers."""
+
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+
+
+class EventType(Enum):
+    """Kinds of transcription events, in the order they occur for one utterance."""
+    SPEECH_STARTED = 'speech_started'
+    PARTIAL = 'partial'
+    FINAL = 'final'
+    SKIPPED = 'skipped'
+    TIMEOUT = 'timeout'
+    ERROR = 'error'
+
+
+@dataclass(frozen=True)
+class TranscriptionEvent:
+    """One event from a transcriber's event stream.
+
+    Attributes:
+        type: Kind of event
+        utterance_id: Sequence number of the listen attempt the event belongs to
+        text: Transcribed text (PARTIAL and FINAL only)
+        timestamp: Wall-clock time the event was produced
+        speech_started_at: Estimated wall-clock time speech began, when known
+        audio_seconds: Duration of the captured audio (FINAL only)
+        decode_seconds: Time spent decoding the captured audio (FINAL only)
+        error: Exception that ended the listen attempt (ERROR only)
+        reason: Why the utterance was dropped, e.g. 'no_speech' (SKIPPED only)
+        confidence: Average token probability of the text, 0 to 1, when known (FINAL only)
+    """
+    type: EventType
+    utterance_id: int
+    text: str = ''
+    timestamp: float = field(default_factory=time.time)
+    speech_started_at: float | None = None
+    audio_seconds: float | None = None
+    decode_seconds: float | None = None
+    error: Exception | None = None
+    reason: str | None = None
+    confidence: float | None = None
+
+    @property
+    def latency_seconds(self) -> float | None:
+        """Seconds from the estimated start of speech to this event, when known."""
+        if self.speech_started_at is None:
+            return None
+        return self.timestamp - self.speech_started_at
@@ -1,25 +1,54 @@
 """WhisperMic-based audio transcriber for voice-to-code.
 
 Duck-typed interface expected by this class:
-    processor: Any object with accept(text: str) -> bool method
+    processor: Any object with accept(text: str, event: TranscriptionEvent | None) method
     logger: Logger instance with info() and debug() methods
 """
 
-from typing import Any, Callable
+import asyncio
+import dataclasses
+import threading
+import time
+from collections import Counter
+from typing import Any, AsyncIterator, Callable
 
 from whisper_mic import WhisperMic
 
 from src.logging.logger_protocol import LoggerProtocol
+from src.metrics.metrics_registry import MetricsRegistry, get_metrics
 from src.processors.processor_protocol import ProcessorProtocol
+from src.transcribers.model_names import whisper_model_id
+from src.transcribers.speech_filter import skip_reason, transcript_confidence
+from src.transcribers.transcription_events import EventType, TranscriptionEvent
+from src.utils.memory_info import release_memory
+from src.utils.noise_calibration import Calibration, CalibrationCache, measure_noise_floor, time_of_day_bucket
 
 # WhisperMic returns this prefix on timeout instead of raising exception
 TIMEOUT_PREFIX = "Timeout:"
 
+# Returned from the decode hook instead of empty text for dropped utterances,
+# because WhisperMic.listen() waits forever when a decode yields no text
+SKIPPED_PREFIX = "Skipped:"
+
+# Whisper models consume 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+# Settings a running transcriber picks up without restarting
+LIVE_SETTINGS = (
+    'model', 'pause_threshold', 'listen_timeout', 'energy_threshold', 'dynamic_energy', 'audio_preprocessing',
+)
+
 
 class WhisperMicTranscriber:
     """Transcriber using WhisperMic for audio capture and transcription."""
     
-    def __init__(self, config: dict[str, Any], logger: LoggerProtocol, processor: ProcessorProtocol) -> None:
+    def __init__(
+        self,
+        config: dict[str, Any],
+        logger: LoggerProtocol,
+        processor: ProcessorProtocol,
+        calibration_cache: CalibrationCache | None = None,
+    ) -> None:
         """
         Initialize transcriber with configuration.
         
@@ -27,11 +56,27 @@ class WhisperMicTranscriber:
             config: Configuration dict with whisper settings
             logger: Logger instance for logging
             processor: Object with accept(text: str) method to receive transcribed text
+            calibration_cache: Optional cache of per-device noise calibrations used
+                to seed the energy threshold when dynamic energy is enabled
         """
         self.config = config
         self.logger = logger
         self.processor = processor
+        self.calibration_cache = calibration_cache
+        self._calibration_requested = False
         self.mic = None
+        self.metrics = get_metrics()
+        self.model_name = config.get('model')
+        
+        # Replacement model loaded in the background, swapped in between utterances
+        self._swap_lock = threading.Lock()
+        self._loading_model = None
+        self._pending_model = None
+        self._pending_settings = None
+        self._last_decode = None
+        self.preprocessor = None
+        self._early_exit = None
+        self.skipped_counts: Counter[str] = Counter()
         
         # Read listen timeout values once
         self.listen_timeout = config.get('listen_timeout', 2.0)
@@ -53,6 +98,7 @@ class WhisperMicTranscriber:
         try:
             self.logger.debug(f"Initializing WhisperMic with '{self.config['model']}' model...")
             
+            load_start = time.perf_counter()
             self.mic = WhisperMic(
                 model=self.config['model'],
                 english=True,
@@ -62,8 +108,14 @@ class WhisperMicTranscriber:
                 verbose=self.config.get('debug', False),
                 no_keyboard=True,
             )
+            load_seconds = time.perf_counter() - load_start
+            self.metrics.set('voice_to_code_model_load_seconds', load_seconds, labels={'model': self.config['model']})
+            self._install_decode_hook()
+            self._configure_preprocessor()
+            self.metrics.add_collector(self._collect_queue_depth)
             
-            self.logger.debug("WhisperMic initialized successfully")
+            self.logger.debug(f"WhisperMic initialized successfully in {load_seconds:.1f}s")
+            self._seed_energy_threshold()
             return True
         except Exception as e:
             self.logger.error(f"Failed to initialize WhisperMic: {e}")
@@ -73,6 +125,9 @@ class WhisperMicTranscriber:
         """
         Run continuous voice input loop.
         
+        Synchronous adapter over events(): runs the event stream on its own
+        asyncio loop and hands each final transcript to the processor.
+        
         Args:
             should_continue: Callable returning bool - continue loop while True
         
@@ -83,54 +138,423 @@ class WhisperMicTranscriber:
             self.logger.error("Transcriber not initialized. Call initialize() first.")
             return False
         
-        chunk_num = 0
-        
         try:
-            while should_continue():
-                self.logger.debug(f"Waiting for speech (chunk {chunk_num})...")
-                
-                text = self._listen_and_transcribe()
-                
-                if text:
-                    self.logger.info(f"Transcribed: {text}")
-                    self.processor.accept(text)
-                
-                chunk_num += 1
+            asyncio.run(self._stream_to_processor(should_continue))
         finally:
+            if self.skipped_counts:
+                summary = ', '.join(f"{reason.replace('_', ' ')} {count}" for reason, count in self.skipped_counts.items())
+                self.logger.info(f"Skipped {sum(self.skipped_counts.values())} utterances this session ({summary})")
+            self.metrics.remove_collector(self._collect_queue_depth)
+            self.metrics.set('voice_to_code_audio_queue_depth', 0)
+            with self._swap_lock:
+                self._loading_model = None
+                self._pending_model = None
+                self._pending_settings = None
             self.mic = None
             self.logger = None
             self.processor = None
         
         return True
 
-    def _listen_and_transcribe(self) -> str | None:
+    async def _stream_to_processor(self, should_continue: Callable[[], bool]) -> None:
+        async for event in self.events(should_continue):
+            if event.type == EventType.FINAL:
+                self.processor.accept(event.text, event)
+
+    async def events(self, should_continue: Callable[[], bool] | None = None) -> AsyncIterator[TranscriptionEvent]:
+        """
+        Listen continuously and yield structured events.
+        
+        Each listen attempt yields SPEECH_STARTED once speech is known to be in
+        progress, followed by exactly one of FINAL, SKIPPED, TIMEOUT or ERROR. Capture and
+        decoding run in a worker thread, so the event loop stays free. Whisper
+        decodes whole utterances, so no PARTIAL events are produced.
+        
+        Args:
+            should_continue: Optional callable checked before each listen; stream
+                until the consumer stops iterating if omitted
+        
+        Yields:
+            TranscriptionEvent for each stage of each utterance
+        """
+        if not self.mic:
+            raise RuntimeError("Transcriber not initialized. Call initialize() first.")
+        
+        utterance_id = 0
+        while should_continue is None or should_continue():
+            self._apply_pending_settings()
+            self._apply_pending_model()
+            if self._calibration_requested:
+                self._calibration_requested = False
+                await asyncio.to_thread(self.calibrate)
+            self.logger.debug(f"Waiting for speech (chunk {utterance_id})...")
+            
+            listen = asyncio.ensure_future(asyncio.to_thread(self._listen_once))
+            try:
+                # The recognizer gives up after listen_timeout unless a phrase has
+                # started, so a listen still running past it means speech is in progress
+                done, _ = await asyncio.wait({listen}, timeout=self.listen_timeout)
+                speech_announced = not done
+                if speech_announced:
+                    yield TranscriptionEvent(EventType.SPEECH_STARTED, utterance_id)
+                event = await listen
+            finally:
+                if not listen.done():
+                    # Consumer stopped mid-utterance: let the worker thread finish its listen
+                    await asyncio.wait({listen})
+            
+            event = dataclasses.replace(event, utterance_id=utterance_id)
+            if event.type == EventType.FINAL:
+                if not speech_announced:
+                    yield TranscriptionEvent(
+                        EventType.SPEECH_STARTED, utterance_id, speech_started_at=event.speech_started_at
+                    )
+                self.logger.info(f"Transcribed: {event.text}")
+                self.metrics.inc('voice_to_code_utterances_total')
+            yield event
+            utterance_id += 1
+
+    def update_settings(self, config: dict[str, Any]) -> list[str]:
+        """
+        Apply new settings to a running transcriber.
+        
+        Thresholds take effect from the next utterance. A model change is loaded
+        in the background and swapped in between utterances, so dictation
+        continues on the current model meanwhile.
+        
+        Args:
+            config: Full configuration dict
+            
+        Returns:
+            Names of changed settings that will be applied live
+        """
+        changed = [key for key in LIVE_SETTINGS if key in config and config[key] != self.config.get(key)]
+        if not changed or not self.mic:
+            return []
+        
+        with self._swap_lock:
+            self._pending_settings = dict(config)
+        if 'model' in changed:
+            self.switch_model(config['model'])
+        return changed
+
+    def _apply_pending_settings(self) -> None:
+        """Push settings queued by update_settings() to WhisperMic's recognizer."""
+        with self._swap_lock:
+            config = self._pending_settings
+            self._pending_settings = None
+        if not config:
+            return
+        
+        self.config = {**self.config, **config}
+        self.listen_timeout = self.config.get('listen_timeout', 2.0)
+        recorder = getattr(self.mic, 'recorder', None)
+        if recorder is not None:
+            recorder.pause_threshold = self.config.get('pause_threshold', 2.0)
+            recorder.energy_threshold = self.config.get('energy_threshold', 100)
+            recorder.dynamic_energy_threshold = self.config.get('dynamic_energy', True)
+        self._configure_preprocessor()
+        self.logger.debug("Applied updated audio settings")
+
+    def _configure_preprocessor(self) -> None:
+        """Create or drop the audio preprocessing stage according to config."""
+        if not self.config.get('audio_preprocessing', False):
+            self.preprocessor = None
+            return
+        if self.preprocessor is None:
+            # NumPy comes with Whisper; imported lazily so the stage stays optional
+            from src.transcribers.audio_preprocessor import AudioPreprocessor
+            self.preprocessor = AudioPreprocessor()
+            self.logger.debug("Audio preprocessing enabled (noise suppression, high-pass, AGC)")
+
+    def request_calibration(self) -> None:
+        """Re-measure ambient noise before the next utterance (stay quiet meanwhile)."""
+        self._calibration_requested = True
+
+    def calibrate(self) -> Calibration | None:
+        """
+        Measure ambient noise, set the energy threshold from it and cache the result.
+        
+        Must not run while listening, since it records from the same microphone.
+        
+        Returns:
+            New calibration, or None if measuring failed
+        """
+        seconds = self.config.get('calibration_seconds', 1.5)
+        self.logger.info(f"Calibrating microphone for {seconds:g}s, please stay quiet...")
+        try:
+            recorder = self.mic.recorder
+            noise_floor = measure_noise_floor(self.mic.source, seconds)
+            calibration = Calibration(
+                noise_floor=noise_floor,
+                energy_threshold=round(noise_floor * recorder.dynamic_energy_ratio, 1),
+                calibrated_at=time.time(),
+            )
+        except Exception as e:
+            self.logger.error(f"Microphone calibration failed: {e}")
+            return None
+        
+        recorder.energy_threshold = calibration.energy_threshold
+        self.logger.info(
+            f"Calibrated: noise floor {calibration.noise_floor:.0f}, "
+            f"energy threshold {calibration.energy_threshold:.0f}"
+        )
+        if self.calibration_cache:
+            try:
+                self.calibration_cache.put(self._input_device_name(), time_of_day_bucket(), calibration)
+            except OSError as e:
+                self.logger.warning(f"Could not save calibration: {e}")
+        return calibration
+
+    def _seed_energy_threshold(self) -> None:
+        """Start from the cached calibration for this device, calibrating if there is none."""
+        if not self.calibration_cache or not self.config.get('dynamic_energy', True):
+            return
+        if self._calibration_requested:
+            return  # Fresh calibration runs before the first listen
+        
+        device = self._input_device_name()
+        bucket = time_of_day_bucket()
+        calibration = self.calibration_cache.get(device, bucket)
+        if calibration is None or calibration.is_stale():
+            self.calibrate()
+            return
+        
+        self.mic.recorder.energy_threshold = calibration.energy_threshold
+        self.logger.debug(
+            f"Energy threshold {calibration.energy_threshold:.0f} from cached calibration of '{device}' ({bucket})"
+        )
+
+    def _input_device_name(self) -> str:
+        """Name of the input device WhisperMic records from, or 'default' if unknown."""
+        source = self.mic.source
+        try:
+            audio = source.pyaudio_module.PyAudio()
+            try:
+                if source.device_index is not None:
+                    info = audio.get_device_info_by_index(source.device_index)
+                else:
+                    info = audio.get_default_input_device_info()
+                return str(info.get('name') or 'default')
+            finally:
+                audio.terminate()
+        except Exception:
+            return 'default'
+
+    def switch_model(self, model_name: str) -> None:
+        """
+        Load another Whisper model in the background and use it from the next utterance.
+        
+        The current model keeps serving until the new one is ready, then it is
+        dropped so its memory can be reclaimed. Requesting the model already in
+        use cancels a swap in flight.
+        
+        Args:
+            model_name: Whisper model name (tiny, base, small, medium, large)
+        """
+        with self._swap_lock:
+            if not self.mic or model_name == self._loading_model:
+                return
+            if model_name == self.model_name:
+                # Back to the current model: cancel any swap still in flight
+                self._loading_model = None
+                self._pending_model = None
+                return
+            self._loading_model = model_name
+            self._pending_model = None
+        
+        threading.Thread(
+            target=self._load_replacement_model,
+            args=(model_name,),
+            name='model-loader',
+            daemon=True,
+        ).start()
+
+    def _load_replacement_model(self, model_name: str) -> None:
+        """Load a model off the streaming thread and queue it for swapping in."""
+        logger = self.logger
+        try:
+            load_start = time.perf_counter()
+            model = self._load_model(model_name)
+            load_seconds = time.perf_counter() - load_start
+        except Exception as e:
+            with self._swap_lock:
+                if self._loading_model == model_name:
+                    self._loading_model = None
+            if logger:
+                logger.error(f"Failed to load '{model_name}' model: {e}")
+            return
+        
+        self.metrics.set('voice_to_code_model_load_seconds', load_seconds, labels={'model': model_name})
+        with self._swap_lock:
+            # Drop the result if streaming stopped or another model was requested meanwhile
+            if self._loading_model != model_name:
+                return
+            self._loading_model = None
+            self._pending_model = (model_name, model)
+        if logger:
+            logger.debug(f"Loaded '{model_name}' model in {load_seconds:.1f}s")
+
+    def _load_model(self, model_name: str) -> Any:
+        """Load a Whisper model the same way WhisperMic does, on the current model's device."""
+        import whisper
+        
+        current = getattr(self.mic, 'audio_model', None)
+        device = getattr(current, 'device', None)
+        return whisper.load_model(whisper_model_id(model_name), device=device)
+
+    def _apply_pending_model(self) -> None:
+        """Swap in a model loaded by switch_model() and release the old one."""
+        with self._swap_lock:
+            pending = self._pending_model
+            self._pending_model = None
+        if not pending:
+            return
+        
+        model_name, model = pending
+        previous = self.model_name
+        self.mic.audio_model = model
+        self._install_decode_hook()
+        self.model_name = model_name
+        del model, pending
+        release_memory()
+        self.logger.info(f"Switched transcription model from '{previous}' to '{model_name}'")
+
+    def _install_decode_hook(self) -> None:
+        """Wrap the Whisper model's transcribe() so every decode is timed.
+        
+        WhisperMic captures and decodes inside a single listen() call, so the
+        model is the only place where decode time can be separated from
+        capture time.
+        """
+        model = getattr(self.mic, 'audio_model', None)
+        if model is None:
+            return
+        self._model_transcribe = model.transcribe
+        self._early_exit = self._create_early_exit(model) if self.config.get('speech_filter', True) else None
+        model.transcribe = self._decode
+    
+    def _create_early_exit(self, model: Any) -> Any:
+        """Set up the no-speech precheck for an openai-whisper model, if possible."""
+        if not hasattr(model, 'embed_audio'):
+            return None
+        try:
+            from src.transcribers.early_exit_decoder import EarlyExitDecoder
+        except ImportError as e:
+            self.logger.debug(f"No-speech early exit unavailable: {e}")
+            return None
+        return EarlyExitDecoder(
+            model,
+            self._model_transcribe,
+            self.config.get('no_speech_threshold', 0.6),
+            self.config.get('logprob_threshold', -1.0),
+        )
+    
+    def _decode(self, audio: Any, *args: Any, **kwargs: Any) -> Any:
+        """Decode captured audio with the wrapped model and record timing metrics."""
+        started_at = time.time()
+        preprocessor = self.preprocessor
+        if preprocessor is not None:
+            preprocess_start = time.perf_counter()
+            audio = preprocessor.process(audio)
+            self.metrics.observe('voice_to_code_preprocess_seconds', time.perf_counter() - preprocess_start)
+        
+        start = time.perf_counter()
+        result = None
+        if self._early_exit is not None:
+            try:
+                result = self._early_exit.transcribe(audio, *args, **kwargs)
+            except Exception as e:
+                # Never lose an utterance to the precheck: disable it and decode normally
+                self._early_exit = None
+                if self.logger:
+                    self.logger.warning(f"No-speech early exit failed, disabling it: {e}")
+        if result is None:
+            result = self._model_transcribe(audio, *args, **kwargs)
+        decode_seconds = time.perf_counter() - start
+        
+        audio_seconds = len(audio) / SAMPLE_RATE
+        self.metrics.observe('voice_to_code_decode_seconds', decode_seconds)
+        self.metrics.observe('voice_to_code_audio_seconds', audio_seconds)
+        if audio_seconds > 0:
+            self.metrics.set('voice_to_code_decode_realtime_factor', decode_seconds / audio_seconds)
+        confidence = transcript_confidence(result) if isinstance(result, dict) else None
+        self._last_decode = (started_at, audio_seconds, decode_seconds, confidence)
+        
+        if self.config.get('speech_filter', True) and isinstance(result, dict):
+            reason = skip_reason(
+                result,
+                no_speech_threshold=self.config.get('no_speech_threshold', 0.6),
+                logprob_threshold=self.config.get('logprob_threshold', -1.0),
+            )
+            if reason:
+                self._record_skip(reason, result.get('text', ''))
+                result = {**result, 'text': f"{SKIPPED_PREFIX} {reason}"}
+        return result
+    
+    def _record_skip(self, reason: str, text: str) -> None:
+        """Count and log an utterance dropped by the speech filter."""
+        self.skipped_counts[reason] += 1
+        self.metrics.inc('voice_to_code_utterances_skipped_total', labels={'reason': reason})
+        logger = self.logger
+        if logger:
+            total = sum(self.skipped_counts.values())
+            heard = f": '{text.strip()}'" if text.strip() else ""
+            logger.info(f"Skipped utterance ({reason.replace('_', ' ')}){heard} [{total} skipped this session]")
+    
+    def _collect_queue_depth(self, registry: MetricsRegistry) -> None:
+        """Metrics collector reporting audio chunks waiting to be decoded."""
+        mic = self.mic
+        queue = getattr(mic, 'audio_queue', None) if mic else None
+        if queue is not None:
+            registry.set('voice_to_code_audio_queue_depth', queue.qsize())
+
+    def _listen_once(self) -> TranscriptionEvent:
         """
         Listen for speech, auto-detect pause, and transcribe.
         
+        Runs in a worker thread. The utterance id is filled in by events().
+        
         Returns:
-            Transcribed text or None if timeout/interrupted/failed.
+            FINAL event with the text, TIMEOUT if nothing was said, or ERROR if listening failed.
         """
+        self._last_decode = None
         try:
             self.logger.debug("Listening for speech...")
             result = self.mic.listen(timeout=self.listen_timeout)
-            
-            # Handle verbose mode (returns dict) vs normal mode (returns string)
-            if isinstance(result, dict):
-                text = result.get('text', '')
-            else:
-                text = result if result else ''
-            
-            # Check for timeout message
-            if self.is_timeout(text):
-                self.logger.debug(f"No speech detected within {self.listen_timeout}s timeout")
-                return None
-            
-            if text and text.strip():
-                return text.strip()
-            else:
-                self.logger.debug("No speech detected or empty result")
-                return None
-                
         except Exception as e:
             self.logger.error(f"Listen/transcription failed: {e}")
-            return None
+            return TranscriptionEvent(EventType.ERROR, 0, error=e)
+        
+        # Handle verbose mode (returns dict) vs normal mode (returns string)
+        if isinstance(result, dict):
+            text = result.get('text', '')
+        else:
+            text = result if result else ''
+        
+        # Check for timeout message
+        if self.is_timeout(text):
+            self.logger.debug(f"No speech detected within {self.listen_timeout}s timeout")
+            return TranscriptionEvent(EventType.TIMEOUT, 0)
+        
+        if text.startswith(SKIPPED_PREFIX):
+            return TranscriptionEvent(EventType.SKIPPED, 0, reason=text[len(SKIPPED_PREFIX):].strip())
+        
+        if not text or not text.strip():
+            self.logger.debug("No speech detected or empty result")
+            return TranscriptionEvent(EventType.TIMEOUT, 0)
+        
+        decode = self._last_decode
+        if decode is None:
+            return TranscriptionEvent(EventType.FINAL, 0, text=text.strip())
+        decode_started_at, audio_seconds, decode_seconds, confidence = decode
+        return TranscriptionEvent(
+            EventType.FINAL,
+            0,
+            text=text.strip(),
+            # Captured audio ends where decoding starts (the trailing pause is included)
+            speech_started_at=decode_started_at - audio_seconds,
+            audio_seconds=audio_seconds,
+            decode_seconds=decode_seconds,
+            confidence=confidence,
+        )
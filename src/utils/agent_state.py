@@ -0,0 +1,354 @@
+"""Tell whether the agent in a tmux pane is busy or waiting at its prompt.
+
+Each watched pane's output is streamed with `tmux pipe-pane` into a FIFO
+read by a background thread, so state changes are seen as they happen
+without polling capture-pane. The agent counts as idle once its output has
+been quiet for a moment and, if idle patterns are configured, the latest
+output matches one of them (e.g. the hint line agents show under an empty
+prompt). Senders wait for that before typing, so dictation never lands in
+the middle of a response.
+
+Output following each sent prompt is also collected as a turn, handed to an
+optional callback as soon as the agent is idle again (e.g. to read the
+response out loud).
+"""
+
+import codecs
+import itertools
+import os
+import re
+import select
+import shlex
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from src.logging.logger_protocol import LoggerProtocol
+from src.utils.tmux_client import TmuxClient, TmuxCommandError
+
+# Seconds the pane must stay quiet before the agent counts as idle
+DEFAULT_QUIET_SECONDS = 0.5
+
+# Seconds to wait for the agent before sending anyway
+DEFAULT_MAX_WAIT = 60.0
+
+# Characters of recent output that idle patterns are matched against
+TAIL_CHARS = 2048
+
+# Characters of a turn's output kept for the turn callback (the end of long responses)
+TURN_CHARS = 16384
+
+# Called with (target, prompt sent, output since) when a turn ends
+TurnCallback = Callable[[str, str, str], None]
+
+# Terminal escape sequences (CSI, OSC, two-character escapes) and control characters other than newline
+_ESCAPES = re.compile(
+    r'\x1b\[[0-?]*[ -/]*[@-~]'
+    r'|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)'
+    r'|\x1b[@-Z\\-_]'
+    r'|[\x00-\x09\x0b-\x1f\x7f]'
+)
+
+
+def strip_escapes(text: str) -> str:
+    """Remove terminal escape sequences and control characters, keeping line breaks."""
+    return _ESCAPES.sub('', text.replace('\r', '\n'))
+
+
+class PaneAlreadyPipedError(Exception):
+    """The pane's output is already piped somewhere else, e.g. to the user's own log."""
+
+
+class PaneMonitor:
+    """Streams one pane's output and tracks whether its agent is idle."""
+
+    def __init__(
+        self,
+        client: TmuxClient,
+        target: str,
+        idle_patterns: list[re.Pattern],
+        fifo_path: Path,
+        quiet_seconds: float = DEFAULT_QUIET_SECONDS,
+        on_turn_end: TurnCallback | None = None,
+    ) -> None:
+        """
+        Start streaming the pane's output.
+
+        Args:
+            client: tmux connection
+            target: Pane, window or session to watch
+            idle_patterns: Compiled patterns, one of which the latest output must match
+                to count as idle (empty: quiet output is enough)
+            fifo_path: FIFO to create and stream the output through
+            quiet_seconds: Seconds the output must stay quiet to count as idle
+            on_turn_end: Called on the reader thread once the agent is idle after mark_busy()
+
+        Raises:
+            PaneAlreadyPipedError: If the pane already has a pipe, which is left alone
+            OSError: If the FIFO can't be created
+            TmuxCommandError: If tmux refuses to pipe the pane
+        """
+        self.client = client
+        self.target = target
+        self.idle_patterns = idle_patterns
+        self.fifo_path = fifo_path
+        self.quiet_seconds = quiet_seconds
+        self.on_turn_end = on_turn_end
+
+        self._condition = threading.Condition()
+        self._tail = ''
+        self._last_output_at = 0.0
+        self._prompt = ''
+        self._turn: str | None = None  # Output since the last prompt, None outside a turn
+        self._stopped = threading.Event()
+
+        # A pane has one pipe: taking it over would cut off the user's own pipe-pane
+        if client.run('display-message', '-p', '-t', target, '#{pane_pipe}') == ['1']:
+            raise PaneAlreadyPipedError(f"tmux target '{target}' already pipes its output elsewhere")
+        os.mkfifo(fifo_path, 0o600)
+        # Open our own writer too, so reads don't see end-of-file before tmux's writer connects
+        self._read_fd = os.open(fifo_path, os.O_RDONLY | os.O_NONBLOCK)
+        self._write_fd = os.open(fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+        try:
+            # What is on screen now, so an agent already at its prompt is recognised
+            self._tail = strip_escapes('\n'.join(client.run('capture-pane', '-p', '-t', target)))[-TAIL_CHARS:]
+            # -O: output from the pane only; -o: don't replace a pipe opened since the check
+            client.run('pipe-pane', '-O', '-o', '-t', target, f"cat > {shlex.quote(str(fifo_path))}")
+        except TmuxCommandError:
+            self._close_fifo()
+            raise
+        self._thread = threading.Thread(target=self._read, name='pane-monitor', daemon=True)
+        self._thread.start()
+
+    def is_idle(self) -> bool:
+        """Whether the output has gone quiet at a prompt."""
+        with self._condition:
+            return self._is_idle(time.monotonic())
+
+    def mark_busy(self, prompt: str = '') -> None:
+        """
+        Note that input was just sent, so earlier output no longer shows the agent idle.
+
+        Args:
+            prompt: Text that was sent, passed on to the turn callback
+        """
+        with self._condition:
+            self._tail = ''
+            self._last_output_at = time.monotonic()
+            self._prompt = prompt
+            self._turn = ''
+
+    def wait_until_idle(self, timeout: float) -> bool:
+        """
+        Block until the agent is idle.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the agent became idle, False on timeout or when the monitor stopped
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while not self._stopped.is_set():
+                now = time.monotonic()
+                if self._is_idle(now):
+                    return True
+                if now >= deadline:
+                    return False
+                # Woken by new output; otherwise recheck once the output may have gone quiet
+                quiet_at = self._last_output_at + self.quiet_seconds
+                wake_at = quiet_at if quiet_at > now else deadline
+                self._condition.wait(min(wake_at, deadline) - now)
+        return False
+
+    def close(self) -> None:
+        """Stop streaming the pane's output and remove the FIFO."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        try:
+            # pipe-pane without a command closes the pipe
+            self.client.run('pipe-pane', '-t', self.target)
+        except TmuxCommandError:
+            pass  # Pane already gone
+        try:
+            os.write(self._write_fd, b'\0')  # Wake the reader
+        except OSError:
+            pass
+        self._thread.join(timeout=1.0)
+        self._close_fifo()
+        with self._condition:
+            self._condition.notify_all()
+
+    def _is_idle(self, now: float) -> bool:
+        if now - self._last_output_at < self.quiet_seconds:
+            return False
+        return not self.idle_patterns or any(pattern.search(self._tail) for pattern in self.idle_patterns)
+
+    def _read(self) -> None:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        while not self._stopped.is_set():
+            try:
+                ready, _, _ = select.select([self._read_fd], [], [], 0.1)
+                if not ready:
+                    self._check_turn_end()
+                    continue
+                data = os.read(self._read_fd, 65536)
+            except (OSError, ValueError):
+                return
+            if self._stopped.is_set():
+                return
+            text = strip_escapes(decoder.decode(data))
+            with self._condition:
+                self._last_output_at = time.monotonic()
+                self._tail = (self._tail + text)[-TAIL_CHARS:]
+                if self._turn is not None:
+                    self._turn = (self._turn + text)[-TURN_CHARS:]
+                self._condition.notify_all()
+
+    def _check_turn_end(self) -> None:
+        """Hand a finished turn to the callback once the agent is idle again."""
+        with self._condition:
+            # Nothing since the prompt: the agent hasn't started, not finished
+            if not self._turn or self._turn.isspace() or not self._is_idle(time.monotonic()):
+                return
+            prompt, output = self._prompt, self._turn
+            self._turn = None
+        if self.on_turn_end:
+            try:
+                self.on_turn_end(self.target, prompt, output)
+            except Exception:
+                pass  # A faulty callback must not stop the monitor
+
+    def _close_fifo(self) -> None:
+        for fd in (self._read_fd, self._write_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        try:
+            self.fifo_path.unlink()
+        except OSError:
+            pass
+
+
+class AgentStateTracker:
+    """Watches the panes transcripts are sent to and waits for their agent to be idle."""
+
+    def __init__(
+        self,
+        client: TmuxClient,
+        logger: LoggerProtocol,
+        idle_patterns: list[str] | None = None,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        quiet_seconds: float = DEFAULT_QUIET_SECONDS,
+        on_turn_end: TurnCallback | None = None,
+    ) -> None:
+        """
+        Initialize tracker. Panes are watched from the first wait on them (or watch()).
+
+        Args:
+            client: tmux connection
+            logger: Logger instance for logging
+            idle_patterns: Regular expressions (multi-line) one of which the latest
+                output must match to count as idle (empty: quiet output is enough)
+            max_wait: Seconds to wait for the agent before sending anyway
+            quiet_seconds: Seconds the output must stay quiet to count as idle
+            on_turn_end: Called with (target, prompt, output) when an agent is idle
+                again after mark_busy()
+
+        Raises:
+            ValueError: If an idle pattern is not a valid regular expression
+        """
+        self.client = client
+        self.logger = logger
+        self.max_wait = max_wait
+        self.quiet_seconds = quiet_seconds
+        self.on_turn_end = on_turn_end
+        try:
+            self.idle_patterns = [re.compile(pattern, re.MULTILINE) for pattern in idle_patterns or []]
+        except re.error as e:
+            raise ValueError(f"Invalid agent idle pattern: {e}") from e
+
+        self._lock = threading.Lock()
+        self._monitors: dict[str, PaneMonitor] = {}
+        self._piped_elsewhere: set[str] = set()  # Targets left alone because they have a pipe already
+        self._fifo_dir: Path | None = None
+        self._fifo_ids = itertools.count()
+
+    def wait_until_idle(self, target: str) -> bool:
+        """
+        Block until the agent in target is idle, for up to max_wait seconds.
+
+        Args:
+            target: tmux target transcripts are sent to
+
+        Returns:
+            True if the agent is idle (or its state can't be watched), False on timeout
+        """
+        monitor = self.watch(target)
+        if monitor is None:
+            return True
+        return monitor.wait_until_idle(self.max_wait)
+
+    def mark_busy(self, target: str, prompt: str = '') -> None:
+        """
+        Note that input was just sent to target (ignored for targets not watched).
+
+        Args:
+            target: tmux target the input went to
+            prompt: Text that was sent, passed on to the turn callback
+        """
+        monitor = self._monitors.get(target)
+        if monitor is not None:
+            monitor.mark_busy(prompt)
+
+    def close(self) -> None:
+        """Stop watching all panes."""
+        with self._lock:
+            monitors = list(self._monitors.values())
+            self._monitors.clear()
+        for monitor in monitors:
+            monitor.close()
+        if self._fifo_dir is not None:
+            try:
+                self._fifo_dir.rmdir()
+            except OSError:
+                pass
+
+    def watch(self, target: str) -> PaneMonitor | None:
+        """
+        Start watching a target, if not watched yet.
+
+        Args:
+            target: tmux target
+
+        Returns:
+            The target's monitor, None if the pane can't be watched
+        """
+        with self._lock:
+            if target in self._monitors:
+                return self._monitors[target]
+            if target in self._piped_elsewhere:
+                return None
+            if self._fifo_dir is None:
+                self._fifo_dir = Path(tempfile.mkdtemp(prefix='voice-to-code-panes-'))
+            fifo_path = self._fifo_dir / f"pane-{next(self._fifo_ids)}.fifo"
+            try:
+                monitor = PaneMonitor(
+                    self.client, target, self.idle_patterns, fifo_path, self.quiet_seconds, on_turn_end=self.on_turn_end,
+                )
+            except PaneAlreadyPipedError as e:
+                self._piped_elsewhere.add(target)
+                self.logger.info(f"{e}, not watching it: sending without waiting for the agent and without reading responses")
+                return None
+            except (OSError, TmuxCommandError) as e:
+                # Not remembered, so watching is tried again with the next transcript
+                self.logger.warning(f"Can't watch tmux target '{target}', sending without waiting for the agent: {e}")
+                return None
+            self.logger.debug(f"Watching tmux target '{target}' for agent activity")
+            self._monitors[target] = monitor
+            return monitor
@@ -1,5 +1,6 @@
 """Utility to write configuration to config.py file."""
 
+from pathlib import Path
 
 
 def write_config_to_file(config_dict, config_file_path):
@@ -11,7 +12,8 @@ def write_config_to_file(config_dict, config_file_path):
         config_file_path: Path to config.py file
     """
     # Format the config dictionary
-    lines = ["# Voice-to-Code Configuration\n\n", "CONFIG = {\n"]
+    lines = ["CONFIG = {\n"]
+    uses_path = False
     
     for key, value in config_dict.items():
         # Format the comment
@@ -21,9 +23,16 @@ def write_config_to_file(config_dict, config_file_path):
         
         # Format the value
         formatted_value = _format_value(value)
+        uses_path = uses_path or formatted_value.startswith('Path(')
         lines.append(f"    '{key}': {formatted_value},\n")
         lines.append("\n")
     
+    # Path values need the import to load
+    header = "# Voice-to-Code Configuration\n\n"
+    if uses_path:
+        header += "from pathlib import Path\n\n"
+    lines.insert(0, header)
+    
     # Remove last newline and close dict
     if lines[-1] == "\n":
         lines.pop()
@@ -40,6 +49,8 @@ def _format_value(value):
         return str(value)
     elif isinstance(value, (int, float)):
         return str(value)
+    elif isinstance(value, Path):
+        return f'Path("{value}")'
     elif isinstance(value, str):
         # Check if it's a path-like string
         if value.startswith('/') or value.startswith('~'):
@@ -54,13 +65,49 @@ def _get_config_comment(key):
     comments = {
         'transcriber_type': '# Transcriber type: which speech-to-text implementation to use',
         'processor_type': '# Processor type: where to send transcribed text',
+        'fanout': "# Fan-out: allow several comma-separated targets in the session dropdown, delivered to concurrently\n    # Targets may be tmux sessions or panes, 'socket:<path>' or webhook URLs",
+        'session_discovery': '# Session discovery: list running tmux sessions and panes in the session dropdown, updated live',
+        'paste_threshold': '# Paste threshold: transcripts longer than this many characters are pasted into tmux instead of typed\n    # Pasting is faster for long dictations and arrives as one bracketed paste (0 = always type)',
+        'socket_path': "# Socket path: Unix socket or FIFO the 'socket' processor writes JSON lines to",
+        'webhook_url': "# Webhook URL: where the 'webhook' processor POSTs JSON records",
+        'webhook_timeout': '# Webhook timeout: seconds to wait for the webhook to connect or respond',
+        'webhook_retries': '# Webhook retries: retries after a failed request (connection errors, 429 and 5xx), with jittered backoff',
+        'webhook_batch_window': '# Webhook batch window: seconds to collect rapid utterances into one request (0 = send each immediately)',
         'vocalize_response': '# Vocalize AI agent responses using text-to-speech',
+        'vocalize_mode': "# Vocalize mode: how responses are vocalized (tmux only)\n    # 'local' = read the end of each response from the pane output, 'agent' = ask the agent to run say (macOS)\n    # None = 'agent' on macOS, 'local' elsewhere",
+        'agent_gate': "# Agent gate: watch the target pane's output and hold transcripts while the agent is still responding",
+        'agent_idle_patterns': "# Agent idle patterns: regular expressions, one of which the pane's latest output must match\n    # for the agent to count as idle (empty = quiet output is enough), e.g. [r'\\? for shortcuts']",
+        'agent_max_wait': '# Agent max wait: seconds to hold a transcript for a busy agent before sending it anyway',
+        'spoken_code': '# Spoken code: rewrite dictated symbols, casing and numbers into code before delivery\n    # ("camel case get value open paren number forty two close paren" -> "getValue(42)"), extra rules in ~/.voice-to-code/spoken_code.json',
+        'voice_macros': '# Voice macros: replace trigger phrases with their expansion from ~/.voice-to-code/macros.json\n    # The file is reloaded when it changes; multi-line expansions are pasted into tmux as a whole',
+        'outbox': '# Outbox: record every transcript in ~/.voice-to-code/outbox.db until it is delivered\n    # Failed deliveries are retried automatically and listed under Settings → Undelivered Transcripts',
+        'delivery_queue': "# Delivery queue: send transcripts from a background thread so a slow target doesn't delay listening",
+        'delivery_queue_size': '# Delivery queue size: transcripts that may wait for delivery before delivery_overflow applies',
+        'delivery_overflow': "# Delivery overflow: what to do when the queue is full\n    # 'block' = wait for room, 'drop_oldest' = discard the oldest transcript, 'merge' = append to the newest one",
         'model': '# Whisper model: tiny, base, small, medium, large\n    # Trade-off: larger = more accurate but slower',
         'pause_threshold': '# Pause threshold: seconds of silence before ending a phrase',
         'listen_timeout': '# Listen timeout: max seconds to wait for speech to start before checking stop flag',
         'energy_threshold': '# Energy threshold: minimum audio energy to detect speech (higher = less sensitive)\n    # Default 300 works for most environments',
         'dynamic_energy': '# Dynamic energy: auto-adjust energy threshold based on ambient noise',
+        'audio_preprocessing': '# Audio preprocessing: noise suppression, high-pass filter and automatic gain control before decoding\n    # Makes accuracy less dependent on the mic input volume',
+        'speech_filter': '# Speech filter: drop non-speech and hallucinated results (e.g. "Thank you." from a cough)\n    # Decoding stops after the first decoder step when no speech is detected',
+        'no_speech_threshold': "# No-speech threshold: Whisper's no-speech probability above which audio is dropped\n    # (only when the text is also below logprob_threshold, as in Whisper)",
+        'logprob_threshold': '# Log-probability threshold: average token log probability below which text is dropped',
+        'calibration_cache': '# Calibration cache: seed the energy threshold from a per-device, time-of-day noise calibration\n    # Only used with dynamic_energy; calibrations are stored in ~/.voice-to-code/calibration.json',
+        'calibration_seconds': '# Calibration seconds: how long to measure ambient noise when calibrating',
         'log_handler_type': '# Log handler type: where to send log messages',
+        'log_max_lines': '# Log max lines: lines kept in the log view, older ones are removed',
+        'log_max_bytes': "# Log max bytes: start a new log file once it reaches this size (0 = no size limit)\n    # Only used with the 'file' log handler type",
+        'log_max_age_hours': '# Log max age: start a new log file after this many hours (0 = no age limit)',
+        'log_backup_count': '# Log backups: rotated log files kept as voice_input.log.1, .2, ...',
+        'log_compress': '# Log compress: gzip rotated log files',
         'debug': '# Debug mode: log detailed operation info\n    # False = only log start/stop/errors/transcriptions\n    # True = log all operational details',
+        'metrics_enabled': '# Metrics: expose counters and gauges for monitoring',
+        'metrics_port': '# Metrics port: serve http://127.0.0.1:<port>/metrics (0 = no HTTP endpoint)',
+        'metrics_textfile': '# Metrics textfile: periodically rewrite ~/.voice-to-code/voice_to_code.prom',
+        'memory_watchdog': '# Memory watchdog: shed memory when the system runs low instead of swapping',
+        'memory_max_rss_mb': '# Memory limit: process RSS in MB that counts as memory pressure (0 = no limit)',
+        'memory_min_available_mb': '# Memory floor: system available memory in MB that counts as memory pressure (0 = no floor, Linux only)',
+        'memory_fallback_model': '# Fallback model: smaller Whisper model to switch to under memory pressure',
     }
     return comments.get(key, '')
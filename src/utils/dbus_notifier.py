@@ -0,0 +1,458 @@
+"""Desktop notifications over a persistent D-Bus session connection.
+
+Talks to org.freedesktop.Notifications directly on the session bus, so a
+notification is one message on an open socket instead of a notify-send
+process. The connection is opened on first use and kept; the small subset
+of the D-Bus wire protocol needed for method calls (EXTERNAL auth, basic
+types, arrays, dicts and variants) is implemented here, without extra
+dependencies.
+
+Notifications sharing a key within a short window update one notification
+("Send failed (3×)") instead of stacking up.
+"""
+
+import os
+import socket
+import struct
+import threading
+import time
+from typing import Any, NamedTuple
+
+# Message types
+METHOD_CALL = 1
+METHOD_RETURN = 2
+ERROR = 3
+SIGNAL = 4
+
+# Header field codes
+(FIELD_PATH, FIELD_INTERFACE, FIELD_MEMBER, FIELD_ERROR_NAME,
+ FIELD_REPLY_SERIAL, FIELD_DESTINATION, FIELD_SENDER, FIELD_SIGNATURE) = range(1, 9)
+_HEADER_FIELD_TYPES = {
+    FIELD_PATH: 'o', FIELD_INTERFACE: 's', FIELD_MEMBER: 's', FIELD_ERROR_NAME: 's',
+    FIELD_REPLY_SERIAL: 'u', FIELD_DESTINATION: 's', FIELD_SENDER: 's', FIELD_SIGNATURE: 'g',
+}
+
+# Seconds to wait for a reply
+DEFAULT_TIMEOUT = 2.0
+
+# Notifications with the same key within this many seconds update one notification
+DEFAULT_COALESCE_SECONDS = 10.0
+
+# Milliseconds a notification stays up (-1: the server's default)
+EXPIRE_DEFAULT = -1
+
+_ALIGNMENT = {'y': 1, 'b': 4, 'n': 2, 'q': 2, 'i': 4, 'u': 4, 'x': 8, 't': 8, 'd': 8,
+              's': 4, 'o': 4, 'g': 1, 'a': 4, '(': 8, '{': 8, 'v': 1}
+_FIXED = {'y': 'B', 'b': 'I', 'n': 'h', 'q': 'H', 'i': 'i', 'u': 'I', 'x': 'q', 't': 'Q', 'd': 'd'}
+
+
+class Message(NamedTuple):
+    """An unmarshalled message."""
+    type: int
+    serial: int
+    fields: dict[int, Any]  # Header fields by code
+    body: list[Any]
+
+
+class DBusError(Exception):
+    """The bus or a service answered with an error."""
+
+
+class DBusConnectionError(DBusError):
+    """The bus can't be reached or the connection broke."""
+
+
+def split_signature(signature: str) -> list[str]:
+    """
+    Split a signature into single complete types.
+
+    Args:
+        signature: D-Bus signature, e.g. 'susa{sv}'
+
+    Returns:
+        Complete types, e.g. ['s', 'u', 's', 'a{sv}']
+
+    Raises:
+        DBusError: If the signature is malformed
+    """
+    types = []
+    index = 0
+    while index < len(signature):
+        end = _type_end(signature, index)
+        types.append(signature[index:end])
+        index = end
+    return types
+
+
+def _type_end(signature: str, index: int) -> int:
+    if index >= len(signature):
+        raise DBusError(f"Incomplete signature: {signature!r}")
+    code = signature[index]
+    if code == 'a':
+        return _type_end(signature, index + 1)
+    if code in '({':
+        close = ')' if code == '(' else '}'
+        index += 1
+        while index < len(signature) and signature[index] != close:
+            index = _type_end(signature, index)
+        if index >= len(signature):
+            raise DBusError(f"Unclosed container in signature: {signature!r}")
+        return index + 1
+    if code not in _ALIGNMENT:
+        raise DBusError(f"Unsupported type {code!r} in signature: {signature!r}")
+    return index + 1
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def align(self, boundary: int) -> None:
+        self.data.extend(b'\0' * (-len(self.data) % boundary))
+
+    def write(self, signature: str, value: Any) -> None:
+        code = signature[0]
+        self.align(_ALIGNMENT[code])
+        if code in _FIXED:
+            self.data.extend(struct.pack('<' + _FIXED[code], value))
+        elif code in 'so':
+            encoded = value.encode('utf-8')
+            self.data.extend(struct.pack('<I', len(encoded)) + encoded + b'\0')
+        elif code == 'g':
+            encoded = value.encode('ascii')
+            self.data.extend(struct.pack('<B', len(encoded)) + encoded + b'\0')
+        elif code == 'v':
+            value_signature, inner = value
+            self.write('g', value_signature)
+            self.write(value_signature, inner)
+        elif code == 'a':
+            element = signature[1:]
+            length_at = len(self.data)
+            self.data.extend(b'\0\0\0\0')
+            self.align(_ALIGNMENT[element[0]])
+            start = len(self.data)
+            items = value.items() if element[0] == '{' else value
+            for item in items:
+                self.write(element, item)
+            struct.pack_into('<I', self.data, length_at, len(self.data) - start)
+        elif code in '({':
+            for member, item in zip(split_signature(signature[1:-1]), value):
+                self.write(member, item)
+
+
+class _Reader:
+    def __init__(self, data: bytes, offset: int = 0) -> None:
+        self.data = data
+        self.offset = offset
+
+    def align(self, boundary: int) -> None:
+        self.offset += -self.offset % boundary
+
+    def read(self, signature: str) -> Any:
+        code = signature[0]
+        self.align(_ALIGNMENT[code])
+        if code in _FIXED:
+            fmt = '<' + _FIXED[code]
+            (value,) = struct.unpack_from(fmt, self.data, self.offset)
+            self.offset += struct.calcsize(fmt)
+            return bool(value) if code == 'b' else value
+        if code in 'sog':
+            fmt = '<B' if code == 'g' else '<I'
+            (length,) = struct.unpack_from(fmt, self.data, self.offset)
+            self.offset += struct.calcsize(fmt)
+            value = self.data[self.offset:self.offset + length].decode('utf-8')
+            self.offset += length + 1
+            return value
+        if code == 'v':
+            value_signature = self.read('g')
+            return value_signature, self.read(value_signature)
+        if code == 'a':
+            element = signature[1:]
+            (length,) = struct.unpack_from('<I', self.data, self.offset)
+            self.offset += 4
+            self.align(_ALIGNMENT[element[0]])
+            end = self.offset + length
+            items = []
+            while self.offset < end:
+                items.append(self.read(element))
+            return dict(items) if element[0] == '{' else items
+        # Struct or dict entry
+        return tuple(self.read(member) for member in split_signature(signature[1:-1]))
+
+
+def build_message(
+    message_type: int,
+    serial: int,
+    fields: dict[int, Any],
+    signature: str = '',
+    body: list[Any] | tuple = (),
+) -> bytes:
+    """
+    Marshal a message.
+
+    Args:
+        message_type: METHOD_CALL, METHOD_RETURN, ERROR, ...
+        serial: Message serial, non-zero
+        fields: Header fields by code (path, member, reply serial, ...)
+        signature: Body signature
+        body: Body values, one per complete type in signature
+
+    Returns:
+        Message bytes
+    """
+    body_writer = _Writer()
+    for member, value in zip(split_signature(signature), body):
+        body_writer.write(member, value)
+    if signature:
+        fields = {**fields, FIELD_SIGNATURE: signature}
+
+    header = _Writer()
+    header.data.extend(struct.pack('<cBBBII', b'l', message_type, 0, 1, len(body_writer.data), serial))
+    header.write('a(yv)', [(code, (_HEADER_FIELD_TYPES[code], value)) for code, value in fields.items()])
+    header.align(8)
+    return bytes(header.data + body_writer.data)
+
+
+def read_message(sock: socket.socket) -> Message:
+    """
+    Read and unmarshal one message.
+
+    Args:
+        sock: Authenticated connection
+
+    Returns:
+        The message
+
+    Raises:
+        DBusConnectionError: If the connection closed
+        DBusError: If the message is malformed
+    """
+    fixed = _receive(sock, 16)
+    endian, message_type, _flags, _version, body_length, serial, fields_length = struct.unpack('<cBBBIII', fixed)
+    if endian != b'l':
+        raise DBusError("Big-endian messages are not supported")
+    header_length = 16 + fields_length + (-(16 + fields_length) % 8)
+    data = fixed + _receive(sock, header_length - 16 + body_length)
+    fields = dict((code, value) for code, (_sig, value) in _Reader(data, 12).read('a(yv)'))
+    body_reader = _Reader(data, header_length)
+    body = [body_reader.read(member) for member in split_signature(fields.get(FIELD_SIGNATURE, ''))]
+    return Message(message_type, serial, fields, body)
+
+
+def _receive(sock: socket.socket, length: int) -> bytes:
+    data = bytearray()
+    while len(data) < length:
+        chunk = sock.recv(length - len(data))
+        if not chunk:
+            raise DBusConnectionError("Connection closed by the bus")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def session_bus_address() -> str | None:
+    """Get the session bus socket address, None if there is no session bus."""
+    return os.environ.get('DBUS_SESSION_BUS_ADDRESS') or None
+
+
+def connect(address: str, timeout: float = DEFAULT_TIMEOUT) -> socket.socket:
+    """
+    Open and authenticate a connection to a bus.
+
+    Args:
+        address: Bus address, e.g. 'unix:path=/run/user/1000/bus' (several separated by ';')
+        timeout: Seconds to wait for the bus to answer
+
+    Returns:
+        Connected socket, ready for messages
+
+    Raises:
+        DBusConnectionError: If no address could be connected to or authentication failed
+    """
+    errors = []
+    for entry in address.split(';'):
+        transport, _, params = entry.partition(':')
+        options = dict(param.partition('=')[::2] for param in params.split(',') if param)
+        if transport != 'unix':
+            errors.append(f"unsupported transport '{transport}'")
+            continue
+        if 'path' in options:
+            path = options['path']
+        elif 'abstract' in options:
+            path = '\0' + options['abstract']
+        else:
+            errors.append(f"no socket in '{entry}'")
+            continue
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+            _authenticate(sock)
+            return sock
+        except (OSError, DBusError) as e:
+            sock.close()
+            errors.append(str(e))
+    raise DBusConnectionError(f"Can't connect to D-Bus at {address}: {'; '.join(errors)}")
+
+
+def _authenticate(sock: socket.socket) -> None:
+    uid = str(os.getuid()).encode('ascii').hex()
+    sock.sendall(b'\0AUTH EXTERNAL ' + uid.encode('ascii') + b'\r\n')
+    reply = bytearray()
+    while not reply.endswith(b'\r\n'):
+        chunk = sock.recv(256)
+        if not chunk:
+            raise DBusConnectionError("Connection closed during authentication")
+        reply.extend(chunk)
+    if not reply.startswith(b'OK '):
+        raise DBusConnectionError(f"Authentication rejected: {reply.decode('ascii', 'replace').strip()}")
+    sock.sendall(b'BEGIN\r\n')
+
+
+class DBusConnection:
+    """Persistent session bus connection for method calls. Safe to share between threads."""
+
+    def __init__(self, address: str, timeout: float = DEFAULT_TIMEOUT) -> None:
+        """
+        Connect and register on the bus.
+
+        Args:
+            address: Bus address
+            timeout: Seconds to wait for replies
+
+        Raises:
+            DBusConnectionError: If the bus can't be reached
+        """
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._serial = 0
+        self._sock = connect(address, timeout)
+        try:
+            self.unique_name = self.call('org.freedesktop.DBus', '/org/freedesktop/DBus', 'org.freedesktop.DBus', 'Hello')[0]
+        except (OSError, DBusError):
+            self.close()
+            raise
+
+    def call(
+        self,
+        destination: str,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = '',
+        body: list[Any] | tuple = (),
+    ) -> list[Any]:
+        """
+        Call a method and wait for its reply.
+
+        Returns:
+            Reply values
+
+        Raises:
+            DBusConnectionError: If the connection broke
+            DBusError: If the call failed
+        """
+        with self._lock:
+            self._serial += 1
+            serial = self._serial
+            fields = {FIELD_PATH: path, FIELD_INTERFACE: interface, FIELD_MEMBER: member, FIELD_DESTINATION: destination}
+            try:
+                self._sock.sendall(build_message(METHOD_CALL, serial, fields, signature, body))
+                while True:
+                    reply = read_message(self._sock)
+                    if reply.fields.get(FIELD_REPLY_SERIAL) != serial:
+                        continue  # Signals and other traffic
+                    if reply.type == ERROR:
+                        detail = reply.body[0] if reply.body and isinstance(reply.body[0], str) else ''
+                        raise DBusError(f"{reply.fields.get(FIELD_ERROR_NAME)}: {detail}")
+                    return reply.body
+            except OSError as e:
+                raise DBusConnectionError(f"D-Bus connection failed: {e}") from e
+
+    def close(self) -> None:
+        """Close the connection."""
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+class DBusNotifier:
+    """Sends desktop notifications over the session bus, coalescing bursts."""
+
+    def __init__(
+        self,
+        address: str | None = None,
+        app_name: str = 'Voice to Code',
+        coalesce_seconds: float = DEFAULT_COALESCE_SECONDS,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        """
+        Initialize notifier. The bus is connected on the first notification.
+
+        Args:
+            address: Bus address (defaults to the session bus from the environment)
+            app_name: Application name shown with notifications
+            coalesce_seconds: Notifications with the same key within this many seconds update one notification
+            timeout: Seconds to wait for the notification service
+        """
+        self.address = address or session_bus_address()
+        self.app_name = app_name
+        self.coalesce_seconds = coalesce_seconds
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._connection: DBusConnection | None = None
+        self._recent: dict[str, tuple[int, int, float]] = {}  # key -> (notification id, count, sent at)
+
+    def notify(self, title: str, message: str, key: str | None = None) -> bool:
+        """
+        Show a notification, or update the last one with the same key.
+
+        Args:
+            title: Notification title
+            message: Notification text
+            key: Notifications to coalesce (defaults to the title)
+
+        Returns:
+            True if the notification service took it, False if the bus or the service isn't available
+        """
+        if not self.address:
+            return False
+        key = title if key is None else key
+        with self._lock:
+            now = time.monotonic()
+            replaces_id, count, sent_at = self._recent.get(key, (0, 0, 0.0))
+            if now - sent_at > self.coalesce_seconds:
+                replaces_id, count = 0, 0
+            count += 1
+            body = f"{message} ({count}×)" if count > 1 else message
+            args = [self.app_name, replaces_id, '', title, body, [], {'urgency': ('y', 1)}, EXPIRE_DEFAULT]
+            # One retry: a broken connection is only noticed when writing to it
+            for _ in range(2):
+                try:
+                    connection = self._connect()
+                    (notification_id,) = connection.call(
+                        'org.freedesktop.Notifications', '/org/freedesktop/Notifications',
+                        'org.freedesktop.Notifications', 'Notify', 'susssasa{sv}i', args,
+                    )
+                    self._recent[key] = (notification_id, count, now)
+                    return True
+                except DBusConnectionError:
+                    self._disconnect()
+                except DBusError:
+                    return False  # No notification service on this bus
+            return False
+
+    def close(self) -> None:
+        """Close the bus connection."""
+        with self._lock:
+            self._disconnect()
+
+    def _connect(self) -> DBusConnection:
+        if self._connection is None:
+            self._connection = DBusConnection(self.address, self.timeout)
+        return self._connection
+
+    def _disconnect(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -1,12 +1,16 @@
 """Cross-platform feedback utilities for voice-to-code: notifications and speech."""
 
+import functools
 import shutil
 import subprocess
 
+from src.utils.dbus_notifier import DBusNotifier
 from src.utils.os_detection import get_os_type, OSType
+from src.utils.tts_worker import NORMAL, get_tts_worker
 
 
-def notify(title, message):
+def notify(title, message, key=None):
+    """Show a desktop notification; on Linux, ones sharing a key within a few seconds update one notification."""
     try:
         os_type = get_os_type()
         if os_type == OSType.MACOS:
@@ -15,29 +19,43 @@ def notify(title, message):
                 f'display notification "{message}" with title "{title}"'
             ], check=True, capture_output=True)
         elif os_type == OSType.LINUX:
-            if not shutil.which("notify-send"):
+            if _get_notifier().notify(title, message, key):
+                return
+            # No session bus: one notify-send process per notification
+            notify_send = _which("notify-send")
+            if not notify_send:
                 return
             subprocess.run([
-                "notify-send", title, message
+                notify_send, title, message
             ], check=True, capture_output=True)
     except Exception as e:
         import sys
         print(f"WARNING: notify failed: {e}", file=sys.stderr)
 
 
-def speak(message):
+_notifier = None
+
+
+def _get_notifier():
+    """Get the shared D-Bus notifier, whose session bus connection is kept between notifications."""
+    global _notifier
+    if _notifier is None:
+        _notifier = DBusNotifier()
+    return _notifier
+
+
+@functools.lru_cache(maxsize=None)
+def _which(command):
+    return shutil.which(command)
+
+
+def speak(message, priority=NORMAL, interrupt=False, cache=True):
+    """Queue a message on the shared TTS worker (see tts_worker); returns immediately."""
     try:
-        os_type = get_os_type()
-        if os_type == OSType.MACOS:
-            subprocess.Popen([
-                "say", "-v", "Princess", message
-            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        elif os_type == OSType.LINUX:
-            if not shutil.which("espeak-ng"):
-                return
-            subprocess.Popen([
-                "espeak-ng", message
-            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        worker = get_tts_worker()
+        if worker is None:
+            return
+        worker.say(message, priority=priority, interrupt=interrupt, cache=cache)
     except Exception as e:
         import sys
         print(f"WARNING: speak failed: {e}", file=sys.stderr)
@@ -0,0 +1,92 @@
+"""Process memory inspection utilities."""
+
+import ctypes
+import ctypes.util
+import gc
+import resource
+import sys
+from pathlib import Path
+
+from src.utils.os_detection import OSType, get_os_type
+
+PROC_SELF_STATUS = Path('/proc/self/status')
+PROC_MEMINFO = Path('/proc/meminfo')
+
+
+def _read_kib_field(path: Path, field: str) -> int | None:
+    """Read a 'Field:   1234 kB' line from a /proc file and return bytes."""
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def get_process_rss_bytes() -> int | None:
+    """Get the resident set size of the current process.
+
+    Reads VmRSS from /proc on Linux. Other systems only expose the peak RSS
+    through getrusage, which is returned instead.
+
+    Returns:
+        RSS in bytes, or None if it cannot be determined
+    """
+    if get_os_type() == OSType.LINUX:
+        rss = _read_kib_field(PROC_SELF_STATUS, 'VmRSS')
+        if rss is not None:
+            return rss
+    return get_peak_rss_bytes()
+
+
+def get_peak_rss_bytes() -> int | None:
+    """Get the peak resident set size of the current process.
+
+    Returns:
+        Peak RSS in bytes, or None if it cannot be determined
+    """
+    try:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except (OSError, ValueError):
+        return None
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak if get_os_type() == OSType.MACOS else peak * 1024
+
+
+def get_available_memory_bytes() -> int | None:
+    """Get the memory available to new allocations without swapping.
+
+    Reads MemAvailable from /proc/meminfo, so it is only known on Linux.
+
+    Returns:
+        Available memory in bytes, or None if it cannot be determined
+    """
+    if get_os_type() != OSType.LINUX:
+        return None
+    return _read_kib_field(PROC_MEMINFO, 'MemAvailable')
+
+
+def release_memory() -> None:
+    """Return memory held by caches to the system.
+
+    Runs a full garbage collection, empties PyTorch's CUDA cache if torch is
+    already loaded, and asks glibc to hand freed heap pages back to the OS.
+    """
+    gc.collect()
+
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        try:
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except Exception:
+            pass
+
+    if get_os_type() == OSType.LINUX:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6')
+            libc.malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
@@ -0,0 +1,190 @@
+"""Memory-pressure watchdog that sheds transcriber memory before the system swaps.
+
+Escalation while pressure lasts, one step per check:
+    1. Release caches (garbage collection, CUDA cache, glibc heap trim)
+    2. Switch the transcriber to the configured fallback model, dropping the
+       original model entirely
+
+Once pressure has stayed away for a while and the original model would fit
+again with some headroom, it is reloaded.
+"""
+
+import threading
+import time
+
+from src.logging.logger_protocol import LoggerProtocol
+from src.metrics.metrics_registry import MetricsRegistry, get_metrics
+from src.transcribers.transcriber_protocol import TranscriberProtocol
+from src.utils.memory_info import get_available_memory_bytes, get_process_rss_bytes, release_memory
+
+# Seconds between memory checks
+DEFAULT_CHECK_INTERVAL = 5.0
+
+# Seconds pressure must stay away before the original model is restored
+DEFAULT_RESTORE_DELAY = 60.0
+
+# Fraction of each threshold kept free when deciding whether a restore fits
+RESTORE_HEADROOM = 0.1
+
+# Watchdog states
+NORMAL = 'normal'
+RELEASED = 'released'
+DOWNGRADED = 'downgraded'
+
+
+class MemoryWatchdog:
+    """Samples process RSS and available system memory and reacts to pressure."""
+
+    def __init__(
+        self,
+        transcriber: TranscriberProtocol,
+        logger: LoggerProtocol,
+        fallback_model: str | None,
+        max_rss_bytes: int | None = None,
+        min_available_bytes: int | None = None,
+        interval: float = DEFAULT_CHECK_INTERVAL,
+        restore_delay: float = DEFAULT_RESTORE_DELAY,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """
+        Initialize watchdog.
+
+        Args:
+            transcriber: Transcriber whose model can be switched
+            logger: Logger instance for reporting actions
+            fallback_model: Smaller model to switch to under pressure (None to never switch)
+            max_rss_bytes: Process RSS above which memory is under pressure (None disables)
+            min_available_bytes: System available memory below which memory is under pressure (None disables)
+            interval: Seconds between checks
+            restore_delay: Seconds without pressure before restoring the original model
+            metrics: Registry to record memory gauges in (defaults to the process-wide registry)
+        """
+        self.transcriber = transcriber
+        self.logger = logger
+        self.fallback_model = fallback_model
+        self.max_rss_bytes = max_rss_bytes
+        self.min_available_bytes = min_available_bytes
+        self.interval = interval
+        self.restore_delay = restore_delay
+        self.metrics = metrics or get_metrics()
+
+        self.state = NORMAL
+        self.original_model = None
+        self._rss_before_downgrade = None
+        self._model_savings = None
+        self._calm_since = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def start(self) -> None:
+        """Start checking memory in a background thread."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='memory-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def check(self, now: float | None = None) -> None:
+        """
+        Sample memory once and take at most one action.
+
+        Args:
+            now: Monotonic timestamp of this check (defaults to time.monotonic())
+        """
+        now = time.monotonic() if now is None else now
+        rss = get_process_rss_bytes()
+        available = get_available_memory_bytes()
+        if rss is not None:
+            self.metrics.set('voice_to_code_process_rss_bytes', rss)
+        if available is not None:
+            self.metrics.set('voice_to_code_memory_available_bytes', available)
+
+        reason = self._pressure_reason(rss, available)
+        if reason:
+            self._calm_since = None
+            self._relieve(reason, rss)
+            return
+
+        if self._calm_since is None:
+            self._calm_since = now
+        if self.state == RELEASED:
+            self.state = NORMAL
+        elif self.state == DOWNGRADED:
+            self._maybe_restore(rss, available, now)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.error(f"Memory watchdog check failed: {e}")
+
+    def _pressure_reason(self, rss: int | None, available: int | None) -> str | None:
+        """Describe which threshold is crossed, or None when memory is fine."""
+        if self.max_rss_bytes and rss is not None and rss > self.max_rss_bytes:
+            return f"process RSS {_mb(rss)} MB above {_mb(self.max_rss_bytes)} MB"
+        if self.min_available_bytes and available is not None and available < self.min_available_bytes:
+            return f"available memory {_mb(available)} MB below {_mb(self.min_available_bytes)} MB"
+        return None
+
+    def _relieve(self, reason: str, rss: int | None) -> None:
+        """Take the next escalation step for the current pressure."""
+        if self.state == NORMAL:
+            release_memory()
+            self.state = RELEASED
+            self._record_action('release_caches')
+            self.logger.warning(f"Memory pressure ({reason}): released cached memory")
+        elif self.state == RELEASED:
+            current = self.transcriber.model_name
+            if not self.fallback_model or current == self.fallback_model:
+                return
+            self.transcriber.switch_model(self.fallback_model)
+            self.original_model = current
+            self._rss_before_downgrade = rss
+            self._model_savings = None
+            self.state = DOWNGRADED
+            self._record_action('downgrade_model')
+            self.logger.warning(
+                f"Memory pressure ({reason}): switching from '{current}' to '{self.fallback_model}' model"
+            )
+
+    def _maybe_restore(self, rss: int | None, available: int | None, now: float) -> None:
+        """Reload the original model once it would fit again and pressure has stayed away."""
+        if self.transcriber.model_name != self.fallback_model:
+            # Fallback still loading, or it failed to load and pressure went away anyway
+            if now - self._calm_since >= self.restore_delay:
+                self.state = NORMAL
+                self.original_model = None
+            return
+        if self._model_savings is None:
+            # First calm sample with the fallback in place: measure what the downgrade freed
+            before = self._rss_before_downgrade
+            self._model_savings = max(before - rss, 0) if before is not None and rss is not None else 0
+        if now - self._calm_since < self.restore_delay:
+            return
+
+        savings = self._model_savings
+        if self.max_rss_bytes and rss is not None and rss + savings > self.max_rss_bytes * (1 - RESTORE_HEADROOM):
+            return
+        if (self.min_available_bytes and available is not None
+                and available - savings < self.min_available_bytes * (1 + RESTORE_HEADROOM)):
+            return
+
+        self.transcriber.switch_model(self.original_model)
+        self.logger.info(f"Memory pressure subsided: restoring '{self.original_model}' model")
+        self._record_action('restore_model')
+        self.state = NORMAL
+        self.original_model = None
+        self._calm_since = None
+
+    def _record_action(self, action: str) -> None:
+        self.metrics.inc('voice_to_code_memory_actions_total', labels={'action': action})
+
+
+def _mb(value: int) -> int:
+    return value // (1024 * 1024)
@@ -0,0 +1,169 @@
+"""Ambient-noise calibration and its per-device cache.
+
+A calibration measures the microphone's noise floor for a short moment of
+silence and derives the energy threshold speech must exceed. Results are
+cached per input device and time of day, so a session can start from a
+threshold that already suits the room instead of re-learning it.
+"""
+
+import json
+import os
+import sys
+import time
+from array import array
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+# Calibrations older than this are redone instead of reused
+CALIBRATION_MAX_AGE = 7 * 24 * 3600
+
+# Percentile of chunk energies treated as the noise floor
+NOISE_FLOOR_PERCENTILE = 90
+
+# Array typecodes for signed PCM samples by sample width in bytes
+_SAMPLE_TYPECODES = {1: 'b', 2: 'h', 4: 'i'}
+
+
+@dataclass
+class Calibration:
+    """Noise measurement for one input device."""
+    noise_floor: float
+    energy_threshold: float
+    calibrated_at: float
+
+    def is_stale(self, now: float | None = None) -> bool:
+        """Check whether the calibration is too old to reuse."""
+        now = time.time() if now is None else now
+        return now - self.calibrated_at > CALIBRATION_MAX_AGE
+
+
+def time_of_day_bucket(when: datetime | None = None) -> str:
+    """
+    Get the time-of-day bucket calibrations are grouped by.
+
+    Args:
+        when: Local time to classify (defaults to now)
+
+    Returns:
+        One of 'night', 'morning', 'afternoon', 'evening'
+    """
+    hour = (when or datetime.now()).hour
+    if hour < 6:
+        return 'night'
+    if hour < 12:
+        return 'morning'
+    if hour < 18:
+        return 'afternoon'
+    return 'evening'
+
+
+def chunk_energy(buffer: bytes, sample_width: int) -> float:
+    """
+    Compute the RMS energy of a chunk of signed PCM audio.
+
+    Args:
+        buffer: Raw audio bytes in native byte order
+        sample_width: Bytes per sample (1, 2 or 4)
+
+    Returns:
+        Root mean square of the samples (same scale as audioop.rms)
+    """
+    samples = array(_SAMPLE_TYPECODES[sample_width])
+    samples.frombytes(buffer[:len(buffer) - len(buffer) % sample_width])
+    if not samples:
+        return 0.0
+    return (sum(s * s for s in samples) / len(samples)) ** 0.5
+
+
+def measure_noise_floor(source: Any, seconds: float) -> float:
+    """
+    Record from a speech_recognition Microphone and measure its noise floor.
+
+    Args:
+        source: Closed speech_recognition Microphone (opened for the measurement)
+        seconds: How long to listen
+
+    Returns:
+        Chunk energy at NOISE_FLOOR_PERCENTILE, so brief clicks don't inflate it
+    """
+    with source:
+        chunk_count = max(1, int(seconds * source.SAMPLE_RATE / source.CHUNK))
+        energies = sorted(
+            chunk_energy(source.stream.read(source.CHUNK), source.SAMPLE_WIDTH)
+            for _ in range(chunk_count)
+        )
+    index = min(len(energies) - 1, len(energies) * NOISE_FLOOR_PERCENTILE // 100)
+    return energies[index]
+
+
+class CalibrationCache:
+    """JSON file of calibrations keyed by device name and time-of-day bucket."""
+
+    def __init__(self, path: Path | str) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            path: JSON file to read and write (created on first save)
+        """
+        self.path = Path(path)
+
+    def get(self, device: str, bucket: str) -> Calibration | None:
+        """
+        Look up the calibration for a device.
+
+        Falls back to the device's most recent calibration from another
+        bucket, which still beats starting from the configured default.
+
+        Args:
+            device: Input device name
+            bucket: Time-of-day bucket from time_of_day_bucket()
+
+        Returns:
+            Cached calibration, or None if the device was never calibrated
+        """
+        entries = self._load().get(device, {})
+        if bucket in entries:
+            return self._parse(entries[bucket])
+        others = [self._parse(entry) for entry in entries.values()]
+        others = [c for c in others if c is not None]
+        return max(others, key=lambda c: c.calibrated_at) if others else None
+
+    def put(self, device: str, bucket: str, calibration: Calibration) -> None:
+        """
+        Store a calibration and write the file atomically.
+
+        Args:
+            device: Input device name
+            bucket: Time-of-day bucket from time_of_day_bucket()
+            calibration: Calibration to store
+        """
+        devices = self._load()
+        devices.setdefault(device, {})[bucket] = asdict(calibration)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_text(json.dumps({'devices': devices}, indent=2))
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            devices = json.loads(self.path.read_text()).get('devices', {})
+            return devices if isinstance(devices, dict) else {}
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"WARNING: Ignoring unreadable calibration cache {self.path}: {e}", file=sys.stderr)
+            return {}
+
+    @staticmethod
+    def _parse(entry: Any) -> Calibration | None:
+        try:
+            return Calibration(
+                noise_floor=float(entry['noise_floor']),
+                energy_threshold=float(entry['energy_threshold']),
+                calibrated_at=float(entry['calibrated_at']),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
@@ -0,0 +1,157 @@
+"""Durable record of transcripts until their target has them.
+
+Every transcript is written to a SQLite database before delivery and marked
+delivered afterwards, so text that could not be sent (missing tmux session,
+unreachable webhook, crash mid-send) survives restarts and can be re-sent.
+
+The database runs in WAL mode with synchronous=NORMAL: a write is an append
+to the log without an fsync of its own, and the log is synced in batches at
+checkpoints. That survives the app crashing or being killed; only a power
+loss can take the last few transcripts with it.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Item states
+PENDING = 'pending'
+DELIVERED = 'delivered'
+DISCARDED = 'discarded'
+
+# Delivered and discarded items are removed after this many seconds
+RETENTION_SECONDS = 7 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    target TEXT NOT NULL,
+    text TEXT NOT NULL,
+    record TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_pending ON items (status, target, id);
+"""
+
+
+@dataclass(frozen=True)
+class OutboxItem:
+    """One recorded transcript."""
+    id: int
+    target: str
+    text: str
+    record: dict[str, Any]
+    attempts: int
+    created_at: float
+
+
+class Outbox:
+    """SQLite-backed store of transcripts awaiting delivery. Safe to share between threads."""
+
+    def __init__(self, path: Path | str) -> None:
+        """
+        Open (or create) the outbox and drop old delivered items.
+
+        Args:
+            path: Database file, created with its directory if missing
+
+        Raises:
+            sqlite3.Error: If the database can't be opened
+        """
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(_SCHEMA)
+        self._db.execute(
+            'DELETE FROM items WHERE status != ? AND updated_at < ?',
+            (PENDING, time.time() - RETENTION_SECONDS),
+        )
+
+    def add(self, target: str, text: str, record: dict[str, Any]) -> int:
+        """
+        Record a transcript before it is delivered.
+
+        Args:
+            target: Where the transcript is meant to go
+            text: Transcribed text
+            record: Transcript details (see transcript_records), kept for re-delivery
+
+        Returns:
+            Item id
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                'INSERT INTO items (target, text, record, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (target, text, json.dumps(record, ensure_ascii=False), PENDING, now, now),
+            )
+            return cursor.lastrowid
+
+    def mark_delivered(self, item_id: int) -> None:
+        """Mark an item as delivered."""
+        self._set_status(item_id, DELIVERED)
+
+    def discard(self, item_id: int) -> None:
+        """Give up on delivering an item."""
+        self._set_status(item_id, DISCARDED)
+
+    def record_attempt(self, item_id: int) -> None:
+        """Count a failed delivery attempt."""
+        with self._lock:
+            self._db.execute(
+                'UPDATE items SET attempts = attempts + 1, updated_at = ? WHERE id = ?',
+                (time.time(), item_id),
+            )
+
+    def pending(self, target: str | None = None, since: float | None = None) -> list[OutboxItem]:
+        """
+        Get items not delivered yet, oldest first.
+
+        Args:
+            target: Only items for this target (None for all)
+            since: Only items recorded at or after this time (None for all)
+
+        Returns:
+            Pending items
+        """
+        query = 'SELECT id, target, text, record, attempts, created_at FROM items WHERE status = ?'
+        params: tuple[Any, ...] = (PENDING,)
+        if target is not None:
+            query += ' AND target = ?'
+            params += (target,)
+        if since is not None:
+            query += ' AND created_at >= ?'
+            params += (since,)
+        with self._lock:
+            rows = self._db.execute(query + ' ORDER BY id', params).fetchall()
+        return [
+            OutboxItem(item_id, item_target, text, json.loads(record), attempts, created_at)
+            for item_id, item_target, text, record, attempts, created_at in rows
+        ]
+
+    def pending_count(self) -> int:
+        """Get the number of items not delivered yet."""
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM items WHERE status = ?', (PENDING,)).fetchone()[0]
+
+    def close(self) -> None:
+        """Checkpoint the log and close the database."""
+        with self._lock:
+            self._db.close()
+
+    def _set_status(self, item_id: int, status: str) -> None:
+        with self._lock:
+            self._db.execute(
+                'UPDATE items SET status = ?, updated_at = ? WHERE id = ?',
+                (status, time.time(), item_id),
+            )
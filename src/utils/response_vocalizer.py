@@ -0,0 +1,113 @@
+"""Read the end of each agent response out loud, without asking the agent to.
+
+The agent pane's output after each sent prompt (see AgentStateTracker) is
+cleaned of terminal redraw noise: prompt echo, spinners, status and hint
+lines, box borders and lines repeated by redraws. What remains is the
+prose of the response, and its last few sentences, where agents usually
+sum up what they did, are spoken through the local TTS engine.
+"""
+
+import re
+from typing import Callable
+
+from src.logging.logger_protocol import LoggerProtocol
+
+# Sentences spoken from the end of each response
+DEFAULT_MAX_SENTENCES = 2
+
+# Longest text spoken for one response
+MAX_SPOKEN_CHARS = 400
+
+# Lines that are interface rather than response (spinners, status and hint lines)
+NOISE_PATTERNS = (
+    re.compile(r'esc to interrupt', re.IGNORECASE),
+    re.compile(r'for shortcuts', re.IGNORECASE),
+    re.compile(r'\b(?:tokens?|ctrl\+\w)\b', re.IGNORECASE),
+)
+
+# Box drawing, bullets and prompt markers around lines of text user interfaces
+_DECORATION = '│┃║╭╮╰╯─━═┌┐└┘├┤┬┴┼•●⏺⎿✻✶✳✢·*>❯›$#'
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+_WORDS = re.compile(r'[A-Za-z]{2,}')
+
+
+def extract_response(output: str, prompt: str = '', max_sentences: int = DEFAULT_MAX_SENTENCES) -> str:
+    """
+    Pick the closing sentences of an agent response out of raw pane output.
+
+    Args:
+        output: Pane output since the prompt was sent, escape sequences removed
+        prompt: Text that was sent, so its echo can be skipped
+        max_sentences: Sentences to keep from the end of the response
+
+    Returns:
+        Text to speak, empty if the output held no prose
+    """
+    prompt_key = ' '.join(prompt.split()).lower()
+    lines: list[str] = []
+    seen: set[str] = set()
+    for raw in output.split('\n'):
+        line = ' '.join(raw.strip(_DECORATION + ' \t').split())
+        key = line.lower()
+        if not line or key in seen:
+            continue
+        if len(_WORDS.findall(line)) < 3:
+            continue  # Spinners, progress counters, file names, code fragments
+        if prompt_key and (key in prompt_key or prompt_key in key):
+            continue
+        if any(pattern.search(line) for pattern in NOISE_PATTERNS):
+            continue
+        seen.add(key)
+        lines.append(line)
+
+    sentences = [sentence for sentence in _SENTENCE_END.split(' '.join(lines)) if sentence]
+    spoken = ' '.join(sentences[-max_sentences:])
+    if len(spoken) > MAX_SPOKEN_CHARS:
+        spoken = spoken[-MAX_SPOKEN_CHARS:].split(' ', 1)[-1]
+    return spoken
+
+
+class ResponseVocalizer:
+    """Speaks the end of each agent turn while enabled."""
+
+    def __init__(
+        self,
+        speak: Callable[[str], None],
+        logger: LoggerProtocol,
+        max_sentences: int = DEFAULT_MAX_SENTENCES,
+    ) -> None:
+        """
+        Initialize vocalizer, disabled until set_enabled(True).
+
+        Args:
+            speak: Speaks a message through the local TTS engine
+            logger: Logger instance for logging
+            max_sentences: Sentences spoken from the end of each response
+        """
+        self.speak = speak
+        self.logger = logger
+        self.max_sentences = max_sentences
+        self.enabled = False
+
+    def set_enabled(self, is_on: bool) -> None:
+        """Turn speaking responses on or off."""
+        self.enabled = is_on
+
+    def on_turn_end(self, target: str, prompt: str, output: str) -> None:
+        """
+        Speak the end of a finished agent turn (AgentStateTracker turn callback).
+
+        Args:
+            target: tmux target the turn happened in
+            prompt: Text that started the turn
+            output: Pane output of the turn
+        """
+        if not self.enabled:
+            return
+        text = extract_response(output, prompt, self.max_sentences)
+        if not text:
+            self.logger.debug(f"No response text to speak from '{target}'")
+            return
+        self.logger.debug(f"Speaking response from '{target}': {text}")
+        self.speak(text)
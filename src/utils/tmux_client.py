@@ -0,0 +1,312 @@
+"""Persistent tmux control-mode connection shared by all tmux commands.
+
+Running `tmux <command>` forks a process and opens a new server connection
+for every command. A control-mode client (`tmux -C`) stays connected and
+reads commands line by line from stdin; tmux answers each one, in order,
+with a %begin ... %end (or %error) block. Several commands can therefore be
+written in one go and their replies matched up afterwards.
+
+The client attaches to a small dedicated session, so it never changes the
+size or state of the user's sessions, and the session is destroyed as soon
+as the client goes away. If the server restarts, the next command
+reconnects; if control mode cannot be started at all, commands fall back to
+one tmux process each.
+"""
+
+import atexit
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+# Session the control client attaches to (created on demand)
+CONTROL_SESSION = 'voice-to-code-control'
+
+# Seconds to wait for tmux to answer a command
+DEFAULT_TIMEOUT = 5.0
+
+# Seconds to wait before retrying control mode after it failed to start
+RECONNECT_INTERVAL = 5.0
+
+# Characters with a special meaning inside tmux double-quoted strings
+_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '$': '\\$', '\n': '\\n', '\r': '\\r'})
+
+
+class TmuxCommandError(subprocess.CalledProcessError):
+    """A tmux command failed (also raised for lost connections and timeouts)."""
+
+
+def quote_argument(arg: str) -> str:
+    """
+    Quote an argument for tmux's command parser.
+
+    Args:
+        arg: Argument as it would be passed to the tmux executable
+
+    Returns:
+        Double-quoted argument with no environment, home or line-break expansion
+    """
+    return '"' + arg.translate(_ESCAPES) + '"'
+
+
+class _Reply:
+    """Output of one command, filled in by the reader thread."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.output: list[str] = []
+        self.error = False
+
+    def resolve(self, output: list[str], error: bool) -> None:
+        self.output = output
+        self.error = error
+        self.done.set()
+
+
+class _Connection:
+    """One running `tmux -C` process and the replies it still owes."""
+
+    def __init__(self, process: subprocess.Popen, on_notification: Callable[[str], None]) -> None:
+        self.process = process
+        self.on_notification = on_notification
+        self.pending: deque[_Reply] = deque()
+        self.alive = True
+        # tmux acknowledges the command that started the client with its own reply
+        self.attached = _Reply()
+        self.pending.append(self.attached)
+        threading.Thread(target=self._read, name='tmux-control', daemon=True).start()
+
+    def _read(self) -> None:
+        block = None
+        begin_args = None
+        try:
+            for line in self.process.stdout:
+                line = line.rstrip('\n')
+                if block is None:
+                    # Lines outside a reply block are notifications (%output, %exit, ...)
+                    if line.startswith('%begin '):
+                        block, begin_args = [], line.split(' ', 1)[1]
+                    elif not line.startswith('%output '):
+                        self.on_notification(line)
+                    continue
+                kind, _, args = line.partition(' ')
+                if kind in ('%end', '%error') and args == begin_args:
+                    if self.pending:
+                        self.pending.popleft().resolve(block, kind == '%error')
+                    block = None
+                else:
+                    block.append(line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.alive = False
+            while self.pending:
+                self.pending.popleft().resolve(['lost connection to tmux server'], True)
+            # tmux only says %exit when it shuts down cleanly; report every disconnect the same way
+            self.on_notification('%exit')
+
+    def close(self) -> None:
+        self.alive = False
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1.0)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+
+class TmuxClient:
+    """Sends tmux commands over a shared control-mode connection."""
+
+    def __init__(
+        self,
+        session_name: str = CONTROL_SESSION,
+        timeout: float = DEFAULT_TIMEOUT,
+        tmux_binary: str = 'tmux',
+        socket_name: str | None = None,
+    ) -> None:
+        """
+        Initialize client. The connection is opened by the first command.
+
+        Args:
+            session_name: Dedicated session the control client attaches to
+            timeout: Seconds to wait for tmux to answer a batch of commands
+            tmux_binary: tmux executable
+            socket_name: tmux server socket name (tmux -L), None for the default server
+        """
+        self.session_name = session_name
+        self.timeout = timeout
+        self.tmux = [tmux_binary] + (['-L', socket_name] if socket_name else [])
+        self._lock = threading.Lock()
+        self._connection: _Connection | None = None
+        self._retry_at = 0.0
+        self._closed = False
+        self._listeners: list[Callable[[str], None]] = []
+
+    def run(self, *args: str) -> list[str]:
+        """
+        Run one tmux command.
+
+        Args:
+            *args: Command and arguments, e.g. ("send-keys", "-t", "main", "Enter")
+
+        Returns:
+            Lines the command printed
+
+        Raises:
+            TmuxCommandError if the command fails
+        """
+        return self.run_many([list(args)])[0]
+
+    def run_many(self, commands: list[list[str]]) -> list[list[str]]:
+        """
+        Run several tmux commands, writing all of them before waiting for any reply.
+
+        tmux still executes the commands one after another, in order.
+
+        Args:
+            commands: Commands with their arguments
+
+        Returns:
+            Lines printed by each command
+
+        Raises:
+            TmuxCommandError for the first command that failed
+        """
+        replies = self._send(commands)
+        if replies is None:
+            return [self._run_subprocess(command) for command in commands]
+
+        deadline = time.monotonic() + self.timeout
+        outputs = []
+        for command, reply in zip(commands, replies):
+            if not reply.done.wait(max(0.0, deadline - time.monotonic())):
+                self._drop_connection()
+                raise TmuxCommandError(1, [*self.tmux, *command], stderr='timed out waiting for tmux')
+            if reply.error:
+                message = '\n'.join(reply.output)
+                raise TmuxCommandError(1, [*self.tmux, *command], stderr=message)
+            outputs.append(reply.output)
+        return outputs
+
+    def is_connected(self) -> bool:
+        """Check whether commands currently go over a live control-mode connection (and notifications arrive)."""
+        connection = self._connection
+        return connection is not None and connection.alive
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Register a callable for control-mode notifications such as '%sessions-changed'.
+
+        Listeners run on the connection's reader thread with the raw notification
+        line (pane output is not forwarded). They must not wait for tmux commands,
+        whose replies arrive on that same thread.
+
+        Args:
+            listener: Callable taking the notification line
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str], None]) -> None:
+        """Unregister a listener added with add_listener()."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def close(self) -> None:
+        """Disconnect, which also removes the dedicated session. Later commands run as separate processes."""
+        self._closed = True
+        self._drop_connection()
+
+    def _send(self, commands: list[list[str]]) -> list[_Reply] | None:
+        """Write commands to the connection; None if control mode is unavailable."""
+        data = ''.join(' '.join(quote_argument(arg) for arg in command) + '\n' for command in commands)
+        with self._lock:
+            # One retry: a dead server is only noticed when writing to it
+            for _ in range(2):
+                connection = self._connect()
+                if connection is None:
+                    return None
+                replies = [_Reply() for _ in commands]
+                connection.pending.extend(replies)
+                try:
+                    connection.process.stdin.write(data)
+                    connection.process.stdin.flush()
+                    return replies
+                except (OSError, ValueError):
+                    connection.close()
+        return None
+
+    def _connect(self) -> _Connection | None:
+        """Return the live connection, starting one if needed (caller holds the lock)."""
+        if self._connection is not None and self._connection.alive:
+            return self._connection
+        self._connection = None
+        if self._closed or time.monotonic() < self._retry_at:
+            return None
+
+        env = dict(os.environ)
+        env.pop('TMUX', None)  # Not a nested client; tmux refuses those without this
+        try:
+            process = subprocess.Popen(
+                [*self.tmux, '-C', 'new-session', '-A', '-s', self.session_name],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                text=True, encoding='utf-8', errors='replace', env=env,
+                start_new_session=True,  # Keep Ctrl+C in the launching terminal away from tmux
+            )
+        except OSError:
+            self._retry_at = time.monotonic() + RECONNECT_INTERVAL
+            return None
+
+        connection = _Connection(process, self._notify)
+        if not connection.attached.done.wait(self.timeout) or connection.attached.error:
+            connection.close()
+            self._retry_at = time.monotonic() + RECONNECT_INTERVAL
+            return None
+
+        # Remove the session once no client is attached, even if this process crashes
+        reply = _Reply()
+        connection.pending.append(reply)
+        try:
+            process.stdin.write(f'set-option -t {quote_argument(self.session_name)} destroy-unattached on\n')
+            process.stdin.flush()
+        except (OSError, ValueError):
+            connection.close()
+            return None
+        self._connection = connection
+        return connection
+
+    def _drop_connection(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _notify(self, line: str) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(line)
+            except Exception:
+                pass  # A faulty listener must not break command replies
+
+    def _run_subprocess(self, command: list[str]) -> list[str]:
+        """Run a command as its own tmux process (fallback when control mode is unavailable)."""
+        result = subprocess.run([*self.tmux, *command], capture_output=True, text=True)
+        if result.returncode != 0:
+            raise TmuxCommandError(result.returncode, result.args, result.stdout, result.stderr)
+        return result.stdout.splitlines()
+
+
+_client: TmuxClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_tmux_client() -> TmuxClient:
+    """Get the process-wide tmux client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = TmuxClient()
+            atexit.register(_client.close)
+        return _client
@@ -1,14 +1,11 @@
 """tmux-specific feedback utilities for voice-to-code."""
 
-import subprocess
+from src.utils.tmux_client import get_tmux_client
 
 
 def update_status(status, session_name):
     """Update tmux status bar with current state."""
     try:
-        subprocess.run([
-            "tmux", "set-option", "-t", session_name,
-            "status-right", f"[{status}]"
-        ], capture_output=True)
+        get_tmux_client().run("set-option", "-t", session_name, "status-right", f"[{status}]")
     except Exception:
         pass  # Silently fail if tmux status update doesn't work
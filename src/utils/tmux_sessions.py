@@ -0,0 +1,230 @@
+"""Live list of tmux sessions, windows and panes, kept current by tmux itself.
+
+The registry subscribes to control-mode notifications on the shared tmux
+connection and re-reads the pane list only when tmux reports that sessions,
+windows or layouts changed. Senders can then check a target against the
+cached list without a round trip to the server.
+
+Without a control-mode connection (tmux too old, or the dedicated session
+couldn't be created) commands run as separate processes and no
+notifications arrive. The list is then re-read every retry_interval for the
+session dropdown, but is_known() answers None, so a session started since
+the last read is never refused.
+"""
+
+import fnmatch
+import threading
+from dataclasses import dataclass
+from typing import Callable
+
+from src.utils.tmux_client import TmuxClient, TmuxCommandError
+
+# Notifications after which the pane list may have changed
+REFRESH_NOTIFICATIONS = frozenset({
+    '%sessions-changed',
+    '%session-changed',
+    '%session-renamed',
+    '%window-add',
+    '%window-close',
+    '%window-renamed',
+    '%unlinked-window-add',
+    '%unlinked-window-close',
+    '%unlinked-window-renamed',
+    '%layout-change',
+})
+
+# Seconds between attempts to read the pane list while tmux is unreachable
+RETRY_INTERVAL = 10.0
+
+_FIELDS = ('session_name', 'window_index', 'window_name', 'pane_index', 'pane_id')
+_FORMAT = '\t'.join(f'#{{{field}}}' for field in _FIELDS)
+
+
+@dataclass(frozen=True)
+class TmuxPane:
+    """One pane as reported by list-panes."""
+    session: str
+    window_index: int
+    window_name: str
+    pane_index: int
+    pane_id: str
+
+    @property
+    def target(self) -> str:
+        """Target string addressing exactly this pane."""
+        return f"{self.session}:{self.window_index}.{self.pane_index}"
+
+
+def parse_panes(lines: list[str]) -> list[TmuxPane]:
+    """
+    Parse list-panes output produced with the registry's format.
+
+    Args:
+        lines: Output lines, one pane per line
+
+    Returns:
+        Panes, skipping lines that don't match the format
+    """
+    panes = []
+    for line in lines:
+        fields = line.split('\t')
+        if len(fields) != len(_FIELDS):
+            continue
+        session, window_index, window_name, pane_index, pane_id = fields
+        try:
+            panes.append(TmuxPane(session, int(window_index), window_name, int(pane_index), pane_id))
+        except ValueError:
+            continue
+    return panes
+
+
+class TmuxSessionRegistry:
+    """Cached, notification-driven view of the panes on the tmux server."""
+
+    def __init__(
+        self,
+        client: TmuxClient,
+        on_change: Callable[[list[str]], None] | None = None,
+        retry_interval: float = RETRY_INTERVAL,
+    ) -> None:
+        """
+        Initialize registry.
+
+        Args:
+            client: Shared tmux client to listen on and query
+            on_change: Called from the registry thread with the new target list
+                (see targets()) whenever it changes
+            retry_interval: Seconds between attempts while tmux is unreachable
+        """
+        self.client = client
+        self.on_change = on_change
+        self.retry_interval = retry_interval
+        self._lock = threading.Lock()
+        self._panes: list[TmuxPane] | None = None
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Subscribe to tmux notifications and read the pane list in the background."""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self.client.add_listener(self._on_notification)
+        self._thread = threading.Thread(target=self._run, name='tmux-sessions', daemon=True)
+        self._thread.start()
+        self._wake.set()
+
+    def stop(self) -> None:
+        """Unsubscribe and stop the background thread."""
+        self.client.remove_listener(self._on_notification)
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def targets(self) -> list[str]:
+        """
+        Get the targets to offer for selection.
+
+        Returns:
+            Session names, followed by 'session:window.pane' targets for sessions
+            with more than one pane (the control session is left out)
+        """
+        with self._lock:
+            panes = self._panes or []
+        sessions = sorted({pane.session for pane in panes})
+        targets = list(sessions)
+        for session in sessions:
+            session_panes = [pane for pane in panes if pane.session == session]
+            if len(session_panes) > 1:
+                targets.extend(pane.target for pane in session_panes)
+        return targets
+
+    def is_known(self, target: str) -> bool | None:
+        """
+        Check a send-keys target against the cached pane list, without asking tmux.
+
+        Session names are matched the way tmux resolves them: exactly, then by
+        unique prefix, then as a glob pattern.
+
+        Args:
+            target: Target as passed to send-keys -t ('session', 'session:window'
+                or 'session:window.pane')
+
+        Returns:
+            True if a pane matches, False if none does, None if the pane list is
+            not known or may be stale (no control-mode connection), or the target
+            uses a form the cache can't check
+        """
+        with self._lock:
+            panes = self._panes
+        if panes is None or not target or target[0] in '$@%=':
+            return None
+        if not self.client.is_connected():
+            return None
+
+        session, _, rest = target.partition(':')
+        window, _, pane = rest.partition('.')
+        candidates = self._match_session(session, panes)
+        if window:
+            candidates = [p for p in candidates if window in (str(p.window_index), p.window_name)]
+        if pane:
+            candidates = [p for p in candidates if pane == str(p.pane_index)]
+        return bool(candidates)
+
+    def refresh(self) -> bool:
+        """
+        Read the pane list from tmux now.
+
+        Returns:
+            True if the list was read, False if tmux could not be reached
+        """
+        try:
+            lines = self.client.run('list-panes', '-a', '-F', _FORMAT)
+        except (TmuxCommandError, OSError):
+            self._set_panes(None)
+            return False
+        panes = [pane for pane in parse_panes(lines) if pane.session != self.client.session_name]
+        self._set_panes(panes)
+        return True
+
+    @staticmethod
+    def _match_session(session: str, panes: list[TmuxPane]) -> list[TmuxPane]:
+        names = {pane.session for pane in panes}
+        if session in names:
+            matched = {session}
+        else:
+            prefixed = {name for name in names if name.startswith(session)}
+            matched = prefixed if len(prefixed) == 1 else set(fnmatch.filter(names, session))
+        return [pane for pane in panes if pane.session in matched]
+
+    def _set_panes(self, panes: list[TmuxPane] | None) -> None:
+        with self._lock:
+            changed = panes != self._panes
+            self._panes = panes
+        if changed and self.on_change:
+            self.on_change(self.targets())
+
+    def _on_notification(self, line: str) -> None:
+        # Runs on the tmux reader thread, so it must not wait for tmux commands
+        kind = line.split(' ', 1)[0]
+        if kind == '%exit':
+            # Connection gone: nothing is known until the list is read again
+            self._set_panes(None)
+            self._wake.set()
+        elif kind in REFRESH_NOTIFICATIONS:
+            self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopped.is_set():
+                return
+            if not self.refresh() or not self.client.is_connected():
+                # Unreachable, or no notifications to wait for: read the list again later
+                if self._stopped.wait(self.retry_interval):
+                    return
+                self._wake.set()
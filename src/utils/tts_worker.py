@@ -0,0 +1,306 @@
+"""Long-lived text-to-speech worker with a cache of synthesized phrases.
+
+Messages are queued to one background thread instead of starting a speech
+process per message. Each message is synthesized to a WAV file once
+(`say -o` on macOS, `espeak-ng -w` on Linux) and kept in a cache keyed by
+its text, so repeated phrases ("Voice to Code starting", status notices)
+play straight from disk. Messages that are unlikely to repeat, such as
+agent responses, are queued with cache=False: they are synthesized to a
+temporary file that is deleted after playback, so they neither evict status
+phrases from the cache nor stay on disk. Playback runs in-process through
+PyAudio when it is available, otherwise through the system player (afplay,
+paplay or aplay).
+
+Urgent messages are spoken first, and a message queued with interrupt=True
+cuts off the one playing and drops queued ones of the same or lower
+priority, so a stale response never holds up a new one.
+"""
+
+import atexit
+import hashlib
+import heapq
+import itertools
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from pathlib import Path
+from typing import Callable
+
+from src.constants import DEFAULT_OUTPUT_DIR, DEFAULT_TTS_CACHE_DIR
+from src.metrics.metrics_registry import MetricsRegistry, get_metrics
+from src.utils.os_detection import OSType, get_os_type
+
+# Message priorities, lower is spoken first
+URGENT = 0
+NORMAL = 1
+
+# Synthesized phrases kept in the cache (least recently spoken are removed first)
+DEFAULT_MAX_CACHE_ENTRIES = 256
+
+# macOS voice
+MACOS_VOICE = 'Princess'
+
+# Frames written to the audio device at a time (also how quickly playback can be cut off)
+PLAYBACK_CHUNK_FRAMES = 1024
+
+# Writes a message's audio to a WAV file, returns False if it couldn't
+Synthesizer = Callable[[str, Path], bool]
+
+# Plays a WAV file, stopping early once the event is set
+Player = Callable[[Path, threading.Event], None]
+
+
+def system_synthesizer() -> tuple[Synthesizer, str] | None:
+    """
+    Get the local speech synthesizer.
+
+    Returns:
+        (synthesizer, engine name used in cache keys), or None if there is no engine
+    """
+    os_type = get_os_type()
+    if os_type == OSType.MACOS:
+        command = ['say', '-v', MACOS_VOICE, '-f', '-', '--file-format=WAVE', '--data-format=LEI16@22050', '-o']
+    elif os_type == OSType.LINUX and shutil.which('espeak-ng'):
+        command = ['espeak-ng', '--stdin', '-w']
+    else:
+        return None
+
+    def synthesize(text: str, path: Path) -> bool:
+        # Text goes through stdin, so a message starting with "-" isn't read as an option
+        result = subprocess.run([*command, str(path)], input=text, text=True, capture_output=True)
+        return result.returncode == 0 and path.exists()
+
+    return synthesize, ' '.join(command)
+
+
+def system_player() -> Player | None:
+    """
+    Get the local WAV player: PyAudio in-process, or a player command.
+
+    Returns:
+        Player, or None if nothing can play audio
+    """
+    try:
+        import pyaudio
+    except ImportError:
+        pyaudio = None
+
+    if pyaudio is not None:
+        audio = pyaudio.PyAudio()
+        atexit.register(audio.terminate)
+
+        def play_in_process(path: Path, stop: threading.Event) -> None:
+            with wave.open(str(path), 'rb') as wav:
+                stream = audio.open(
+                    format=audio.get_format_from_width(wav.getsampwidth()),
+                    channels=wav.getnchannels(),
+                    rate=wav.getframerate(),
+                    output=True,
+                )
+                try:
+                    while not stop.is_set():
+                        frames = wav.readframes(PLAYBACK_CHUNK_FRAMES)
+                        if not frames:
+                            break
+                        stream.write(frames)
+                finally:
+                    stream.stop_stream()
+                    stream.close()
+
+        return play_in_process
+
+    player = next((command for command in (['afplay'], ['paplay'], ['aplay', '-q']) if shutil.which(command[0])), None)
+    if player is None:
+        return None
+
+    def play_with_command(path: Path, stop: threading.Event) -> None:
+        process = subprocess.Popen([*player, str(path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        while process.poll() is None:
+            if stop.wait(0.05):
+                process.terminate()
+                process.wait()
+
+    return play_with_command
+
+
+class TtsWorker:
+    """Queue of messages spoken one after another by a background thread."""
+
+    def __init__(
+        self,
+        cache_dir: Path | str,
+        synthesizer: Synthesizer,
+        player: Player,
+        engine: str = '',
+        max_cache_entries: int = DEFAULT_MAX_CACHE_ENTRIES,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """
+        Initialize worker. The thread starts with the first message.
+
+        Args:
+            cache_dir: Directory for synthesized WAV files, created if missing
+            synthesizer: Writes a message's audio to a WAV file
+            player: Plays a WAV file until done or told to stop
+            engine: Engine and voice, part of the cache key so changing them re-synthesizes
+            max_cache_entries: Synthesized phrases to keep
+            metrics: Registry to record speech metrics in (defaults to the process-wide registry)
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.synthesizer = synthesizer
+        self.player = player
+        self.engine = engine
+        self.max_cache_entries = max_cache_entries
+        self.metrics = metrics or get_metrics()
+
+        self._condition = threading.Condition()
+        self._queue: list[tuple[int, int, str, bool]] = []
+        self._order = itertools.count()
+        self._playing_priority: int | None = None
+        self._stop_playing = threading.Event()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def say(self, message: str, priority: int = NORMAL, interrupt: bool = False, cache: bool = True) -> None:
+        """
+        Queue a message.
+
+        Args:
+            message: Text to speak
+            priority: URGENT messages are spoken before NORMAL ones
+            interrupt: Cut off the message playing and drop queued ones, unless they are more urgent
+            cache: Keep the synthesized audio for the next time the message is said; if False
+                it goes to a temporary file deleted after playback
+        """
+        if not message.strip():
+            return
+        with self._condition:
+            if self._closed:
+                return
+            if interrupt:
+                dropped = len(self._queue)
+                self._queue = [item for item in self._queue if item[0] < priority]
+                heapq.heapify(self._queue)
+                dropped -= len(self._queue)
+                if self._playing_priority is not None and self._playing_priority >= priority:
+                    self._stop_playing.set()
+                    dropped += 1
+                if dropped:
+                    self.metrics.inc('voice_to_code_tts_interrupted_total', dropped)
+            heapq.heappush(self._queue, (priority, next(self._order), message, cache))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='tts-worker', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def wait_until_done(self, timeout: float | None = None) -> bool:
+        """
+        Block until every queued message has been spoken.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if nothing is left to speak
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._queue and self._playing_priority is None, timeout)
+
+    def close(self) -> None:
+        """Stop speaking and drop queued messages."""
+        with self._condition:
+            self._closed = True
+            self._queue.clear()
+            self._stop_playing.set()
+            self._condition.notify_all()
+
+    def cache_path(self, message: str) -> Path:
+        """Get the cache file a message is synthesized to."""
+        key = hashlib.sha256(f"{self.engine}\0{message}".encode('utf-8')).hexdigest()[:32]
+        return self.cache_dir / f"{key}.wav"
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or self._closed)
+                if self._closed:
+                    return
+                priority, _, message, cache = heapq.heappop(self._queue)
+                self._playing_priority = priority
+                self._stop_playing.clear()
+            try:
+                if cache:
+                    self._speak(message)
+                else:
+                    self._speak_uncached(message)
+            except Exception as e:
+                print(f"WARNING: speak failed: {e}", file=sys.stderr)
+            finally:
+                with self._condition:
+                    self._playing_priority = None
+                    self._condition.notify_all()
+
+    def _speak(self, message: str) -> None:
+        path = self.cache_path(message)
+        if path.exists():
+            self.metrics.inc('voice_to_code_tts_messages_total', labels={'source': 'cache'})
+            path.touch()  # Most recently spoken, so pruned last
+        else:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            partial = path.with_name(f"{path.name}.part")
+            if not self._synthesize(message, partial):
+                return
+            partial.replace(path)
+            self._prune_cache()
+        if not self._stop_playing.is_set():
+            self.player(path, self._stop_playing)
+
+    def _speak_uncached(self, message: str) -> None:
+        fd, name = tempfile.mkstemp(prefix='voice-to-code-tts-', suffix='.wav')
+        os.close(fd)
+        path = Path(name)
+        try:
+            if self._synthesize(message, path) and not self._stop_playing.is_set():
+                self.player(path, self._stop_playing)
+        finally:
+            path.unlink(missing_ok=True)
+
+    def _synthesize(self, message: str, path: Path) -> bool:
+        """Synthesize a message to path and record it, returns False (path removed) if that failed."""
+        start = time.perf_counter()
+        if not self.synthesizer(message, path):
+            path.unlink(missing_ok=True)
+            print(f"WARNING: speech synthesis failed for: {message}", file=sys.stderr)
+            return False
+        self.metrics.inc('voice_to_code_tts_messages_total', labels={'source': 'synthesized'})
+        self.metrics.observe('voice_to_code_tts_synthesis_seconds', time.perf_counter() - start)
+        return True
+
+    def _prune_cache(self) -> None:
+        """Remove the least recently spoken phrases beyond max_cache_entries."""
+        entries = sorted(self.cache_dir.glob('*.wav'), key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in entries[self.max_cache_entries:]:
+            entry.unlink(missing_ok=True)
+
+
+_worker: TtsWorker | None = None
+_worker_lock = threading.Lock()
+
+
+def get_tts_worker() -> TtsWorker | None:
+    """Get the process-wide TTS worker, creating it on first use (None without a speech engine or player)."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            synthesizer = system_synthesizer()
+            player = system_player() if synthesizer else None
+            if synthesizer is None or player is None:
+                return None
+            _worker = TtsWorker(DEFAULT_OUTPUT_DIR / DEFAULT_TTS_CACHE_DIR, synthesizer[0], player, engine=synthesizer[1])
+            atexit.register(_worker.close)
+        return _worker
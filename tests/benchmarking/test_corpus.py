@@ -0,0 +1,34 @@
+"""Tests for benchmark corpus loading."""
+
+import pytest
+
+from src.benchmarking.corpus import load_corpus
+
+
+def test_load_corpus_pairs_wav_and_txt(tmp_path):
+    """Corpus should include each WAV that has a transcript, recursively."""
+    (tmp_path / 'a.wav').write_bytes(b'')
+    (tmp_path / 'a.txt').write_text('open the file\n')
+    (tmp_path / 'accented').mkdir()
+    (tmp_path / 'accented' / 'b.wav').write_bytes(b'')
+    (tmp_path / 'accented' / 'b.txt').write_text('run the tests')
+    (tmp_path / 'no_transcript.wav').write_bytes(b'')
+    
+    corpus = load_corpus(tmp_path)
+    
+    assert [item.name for item in corpus] == ['a', 'b']
+    assert corpus[0].reference == 'open the file'
+
+
+def test_load_corpus_missing_directory(tmp_path):
+    """Missing directory should raise FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        load_corpus(tmp_path / 'missing')
+
+
+def test_load_corpus_without_pairs(tmp_path):
+    """Directory without usable pairs should raise FileNotFoundError."""
+    (tmp_path / 'a.wav').write_bytes(b'')
+    
+    with pytest.raises(FileNotFoundError, match="No .wav files"):
+        load_corpus(tmp_path)
@@ -0,0 +1,101 @@
+"""Tests for the benchmark runner."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.benchmarking.corpus import CorpusItem
+from src.benchmarking.runner import (
+    create_decoder,
+    format_table,
+    percentile,
+    results_to_json,
+    run_benchmark,
+)
+from src.benchmarking.whisper_decoder import WhisperDecoder
+
+
+class FakeDecoder:
+    """Decoder returning canned transcripts for one second of audio each."""
+    
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.loaded = False
+        self.closed = False
+    
+    def load(self):
+        self.loaded = True
+    
+    def load_audio(self, audio_path):
+        return [0.0] * 16000
+    
+    def decode(self, audio):
+        return self.outputs.pop(0)
+    
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def corpus():
+    return [
+        CorpusItem(Path('one.wav'), 'open the file'),
+        CorpusItem(Path('two.wav'), 'run the tests'),
+    ]
+
+
+def test_run_benchmark_scores_each_utterance(corpus):
+    """Runner should decode every item and compute corpus-level WER."""
+    decoder = FakeDecoder(['open the file', 'run the test'])
+    
+    result = run_benchmark(corpus, decoder, 'whisper_mic', 'tiny', 'default')
+    
+    assert decoder.loaded and decoder.closed
+    assert [u.name for u in result.utterances] == ['one', 'two']
+    assert result.utterances[1].errors == 1
+    assert result.word_error_rate == pytest.approx(1 / 6)
+    assert result.utterances[0].audio_seconds == 1.0
+    assert result.peak_rss_bytes > 0
+
+
+def test_run_benchmark_closes_decoder_on_failure(corpus):
+    """Decoder should be released even if decoding fails."""
+    decoder = FakeDecoder([])
+    
+    with pytest.raises(IndexError):
+        run_benchmark(corpus, decoder, 'whisper_mic', 'tiny', 'default')
+    
+    assert decoder.closed
+
+
+def test_percentile_interpolates():
+    """Percentiles should interpolate between samples."""
+    values = [1.0, 2.0, 3.0, 4.0]
+    
+    assert percentile(values, 50) == 2.5
+    assert percentile(values, 100) == 4.0
+    assert percentile([], 95) == 0.0
+
+
+def test_report_formats(corpus):
+    """Table and JSON should include aggregates for each configuration."""
+    result = run_benchmark(corpus, FakeDecoder(['open the file', 'run the tests']), 'whisper_mic', 'base', 'greedy')
+    
+    table = format_table([result])
+    data = json.loads(results_to_json([result]))
+    
+    assert 'WER' in table.splitlines()[0]
+    assert 'whisper_mic  base' in table
+    assert data['results'][0]['word_error_rate'] == 0.0
+    assert len(data['results'][0]['utterances']) == 2
+
+
+def test_create_decoder():
+    """Factory should create whisper decoders and reject unknown backends."""
+    assert isinstance(create_decoder('whisper_mic', 'tiny', 'greedy'), WhisperDecoder)
+    
+    with pytest.raises(ValueError, match="Unknown transcriber type"):
+        create_decoder('unknown', 'tiny', 'default')
+    with pytest.raises(ValueError, match="Unknown decoding profile"):
+        create_decoder('whisper_mic', 'tiny', 'unknown')
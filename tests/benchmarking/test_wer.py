@@ -0,0 +1,38 @@
+"""Tests for word error rate scoring."""
+
+import pytest
+
+from src.benchmarking.wer import normalize_text, word_error_rate, word_errors
+
+
+def test_normalize_ignores_case_and_punctuation():
+    """Normalization should drop punctuation and case, keeping apostrophes."""
+    assert normalize_text("Open the file, please. Don't save!") == ['open', 'the', 'file', 'please', "don't", 'save']
+
+
+def test_identical_transcripts_have_no_errors():
+    """Matching transcripts should score zero errors."""
+    assert word_errors("Run the tests.", "run the tests") == (0, 3)
+
+
+@pytest.mark.parametrize("hypothesis,expected_errors", [
+    ("run the test", 1),         # substitution
+    ("run tests", 1),            # deletion
+    ("run all the tests", 1),    # insertion
+    ("", 3),                     # everything deleted
+    ("walk a dog now", 4),       # 3 substitutions + 1 insertion
+])
+def test_word_errors_counts_edits(hypothesis, expected_errors):
+    """Each substitution, deletion and insertion should count once."""
+    assert word_errors("run the tests", hypothesis) == (expected_errors, 3)
+
+
+def test_word_error_rate():
+    """WER should be errors over reference word count."""
+    assert word_error_rate("one two three four", "one two tree four") == 0.25
+
+
+def test_word_error_rate_empty_reference():
+    """Empty reference should score 0 for empty output and 1 otherwise."""
+    assert word_error_rate("", "") == 0.0
+    assert word_error_rate("", "thank you") == 1.0
@@ -1,6 +1,10 @@
 """Tests for file log handler."""
 
-from src.logging.file_log_handler import create_file_handler
+import gzip
+import time
+
+from src.logging.file_log_handler import FileLogHandler, create_file_handler
+from src.logging.logger import Logger
 
 
 def test_file_handler_writes_to_file(tmp_path):
@@ -9,6 +13,7 @@ def test_file_handler_writes_to_file(tmp_path):
     handler = create_file_handler(log_file, debug_mode=True)
     
     handler('INFO', 'test message')
+    handler.close()
     
     content = log_file.read_text()
     assert 'test message' in content
@@ -22,6 +27,7 @@ def test_file_handler_appends_not_overwrites(tmp_path):
     
     handler('INFO', 'first message')
     handler('INFO', 'second message')
+    handler.close()
     
     content = log_file.read_text()
     assert 'first message' in content
@@ -36,6 +42,7 @@ def test_file_handler_filters_debug_when_disabled(tmp_path):
     handler('DEBUG', 'should not appear')
     handler('INFO', 'should appear')
     handler('ERROR', 'error message')
+    handler.close()
     
     content = log_file.read_text()
     assert 'should not appear' not in content
@@ -51,6 +58,7 @@ def test_file_handler_logs_debug_when_enabled(tmp_path):
     handler('DEBUG', 'debug message')
     handler('INFO', 'info message')
     handler('WARNING', 'warning message')
+    handler.close()
     
     content = log_file.read_text()
     assert 'DEBUG: debug message' in content
@@ -64,8 +72,113 @@ def test_file_handler_includes_timestamp(tmp_path):
     handler = create_file_handler(log_file, debug_mode=True)
     
     handler('INFO', 'test')
+    handler.close()
     
     content = log_file.read_text()
     # Check for timestamp pattern [YYYY-MM-DD HH:MM:SS]
     assert content.startswith('[')
     assert ']' in content
+
+
+def test_file_handler_writes_in_background(tmp_path):
+    """File handler should queue messages and write them on flush, ERROR or the interval."""
+    log_file = tmp_path / "test.log"
+    handler = FileLogHandler(log_file, debug_mode=True, flush_interval=60)
+
+    handler('INFO', 'queued')
+    assert not log_file.exists()
+
+    assert handler.flush()
+    assert 'INFO: queued' in log_file.read_text()
+
+    handler('ERROR', 'urgent')
+    deadline = time.monotonic() + 2
+    while 'urgent' not in log_file.read_text() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert 'ERROR: urgent' in log_file.read_text()
+    handler.close()
+
+
+def test_file_handler_writes_directly_after_close(tmp_path):
+    """File handler should still write messages logged after it was closed."""
+    log_file = tmp_path / "test.log"
+    handler = FileLogHandler(log_file, flush_interval=60)
+    handler('INFO', 'before close')
+    handler.close()
+
+    handler('INFO', 'after close')
+
+    assert log_file.read_text().count('INFO: ') == 2
+
+
+def test_file_handler_rotates_by_size(tmp_path):
+    """File handler should rotate before exceeding max_bytes, keeping backup_count gzipped segments."""
+    log_file = tmp_path / "test.log"
+    handler = FileLogHandler(log_file, flush_interval=60, max_bytes=100, backup_count=2, compress=True)
+
+    for i in range(4):
+        handler('INFO', f"message {i} " + 'x' * 50)
+        handler.flush()
+    handler.close()
+
+    assert 'message 3' in log_file.read_text()
+    with gzip.open(tmp_path / "test.log.1.gz", 'rt') as f:
+        assert 'message 2' in f.read()
+    with gzip.open(tmp_path / "test.log.2.gz", 'rt') as f:
+        assert 'message 1' in f.read()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['test.log', 'test.log.1.gz', 'test.log.2.gz']
+
+
+def test_file_handler_rotates_by_age(tmp_path):
+    """File handler should start a new file once the current one is older than max_age."""
+    log_file = tmp_path / "test.log"
+    handler = FileLogHandler(log_file, flush_interval=60, max_bytes=0, max_age=0.05)
+
+    handler('INFO', 'old')
+    handler.flush()
+    time.sleep(0.1)
+    handler('INFO', 'new')
+    handler.close()
+
+    assert 'new' in log_file.read_text()
+    assert 'old' in (tmp_path / "test.log.1").read_text()
+
+
+def test_file_handler_age_survives_restarts(tmp_path):
+    """File handler should count a file's age from its first line, not from when it was opened."""
+    log_file = tmp_path / "test.log"
+    log_file.write_text("[2020-01-01 09:00:00] INFO: from an earlier run\n")
+    handler = FileLogHandler(log_file, flush_interval=60, max_bytes=0, max_age=3600)
+
+    handler('INFO', 'after restart')
+    handler.close()
+
+    assert 'after restart' in log_file.read_text()
+    assert 'earlier run' in (tmp_path / "test.log.1").read_text()
+
+
+def test_file_handler_keeps_recent_file_across_restarts(tmp_path):
+    """File handler should keep appending to a file started less than max_age ago."""
+    log_file = tmp_path / "test.log"
+    for message in ['first run', 'second run']:
+        handler = FileLogHandler(log_file, flush_interval=60, max_bytes=0, max_age=3600)
+        handler('INFO', message)
+        handler.close()
+
+    assert log_file.read_text().count('INFO: ') == 2
+    assert not (tmp_path / "test.log.1").exists()
+
+
+def test_logger_flush_and_close_reach_file_handler(tmp_path):
+    """Logger flush() and close() should write out the file handler's queue."""
+    log_file = tmp_path / "test.log"
+    handler = FileLogHandler(log_file, flush_interval=60)
+    logger = Logger([handler, lambda level, message: None])
+
+    logger.info('flushed')
+    logger.flush()
+    assert 'flushed' in log_file.read_text()
+
+    logger.info('closed')
+    logger.close()
+    assert 'closed' in log_file.read_text()
@@ -1,20 +1,57 @@
 """Tests for GUI log handler."""
 
-from src.logging.gui_log_handler import create_gui_handler
+import threading
+
+from src.logging.gui_log_handler import BATCH_SIZE, GuiLogHandler, create_gui_handler
 
 
 class MockWidget:
-    """Mock tkinter widget for testing."""
+    """Mock tkinter Text widget for testing, with after() callbacks run by run_after()."""
     
     def __init__(self):
         self.text = []
+        self.tags = []
+        self.inserts = 0
         self.seen_positions = []
+        self.tag_colors = {}
+        self.scheduled = {}
+        self.deleted = []
     
-    def insert(self, pos, text):
-        self.text.append(text)
+    def insert(self, pos, *chunks):
+        self.inserts += 1
+        self.text.extend(chunks[0::2])
+        self.tags.extend(chunks[1::2])
     
     def see(self, pos):
         self.seen_positions.append(pos)
+    
+    def tag_configure(self, tag, foreground):
+        self.tag_colors[tag] = foreground
+    
+    def index(self, pos):
+        assert pos == 'end-1c'
+        return f"{len(self.text) + 1}.0"
+    
+    def delete(self, start, end):
+        assert start == '1.0'
+        count = int(end.split('.')[0]) - 1
+        self.deleted.append(count)
+        del self.text[:count]
+        del self.tags[:count]
+    
+    def after(self, ms, func):
+        after_id = f"after#{len(self.scheduled)}"
+        self.scheduled[after_id] = (ms, func)
+        return after_id
+    
+    def after_cancel(self, after_id):
+        self.scheduled.pop(after_id)
+    
+    def run_after(self):
+        """Run the pending after() callbacks, as the main loop would."""
+        callbacks, self.scheduled = self.scheduled, {}
+        for _ms, func in callbacks.values():
+            func()
 
 
 def test_gui_handler_inserts_text():
@@ -23,6 +60,7 @@ def test_gui_handler_inserts_text():
     handler = create_gui_handler(widget, debug_mode=True)
     
     handler('INFO', 'test message')
+    handler.flush()
     
     assert len(widget.text) == 1
     assert 'test message' in widget.text[0]
@@ -34,6 +72,7 @@ def test_gui_handler_auto_scrolls():
     handler = create_gui_handler(widget, debug_mode=True)
     
     handler('INFO', 'test')
+    handler.flush()
     
     assert len(widget.seen_positions) == 1
 
@@ -46,6 +85,7 @@ def test_gui_handler_filters_debug_when_disabled():
     handler('DEBUG', 'should not appear')
     handler('INFO', 'should appear')
     handler('ERROR', 'error message')
+    handler.flush()
     
     assert len(widget.text) == 2
     assert 'INFO: should appear' in widget.text[0]
@@ -61,6 +101,7 @@ def test_gui_handler_logs_debug_when_enabled():
     handler('DEBUG', 'debug message')
     handler('INFO', 'info message')
     handler('WARNING', 'warning message')
+    handler.flush()
     
     assert len(widget.text) == 3
     assert 'DEBUG: debug message' in widget.text[0]
@@ -74,7 +115,84 @@ def test_gui_handler_includes_timestamp():
     handler = create_gui_handler(widget, debug_mode=True)
     
     handler('INFO', 'test')
+    handler.flush()
     
     # Check for timestamp pattern [HH:MM:SS]
     assert widget.text[0].startswith('[')
     assert ']' in widget.text[0]
+
+
+def test_gui_handler_drains_on_main_loop():
+    """GUI handler should not touch the widget when called, only when the main loop drains the queue."""
+    widget = MockWidget()
+    handler = GuiLogHandler(widget, debug_mode=True)
+    
+    logger_thread = threading.Thread(target=lambda: [handler('INFO', f"message {i}") for i in range(3)])
+    logger_thread.start()
+    logger_thread.join()
+    assert widget.text == []
+    
+    widget.run_after()
+    
+    assert len(widget.text) == 3
+    assert widget.inserts == 1
+    assert len(widget.seen_positions) == 1
+    assert len(widget.scheduled) == 1  # Drains again later
+
+
+def test_gui_handler_colors_levels_with_tags():
+    """GUI handler should tag each line with its level, colored once per widget."""
+    widget = MockWidget()
+    handler = GuiLogHandler(widget, debug_mode=True)
+    
+    handler('INFO', 'info')
+    handler('ERROR', 'error')
+    handler.flush()
+    
+    assert widget.tags == ['INFO', 'ERROR']
+    assert set(widget.tag_colors) == {'DEBUG', 'WARNING', 'ERROR'}
+
+
+def test_gui_handler_large_backlog_spans_main_loop_turns():
+    """GUI handler should insert at most BATCH_SIZE messages per drain and continue right away."""
+    widget = MockWidget()
+    handler = GuiLogHandler(widget, max_lines=0)
+    for i in range(BATCH_SIZE + 1):
+        handler('INFO', f"message {i}")
+    
+    widget.run_after()
+    assert len(widget.text) == BATCH_SIZE
+    assert [ms for ms, _func in widget.scheduled.values()] == [0]
+    
+    widget.run_after()
+    assert len(widget.text) == BATCH_SIZE + 1
+
+
+def test_gui_handler_trims_old_lines_in_bulk():
+    """GUI handler should keep max_lines, deleting old lines only once 10% over."""
+    widget = MockWidget()
+    handler = GuiLogHandler(widget, max_lines=100)
+    
+    for i in range(110):
+        handler('INFO', f"message {i}")
+        handler.flush()
+    assert widget.deleted == []
+    
+    handler('INFO', 'message 110')
+    handler.flush()
+    
+    assert widget.deleted == [11]
+    assert len(widget.text) == 100
+    assert 'message 11' in widget.text[0]
+
+
+def test_gui_handler_close_shows_queued_and_stops():
+    """GUI handler close() should show queued messages and stop draining."""
+    widget = MockWidget()
+    handler = GuiLogHandler(widget)
+    handler('INFO', 'last')
+    
+    handler.close()
+    
+    assert 'last' in widget.text[0]
+    assert widget.scheduled == {}
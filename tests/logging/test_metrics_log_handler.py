@@ -0,0 +1,18 @@
+"""Tests for metrics log handler."""
+
+from src.logging.logger import Logger
+from src.logging.metrics_log_handler import create_metrics_handler
+from src.metrics.metrics_registry import MetricsRegistry
+
+
+def test_metrics_handler_counts_by_level():
+    """Metrics handler should count messages per level."""
+    registry = MetricsRegistry()
+    logger = Logger(create_metrics_handler(registry))
+    
+    logger.info("one")
+    logger.error("two")
+    logger.error("three")
+    
+    assert registry.get('voice_to_code_log_messages_total', labels={'level': 'INFO'}) == 1
+    assert registry.get('voice_to_code_log_messages_total', labels={'level': 'ERROR'}) == 2
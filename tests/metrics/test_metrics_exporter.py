@@ -0,0 +1,76 @@
+"""Tests for MetricsExporter."""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.metrics.metrics_exporter import MetricsExporter, collect_process_metrics
+from src.metrics.metrics_registry import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    """Registry with one counter."""
+    registry = MetricsRegistry()
+    registry.inc('voice_to_code_utterances_total', 3)
+    return registry
+
+
+def test_http_endpoint_serves_prometheus_and_json(registry):
+    """Exporter should serve both formats on localhost."""
+    exporter = MetricsExporter(registry, port=0)
+    exporter.start()
+    try:
+        with urllib.request.urlopen(exporter.url, timeout=5) as response:
+            text = response.read().decode()
+            assert response.headers['Content-Type'].startswith('text/plain')
+        with urllib.request.urlopen(exporter.url + '.json', timeout=5) as response:
+            data = json.loads(response.read())
+    finally:
+        exporter.stop()
+    
+    assert 'voice_to_code_utterances_total 3' in text
+    assert data['metrics']['voice_to_code_utterances_total'][0]['value'] == 3
+
+
+def test_http_endpoint_unknown_path_returns_404(registry):
+    """Unknown paths should return 404."""
+    exporter = MetricsExporter(registry, port=0)
+    exporter.start()
+    try:
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            urllib.request.urlopen(exporter.url.replace('/metrics', '/other'), timeout=5)
+    finally:
+        exporter.stop()
+    
+    assert exc_info.value.code == 404
+
+
+def test_textfile_written_on_start_and_stop(registry, tmp_path):
+    """Exporter should write the textfile immediately and again on stop."""
+    textfile = tmp_path / 'metrics.prom'
+    exporter = MetricsExporter(registry, textfile_path=textfile, interval=60)
+    exporter.start()
+    registry.inc('voice_to_code_utterances_total')
+    exporter.stop()
+    
+    assert 'voice_to_code_utterances_total 4' in textfile.read_text()
+    assert not (tmp_path / 'metrics.prom.tmp').exists()
+
+
+def test_http_disabled_when_port_is_none(registry):
+    """No URL should be exposed when HTTP is disabled."""
+    exporter = MetricsExporter(registry, port=None)
+    exporter.start()
+    exporter.stop()
+    
+    assert exporter.url is None
+
+
+def test_collect_process_metrics_sets_rss(registry):
+    """Process collector should report a positive RSS."""
+    collect_process_metrics(registry)
+    
+    assert registry.get('voice_to_code_process_rss_bytes') > 0
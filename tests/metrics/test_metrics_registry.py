@@ -0,0 +1,109 @@
+"""Tests for MetricsRegistry."""
+
+import json
+
+from src.metrics.metrics_registry import MetricsRegistry
+
+
+def test_inc_accumulates_counter():
+    """Counters should add up increments."""
+    registry = MetricsRegistry()
+    
+    registry.inc('requests_total')
+    registry.inc('requests_total', 2)
+    
+    assert registry.get('requests_total') == 3
+
+
+def test_set_overwrites_gauge():
+    """Gauges should keep only the last value."""
+    registry = MetricsRegistry()
+    
+    registry.set('queue_depth', 5)
+    registry.set('queue_depth', 2)
+    
+    assert registry.get('queue_depth') == 2
+
+
+def test_labels_are_tracked_separately():
+    """Same metric name with different labels should be separate series."""
+    registry = MetricsRegistry()
+    
+    registry.inc('log_total', labels={'level': 'INFO'})
+    registry.inc('log_total', labels={'level': 'ERROR'})
+    registry.inc('log_total', labels={'level': 'ERROR'})
+    
+    assert registry.get('log_total', labels={'level': 'INFO'}) == 1
+    assert registry.get('log_total', labels={'level': 'ERROR'}) == 2
+
+
+def test_observe_records_sum_and_count():
+    """Summaries should be exported as _sum and _count."""
+    registry = MetricsRegistry()
+    
+    registry.observe('decode_seconds', 1.5)
+    registry.observe('decode_seconds', 0.5)
+    
+    assert registry.get('decode_seconds_sum') == 2.0
+    assert registry.get('decode_seconds_count') == 2
+
+
+def test_to_prometheus_format():
+    """Prometheus output should include TYPE lines and labelled samples."""
+    registry = MetricsRegistry()
+    registry.inc('voice_to_code_utterances_total')
+    registry.inc('voice_to_code_log_messages_total', labels={'level': 'ERROR'})
+    registry.observe('voice_to_code_decode_seconds', 0.25)
+    
+    text = registry.to_prometheus()
+    
+    assert '# TYPE voice_to_code_utterances_total counter' in text
+    assert 'voice_to_code_utterances_total 1\n' in text
+    assert 'voice_to_code_log_messages_total{level="ERROR"} 1' in text
+    assert '# TYPE voice_to_code_decode_seconds summary' in text
+    assert 'voice_to_code_decode_seconds_sum 0.25' in text
+    assert 'voice_to_code_decode_seconds_count 1' in text
+
+
+def test_to_json_contains_values():
+    """JSON output should contain every series with its labels."""
+    registry = MetricsRegistry()
+    registry.set('queue_depth', 4, labels={'queue': 'delivery'})
+    
+    data = json.loads(registry.to_json())
+    
+    assert data['metrics']['queue_depth'] == [{'labels': {'queue': 'delivery'}, 'value': 4.0}]
+
+
+def test_collectors_run_before_export():
+    """Collectors should refresh gauges on every export, once per registration."""
+    registry = MetricsRegistry()
+    calls = []
+    
+    def collector(reg):
+        calls.append(1)
+        reg.set('rss_bytes', 1024)
+    
+    registry.add_collector(collector)
+    registry.add_collector(collector)
+    text = registry.to_prometheus()
+    
+    assert len(calls) == 1
+    assert 'rss_bytes 1024' in text
+    
+    registry.remove_collector(collector)
+    registry.to_prometheus()
+    assert len(calls) == 1
+
+
+def test_failing_collector_does_not_break_export():
+    """A collector raising should not prevent other metrics from exporting."""
+    registry = MetricsRegistry()
+    registry.inc('ok_total')
+    
+    def failing(reg):
+        raise RuntimeError("boom")
+    
+    registry.add_collector(failing)
+    
+    assert 'ok_total 1' in registry.to_prometheus()
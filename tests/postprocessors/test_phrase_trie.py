@@ -0,0 +1,46 @@
+"""Tests for PhraseTrie class."""
+
+import pytest
+
+from src.postprocessors.phrase_trie import PhraseTrie, split_words
+
+
+def test_split_words_normalizes():
+    """Test words are lowercased, stripped of punctuation and split on hyphens."""
+    assert split_words("Camel-case  Paren.") == ['camel', 'case', 'paren']
+
+
+def test_longest_match_prefers_longer_phrase():
+    """Test the longest phrase starting at a position wins over its prefixes."""
+    trie = PhraseTrie()
+    trie.add('equals', '=')
+    trie.add('double equals', '==')
+    trie.add('double', 'x2')
+    words = ['a', 'double', 'equals', 'b']
+
+    assert trie.longest_match(words, 1) == (3, '==')
+    assert trie.longest_match(words, 2) == (3, '=')
+    assert trie.longest_match(words, 0) is None
+
+
+def test_add_replace_remove():
+    """Test replacing keeps the size, removing drops the phrase but not longer ones sharing it."""
+    trie = PhraseTrie()
+    trie.add('dot', '.')
+    trie.add('dot', '·')
+    trie.add('dot dot', '..')
+
+    assert len(trie) == 2
+    assert trie.get('Dot') == '·'
+    assert trie.remove('dot') is True
+    assert trie.remove('dot') is False
+    assert trie.get('dot') is None
+    assert trie.longest_match(['dot', 'dot'], 0) == (2, '..')
+    assert dict(trie.items()) == {'dot dot': '..'}
+    assert trie.max_words == 2
+
+
+def test_add_rejects_empty_phrase():
+    """Test a phrase with no words is refused."""
+    with pytest.raises(ValueError):
+        PhraseTrie().add(' - ', 'x')
@@ -0,0 +1,131 @@
+"""Tests for SpokenCodeGrammar class."""
+
+import pytest
+
+from src.postprocessors.spoken_code import SpokenCodeGrammar, parse_number
+
+
+@pytest.fixture
+def grammar():
+    return SpokenCodeGrammar()
+
+
+@pytest.fixture
+def everyday_grammar():
+    return SpokenCodeGrammar({'everyday_symbols': True})
+
+
+@pytest.mark.parametrize('spoken, code', [
+    ("camel case get value open paren close paren", "getValue()"),
+    ("items open bracket number zero close bracket plus equals number two hundred and fifty six", "items[0] += 256"),
+    ("if role double equals open quote admin close quote", 'if role == "admin"'),
+])
+def test_symbols_and_joins(grammar, spoken, code):
+    """Test symbols attach to their neighbours the way code is written."""
+    assert grammar.process(spoken) == code
+
+
+@pytest.mark.parametrize('spoken, code', [
+    ("Snake case user ID equals number forty two.", "user_id = 42"),
+    ("self dot name plus equals number two hundred and fifty six", "self.name += 256"),
+    ("for i in range open paren number ten close paren colon", "for i in range(10):"),
+    ("items open bracket number zero close bracket comma done", "items[0], done"),
+])
+def test_everyday_symbols(everyday_grammar, spoken, code):
+    """Test symbols named by everyday words work once opted into."""
+    assert everyday_grammar.process(spoken) == code
+
+
+@pytest.mark.parametrize('spoken, code', [
+    ("pascal case http client", "HttpClient"),
+    ("Constant-case max retries", "MAX_RETRIES"),
+    ("kebab case my branch name", "my-branch-name"),
+    ("snake case user name end case is set", "user_name is set"),
+])
+def test_formatters(grammar, spoken, code):
+    """Test formatters apply to following words until the next command or end case."""
+    assert grammar.process(spoken) == code
+
+
+@pytest.mark.parametrize('spoken, digits', [
+    ("four oh four", "404"),
+    ("one thousand two hundred", "1200"),
+    ("fifteen", "15"),
+    ("twenty one", "21"),
+    ("8080", "8080"),
+])
+def test_parse_number(spoken, digits):
+    """Test digit runs and spoken numbers are both read."""
+    keys = spoken.split()
+    assert parse_number(keys, 0) == (len(keys), digits)
+
+
+def test_leaves_ordinary_speech_alone(grammar):
+    """Test text without commands keeps its spelling, and a stray 'number' stays a word."""
+    assert grammar.process("Run the tests, then show me what failed.") == "Run the tests, then show me what failed."
+    assert grammar.process("what number is it") == "what number is it"
+
+
+@pytest.mark.parametrize('spoken', [
+    "run it three times",
+    "star the repo and pipe the output to less",
+    "leave a space after the percent",
+    "keep it in lower case, smash the cache and use dotted names",
+    "hash the password",
+    "add a grace period of a day",
+    "compute the dot product",
+    "plus we need tests",
+    "fix the arrow key handler",
+    "if it equals zero, return early",
+    "add a new line to the README and a comma after the name",
+    "less than a second, minus the startup time",
+    "bang on, the colon and semicolon rules need a question mark at the end",
+])
+def test_ordinary_words_are_not_commands(grammar, spoken):
+    """Test words that also come up in plain instructions are not built-in symbols or formatters."""
+    assert grammar.process(spoken) == spoken
+
+
+def test_custom_rules():
+    """Test custom symbols and formatters are added and removed built-ins no longer match."""
+    grammar = SpokenCodeGrammar({
+        'symbols': {'walrus': ':=', 'spread': {'text': '...', 'join': 'right'}},
+        'formatters': {'dunder': 'snake'},
+        'everyday_symbols': True,
+        'remove': ['dot'],
+    })
+
+    assert grammar.process("x walrus spread args") == "x := ...args"
+    assert grammar.process("dunder init") == "init"
+    assert grammar.process("self dot name") == "self dot name"
+
+
+def test_opt_in_to_ordinary_words():
+    """Test collision-prone words can still be added as rules."""
+    grammar = SpokenCodeGrammar({'symbols': {'times': '*'}, 'formatters': {'smash': 'smash'}})
+
+    assert grammar.process("a times b") == "a * b"
+    assert grammar.process("smash get value") == "getvalue"
+
+
+def test_rejects_malformed_rules():
+    """Test unknown joins, styles and rule shapes are reported."""
+    with pytest.raises(ValueError, match="unknown join"):
+        SpokenCodeGrammar({'symbols': {'spread': {'text': '...', 'join': 'sideways'}}})
+    with pytest.raises(ValueError, match="unknown style"):
+        SpokenCodeGrammar({'formatters': {'dunder': 'wavy'}})
+    with pytest.raises(ValueError):
+        SpokenCodeGrammar({'symbols': {'spread': 3}})
+
+
+def test_from_file(tmp_path):
+    """Test a missing rules file means built-ins only and invalid JSON is reported."""
+    path = tmp_path / 'spoken_code.json'
+    assert len(SpokenCodeGrammar.from_file(path)) == len(SpokenCodeGrammar())
+
+    path.write_text('{"symbols": {"walrus": ":="}}')
+    assert SpokenCodeGrammar.from_file(path).process("x walrus y") == "x := y"
+
+    path.write_text('{"symbols": ')
+    with pytest.raises(ValueError, match="not valid JSON"):
+        SpokenCodeGrammar.from_file(path)
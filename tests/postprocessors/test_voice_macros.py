@@ -0,0 +1,81 @@
+"""Tests for VoiceMacros class."""
+
+import json
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from src.metrics.metrics_registry import MetricsRegistry
+from src.postprocessors.voice_macros import VoiceMacros, load_macros
+
+
+def _write(path, macros, mtime=None):
+    path.write_text(json.dumps(macros))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def _macros(path, **kwargs):
+    return VoiceMacros(path, Mock(), metrics=MetricsRegistry(), **kwargs)
+
+
+def test_expands_triggers_anywhere_in_transcript(tmp_path):
+    """Test triggers are matched case- and punctuation-insensitively, longest first."""
+    path = tmp_path / 'macros.json'
+    _write(path, {
+        'review mode': 'Review the last commit.',
+        'ship it': ['Run the tests.', 'Commit and push.'],
+        'ship it now': 'Push without testing.',
+    })
+    macros = _macros(path)
+
+    assert macros.process("Review mode.") == "Review the last commit."
+    assert macros.process("OK, ship it") == "OK, Run the tests.\nCommit and push."
+    assert macros.process("ship it now") == "Push without testing."
+    assert macros.process("nothing to see here") == "nothing to see here"
+    assert macros.metrics.get('voice_to_code_macro_expansions_total') == 3
+    assert macros.metrics.get('voice_to_code_macros') == 3
+
+
+def test_reloads_when_file_changes(tmp_path):
+    """Test edits apply after the check interval, and a broken file keeps the old macros."""
+    path = tmp_path / 'macros.json'
+    _write(path, {'ship it': 'v1'}, mtime=1000)
+    macros = _macros(path, check_interval=0)
+
+    _write(path, {'ship it': 'v2'}, mtime=2000)
+    assert macros.process("ship it") == "v2"
+
+    path.write_text('{"ship it": ')
+    os.utime(path, (3000, 3000))
+    assert macros.process("ship it") == "v2"
+    assert 'Keeping previous voice macros' in macros.logger.warning.call_args[0][0]
+
+    path.unlink()
+    assert macros.process("ship it") == "ship it"
+
+
+def test_waits_for_check_interval(tmp_path):
+    """Test the file isn't checked again before the interval has passed."""
+    path = tmp_path / 'macros.json'
+    macros = _macros(path, check_interval=3600)
+    assert len(macros) == 0
+
+    _write(path, {'ship it': 'go'})
+
+    assert macros.process("ship it") == "ship it"
+    assert macros.reload() is True
+    assert macros.process("ship it") == "go"
+
+
+def test_load_macros_rejects_malformed_file(tmp_path):
+    """Test non-object files and non-string expansions are reported."""
+    path = tmp_path / 'macros.json'
+    _write(path, ['ship it'])
+    with pytest.raises(ValueError, match="JSON object"):
+        load_macros(path)
+
+    _write(path, {'ship it': 3})
+    with pytest.raises(ValueError, match="must expand to"):
+        load_macros(path)
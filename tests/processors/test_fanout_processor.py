@@ -0,0 +1,108 @@
+"""Tests for FanoutProcessor class."""
+
+import threading
+from unittest.mock import Mock
+
+from src.metrics.metrics_registry import MetricsRegistry
+from src.processors.fanout_processor import FanoutProcessor, is_tmux_target, parse_targets
+
+
+def _fanout(targets, processors):
+    return FanoutProcessor(lambda: targets, processors.__getitem__, Mock(), metrics=MetricsRegistry())
+
+
+def test_parse_targets_splits_and_dedupes():
+    """Test comma-separated dropdown values become a clean target list."""
+    assert parse_targets('coding, review,, coding ') == ['coding', 'review']
+    assert parse_targets('ai-voice-input') == ['ai-voice-input']
+    assert parse_targets('') == []
+
+
+def test_is_tmux_target():
+    """Test sockets and URLs are told apart from tmux sessions."""
+    assert is_tmux_target('work:0.1')
+    assert not is_tmux_target('socket:/tmp/voice.sock')
+    assert not is_tmux_target('http://127.0.0.1:8765/prompt')
+
+
+def test_delivers_to_all_targets_concurrently():
+    """Test each target gets the text and a slow target doesn't hold up the others."""
+    both_started = threading.Barrier(2, timeout=2)
+    received = []
+
+    def slow_accept(text, event):
+        # Only passes if the other target is being delivered to at the same time
+        both_started.wait()
+        received.append(text)
+
+    processors = {'coding': Mock(), 'review': Mock()}
+    for processor in processors.values():
+        processor.accept.side_effect = slow_accept
+    fanout = _fanout(['coding', 'review'], processors)
+    event = Mock()
+
+    assert fanout.accept('run the tests', event) is True
+
+    assert received == ['run the tests', 'run the tests']
+    processors['coding'].accept.assert_called_once_with('run the tests', event)
+    assert fanout.metrics.get('voice_to_code_fanout_delivery_seconds_count', {'target': 'review'}) == 1
+    fanout.close()
+
+
+def test_reports_failed_targets():
+    """Test exceptions and False results count as per-target failures."""
+    processors = {'ok': Mock(), 'raises': Mock(), 'refuses': Mock()}
+    processors['raises'].accept.side_effect = RuntimeError('boom')
+    processors['refuses'].accept.return_value = False
+    fanout = _fanout(['ok', 'raises', 'refuses'], processors)
+
+    assert fanout.accept('hello') is False
+
+    assert fanout.metrics.get('voice_to_code_fanout_failures_total', {'target': 'raises'}) == 1
+    assert fanout.metrics.get('voice_to_code_fanout_failures_total', {'target': 'refuses'}) == 1
+    assert fanout.metrics.get('voice_to_code_fanout_failures_total', {'target': 'ok'}) == 0
+    assert "Delivery to 'raises' failed: boom" in fanout.logger.error.call_args[0][0]
+    assert 'failed: raises, refuses' in fanout.logger.warning.call_args[0][0]
+    fanout.close()
+
+
+def test_follows_selection_and_creates_targets_once():
+    """Test the current selection is read per transcript and processors are reused."""
+    selection = ['a']
+    create_target = Mock(side_effect=lambda target: Mock(name=target))
+    fanout = FanoutProcessor(lambda: selection, create_target, Mock(), metrics=MetricsRegistry())
+
+    fanout.accept('one')
+    selection.append('b')
+    fanout.accept('two')
+    fanout.toggle_vocalization(True)
+
+    assert [call[0][0] for call in create_target.call_args_list] == ['a', 'b']
+    created = dict(fanout._processors)
+    created['b'].toggle_vocalization.assert_called_once_with(True)
+    assert fanout.close() is True
+    created['a'].close.assert_called_once_with(None)
+
+
+def test_close_reports_targets_with_undelivered_text():
+    """Test close is False when any target couldn't deliver what it had pending."""
+    processors = {'a': Mock(), 'b': Mock()}
+    processors['b'].close.return_value = False
+    fanout = _fanout(['a', 'b'], processors)
+    fanout.accept('hello')
+
+    assert fanout.close(timeout=1) is False
+    processors['a'].close.assert_called_once_with(1)
+
+
+def test_resend_goes_to_the_recorded_target():
+    """Test an outbox item is retried through its own target, whatever is selected."""
+    processors = {'a': Mock(), 'b': Mock()}
+    processors['b'].resend.return_value = True
+    fanout = _fanout(['a'], processors)
+    item = Mock(target='b')
+
+    assert fanout.resend(item) is True
+
+    processors['b'].resend.assert_called_once_with(item)
+    processors['a'].resend.assert_not_called()
@@ -0,0 +1,239 @@
+"""Tests for OutboxProcessor class."""
+
+import socket
+from unittest.mock import Mock
+
+import pytest
+
+from src.metrics.metrics_registry import MetricsRegistry
+from src.processors.outbox_processor import OutboxProcessor
+from src.processors.socket_processor import SocketProcessor
+from src.transcribers.transcription_events import EventType, TranscriptionEvent
+from src.utils.outbox import Outbox
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = Outbox(tmp_path / 'outbox.db')
+    yield outbox
+    outbox.close()
+
+
+def _processor(inner, outbox, **kwargs):
+    return OutboxProcessor(inner, 'work', outbox, Mock(), retry_interval=60, metrics=MetricsRegistry(), **kwargs)
+
+
+def test_records_then_marks_delivered(outbox):
+    """Test a delivered transcript leaves nothing pending."""
+    inner = Mock()
+    inner.accept.return_value = True
+    processor = _processor(inner, outbox)
+    event = TranscriptionEvent(EventType.FINAL, 4, 'hello', confidence=0.8)
+
+    assert processor.accept('hello', event) is True
+
+    delivered_event = inner.accept.call_args[0][1]
+    assert (delivered_event.utterance_id, delivered_event.confidence) == (4, 0.8)
+    assert outbox.pending() == []
+    assert processor.close() is True
+
+
+def test_failed_transcript_is_kept_and_sent_first_later(outbox):
+    """Test a failure keeps the text, and it goes out before the next transcript."""
+    inner = Mock()
+    inner.accept.side_effect = [False, True, True]
+    processor = _processor(inner, outbox)
+
+    assert processor.accept('first') is False
+    assert [item.text for item in outbox.pending('work')] == ['first']
+
+    assert processor.accept('second') is True
+
+    assert [call[0][0] for call in inner.accept.call_args_list] == ['first', 'first', 'second']
+    assert outbox.pending() == []
+    assert processor.metrics.get('voice_to_code_outbox_redelivered_total') == 1
+
+
+def test_exceptions_count_as_failures(outbox):
+    """Test an exception from the target keeps the text in the outbox."""
+    inner = Mock()
+    inner.accept.side_effect = RuntimeError('boom')
+    processor = _processor(inner, outbox)
+
+    assert processor.accept('hello') is False
+
+    assert outbox.pending()[0].attempts == 1
+    assert processor.close() is False
+    assert "kept in the outbox" in processor.logger.warning.call_args[0][0]
+
+
+def test_unavailable_target_is_not_tried(outbox):
+    """Test nothing is sent while the target is known to be missing."""
+    inner = Mock()
+    processor = _processor(inner, outbox, is_available=lambda: False)
+
+    assert processor.accept('hello') is False
+
+    inner.accept.assert_not_called()
+    assert [item.text for item in outbox.pending()] == ['hello']
+    assert processor.metrics.get('voice_to_code_outbox_pending') == 1
+
+
+def test_retries_in_background_when_target_returns(outbox):
+    """Test recent pending transcripts, including ones from a run that just ended, are retried automatically."""
+    outbox.add('work', 'from last run', {'text': 'from last run'})
+    outbox.add('other', 'not ours', {})
+    available = [False]
+    inner = Mock()
+    inner.accept.return_value = True
+    processor = OutboxProcessor(inner, 'work', outbox, Mock(), is_available=lambda: available[0],
+                                retry_interval=0.01, metrics=MetricsRegistry())
+
+    available[0] = True
+    for _ in range(200):
+        if not outbox.pending('work'):
+            break
+        processor._stopped.wait(0.01)
+    processor.close()
+
+    inner.accept.assert_called_once()
+    assert inner.accept.call_args[0][0] == 'from last run'
+    assert [item.text for item in outbox.pending()] == ['not ours']
+
+
+def test_old_transcripts_are_left_for_the_user(outbox):
+    """Test transcripts past max_retry_age are neither retried nor sent ahead of new ones."""
+    old_id = outbox.add('work', 'from yesterday', {'text': 'from yesterday'})
+    outbox._db.execute('UPDATE items SET created_at = created_at - 86400 WHERE id = ?', (old_id,))
+    inner = Mock()
+    inner.accept.return_value = True
+    processor = _processor(inner, outbox, max_retry_age=600)
+
+    assert processor.retry() is True
+    inner.accept.assert_not_called()
+
+    assert processor.accept('now') is True
+
+    assert [call[0][0] for call in inner.accept.call_args_list] == ['now']
+    assert [item.text for item in outbox.pending()] == ['from yesterday']
+    assert processor.close() is False
+
+
+class ConfirmingProcessor:
+    """Processor that buffers transcripts and confirms them when told to."""
+
+    confirms_delivery = True
+
+    def __init__(self):
+        self.buffered = []
+
+    def accept(self, text, event=None, on_done=None):
+        self.buffered.append((text, on_done))
+        return True
+
+    def finish(self, ok):
+        buffered, self.buffered = self.buffered, []
+        for _text, on_done in buffered:
+            on_done(ok)
+
+    def close(self, timeout=None):
+        self.finish(False)
+        return True
+
+
+def test_buffered_transcript_stays_pending_until_confirmed(outbox):
+    """Test a transcript the processor only buffered isn't marked delivered or sent twice."""
+    inner = ConfirmingProcessor()
+    processor = _processor(inner, outbox)
+
+    assert processor.accept('first') is True
+    assert processor.retry() is True
+    assert [text for text, _on_done in inner.buffered] == ['first']
+    assert [item.text for item in outbox.pending()] == ['first']
+
+    inner.finish(True)
+
+    assert outbox.pending() == []
+    processor.close()
+
+
+def test_dropped_buffer_keeps_transcript_for_retry(outbox):
+    """Test a buffered transcript the processor gives up on is kept and sent again."""
+    inner = ConfirmingProcessor()
+    processor = _processor(inner, outbox)
+    processor.accept('first')
+
+    inner.finish(False)
+
+    assert outbox.pending()[0].attempts == 1
+    processor.retry()
+    assert [text for text, _on_done in inner.buffered] == ['first']
+    assert processor.close() is False
+    assert [item.text for item in outbox.pending()] == ['first']
+
+
+def test_socket_records_count_as_delivered_once_written(outbox, tmp_path):
+    """Test a socket transcript buffered for an absent reader stays in the outbox after close."""
+    path = tmp_path / 'voice.sock'
+    processor = _processor(SocketProcessor(path, Mock(), reconnect_interval=0, metrics=MetricsRegistry()), outbox)
+
+    processor.accept('nobody listening')
+    assert processor.close(timeout=0.05) is False
+    assert [item.text for item in outbox.pending()] == ['nobody listening']
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen()
+    processor = _processor(SocketProcessor(path, Mock(), metrics=MetricsRegistry()), outbox)
+    assert processor.retry() is True
+    conn, _ = server.accept()
+    assert b'nobody listening' in conn.recv(4096)
+    assert outbox.pending() == []
+    processor.close()
+    conn.close()
+    server.close()
+
+
+def test_resend_retries_old_transcript_through_its_row(outbox):
+    """Test resend delivers an old transcript without recording it again."""
+    old_id = outbox.add('work', 'from yesterday', {'text': 'from yesterday'})
+    outbox._db.execute('UPDATE items SET created_at = created_at - 86400 WHERE id = ?', (old_id,))
+    inner = Mock()
+    inner.accept.side_effect = [False, True]
+    processor = _processor(inner, outbox, max_retry_age=600)
+    item = outbox.pending()[0]
+
+    assert processor.resend(item) is False
+    assert [pending.id for pending in outbox.pending()] == [old_id]
+
+    assert processor.retry() is True
+
+    assert [call[0][0] for call in inner.accept.call_args_list] == ['from yesterday'] * 2
+    assert outbox.pending() == []
+    processor.close()
+
+
+def test_resend_waits_for_confirmation(outbox):
+    """Test a re-sent transcript stays pending until a buffering target confirms it."""
+    outbox.add('work', 'hello', {'text': 'hello'})
+    inner = ConfirmingProcessor()
+    processor = _processor(inner, outbox)
+
+    assert processor.resend(outbox.pending()[0]) is True
+    assert len(outbox.pending()) == 1
+
+    inner.finish(True)
+    assert outbox.pending() == []
+    processor.close()
+
+
+def test_resend_refuses_other_targets(outbox):
+    """Test an item recorded for another target is not delivered here."""
+    outbox.add('other', 'hello', {'text': 'hello'})
+    inner = Mock()
+    processor = _processor(inner, outbox)
+
+    assert processor.resend(outbox.pending()[0]) is False
+
+    inner.accept.assert_not_called()
+    processor.close()
@@ -0,0 +1,49 @@
+"""Tests for PostprocessingProcessor class."""
+
+from unittest.mock import Mock
+
+from src.metrics.metrics_registry import MetricsRegistry
+from src.processors.postprocessing_processor import PostprocessingProcessor
+
+
+def _processor(*postprocessors):
+    return PostprocessingProcessor(Mock(), list(postprocessors), Mock(), metrics=MetricsRegistry())
+
+
+def test_rewrites_in_order_and_forwards_event():
+    """Test each post-processor sees the previous one's output and the event is passed on."""
+    first, second = Mock(), Mock()
+    first.process.side_effect = lambda text: text.upper()
+    second.process.side_effect = lambda text: text + '!'
+    processor = _processor(first, second)
+    processor.processor.accept.return_value = True
+    event = Mock()
+
+    assert processor.accept('hello', event) is True
+
+    processor.processor.accept.assert_called_once_with('HELLO!', event)
+    assert "Rewrote 'hello' as 'HELLO!'" in processor.logger.debug.call_args[0][0]
+    assert processor.metrics.get('voice_to_code_postprocess_seconds_count') == 1
+
+
+def test_drops_text_rewritten_to_nothing():
+    """Test nothing is delivered when a post-processor leaves only whitespace."""
+    postprocessor = Mock()
+    postprocessor.process.return_value = ' '
+    processor = _processor(postprocessor)
+
+    assert processor.accept('end case') is None
+    assert processor.accept('') is None
+    processor.processor.accept.assert_not_called()
+
+
+def test_passes_through_vocalization_and_close():
+    """Test toggle_vocalization and close reach the wrapped processor."""
+    processor = _processor()
+    processor.processor.close.return_value = True
+
+    processor.toggle_vocalization(True)
+
+    processor.processor.toggle_vocalization.assert_called_once_with(True)
+    assert processor.close(2) is True
+    processor.processor.close.assert_called_once_with(2)
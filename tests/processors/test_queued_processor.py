@@ -0,0 +1,199 @@
+"""Tests for QueuedProcessor class."""
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from src.metrics.metrics_registry import MetricsRegistry
+from src.processors.queued_processor import QueuedProcessor
+
+
+class GatedProcessor:
+    """Processor that records deliveries and can be held up like a hung tmux call."""
+
+    def __init__(self):
+        self.delivered = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+
+    def accept(self, text, event=None):
+        self.started.set()
+        self.gate.wait(5)
+        self.delivered.append(text)
+
+    def toggle_vocalization(self, is_on):
+        self.delivered.append(('vocalization', is_on))
+
+    def close(self, timeout=None):
+        self.closed_with = timeout
+        return True
+
+
+def _held(inner, **kwargs):
+    """QueuedProcessor whose worker is stuck delivering a first 'busy' transcript."""
+    inner.gate.clear()
+    processor = QueuedProcessor(inner, Mock(), metrics=MetricsRegistry(), **kwargs)
+    processor.accept('busy')
+    assert inner.started.wait(2)
+    return processor
+
+
+def test_accept_returns_before_delivery():
+    """Test accept queues text without waiting for a slow target."""
+    inner = GatedProcessor()
+    processor = _held(inner)
+
+    processor.accept('next')
+
+    assert inner.delivered == []
+    assert processor.pending() == 2
+    inner.gate.set()
+    assert processor.close()
+    assert inner.delivered == ['busy', 'next']
+
+
+def test_delivers_in_order_including_vocalization():
+    """Test transcripts and vocalization changes reach the target in submission order."""
+    inner = GatedProcessor()
+    processor = QueuedProcessor(inner, Mock(), metrics=MetricsRegistry())
+
+    processor.accept('one')
+    processor.toggle_vocalization(True)
+    processor.accept('two')
+
+    assert processor.flush(2)
+    assert inner.delivered == ['one', ('vocalization', True), 'two']
+    processor.close()
+
+
+def test_passes_event_to_wrapped_processor():
+    """Test the transcription event travels with its text."""
+    inner = Mock()
+    processor = QueuedProcessor(inner, Mock(), metrics=MetricsRegistry())
+    event = Mock()
+
+    processor.accept('hello', event)
+
+    assert processor.close()
+    inner.accept.assert_called_once_with('hello', event)
+
+
+def test_empty_text_is_not_queued():
+    """Test empty transcripts are rejected."""
+    inner = GatedProcessor()
+    processor = QueuedProcessor(inner, Mock(), metrics=MetricsRegistry())
+
+    assert processor.submit('') is False
+    assert processor.submit(None) is False
+    processor.close()
+    assert inner.delivered == []
+
+
+def test_drop_oldest_discards_oldest_queued_transcript():
+    """Test drop_oldest makes room by discarding the oldest waiting transcript."""
+    inner = GatedProcessor()
+    processor = _held(inner, max_queue_size=2, overflow='drop_oldest')
+
+    for text in ('a', 'b', 'c'):
+        assert processor.submit(text)
+
+    inner.gate.set()
+    processor.close()
+    assert inner.delivered == ['busy', 'b', 'c']
+    assert processor.metrics.get('voice_to_code_delivery_overflow_total', {'policy': 'drop_oldest'}) == 1
+
+
+def test_merge_appends_to_newest_queued_transcript():
+    """Test merge keeps all text by joining it onto the newest waiting transcript."""
+    inner = GatedProcessor()
+    processor = _held(inner, max_queue_size=2, overflow='merge')
+
+    for text in ('a', 'b', 'c', 'd'):
+        assert processor.submit(text)
+
+    inner.gate.set()
+    processor.close()
+    assert inner.delivered == ['busy', 'a', 'b c d']
+
+
+def test_block_waits_for_room():
+    """Test block holds the submitter until the worker frees a slot."""
+    inner = GatedProcessor()
+    processor = _held(inner, max_queue_size=1, overflow='block')
+    processor.submit('a')
+
+    submitted = threading.Event()
+    thread = threading.Thread(target=lambda: (processor.submit('b'), submitted.set()))
+    thread.start()
+
+    assert not submitted.wait(0.2)
+    inner.gate.set()
+    assert submitted.wait(2)
+    thread.join()
+    processor.close()
+    assert inner.delivered == ['busy', 'a', 'b']
+
+
+def test_close_reports_undelivered_items():
+    """Test close gives up after the timeout and reports what was discarded."""
+    inner = GatedProcessor()
+    processor = _held(inner)
+    processor.accept('stuck')
+
+    assert processor.close(timeout=0.1) is False
+
+    processor.logger.warning.assert_called()
+    assert 'Discarded 1' in processor.logger.warning.call_args[0][0]
+    assert processor.submit('late') is False
+    inner.gate.set()
+
+
+def test_close_closes_wrapped_processor():
+    """Test close passes on to the wrapped processor after the queue drained, with the time left."""
+    inner = Mock()
+    inner.close.return_value = False
+    processor = QueuedProcessor(inner, Mock(), metrics=MetricsRegistry())
+    processor.accept('hello')
+
+    assert processor.close(timeout=2.0) is False
+
+    inner.accept.assert_called_once()
+    inner.close.assert_called_once()
+    assert 0 < inner.close.call_args[0][0] <= 2.0
+
+
+def test_delivery_errors_are_logged_and_worker_continues():
+    """Test an exception from the target does not stop later deliveries."""
+    inner = Mock()
+    inner.accept.side_effect = [RuntimeError('boom'), None]
+    processor = QueuedProcessor(inner, Mock(), metrics=MetricsRegistry())
+
+    processor.accept('one')
+    processor.accept('two')
+
+    assert processor.close()
+    assert inner.accept.call_count == 2
+    assert 'Delivery failed: boom' in processor.logger.error.call_args[0][0]
+
+
+def test_records_delivery_latency():
+    """Test each delivery is observed in the latency summary."""
+    inner = GatedProcessor()
+    registry = MetricsRegistry()
+    processor = QueuedProcessor(inner, Mock(), metrics=registry)
+
+    processor.accept('one')
+    processor.close()
+
+    assert registry.get('voice_to_code_delivery_latency_seconds_count') == 1
+    assert registry.get('voice_to_code_delivery_queue_depth') == 0
+
+
+def test_rejects_invalid_configuration():
+    """Test invalid queue size and overflow policy raise ValueError."""
+    with pytest.raises(ValueError, match="max_queue_size"):
+        QueuedProcessor(Mock(), Mock(), max_queue_size=0)
+    with pytest.raises(ValueError, match="Unknown overflow policy"):
+        QueuedProcessor(Mock(), Mock(), overflow='spill')
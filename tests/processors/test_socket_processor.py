@@ -0,0 +1,146 @@
+"""Tests for SocketProcessor class."""
+
+import json
+import os
+import socket
+from unittest.mock import Mock
+
+from src.metrics.metrics_registry import MetricsRegistry
+from src.processors.socket_processor import SocketProcessor
+from src.transcribers.transcription_events import EventType, TranscriptionEvent
+
+
+def _listen(path):
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen(1)
+    server.settimeout(2)
+    return server
+
+
+def _read_records(conn, count):
+    """Read count JSON lines from a connected socket."""
+    conn.settimeout(2)
+    data = b''
+    while data.count(b'\n') < count:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return [json.loads(line) for line in data.splitlines()]
+
+
+def _processor(path, **kwargs):
+    return SocketProcessor(path, Mock(), metrics=MetricsRegistry(), **kwargs)
+
+
+def test_writes_json_lines_to_unix_socket(tmp_path):
+    """Test transcripts arrive as JSON lines with the event's details."""
+    path = tmp_path / 'voice.sock'
+    server = _listen(path)
+    processor = _processor(path)
+    event = TranscriptionEvent(
+        EventType.FINAL, 3, 'run the tests', timestamp=100.0,
+        speech_started_at=96.0, audio_seconds=3.2, decode_seconds=0.8, confidence=0.9,
+    )
+
+    processor.accept('run the tests', event)
+    processor.toggle_vocalization(True)
+    conn, _ = server.accept()
+
+    records = _read_records(conn, 2)
+    assert records[0] == {
+        'type': 'transcript', 'utterance_id': 3, 'text': 'run the tests', 'timestamp': 100.0,
+        'speech_started_at': 96.0, 'audio_seconds': 3.2, 'decode_seconds': 0.8, 'confidence': 0.9,
+    }
+    assert records[1]['type'] == 'vocalization' and records[1]['enabled'] is True
+    assert processor.close()
+    assert processor.metrics.get('voice_to_code_socket_records_total') == 2
+    conn.close()
+    server.close()
+
+
+def test_keeps_one_connection(tmp_path):
+    """Test successive transcripts reuse the same connection."""
+    path = tmp_path / 'voice.sock'
+    server = _listen(path)
+    processor = _processor(path)
+
+    processor.accept('one')
+    conn, _ = server.accept()
+    processor.accept('two')
+
+    assert [r['text'] for r in _read_records(conn, 2)] == ['one', 'two']
+    assert processor.metrics.get('voice_to_code_socket_connects_total') == 1
+    processor.close()
+    conn.close()
+    server.close()
+
+
+def test_buffers_until_reader_appears(tmp_path):
+    """Test records are kept while nothing listens and sent once a reader connects."""
+    path = tmp_path / 'voice.sock'
+    processor = _processor(path, reconnect_interval=0)
+
+    processor.accept('early')
+    processor.logger.warning.assert_called_once()
+    assert processor.metrics.get('voice_to_code_socket_buffered_records') == 1
+
+    server = _listen(path)
+    processor.accept('late')
+    conn, _ = server.accept()
+
+    assert [r['text'] for r in _read_records(conn, 2)] == ['early', 'late']
+    processor.close()
+    conn.close()
+    server.close()
+
+
+def test_reconnects_after_reader_restarts(tmp_path):
+    """Test a lost reader is replaced by a new connection without losing records."""
+    path = tmp_path / 'voice.sock'
+    server = _listen(path)
+    processor = _processor(path, reconnect_interval=0)
+    processor.accept('first')
+    conn, _ = server.accept()
+    assert _read_records(conn, 1)[0]['text'] == 'first'
+    conn.close()
+    server.close()
+    os.unlink(path)
+
+    processor.accept('between')
+    processor.accept('second')
+    server = _listen(path)
+    assert processor.close(timeout=2)
+    conn, _ = server.accept()
+
+    assert [r['text'] for r in _read_records(conn, 2)] == ['between', 'second']
+    assert processor.metrics.get('voice_to_code_socket_connects_total') == 2
+    conn.close()
+    server.close()
+
+
+def test_drops_oldest_when_buffer_is_full(tmp_path):
+    """Test the buffer is bounded and the oldest record is dropped."""
+    processor = _processor(tmp_path / 'missing.sock', max_buffered_records=2)
+
+    for text in ('a', 'b', 'c'):
+        processor.accept(text)
+
+    assert [json.loads(r)['text'] for r, _on_done in processor._records] == ['b', 'c']
+    assert processor.metrics.get('voice_to_code_socket_records_dropped_total') == 1
+    assert processor.close(timeout=0) is False
+
+
+def test_writes_to_fifo(tmp_path):
+    """Test a FIFO with a reader receives the records."""
+    path = tmp_path / 'voice.fifo'
+    os.mkfifo(path)
+    reader = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+    processor = _processor(path)
+
+    processor.accept('über')
+
+    assert processor.close()
+    assert json.loads(os.read(reader, 65536).decode('utf-8'))['text'] == 'über'
+    os.close(reader)
@@ -1,9 +1,10 @@
 """Tests for TmuxProcessor class."""
 
-import subprocess
 from unittest.mock import Mock, patch
 
+from src.metrics.metrics_registry import MetricsRegistry
 from src.processors.tmux_processor import TmuxProcessor
+from src.utils.tmux_client import TmuxCommandError
 
 
 def test_initialization_stores_callable():
@@ -18,86 +19,164 @@ def test_initialization_stores_callable():
     assert processor.get_session_name() == 'my-session'
 
 
-@patch('subprocess.run')
-def test_accept_sends_to_tmux(mock_run):
+@patch('src.processors.tmux_processor.get_tmux_client')
+def test_initialization_defaults_to_shared_client(mock_get_client):
+    """Test processor uses the shared tmux client unless one is given."""
+    assert TmuxProcessor(Mock(), Mock()).client is mock_get_client.return_value
+
+    client = Mock()
+    assert TmuxProcessor(Mock(), Mock(), client=client).client is client
+
+
+def test_accept_sends_to_tmux():
     """Test accept sends text with correct tmux commands."""
     get_session = Mock(return_value='test-session')
     logger = Mock()
-    processor = TmuxProcessor(get_session, logger)
+    client = Mock()
+    processor = TmuxProcessor(get_session, logger, client=client)
     
     processor.accept("Hello world")
     
-    # Should call tmux twice: send-keys with text, then Enter
-    assert mock_run.call_count == 2
+    # Should send two tmux commands in one batch: send-keys with text, then Enter
+    client.run_many.assert_called_once()
     get_session.assert_called()
     
-    calls = mock_run.call_args_list
-    assert calls[0][0][0] == ["tmux", "send-keys", "-t", "test-session", "-l", "Hello world"]
-    assert calls[1][0][0] == ["tmux", "send-keys", "-t", "test-session", "Enter"]
+    commands = client.run_many.call_args[0][0]
+    assert commands[0] == ["send-keys", "-t", "test-session", "-l", "Hello world"]
+    assert commands[1] == ["send-keys", "-t", "test-session", "Enter"]
 
 
-@patch('subprocess.run')
-def test_accept_sanitizes_newlines(mock_run):
+def test_accept_sanitizes_newlines():
     """Test accept removes newlines from text."""
     get_session = Mock(return_value='test-session')
     logger = Mock()
-    processor = TmuxProcessor(get_session, logger)
+    client = Mock()
+    processor = TmuxProcessor(get_session, logger, client=client)
     
     processor.accept("Line1\nLine2\rLine3")
     
     # Should send with newlines replaced by spaces
-    calls = mock_run.call_args_list
-    assert calls[0][0][0] == ["tmux", "send-keys", "-t", "test-session", "-l", "Line1 Line2 Line3"]
+    commands = client.run_many.call_args[0][0]
+    assert commands[0] == ["send-keys", "-t", "test-session", "-l", "Line1 Line2 Line3"]
 
 
-@patch('subprocess.run')
-def test_accept_sanitizes_mixed_newlines(mock_run):
+def test_accept_sanitizes_mixed_newlines():
     """Test accept handles mixed newline characters."""
     get_session = Mock(return_value='test-session')
     logger = Mock()
-    processor = TmuxProcessor(get_session, logger)
+    client = Mock()
+    processor = TmuxProcessor(get_session, logger, client=client)
     
     processor.accept("First\n\rSecond\r\nThird")
     
-    calls = mock_run.call_args_list
+    commands = client.run_many.call_args[0][0]
     # All newlines should be replaced with spaces
-    assert calls[0][0][0] == ["tmux", "send-keys", "-t", "test-session", "-l", "First  Second  Third"]
+    assert commands[0] == ["send-keys", "-t", "test-session", "-l", "First  Second  Third"]
+
+
+def test_accept_pastes_multiline_text_as_a_whole():
+    """Test keep_line_breaks pastes text with line breaks in one go, below the threshold too."""
+    client = Mock()
+    processor = TmuxProcessor(Mock(return_value='test-session'), Mock(), client=client, keep_line_breaks=True)
+    
+    processor.accept("Run the tests.\r\nCommit.\n")
+    
+    commands = client.run_many.call_args[0][0]
+    assert commands == [
+        ["set-buffer", "-b", "voice-to-code", "--", "Run the tests.\nCommit."],
+        ["paste-buffer", "-d", "-p", "-b", "voice-to-code", "-t", "test-session"],
+        ["send-keys", "-t", "test-session", "Enter"],
+    ]
+
+
+def test_accept_waits_for_agent_before_sending():
+    """Test text is held until the agent is idle and the wait is recorded."""
+    client = Mock()
+    agent_state = Mock()
+    agent_state.wait_until_idle.side_effect = lambda target: client.run_many.assert_not_called() or True
+    processor = TmuxProcessor(Mock(return_value='work'), Mock(), client=client, agent_state=agent_state)
+    processor.metrics = MetricsRegistry()
+    
+    assert processor.accept("run the tests") is True
+    
+    agent_state.wait_until_idle.assert_called_once_with('work')
+    agent_state.mark_busy.assert_called_once_with('work', 'run the tests')
+    assert processor.metrics.get('voice_to_code_agent_wait_seconds_count') == 1
+    processor.close()
+    agent_state.close.assert_called_once()
 
 
-@patch('subprocess.run')
-def test_accept_returns_false_for_empty_text(mock_run):
+def test_accept_sends_anyway_when_agent_stays_busy():
+    """Test a wait that times out is counted and warned about, and the text still goes out."""
+    client = Mock()
+    agent_state = Mock()
+    agent_state.wait_until_idle.return_value = False
+    processor = TmuxProcessor(Mock(return_value='work'), Mock(), client=client, agent_state=agent_state)
+    processor.metrics = MetricsRegistry()
+    
+    assert processor.accept("run the tests") is True
+    
+    client.run_many.assert_called_once()
+    assert processor.metrics.get('voice_to_code_agent_wait_timeouts_total') == 1
+    assert "still busy" in processor.logger.warning.call_args[0][0]
+
+
+def test_local_vocalization_watches_pane_without_waiting():
+    """Test a response vocalizer is toggled locally and the pane is watched before sending."""
+    client = Mock()
+    agent_state = Mock()
+    vocalizer = Mock(enabled=False)
+    processor = TmuxProcessor(
+        Mock(return_value='work'), Mock(), client=client,
+        agent_state=agent_state, wait_for_agent=False, response_vocalizer=vocalizer,
+    )
+    
+    processor.toggle_vocalization(True)
+    vocalizer.enabled = True
+    processor.accept("explain the bug")
+    
+    vocalizer.set_enabled.assert_called_once_with(True)
+    # Nothing is typed to ask the agent to vocalize
+    assert client.run_many.call_count == 1
+    agent_state.watch.assert_called_once_with('work')
+    agent_state.wait_until_idle.assert_not_called()
+    agent_state.mark_busy.assert_called_once_with('work', 'explain the bug')
+
+
+def test_accept_returns_false_for_empty_text():
     """Test accept returns None for empty text."""
     get_session = Mock(return_value='test-session')
     logger = Mock()
-    processor = TmuxProcessor(get_session, logger)
+    client = Mock()
+    processor = TmuxProcessor(get_session, logger, client=client)
     
     result = processor.accept("")
     
     assert result is None
-    mock_run.assert_not_called()
+    client.run_many.assert_not_called()
 
 
-@patch('subprocess.run')
-def test_accept_returns_false_for_none(mock_run):
+def test_accept_returns_false_for_none():
     """Test accept returns None for None input."""
     get_session = Mock(return_value='test-session')
     logger = Mock()
-    processor = TmuxProcessor(get_session, logger)
+    client = Mock()
+    processor = TmuxProcessor(get_session, logger, client=client)
     
     result = processor.accept(None)
     
     assert result is None
-    mock_run.assert_not_called()
+    client.run_many.assert_not_called()
 
 
-@patch('subprocess.run')
-def test_accept_handles_subprocess_error(mock_run):
-    """Test accept handles and logs subprocess errors."""
+def test_accept_handles_tmux_error():
+    """Test accept handles and logs tmux errors."""
     get_session = Mock(return_value='test-session')
     logger = Mock()
-    processor = TmuxProcessor(get_session, logger)
+    client = Mock()
+    processor = TmuxProcessor(get_session, logger, client=client)
     
-    mock_run.side_effect = subprocess.CalledProcessError(1, 'tmux')
+    client.run_many.side_effect = TmuxCommandError(1, 'tmux')
     
     processor.accept("test")
     
@@ -105,95 +184,181 @@ def test_accept_handles_subprocess_error(mock_run):
     assert "Failed to send to tmux" in logger.error.call_args[0][0]
 
 
-@patch('subprocess.run')
-def test_accept_logs_session_name(mock_run):
+def test_accept_rejects_session_known_to_be_missing():
+    """Test accept skips the send and logs the text when the session doesn't exist."""
+    get_session = Mock(return_value='gone')
+    logger = Mock()
+    client = Mock()
+    sessions = Mock()
+    sessions.is_known.return_value = False
+    processor = TmuxProcessor(get_session, logger, client=client, sessions=sessions)
+    
+    processor.accept("keep this")
+    
+    client.run_many.assert_not_called()
+    sessions.is_known.assert_called_once_with('gone')
+    assert "'gone' does not exist, not sent: keep this" in logger.error.call_args[0][0]
+
+
+def test_accept_sends_when_session_list_unknown():
+    """Test accept still sends when the session list hasn't been read yet."""
+    client = Mock()
+    sessions = Mock()
+    sessions.is_known.return_value = None
+    processor = TmuxProcessor(Mock(return_value='s'), Mock(), client=client, sessions=sessions)
+    
+    processor.accept("hello")
+    
+    client.run_many.assert_called_once()
+
+
+def test_accept_pastes_long_text():
+    """Test text over the paste threshold is loaded into a buffer and pasted."""
+    client = Mock()
+    processor = TmuxProcessor(Mock(return_value='test-session'), Mock(), client=client, paste_threshold=10)
+    
+    processor.accept("-a long dictation")
+    
+    commands = client.run_many.call_args[0][0]
+    assert commands == [
+        ["set-buffer", "-b", "voice-to-code", "--", "-a long dictation"],
+        ["paste-buffer", "-d", "-p", "-b", "voice-to-code", "-t", "test-session"],
+        ["send-keys", "-t", "test-session", "Enter"],
+    ]
+
+
+def test_accept_types_text_at_threshold():
+    """Test text up to the threshold is still typed, and 0 disables pasting."""
+    client = Mock()
+    processor = TmuxProcessor(Mock(return_value='s'), Mock(), client=client, paste_threshold=5)
+    
+    processor.accept("12345")
+    assert client.run_many.call_args[0][0][0][0:4] == ["send-keys", "-t", "s", "-l"]
+    
+    processor.paste_threshold = 0
+    processor.accept("x" * 1000)
+    assert client.run_many.call_args[0][0][0][0] == "send-keys"
+
+
+def test_accept_records_delivery_time_by_method():
+    """Test sends and delivery time are recorded per delivery method."""
+    client = Mock()
+    processor = TmuxProcessor(Mock(return_value='s'), Mock(), client=client, paste_threshold=5)
+    processor.metrics = MetricsRegistry()
+    
+    processor.accept("short")
+    processor.accept("much longer text")
+    
+    for method in ('send_keys', 'paste'):
+        assert processor.metrics.get('voice_to_code_tmux_sends_total', {'method': method}) == 1
+        assert processor.metrics.get('voice_to_code_delivery_seconds_count', {'method': method}) == 1
+
+
+def test_accept_logs_session_name():
     """Test accept logs the session name it's sending to."""
     get_session = Mock(return_value='my-special-session')
     logger = Mock()
-    processor = TmuxProcessor(get_session, logger)
+    client = Mock()
+    processor = TmuxProcessor(get_session, logger, client=client)
     
     processor.accept("test message")
     
     logger.info.assert_called_with("Sending to tmux session 'my-special-session'")
 
 
-@patch('subprocess.run')
-def test_accept_uses_literal_flag(mock_run):
+def test_accept_uses_literal_flag():
     """Test accept uses -l flag for literal text interpretation."""
     get_session = Mock(return_value='test-session')
     logger = Mock()
-    processor = TmuxProcessor(get_session, logger)
+    client = Mock()
+    processor = TmuxProcessor(get_session, logger, client=client)
     
     processor.accept("some $special chars")
     
     # Verify -l flag is used
-    calls = mock_run.call_args_list
-    assert "-l" in calls[0][0][0]
+    commands = client.run_many.call_args[0][0]
+    assert "-l" in commands[0]
 
 
-@patch('subprocess.run')
 @patch('src.processors.tmux_processor.get_os_type')
-def test_toggle_vocalization_on_macos_with_true(mock_get_os_type, mock_run):
+def test_toggle_vocalization_on_macos_with_true(mock_get_os_type):
     """Test toggle_vocalization sends start prompt on macOS when is_on=True."""
     from src.utils.os_detection import OSType
     mock_get_os_type.return_value = OSType.MACOS
     get_session = Mock(return_value='test-session')
     logger = Mock()
-    processor = TmuxProcessor(get_session, logger)
+    client = Mock()
+    processor = TmuxProcessor(get_session, logger, client=client)
     
     processor.toggle_vocalization(True)
     
     # Should send start prompt
-    assert mock_run.call_count == 2
-    first_call = mock_run.call_args_list[0][0][0]
+    commands = client.run_many.call_args[0][0]
+    assert len(commands) == 2
+    first_call = commands[0]
     assert 'after each response' in ' '.join(first_call).lower()
 
 
-@patch('subprocess.run')
 @patch('src.processors.tmux_processor.get_os_type')
-def test_toggle_vocalization_on_macos_with_false(mock_get_os_type, mock_run):
+def test_toggle_vocalization_on_macos_with_false(mock_get_os_type):
     """Test toggle_vocalization sends stop prompt on macOS when is_on=False."""
     from src.utils.os_detection import OSType
     mock_get_os_type.return_value = OSType.MACOS
     get_session = Mock(return_value='test-session')
     logger = Mock()
-    processor = TmuxProcessor(get_session, logger)
+    client = Mock()
+    processor = TmuxProcessor(get_session, logger, client=client)
     
     processor.toggle_vocalization(False)
     
     # Should send stop prompt
-    assert mock_run.call_count == 2
-    first_call = mock_run.call_args_list[0][0][0]
+    commands = client.run_many.call_args[0][0]
+    assert len(commands) == 2
+    first_call = commands[0]
     assert 'Stop vocalizing' in ' '.join(first_call)
 
 
-@patch('subprocess.run')
 @patch('src.processors.tmux_processor.get_os_type')
-def test_toggle_vocalization_noop_on_linux(mock_get_os_type, mock_run):
+def test_toggle_vocalization_never_prompts_agent_when_vocalizing_locally(mock_get_os_type):
+    """Test local vocalization without a vocalizer doesn't fall back to asking the agent on macOS."""
+    from src.utils.os_detection import OSType
+    mock_get_os_type.return_value = OSType.MACOS
+    client = Mock()
+    processor = TmuxProcessor(Mock(return_value='test-session'), Mock(), client=client, vocalize_locally=True)
+    
+    processor.toggle_vocalization(True)
+    processor.toggle_vocalization(False)
+    
+    client.run_many.assert_not_called()
+
+
+@patch('src.processors.tmux_processor.get_os_type')
+def test_toggle_vocalization_noop_on_linux(mock_get_os_type):
     """Test toggle_vocalization is noop on Linux."""
     from src.utils.os_detection import OSType
     mock_get_os_type.return_value = OSType.LINUX
     get_session = Mock(return_value='test-session')
     logger = Mock()
-    processor = TmuxProcessor(get_session, logger)
+    client = Mock()
+    processor = TmuxProcessor(get_session, logger, client=client)
     
     processor.toggle_vocalization(True)
     
-    # Should not call subprocess on non-macOS
-    mock_run.assert_not_called()
+    # Should not call tmux on non-macOS
+    client.run_many.assert_not_called()
 
 
-@patch('subprocess.run')
 @patch('src.processors.tmux_processor.get_os_type')
-def test_toggle_vocalization_handles_error(mock_get_os_type, mock_run):
-    """Test toggle_vocalization handles subprocess errors."""
+def test_toggle_vocalization_handles_error(mock_get_os_type):
+    """Test toggle_vocalization handles tmux errors."""
     from src.utils.os_detection import OSType
     mock_get_os_type.return_value = OSType.MACOS
     get_session = Mock(return_value='test-session')
     logger = Mock()
-    processor = TmuxProcessor(get_session, logger)
+    client = Mock()
+    processor = TmuxProcessor(get_session, logger, client=client)
     
-    mock_run.side_effect = subprocess.CalledProcessError(1, 'tmux')
+    client.run_many.side_effect = TmuxCommandError(1, 'tmux')
     
     processor.toggle_vocalization(True)
     
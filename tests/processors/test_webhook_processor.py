@@ -0,0 +1,162 @@
+"""Tests for WebhookProcessor class."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.metrics.metrics_registry import MetricsRegistry
+from src.processors.webhook_processor import WebhookProcessor
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        with self.server.lock:
+            self.server.requests.append((self.path, self.client_address[1], body))
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Local stand-in for an agent's HTTP API, answering with queued statuses."""
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.statuses = []
+    httpd.requests = []
+    httpd.lock = threading.Lock()
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _processor(server, **kwargs):
+    url = f'http://127.0.0.1:{server.server_address[1]}/prompt'
+    return WebhookProcessor(url, Mock(), metrics=MetricsRegistry(), **kwargs)
+
+
+def test_posts_transcripts_over_one_connection(server):
+    """Test each transcript is POSTed as a JSON record over a kept-alive connection."""
+    processor = _processor(server)
+
+    processor.accept('one')
+    processor.accept('two')
+    processor.close()
+
+    assert [body['text'] for _, _, body in server.requests] == ['one', 'two']
+    assert server.requests[0][0] == '/prompt'
+    assert server.requests[0][2]['type'] == 'transcript'
+    # Same client port: the connection was reused
+    assert server.requests[0][1] == server.requests[1][1]
+    assert processor.metrics.get('voice_to_code_webhook_requests_total', {'status': 200}) == 2
+
+
+@patch('src.processors.webhook_processor.time.sleep')
+def test_retries_server_errors(mock_sleep, server):
+    """Test 503 responses are retried after a jittered backoff."""
+    server.statuses = [503, 503]
+    processor = _processor(server, retries=3)
+
+    processor.accept('hello')
+
+    assert len(server.requests) == 3
+    assert mock_sleep.call_count == 2
+    assert all(0 <= call[0][0] <= 0.4 for call in mock_sleep.call_args_list)
+    assert processor.metrics.get('voice_to_code_webhook_retries_total') == 2
+    assert processor.metrics.get('voice_to_code_webhook_records_total') == 1
+    processor.close()
+
+
+@patch('src.processors.webhook_processor.time.sleep')
+def test_client_errors_are_not_retried(mock_sleep, server):
+    """Test a 400 is logged with the undelivered text and not retried."""
+    server.statuses = [400]
+    processor = _processor(server)
+
+    processor.accept('hello')
+
+    assert len(server.requests) == 1
+    mock_sleep.assert_not_called()
+    assert 'Not delivered' in processor.logger.error.call_args[0][0]
+    assert processor.metrics.get('voice_to_code_webhook_failures_total') == 1
+    processor.close()
+
+
+@patch('src.processors.webhook_processor.time.sleep')
+def test_gives_up_when_unreachable(mock_sleep):
+    """Test connection errors are retried, then the text is logged."""
+    processor = WebhookProcessor('http://127.0.0.1:9/prompt', Mock(), retries=2, metrics=MetricsRegistry())
+
+    processor.accept('lost words')
+
+    assert mock_sleep.call_count == 2
+    assert 'lost words' in processor.logger.error.call_args[0][0]
+    assert processor.close() is True  # Nothing batched
+
+
+def test_batches_rapid_utterances(server):
+    """Test transcripts within the batch window go out as one JSON array."""
+    processor = _processor(server, batch_window=10)
+
+    processor.accept('one')
+    processor.accept('two')
+    assert server.requests == []
+
+    processor.toggle_vocalization(True)
+
+    bodies = [body for _, _, body in server.requests]
+    assert [record['text'] for record in bodies[0]] == ['one', 'two']
+    assert bodies[1][0] == {'type': 'vocalization', 'enabled': True, 'timestamp': bodies[1][0]['timestamp']}
+    processor.close()
+
+
+def test_batch_is_sent_when_window_ends(server):
+    """Test the batch timer sends collected transcripts without further input."""
+    processor = _processor(server, batch_window=0.05)
+
+    processor.accept('one')
+    processor.accept('two')
+
+    for _ in range(100):
+        if server.requests:
+            break
+        threading.Event().wait(0.02)
+    assert [record['text'] for record in server.requests[0][2]] == ['one', 'two']
+    processor.close()
+
+
+@patch('src.processors.webhook_processor.time.sleep')
+def test_batched_transcripts_confirmed_when_posted(mock_sleep, server):
+    """Test on_done reports batched transcripts only once their request finished."""
+    processor = _processor(server, batch_window=10)
+    done = []
+
+    processor.accept('one', on_done=done.append)
+    assert done == []
+    processor.flush()
+    assert done == [True]
+
+    unreachable = WebhookProcessor('http://127.0.0.1:9/prompt', Mock(), retries=0, batch_window=10, metrics=MetricsRegistry())
+    unreachable.accept('lost words', on_done=done.append)
+    assert unreachable.close() is False
+    assert done == [True, False]
+    processor.close()
+
+
+def test_rejects_non_http_url():
+    """Test an unusable URL fails at construction."""
+    with pytest.raises(ValueError, match="http"):
+        WebhookProcessor('localhost:8765', Mock())
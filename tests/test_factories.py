@@ -1,14 +1,25 @@
 """Tests for factory functions."""
 
 import sys
-from unittest.mock import Mock, patch
+from pathlib import Path
+from unittest.mock import ANY, Mock, patch
 
 import pytest
 
 # Mock whisper_mic before importing our code (CI server doesn't have it)
 sys.modules['whisper_mic'] = Mock()
 
-from src.factories import create_processor, create_transcriber  # noqa: E402
+from src.factories import (  # noqa: E402
+    create_memory_watchdog,
+    create_metrics_exporter,
+    create_outbox,
+    create_postprocessors,
+    create_processor,
+    create_session_registry,
+    create_transcriber,
+    vocalizes_responses_locally,
+)
+from src.utils.os_detection import OSType  # noqa: E402
 
 
 @patch('src.factories.TmuxProcessor')
@@ -20,7 +31,10 @@ def test_create_processor_tmux(mock_tmux):
     
     processor = create_processor(config, get_session, logger)
     
-    mock_tmux.assert_called_once_with(get_session, logger)
+    mock_tmux.assert_called_once_with(
+        get_session, logger, sessions=None, paste_threshold=200, keep_line_breaks=False,
+        agent_state=None, wait_for_agent=False, response_vocalizer=None, vocalize_locally=ANY,
+    )
     assert processor == mock_tmux.return_value
 
 
@@ -33,7 +47,83 @@ def test_create_processor_default_type(mock_tmux):
     
     _processor = create_processor(config, get_session, logger)
     
-    mock_tmux.assert_called_once_with(get_session, logger)
+    mock_tmux.assert_called_once_with(
+        get_session, logger, sessions=None, paste_threshold=200, keep_line_breaks=False,
+        agent_state=None, wait_for_agent=False, response_vocalizer=None, vocalize_locally=ANY,
+    )
+
+
+@patch('src.factories.SocketProcessor')
+def test_create_processor_socket(mock_socket):
+    """Test creating socket processor with the default and a configured path."""
+    logger = Mock()
+
+    processor = create_processor({'processor_type': 'socket'}, Mock(), logger)
+
+    mock_socket.assert_called_once_with(Path.home() / '.voice-to-code' / 'voice.sock', logger)
+    assert processor == mock_socket.return_value
+
+    create_processor({'processor_type': 'socket', 'socket_path': '/tmp/agent.sock'}, Mock(), logger)
+    mock_socket.assert_called_with('/tmp/agent.sock', logger)
+
+
+@patch('src.factories.WebhookProcessor')
+def test_create_processor_webhook(mock_webhook):
+    """Test creating webhook processor with its configured settings."""
+    config = {'processor_type': 'webhook', 'webhook_url': 'http://127.0.0.1:8765/prompt', 'webhook_batch_window': 0.3}
+    logger = Mock()
+
+    processor = create_processor(config, Mock(), logger)
+
+    mock_webhook.assert_called_once_with('http://127.0.0.1:8765/prompt', logger, timeout=5.0, retries=3, batch_window=0.3)
+    assert processor == mock_webhook.return_value
+
+
+@patch('src.factories.WebhookProcessor')
+@patch('src.factories.SocketProcessor')
+@patch('src.factories.TmuxProcessor')
+def test_create_processor_fanout_targets(mock_tmux, mock_socket, mock_webhook):
+    """Test fanout delivers to each dropdown target through a processor of the matching type."""
+    config = {'processor_type': 'tmux', 'fanout': True}
+    get_session = Mock(return_value='coding, socket:/tmp/voice.sock, http://127.0.0.1:8765/prompt')
+    logger = Mock()
+
+    processor = create_processor(config, get_session, logger)
+    processor.accept('hello')
+    processor.close()
+
+    assert mock_tmux.call_args[0][0]() == 'coding'
+    mock_tmux.return_value.accept.assert_called_once_with('hello', None)
+    mock_socket.assert_called_once_with('/tmp/voice.sock', logger)
+    mock_webhook.assert_called_once_with('http://127.0.0.1:8765/prompt', logger, timeout=5.0, retries=3, batch_window=0.0)
+
+
+@patch('src.factories.OutboxProcessor')
+@patch('src.factories.TmuxProcessor')
+def test_create_processor_records_each_target_in_outbox(mock_tmux, mock_outbox_processor):
+    """Test the outbox wraps the processor of the selected session, without fanout too."""
+    sessions = Mock()
+    outbox = Mock()
+    logger = Mock()
+    processor = create_processor({'processor_type': 'tmux'}, Mock(return_value='a, b'), logger, sessions=sessions, outbox=outbox)
+
+    processor.accept('hello')
+
+    # Without fanout the dropdown value is one target
+    assert mock_tmux.call_args[0][0]() == 'a, b'
+    args, kwargs = mock_outbox_processor.call_args
+    assert args == (mock_tmux.return_value, 'a, b', outbox, logger)
+    kwargs['is_available']()
+    sessions.is_known.assert_called_once_with('a, b')
+    mock_outbox_processor.return_value.accept.assert_called_once_with('hello', None)
+
+
+@patch('src.factories.Outbox')
+def test_create_outbox(mock_outbox):
+    """Test the outbox is opened in the output directory only when enabled."""
+    assert create_outbox({'outbox': True}) == mock_outbox.return_value
+    mock_outbox.assert_called_once_with(Path.home() / '.voice-to-code' / 'outbox.db')
+    assert create_outbox({}) is None
 
 
 def test_create_processor_unknown_type():
@@ -46,6 +136,138 @@ def test_create_processor_unknown_type():
         create_processor(config, get_session, logger)
 
 
+@patch('src.factories.QueuedProcessor')
+@patch('src.factories.TmuxProcessor')
+def test_create_processor_wraps_in_delivery_queue(mock_tmux, mock_queued):
+    """Test delivery_queue wraps the processor with the configured queue settings."""
+    config = {'processor_type': 'tmux', 'delivery_queue': True, 'delivery_queue_size': 8, 'delivery_overflow': 'merge'}
+    logger = Mock()
+    
+    processor = create_processor(config, Mock(), logger)
+    
+    mock_queued.assert_called_once_with(mock_tmux.return_value, logger, max_queue_size=8, overflow='merge')
+    assert processor == mock_queued.return_value
+
+
+@patch('src.factories.PostprocessingProcessor')
+@patch('src.factories.TmuxProcessor')
+def test_create_processor_wraps_in_spoken_code(mock_tmux, mock_postprocessing):
+    """Test spoken_code rewrites transcripts before they reach the processor."""
+    logger = Mock()
+    
+    processor = create_processor({'processor_type': 'tmux', 'spoken_code': True}, Mock(), logger)
+    
+    assert processor == mock_postprocessing.return_value
+    wrapped, postprocessors, _logger = mock_postprocessing.call_args[0]
+    assert wrapped == mock_tmux.return_value
+    assert postprocessors[0].process("number forty two") == "42"
+
+
+@patch('src.factories.VoiceMacros')
+@patch('src.factories.TmuxProcessor')
+def test_create_processor_expands_voice_macros(mock_tmux, mock_macros):
+    """Test voice_macros adds the macro post-processor and keeps line breaks for tmux."""
+    logger = Mock()
+    
+    processor = create_processor({'processor_type': 'tmux', 'voice_macros': True}, Mock(), logger)
+    
+    mock_macros.assert_called_once_with(Path.home() / '.voice-to-code' / 'macros.json', logger)
+    assert processor.postprocessors == [mock_macros.return_value]
+    assert mock_tmux.call_args[1]['keep_line_breaks'] is True
+
+
+@patch('src.factories.AgentStateTracker')
+@patch('src.factories.get_tmux_client')
+@patch('src.factories.TmuxProcessor')
+def test_create_processor_gates_on_agent_state(mock_tmux, mock_get_client, mock_tracker):
+    """Test agent_gate gives the tmux processor a tracker with the configured patterns."""
+    config = {'processor_type': 'tmux', 'agent_gate': True, 'agent_idle_patterns': ['> $'], 'agent_max_wait': 10}
+    logger = Mock()
+    
+    create_processor(config, Mock(), logger)
+    
+    mock_tracker.assert_called_once_with(
+        mock_get_client.return_value, logger, idle_patterns=['> $'], max_wait=10, on_turn_end=ANY,
+    )
+    assert mock_tmux.call_args[1]['agent_state'] == mock_tracker.return_value
+    assert mock_tmux.call_args[1]['wait_for_agent'] is True
+
+
+@patch('src.factories.TmuxProcessor')
+def test_create_processor_vocalize_mode(mock_tmux):
+    """Test local vocalization gets a vocalizer fed by the pane tracker, agent mode gets neither."""
+    create_processor({'processor_type': 'tmux', 'vocalize_mode': 'local', 'vocalize_response': True}, Mock(), Mock())
+    kwargs = mock_tmux.call_args[1]
+    assert kwargs['agent_state'].on_turn_end == kwargs['response_vocalizer'].on_turn_end
+    assert kwargs['vocalize_locally'] is True
+    
+    create_processor({'processor_type': 'tmux', 'vocalize_mode': 'agent', 'vocalize_response': True}, Mock(), Mock())
+    assert mock_tmux.call_args[1]['agent_state'] is None
+    assert mock_tmux.call_args[1]['response_vocalizer'] is None
+    assert mock_tmux.call_args[1]['vocalize_locally'] is False
+    
+    with pytest.raises(ValueError, match="Unknown vocalize mode"):
+        create_processor({'processor_type': 'tmux', 'vocalize_mode': 'shout'}, Mock(), Mock())
+
+
+@patch('src.factories.TmuxProcessor')
+def test_create_processor_watches_no_panes_unless_asked(mock_tmux):
+    """Test local mode builds no vocalizer or tracker while vocalize_response and agent_gate are off."""
+    create_processor({'processor_type': 'tmux', 'vocalize_mode': 'local'}, Mock(), Mock())
+    
+    assert mock_tmux.call_args[1]['agent_state'] is None
+    assert mock_tmux.call_args[1]['response_vocalizer'] is None
+    assert mock_tmux.call_args[1]['vocalize_locally'] is True
+
+
+@pytest.mark.parametrize('os_type, expected', [(OSType.MACOS, False), (OSType.LINUX, True)])
+def test_vocalize_mode_defaults_to_agent_on_macos(os_type, expected):
+    """Test an unset vocalize_mode keeps asking the agent on macOS and speaks locally elsewhere."""
+    with patch('src.factories.get_os_type', return_value=os_type):
+        assert vocalizes_responses_locally({'processor_type': 'tmux', 'vocalize_mode': None}) is expected
+    assert vocalizes_responses_locally({'processor_type': 'socket', 'vocalize_mode': 'local'}) is False
+
+
+@patch('src.factories.DEFAULT_OUTPUT_DIR')
+def test_create_postprocessors_falls_back_on_bad_rules(mock_output_dir, tmp_path):
+    """Test an unreadable rules file is logged and the built-in grammar is used."""
+    mock_output_dir.__truediv__.side_effect = lambda name: tmp_path / name
+    (tmp_path / 'spoken_code.json').write_text('{"symbols": ')
+    logger = Mock()
+    
+    postprocessors = create_postprocessors({'spoken_code': True}, logger)
+    
+    assert postprocessors[0].process("open paren") == "("
+    assert 'Ignoring spoken-code rules' in logger.warning.call_args[0][0]
+    assert create_postprocessors({}, logger) == []
+
+
+@patch('src.factories.TmuxProcessor')
+def test_create_processor_rejects_unknown_overflow(mock_tmux):
+    """Test unknown delivery_overflow raises ValueError."""
+    config = {'processor_type': 'tmux', 'delivery_queue': True, 'delivery_overflow': 'spill'}
+    
+    with pytest.raises(ValueError, match="Unknown overflow policy"):
+        create_processor(config, Mock(), Mock())
+
+
+@patch('src.factories.TmuxSessionRegistry')
+@patch('src.factories.get_tmux_client')
+def test_create_session_registry(mock_get_client, mock_registry):
+    """Test session discovery uses the shared tmux client."""
+    on_change = Mock()
+    
+    registry = create_session_registry({'processor_type': 'tmux'}, on_change)
+    
+    mock_registry.assert_called_once_with(mock_get_client.return_value, on_change=on_change)
+    assert registry == mock_registry.return_value
+
+
+def test_create_session_registry_disabled():
+    """Test session discovery can be turned off."""
+    assert create_session_registry({'processor_type': 'tmux', 'session_discovery': False}) is None
+
+
 @patch('src.factories.WhisperMicTranscriber')
 def test_create_transcriber_whisper_mic(mock_whisper):
     """Test creating whisper_mic transcriber."""
@@ -55,7 +277,7 @@ def test_create_transcriber_whisper_mic(mock_whisper):
     
     transcriber = create_transcriber(config, logger, processor)
     
-    mock_whisper.assert_called_once_with(config, logger, processor)
+    mock_whisper.assert_called_once_with(config, logger, processor, calibration_cache=None)
     assert transcriber == mock_whisper.return_value
 
 
@@ -68,7 +290,7 @@ def test_create_transcriber_default_type(mock_whisper):
     
     _transcriber = create_transcriber(config, logger, processor)
     
-    mock_whisper.assert_called_once_with(config, logger, processor)
+    mock_whisper.assert_called_once_with(config, logger, processor, calibration_cache=None)
 
 
 def test_create_transcriber_unknown_type():
@@ -79,3 +301,66 @@ def test_create_transcriber_unknown_type():
     
     with pytest.raises(ValueError, match="Unknown transcriber"):
         create_transcriber(config, logger, processor)
+
+
+def test_create_metrics_exporter_disabled_by_default():
+    """Test no exporter is created unless metrics are enabled."""
+    assert create_metrics_exporter({}) is None
+    assert create_metrics_exporter({'metrics_enabled': False}) is None
+
+
+def test_create_metrics_exporter_http_only():
+    """Test exporter serves HTTP without a textfile by default."""
+    config = {'metrics_enabled': True, 'metrics_port': 9999}
+    
+    exporter = create_metrics_exporter(config, textfile_path='/tmp/metrics.prom', registry=Mock())
+    
+    assert exporter.port == 9999
+    assert exporter.textfile_path is None
+
+
+def test_create_metrics_exporter_textfile_only():
+    """Test port 0 disables HTTP when textfile export is on."""
+    config = {'metrics_enabled': True, 'metrics_port': 0, 'metrics_textfile': True}
+    
+    exporter = create_metrics_exporter(config, textfile_path='/tmp/metrics.prom', registry=Mock())
+    
+    assert exporter.port is None
+    assert str(exporter.textfile_path) == '/tmp/metrics.prom'
+
+
+def test_create_metrics_exporter_requires_destination():
+    """Test enabling metrics without any destination raises ValueError."""
+    config = {'metrics_enabled': True, 'metrics_port': 0, 'metrics_textfile': False}
+    
+    with pytest.raises(ValueError, match="metrics_enabled requires"):
+        create_metrics_exporter(config, registry=Mock())
+
+
+def test_create_memory_watchdog_disabled_by_default():
+    """Test memory watchdog is not created unless enabled."""
+    assert create_memory_watchdog({}, Mock(), Mock()) is None
+
+
+def test_create_memory_watchdog_converts_thresholds():
+    """Test memory watchdog thresholds are converted from MB to bytes."""
+    config = {
+        'memory_watchdog': True,
+        'memory_max_rss_mb': 2048,
+        'memory_min_available_mb': 0,
+        'memory_fallback_model': 'tiny',
+    }
+    
+    watchdog = create_memory_watchdog(config, Mock(), Mock())
+    
+    assert watchdog.max_rss_bytes == 2048 * 1024 * 1024
+    assert watchdog.min_available_bytes is None
+    assert watchdog.fallback_model == 'tiny'
+
+
+def test_create_memory_watchdog_requires_threshold():
+    """Test memory watchdog without any threshold raises ValueError."""
+    config = {'memory_watchdog': True, 'memory_max_rss_mb': 0, 'memory_min_available_mb': 0}
+    
+    with pytest.raises(ValueError):
+        create_memory_watchdog(config, Mock(), Mock())
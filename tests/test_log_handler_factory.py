@@ -19,7 +19,9 @@ def test_create_log_handler_file(mock_file_handler):
     
     handler = create_log_handler(config, log_file_path=log_path)
     
-    mock_file_handler.assert_called_once_with(log_path, True, capture_stdlib_logs=True)
+    mock_file_handler.assert_called_once_with(
+        log_path, True, capture_stdlib_logs=True, max_bytes=5_000_000, max_age=0, backup_count=5, compress=True,
+    )
     assert handler == mock_file_handler.return_value
 
 
@@ -31,7 +33,7 @@ def test_create_log_handler_ui(mock_gui_handler):
     
     handler = create_log_handler(config, log_widget=widget)
     
-    mock_gui_handler.assert_called_once_with(widget, False, capture_stdlib_logs=False)
+    mock_gui_handler.assert_called_once_with(widget, False, capture_stdlib_logs=False, max_lines=5000)
     assert handler == mock_gui_handler.return_value
 
 
@@ -0,0 +1,79 @@
+"""Tests for AudioPreprocessor."""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from src.transcribers.audio_preprocessor import SAMPLE_RATE, AudioPreprocessor  # noqa: E402
+
+
+def _rms(samples):
+    return float(np.sqrt(np.mean(samples ** 2)))
+
+
+def _utterance(level=0.02, noise=0.002, hum=0.0, seed=0):
+    """Two seconds of tone between a second of leading and trailing noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(4 * SAMPLE_RATE) / SAMPLE_RATE
+    tone = np.where((t >= 1) & (t < 3), level * np.sin(2 * np.pi * 440 * t), 0.0)
+    return (tone + noise * rng.standard_normal(t.size) + hum * np.sin(2 * np.pi * 50 * t)).astype(np.float32)
+
+
+def test_passthrough_reconstructs_input():
+    """With every stage disabled the STFT round trip should be lossless."""
+    audio = _utterance()
+    preprocessor = AudioPreprocessor(highpass_hz=0, noise_suppression=False, agc=False)
+
+    result = preprocessor.process(audio)
+
+    assert result.dtype == np.float32
+    assert result.shape == audio.shape
+    assert np.max(np.abs(result - audio)) < 1e-5
+
+
+def test_highpass_removes_hum():
+    """Low-frequency hum should be removed while speech-band tones pass."""
+    hum_only = _utterance(level=0.0, noise=0.0, hum=0.05)
+    preprocessor = AudioPreprocessor(noise_suppression=False, agc=False)
+
+    assert _rms(preprocessor.process(hum_only)) < 0.1 * _rms(hum_only)
+
+
+def test_noise_suppression_lowers_noise_in_pauses():
+    """Noise between words should be attenuated relative to speech."""
+    audio = _utterance(noise=0.005)
+    preprocessor = AudioPreprocessor(agc=False)
+
+    result = preprocessor.process(audio)
+
+    pause = slice(int(3.2 * SAMPLE_RATE), 4 * SAMPLE_RATE)
+    speech = slice(int(1.2 * SAMPLE_RATE), int(2.8 * SAMPLE_RATE))
+    assert _rms(result[pause]) < 0.3 * _rms(audio[pause])
+    assert _rms(result[speech]) > 0.8 * _rms(audio[speech])
+
+
+def test_agc_converges_towards_target_level():
+    """Quiet speech should be boosted towards the target level over a few utterances."""
+    preprocessor = AudioPreprocessor(target_level_db=-20.0)
+    speech = slice(int(1.2 * SAMPLE_RATE), int(2.8 * SAMPLE_RATE))
+
+    for seed in range(4):
+        result = preprocessor.process(_utterance(level=0.03, seed=seed))
+
+    assert _rms(result[speech]) == pytest.approx(0.1, rel=0.2)
+
+
+def test_output_never_clips():
+    """Loud input should be limited below full scale."""
+    preprocessor = AudioPreprocessor()
+
+    result = preprocessor.process(_utterance(level=0.9, noise=0.0))
+
+    assert np.max(np.abs(result)) <= 0.99 + 1e-6
+
+
+def test_short_audio_returned_unchanged():
+    """Audio shorter than one frame should pass through."""
+    audio = np.ones(100, dtype=np.float32) * 0.1
+
+    assert np.array_equal(AudioPreprocessor().process(audio), audio)
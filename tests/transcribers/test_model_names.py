@@ -0,0 +1,22 @@
+"""Tests for Whisper model names."""
+
+import pytest
+
+from src.transcribers.model_names import whisper_model_id
+
+
+@pytest.mark.parametrize('model_name, expected', [
+    ('tiny', 'tiny.en'),
+    ('medium', 'medium.en'),
+    ('medium.en', 'medium.en'),
+    ('large', 'large'),
+    ('large-v3', 'large-v3'),
+])
+def test_english_variant_below_large(model_name, expected):
+    """Test models below large map to their .en variant, like WhisperMic loads them."""
+    assert whisper_model_id(model_name) == expected
+
+
+def test_multilingual_when_not_english():
+    """Test english=False keeps the multilingual model."""
+    assert whisper_model_id('small', english=False) == 'small'
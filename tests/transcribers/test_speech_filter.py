@@ -0,0 +1,70 @@
+"""Tests for the speech filter."""
+
+from src.transcribers.speech_filter import (
+    HALLUCINATION,
+    LOW_CONFIDENCE,
+    NO_SPEECH,
+    is_hallucination,
+    skip_reason,
+)
+
+
+def _result(text, no_speech_prob=0.1, avg_logprob=-0.3):
+    return {'text': text, 'segments': [{'no_speech_prob': no_speech_prob, 'avg_logprob': avg_logprob}]}
+
+
+def test_known_hallucinations():
+    """Stock phantom phrases and captions should be recognized."""
+    for text in ["Thanks for watching!", "Please subscribe", "[Music]", "(silence)", "♪ ♪", "..."]:
+        assert is_hallucination(text), text
+
+
+def test_real_answers_need_no_speech():
+    """Short phrases people really say should only count when the decoder saw no speech."""
+    for text in [" Thank you.", "Bye.", "You"]:
+        assert not is_hallucination(text), text
+        assert is_hallucination(text, no_speech=True), text
+
+
+def test_real_commands_are_not_hallucinations():
+    """Commands that merely contain stock phrases should pass."""
+    for text in ["Thank you, now run the tests", "Say bye to the user", "Fix the subscribe button"]:
+        assert not is_hallucination(text), text
+
+
+def test_skip_reason_keeps_confident_speech():
+    """Normal results should be kept."""
+    assert skip_reason(_result(" Refactor the parser."), 0.6, -1.0) is None
+
+
+def test_skip_reason_no_speech():
+    """High no-speech probability with low confidence, or empty text, should be dropped as no speech."""
+    assert skip_reason(_result(" Hello.", no_speech_prob=0.9, avg_logprob=-1.4), 0.6, -1.0) == NO_SPEECH
+    assert skip_reason({'text': '', 'no_speech_prob': 0.95}, 0.6, -1.0) == NO_SPEECH
+    assert skip_reason({'text': '  '}, 0.6, -1.0) == NO_SPEECH
+
+
+def test_skip_reason_keeps_confident_text_despite_no_speech_prob():
+    """Confidently decoded text should be kept even when no_speech_prob is high, as in Whisper."""
+    assert skip_reason(_result(" Yes.", no_speech_prob=0.9), 0.6, -1.0) is None
+
+
+def test_skip_reason_hallucination():
+    """Known phrases should be dropped even with confident statistics."""
+    assert skip_reason(_result(" Thanks for watching!"), 0.6, -1.0) == HALLUCINATION
+    assert skip_reason(_result(" Thank you.", no_speech_prob=0.9), 0.6, -1.0) == HALLUCINATION
+
+
+def test_skip_reason_keeps_real_answers():
+    """A confident "Thank you." with speech in it should be kept."""
+    assert skip_reason(_result(" Thank you."), 0.6, -1.0) is None
+
+
+def test_skip_reason_low_confidence():
+    """Low average log probability should be dropped."""
+    assert skip_reason(_result(" Deploy the thing.", avg_logprob=-1.4), 0.6, -1.0) == LOW_CONFIDENCE
+
+
+def test_skip_reason_without_segments():
+    """Results without decoder statistics should only be judged on text."""
+    assert skip_reason({'text': 'Open the file'}, 0.6, -1.0) is None
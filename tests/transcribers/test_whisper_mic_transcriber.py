@@ -1,7 +1,10 @@
 """Tests for WhisperMicTranscriber class."""
 
+import asyncio
 import sys
-from unittest.mock import Mock, patch
+import threading
+import time
+from unittest.mock import ANY, Mock, patch
 
 # Mock whisper_mic before importing our code (CI server doesn't have it)
 sys.modules['whisper_mic'] = Mock()
@@ -9,9 +12,11 @@ sys.modules['whisper_mic'] = Mock()
 # We need to mock whisper_mic BEFORE importing our code,
 # so we can't move the import to the top.
 # We need to add a # noqa: E402 comment to suppress this specific linting error.
+from src.transcribers.transcription_events import EventType  # noqa: E402
 from src.transcribers.whisper_mic_transcriber import (  # noqa: E402
     WhisperMicTranscriber,
 )
+from src.utils.noise_calibration import Calibration  # noqa: E402
 
 
 def test_initialization_reads_config():
@@ -143,9 +148,9 @@ def test_do_streaming_processes_transcriptions():
     
     # Verify processor.accept was called for each transcription
     assert processor.accept.call_count == 3
-    processor.accept.assert_any_call("First text")
-    processor.accept.assert_any_call("Second text")
-    processor.accept.assert_any_call("Third text")
+    processor.accept.assert_any_call("First text", ANY)
+    processor.accept.assert_any_call("Second text", ANY)
+    processor.accept.assert_any_call("Third text", ANY)
 
 
 def test_do_streaming_skips_none_results():
@@ -169,8 +174,8 @@ def test_do_streaming_skips_none_results():
     
     # Only 2 calls to processor (None is skipped)
     assert processor.accept.call_count == 2
-    processor.accept.assert_any_call("Hello")
-    processor.accept.assert_any_call("World")
+    processor.accept.assert_any_call("Hello", ANY)
+    processor.accept.assert_any_call("World", ANY)
 
 
 def test_do_streaming_stops_on_should_continue_false():
@@ -192,3 +197,313 @@ def test_do_streaming_stops_on_should_continue_false():
     
     assert result is True
     assert processor.accept.call_count == 2
+
+
+@patch('src.transcribers.whisper_mic_transcriber.WhisperMic')
+def test_initialize_times_decodes(MockWhisperMic):
+    """Test the model's transcribe is wrapped to record decode metrics."""
+    model = MockWhisperMic.return_value.audio_model
+    original_transcribe = model.transcribe
+    original_transcribe.return_value = {'text': 'hello'}
+    
+    transcriber = WhisperMicTranscriber({'model': 'tiny'}, Mock(), Mock())
+    transcriber.metrics = Mock()
+    transcriber.initialize()
+    
+    result = model.transcribe([0.0] * 32000, language='english')
+    
+    assert result == {'text': 'hello'}
+    original_transcribe.assert_called_once_with([0.0] * 32000, language='english')
+    transcriber.metrics.observe.assert_any_call('voice_to_code_audio_seconds', 2.0)
+    load_call = transcriber.metrics.set.call_args_list[0]
+    assert load_call[0][0] == 'voice_to_code_model_load_seconds'
+    assert load_call[1] == {'labels': {'model': 'tiny'}}
+
+
+def test_do_streaming_counts_utterances():
+    """Test do_streaming increments the utterance counter per transcription."""
+    transcriber = WhisperMicTranscriber({'listen_timeout': 1.0}, Mock(), Mock())
+    transcriber.mic = Mock()
+    transcriber.metrics = Mock()
+    transcriber.mic.listen.side_effect = ["One", None, "Two"]
+    
+    call_count = [0]
+    def should_continue():
+        call_count[0] += 1
+        return call_count[0] <= 3
+    
+    transcriber.do_streaming(should_continue)
+    
+    utterance_calls = [c for c in transcriber.metrics.inc.call_args_list if c[0][0] == 'voice_to_code_utterances_total']
+    assert len(utterance_calls) == 2
+
+
+def test_switch_model_swaps_between_utterances():
+    """Test a model loaded by switch_model() is swapped in before the next listen."""
+    transcriber = WhisperMicTranscriber({'model': 'large', 'listen_timeout': 1.0}, Mock(), Mock())
+    transcriber.mic = Mock()
+    transcriber.metrics = Mock()
+    new_model = Mock()
+    models_at_listen = []
+    transcriber.mic.listen.side_effect = lambda timeout: models_at_listen.append(transcriber.mic.audio_model)
+    
+    with patch.object(transcriber, '_load_model', return_value=new_model) as load_model, \
+         patch('src.transcribers.whisper_mic_transcriber.release_memory') as release:
+        transcriber.switch_model('base')
+        for thread in threading.enumerate():
+            if thread.name == 'model-loader':
+                thread.join()
+        
+        call_count = [0]
+        def should_continue():
+            call_count[0] += 1
+            return call_count[0] <= 1
+        
+        transcriber.do_streaming(should_continue)
+    
+    load_model.assert_called_once_with('base')
+    release.assert_called_once()
+    assert models_at_listen == [new_model]
+    assert transcriber.model_name == 'base'
+    assert transcriber._model_transcribe is not None
+
+
+def test_switch_model_ignores_current_model():
+    """Test switching to the model already in use does nothing."""
+    transcriber = WhisperMicTranscriber({'model': 'large'}, Mock(), Mock())
+    transcriber.mic = Mock()
+    
+    with patch('src.transcribers.whisper_mic_transcriber.threading.Thread') as MockThread:
+        transcriber.switch_model('large')
+    
+    MockThread.assert_not_called()
+
+
+def test_update_settings_applies_thresholds_on_next_utterance():
+    """Test updated thresholds reach the recognizer before the next listen."""
+    config = {'model': 'large', 'listen_timeout': 1.0, 'energy_threshold': 100, 'pause_threshold': 2.0}
+    transcriber = WhisperMicTranscriber(config, Mock(), Mock())
+    transcriber.mic = Mock()
+    transcriber.metrics = Mock()
+    recorder = transcriber.mic.recorder
+    listen_timeouts = []
+    transcriber.mic.listen.side_effect = lambda timeout: listen_timeouts.append(timeout)
+    
+    applied = transcriber.update_settings({**config, 'energy_threshold': 300, 'listen_timeout': 0.5})
+    
+    call_count = [0]
+    def should_continue():
+        call_count[0] += 1
+        return call_count[0] <= 1
+    transcriber.do_streaming(should_continue)
+    
+    assert sorted(applied) == ['energy_threshold', 'listen_timeout']
+    assert recorder.energy_threshold == 300
+    assert recorder.pause_threshold == 2.0
+    assert listen_timeouts == [0.5]
+
+
+def test_update_settings_starts_model_switch():
+    """Test a model change is handed to switch_model()."""
+    config = {'model': 'large'}
+    transcriber = WhisperMicTranscriber(config, Mock(), Mock())
+    transcriber.mic = Mock()
+    
+    with patch.object(transcriber, 'switch_model') as switch_model:
+        applied = transcriber.update_settings({'model': 'small', 'debug': True})
+    
+    assert applied == ['model']
+    switch_model.assert_called_once_with('small')
+
+
+def test_update_settings_ignores_unchanged_config():
+    """Test nothing is queued when no live setting changed."""
+    config = {'model': 'large', 'energy_threshold': 100}
+    transcriber = WhisperMicTranscriber(config, Mock(), Mock())
+    transcriber.mic = Mock()
+    
+    assert transcriber.update_settings({**config, 'debug': True}) == []
+    assert transcriber._pending_settings is None
+
+
+def _collect_events(transcriber, should_continue):
+    async def collect():
+        return [event async for event in transcriber.events(should_continue)]
+    return asyncio.run(collect())
+
+
+def test_events_yield_final_timeout_and_error():
+    """Test each listen attempt ends in a FINAL, TIMEOUT or ERROR event."""
+    transcriber = WhisperMicTranscriber({'listen_timeout': 1.0}, Mock(), Mock())
+    transcriber.mic = Mock()
+    transcriber.metrics = Mock()
+    transcriber.mic.listen.side_effect = ["Hello", "Timeout: No speech detected", RuntimeError("mic unplugged")]
+    
+    call_count = [0]
+    def should_continue():
+        call_count[0] += 1
+        return call_count[0] <= 3
+    
+    events = _collect_events(transcriber, should_continue)
+    
+    assert [e.type for e in events] == [
+        EventType.SPEECH_STARTED, EventType.FINAL, EventType.TIMEOUT, EventType.ERROR,
+    ]
+    assert [e.utterance_id for e in events] == [0, 0, 1, 2]
+    assert events[1].text == "Hello"
+    assert str(events[3].error) == "mic unplugged"
+
+
+def test_events_announce_speech_while_listening():
+    """Test SPEECH_STARTED is yielded while a listen outlives the timeout."""
+    transcriber = WhisperMicTranscriber({'listen_timeout': 0.01}, Mock(), Mock())
+    transcriber.mic = Mock()
+    transcriber.metrics = Mock()
+    listen_finished = threading.Event()
+    
+    def slow_listen(timeout):
+        time.sleep(0.2)
+        listen_finished.set()
+        return "Long sentence"
+    transcriber.mic.listen.side_effect = slow_listen
+    
+    async def first_event():
+        stream = transcriber.events()
+        event = await stream.__anext__()
+        finished_early = listen_finished.is_set()
+        await stream.aclose()
+        return event, finished_early
+    
+    event, finished_early = asyncio.run(first_event())
+    
+    assert event.type == EventType.SPEECH_STARTED
+    assert finished_early is False
+    assert listen_finished.is_set()
+
+
+def test_events_include_decode_timing():
+    """Test FINAL events carry audio and decode durations from the decode hook."""
+    transcriber = WhisperMicTranscriber({'listen_timeout': 1.0}, Mock(), Mock())
+    transcriber.mic = Mock()
+    transcriber.metrics = Mock()
+    transcriber._model_transcribe = Mock(return_value={'text': 'hi'})
+    
+    def listen(timeout):
+        transcriber._decode([0.0] * 16000)
+        return "hi"
+    transcriber.mic.listen.side_effect = listen
+    
+    call_count = [0]
+    def should_continue():
+        call_count[0] += 1
+        return call_count[0] <= 1
+    
+    final = _collect_events(transcriber, should_continue)[-1]
+    
+    assert final.type == EventType.FINAL
+    assert final.audio_seconds == 1.0
+    assert final.decode_seconds is not None
+    assert final.latency_seconds >= 1.0
+
+
+@patch('src.transcribers.whisper_mic_transcriber.WhisperMic')
+def test_initialize_seeds_energy_threshold_from_cache(MockWhisperMic):
+    """Test a cached calibration sets the recognizer's energy threshold on start."""
+    cache = Mock()
+    cache.get.return_value = Calibration(noise_floor=80.0, energy_threshold=120.0, calibrated_at=time.time())
+    transcriber = WhisperMicTranscriber({'model': 'tiny'}, Mock(), Mock(), calibration_cache=cache)
+    transcriber.metrics = Mock()
+    
+    with patch.object(transcriber, '_input_device_name', return_value='USB Mic'), \
+         patch('src.transcribers.whisper_mic_transcriber.measure_noise_floor') as measure:
+        transcriber.initialize()
+    
+    assert cache.get.call_args[0][0] == 'USB Mic'
+    assert transcriber.mic.recorder.energy_threshold == 120.0
+    measure.assert_not_called()
+
+
+@patch('src.transcribers.whisper_mic_transcriber.WhisperMic')
+def test_initialize_calibrates_unknown_device(MockWhisperMic):
+    """Test a device without cached calibration is measured and cached."""
+    cache = Mock()
+    cache.get.return_value = None
+    MockWhisperMic.return_value.recorder.dynamic_energy_ratio = 1.5
+    transcriber = WhisperMicTranscriber({'model': 'tiny'}, Mock(), Mock(), calibration_cache=cache)
+    transcriber.metrics = Mock()
+    
+    with patch.object(transcriber, '_input_device_name', return_value='USB Mic'), \
+         patch('src.transcribers.whisper_mic_transcriber.measure_noise_floor', return_value=100.0):
+        transcriber.initialize()
+    
+    assert transcriber.mic.recorder.energy_threshold == 150.0
+    device, _bucket, calibration = cache.put.call_args[0]
+    assert device == 'USB Mic'
+    assert calibration.noise_floor == 100.0
+
+
+def test_requested_calibration_runs_before_next_listen():
+    """Test request_calibration() measures noise between utterances."""
+    transcriber = WhisperMicTranscriber({'listen_timeout': 1.0}, Mock(), Mock())
+    transcriber.mic = Mock()
+    transcriber.metrics = Mock()
+    order = []
+    transcriber.mic.listen.side_effect = lambda timeout: order.append('listen')
+    
+    transcriber.request_calibration()
+    call_count = [0]
+    def should_continue():
+        call_count[0] += 1
+        return call_count[0] <= 2
+    
+    with patch.object(transcriber, 'calibrate', side_effect=lambda: order.append('calibrate')):
+        transcriber.do_streaming(should_continue)
+    
+    assert order == ['calibrate', 'listen', 'listen']
+
+
+def test_decode_hook_applies_preprocessor():
+    """Test enabled preprocessing cleans audio before the model decodes it."""
+    transcriber = WhisperMicTranscriber({'model': 'tiny'}, Mock(), Mock())
+    transcriber.metrics = Mock()
+    transcriber._model_transcribe = Mock(return_value={'text': 'hi'})
+    transcriber.preprocessor = Mock()
+    transcriber.preprocessor.process.return_value = [0.5] * 16000
+    
+    transcriber._decode([0.1] * 16000, language='english')
+    
+    transcriber._model_transcribe.assert_called_once_with([0.5] * 16000, language='english')
+    assert transcriber.metrics.observe.call_args_list[0][0][0] == 'voice_to_code_preprocess_seconds'
+
+
+def test_decode_hook_marks_hallucinations_as_skipped():
+    """Test filtered results reach listen() as a skip marker instead of text."""
+    transcriber = WhisperMicTranscriber({'model': 'tiny', 'listen_timeout': 1.0}, Mock(), Mock())
+    transcriber.metrics = Mock()
+    transcriber._model_transcribe = Mock(return_value={
+        'text': ' Thank you.',
+        'segments': [{'no_speech_prob': 0.8, 'avg_logprob': -0.4}],
+    })
+    transcriber.mic = Mock()
+    transcriber.mic.listen.side_effect = lambda timeout: transcriber._decode([0.0] * 16000)['text']
+    
+    call_count = [0]
+    def should_continue():
+        call_count[0] += 1
+        return call_count[0] <= 1
+    
+    events = _collect_events(transcriber, should_continue)
+    
+    assert [e.type for e in events] == [EventType.SKIPPED]
+    assert events[0].reason == 'hallucination'
+    assert transcriber.skipped_counts['hallucination'] == 1
+    transcriber.metrics.inc.assert_any_call('voice_to_code_utterances_skipped_total', labels={'reason': 'hallucination'})
+
+
+def test_decode_hook_keeps_filter_off_when_disabled():
+    """Test results pass through unchanged with speech_filter disabled."""
+    transcriber = WhisperMicTranscriber({'model': 'tiny', 'speech_filter': False}, Mock(), Mock())
+    transcriber.metrics = Mock()
+    transcriber._model_transcribe = Mock(return_value={'text': ' Thank you.'})
+    
+    assert transcriber._decode([0.0] * 16000)['text'] == ' Thank you.'
@@ -0,0 +1,141 @@
+"""Tests for agent state tracking."""
+
+import os
+import re
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.utils.agent_state import AgentStateTracker, PaneMonitor, strip_escapes
+from src.utils.tmux_client import TmuxCommandError
+
+
+def _client(screen=()):
+    client = Mock()
+    client.run.side_effect = lambda *args: list(screen) if args[0] == 'capture-pane' else []
+    return client
+
+
+def _write(monitor, text):
+    """Stand in for tmux writing pane output into the FIFO."""
+    fd = os.open(monitor.fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+    os.write(fd, text.encode())
+    os.close(fd)
+
+
+def test_strip_escapes():
+    """Test colours, cursor movement and titles are removed, carriage returns become line breaks."""
+    assert strip_escapes('\x1b[1;32m> \x1b[0m\x1b]0;title\x07ready\r\n\x1b[2K') == '> ready\n\n'
+
+
+def test_pipes_pane_output_into_fifo_and_stops(tmp_path):
+    """Test the pane is piped through the FIFO on start and unpiped on close."""
+    client = _client()
+    monitor = PaneMonitor(client, 'work:0.1', [], tmp_path / 'pane.fifo')
+
+    pipe = client.run.call_args_list[2][0]
+    assert pipe[:5] == ('pipe-pane', '-O', '-o', '-t', 'work:0.1')
+    assert pipe[5] == f"cat > {tmp_path / 'pane.fifo'}"
+
+    monitor.close()
+    client.run.assert_called_with('pipe-pane', '-t', 'work:0.1')
+    assert not (tmp_path / 'pane.fifo').exists()
+
+
+def test_busy_while_output_streams(tmp_path):
+    """Test output keeps the agent busy until it has been quiet for quiet_seconds."""
+    monitor = PaneMonitor(_client(), 'work', [], tmp_path / 'pane.fifo', quiet_seconds=0.2)
+    assert monitor.is_idle()
+
+    _write(monitor, 'Thinking...')
+    time.sleep(0.05)
+    assert not monitor.is_idle()
+
+    start = time.monotonic()
+    assert monitor.wait_until_idle(2) is True
+    assert time.monotonic() - start >= 0.1
+    monitor.close()
+
+
+def test_idle_patterns_must_match_latest_output(tmp_path):
+    """Test quiet output only counts as idle once the prompt shows, and sent input resets it."""
+    patterns = [re.compile(r'^> $', re.MULTILINE)]
+    monitor = PaneMonitor(_client(['answer', '> ']), 'work', patterns, tmp_path / 'pane.fifo', quiet_seconds=0.05)
+    assert monitor.is_idle()
+
+    monitor.mark_busy()
+    assert monitor.wait_until_idle(0.2) is False
+
+    threading.Timer(0.1, _write, (monitor, '\x1b[2Kdone\r\n> ')).start()
+    assert monitor.wait_until_idle(2) is True
+    monitor.close()
+
+
+def test_tracker_sends_without_waiting_when_pane_cant_be_watched(tmp_path):
+    """Test a pane tmux won't pipe is logged and doesn't hold delivery, and is retried later."""
+    client = Mock()
+    client.run.side_effect = TmuxCommandError(1, ['tmux'], stderr="can't find pane")
+    logger = Mock()
+    tracker = AgentStateTracker(client, logger)
+
+    assert tracker.wait_until_idle('missing') is True
+    assert tracker.wait_until_idle('missing') is True
+    assert logger.warning.call_count == 2
+    tracker.close()
+
+
+def test_tracker_watches_each_target_once():
+    """Test monitors are started per target on first use and closed together."""
+    client = _client()
+    tracker = AgentStateTracker(client, Mock(), quiet_seconds=0)
+
+    assert tracker.wait_until_idle('a') is True
+    assert tracker.wait_until_idle('a') is True
+    assert tracker.wait_until_idle('b') is True
+    tracker.mark_busy('a')
+
+    pipes = [call[0] for call in client.run.call_args_list if call[0][0] == 'pipe-pane']
+    assert [pipe[4] for pipe in pipes] == ['a', 'b']
+    tracker.close()
+    assert client.run.call_args_list[-1][0] == ('pipe-pane', '-t', 'b')
+
+
+def test_tracker_leaves_panes_with_their_own_pipe_alone(tmp_path):
+    """Test a pane the user already pipes is neither re-piped nor unpiped, and is only checked once."""
+    client = Mock()
+    client.run.side_effect = lambda *args: ['1'] if args[0] == 'display-message' else []
+    logger = Mock()
+    tracker = AgentStateTracker(client, logger)
+
+    assert tracker.wait_until_idle('logged') is True
+    assert tracker.wait_until_idle('logged') is True
+    tracker.close()
+
+    assert [call[0][0] for call in client.run.call_args_list] == ['display-message']
+    assert 'already pipes' in logger.info.call_args[0][0]
+
+
+def test_tracker_rejects_invalid_pattern():
+    """Test a malformed idle pattern is reported up front."""
+    with pytest.raises(ValueError, match="Invalid agent idle pattern"):
+        AgentStateTracker(Mock(), Mock(), idle_patterns=['('])
+
+
+def test_turn_output_handed_over_once_agent_is_idle(tmp_path):
+    """Test output after a prompt is passed to on_turn_end when the pane goes quiet."""
+    turns = []
+    ended = threading.Event()
+
+    def on_turn_end(*turn):
+        turns.append(turn)
+        ended.set()
+
+    monitor = PaneMonitor(_client(['old screen']), 'work', [], tmp_path / 'pane.fifo', quiet_seconds=0.1, on_turn_end=on_turn_end)
+    monitor.mark_busy('explain')
+    _write(monitor, 'explain\r\nIt parses the file.\r\n')
+
+    assert ended.wait(2)
+    assert turns == [('work', 'explain', 'explain\n\nIt parses the file.\n\n')]
+    monitor.close()
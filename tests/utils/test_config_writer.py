@@ -1,6 +1,7 @@
 """Tests for config_writer module."""
 
 import importlib.util
+from pathlib import Path
 
 from src.utils.config_writer import _format_value, write_config_to_file
 
@@ -114,3 +115,17 @@ def test_overwrites_existing_file(tmp_path):
     content = config_file.read_text()
     assert "OLD CONTENT" not in content
     assert "CONFIG = {" in content
+
+
+def test_path_values_are_importable(tmp_path):
+    """Test configs with path values import Path so the file still loads."""
+    config_file = tmp_path / "config.py"
+    config = {'socket_path': Path("~/.voice-to-code/voice.sock"), 'log_dir': '/tmp/logs'}
+
+    write_config_to_file(config, config_file)
+
+    spec = importlib.util.spec_from_file_location("test_config", config_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert module.CONFIG['socket_path'] == Path("~/.voice-to-code/voice.sock")
+    assert module.CONFIG['log_dir'] == Path("/tmp/logs")
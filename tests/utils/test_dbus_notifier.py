@@ -0,0 +1,209 @@
+"""Tests for DBusNotifier and the D-Bus wire protocol."""
+
+import socket
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.utils import feedback
+from src.utils.dbus_notifier import (
+    ERROR, FIELD_ERROR_NAME, FIELD_MEMBER, FIELD_REPLY_SERIAL, METHOD_CALL, METHOD_RETURN, SIGNAL,
+    DBusConnection, DBusError, DBusNotifier, _Reader, _Writer, build_message, read_message, split_signature,
+)
+from src.utils.os_detection import OSType
+
+
+class FakeBus:
+    """Stand-in session bus with a notification service, on a Unix socket."""
+
+    def __init__(self, path, has_service=True):
+        self.path = path
+        self.has_service = has_service
+        self.notifications = []  # Notify arguments, in order
+        self.connections = 0
+        self.drop_next = False  # Close the connection instead of answering the next Notify
+        self._serials = iter(range(1, 1000))
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(str(path))
+        self._server.listen()
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    @property
+    def address(self):
+        return f"unix:path={self.path},guid=0123"
+
+    def close(self):
+        self._server.close()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            assert conn.recv(1) == b'\0'
+            assert self._line(conn).startswith(b'AUTH EXTERNAL ')
+            conn.sendall(b'OK 0123\r\n')
+            assert self._line(conn) == b'BEGIN\r\n'
+            while True:
+                try:
+                    call = read_message(conn)
+                except (DBusError, OSError):
+                    return
+                assert call.type == METHOD_CALL
+                reply_to = {FIELD_REPLY_SERIAL: call.serial}
+                # Unrelated traffic ahead of the reply
+                conn.sendall(build_message(SIGNAL, next(self._serials), {FIELD_MEMBER: 'NameAcquired'}, 's', [':1.1']))
+                if call.fields[FIELD_MEMBER] == 'Hello':
+                    reply = build_message(METHOD_RETURN, next(self._serials), reply_to, 's', [':1.1'])
+                elif not self.has_service:
+                    reply = build_message(ERROR, next(self._serials), {
+                        **reply_to, FIELD_ERROR_NAME: 'org.freedesktop.DBus.Error.ServiceUnknown',
+                    }, 's', ['No notification service'])
+                elif self.drop_next:
+                    self.drop_next = False
+                    return
+                else:
+                    self.notifications.append(call.body)
+                    notification_id = call.body[1] or len(self.notifications)
+                    reply = build_message(METHOD_RETURN, next(self._serials), reply_to, 'u', [notification_id])
+                conn.sendall(reply)
+
+    @staticmethod
+    def _line(conn):
+        line = b''
+        while not line.endswith(b'\r\n'):
+            line += conn.recv(1)
+        return line
+
+
+@pytest.fixture
+def bus(tmp_path):
+    bus = FakeBus(tmp_path / 'bus')
+    yield bus
+    bus.close()
+
+
+def test_split_signature():
+    """Test signatures are split into complete types."""
+    assert split_signature('susssasa{sv}i') == ['s', 'u', 's', 's', 's', 'as', 'a{sv}', 'i']
+    assert split_signature('a(yv)') == ['a(yv)']
+    with pytest.raises(DBusError):
+        split_signature('a{sv')
+
+
+def test_marshalling_round_trip():
+    """Test values read back as written, with alignment between them."""
+    signature = 'ysasa{sv}ib'
+    values = [7, 'summary', ['a', 'bc'], {'urgency': ('y', 1), 'category': ('s', 'im')}, -1, True]
+    writer = _Writer()
+    for member, value in zip(split_signature(signature), values):
+        writer.write(member, value)
+
+    reader = _Reader(bytes(writer.data))
+    assert [reader.read(member) for member in split_signature(signature)] == values
+
+
+def test_notify_sends_notification(bus):
+    """Test a notification is one Notify call on the bus."""
+    notifier = DBusNotifier(bus.address)
+
+    assert notifier.notify("Voice to Code", "Listening")
+
+    app_name, replaces_id, _icon, summary, body, actions, hints, _timeout = bus.notifications[0]
+    assert (app_name, replaces_id, summary, body, actions) == ("Voice to Code", 0, "Voice to Code", "Listening", [])
+    assert hints == {'urgency': ('y', 1)}
+    notifier.close()
+
+
+def test_burst_updates_one_notification(bus):
+    """Test notifications with the same key reuse one connection and replace each other."""
+    notifier = DBusNotifier(bus.address)
+
+    for _ in range(3):
+        assert notifier.notify("Send failed", "tmux session 'main' not found")
+    notifier.notify("Other", "separate")
+
+    replaces = [args[1] for args in bus.notifications]
+    bodies = [args[4] for args in bus.notifications]
+    assert replaces == [0, 1, 1, 0]
+    assert bodies[2] == "tmux session 'main' not found (3×)"
+    assert bodies[3] == "separate"
+    assert bus.connections == 1
+    notifier.close()
+
+
+def test_burst_window_expires(bus):
+    """Test a notification after the coalescing window starts a new one."""
+    notifier = DBusNotifier(bus.address, coalesce_seconds=0)
+
+    notifier.notify("Send failed", "first")
+    with patch('src.utils.dbus_notifier.time.monotonic', return_value=1e9):
+        notifier.notify("Send failed", "second")
+
+    assert [args[1] for args in bus.notifications] == [0, 0]
+    assert bus.notifications[1][4] == "second"
+    notifier.close()
+
+
+def test_reconnects_after_broken_connection(bus):
+    """Test a dropped connection is replaced and the notification still delivered."""
+    notifier = DBusNotifier(bus.address)
+    notifier.notify("Voice to Code", "first")
+    bus.drop_next = True
+
+    assert notifier.notify("Voice to Code", "second")
+
+    assert bus.connections == 2
+    assert bus.notifications[-1][4].startswith("second")
+    notifier.close()
+
+
+def test_unavailable_bus_or_service(tmp_path, monkeypatch):
+    """Test notify reports False without a bus or a notification service."""
+    monkeypatch.delenv('DBUS_SESSION_BUS_ADDRESS', raising=False)
+    assert not DBusNotifier(address=None).notify("t", "m")
+    assert not DBusNotifier(f"unix:path={tmp_path / 'missing'}").notify("t", "m")
+
+    bus = FakeBus(tmp_path / 'bus', has_service=False)
+    notifier = DBusNotifier(bus.address)
+    assert not notifier.notify("t", "m")
+    assert not notifier.notify("t", "m")
+    assert bus.connections == 1  # An error reply leaves the connection usable
+    notifier.close()
+    bus.close()
+
+
+def test_call_raises_error_replies(tmp_path):
+    """Test an error reply raises DBusError with its name."""
+    bus = FakeBus(tmp_path / 'bus', has_service=False)
+    connection = DBusConnection(bus.address)
+    assert connection.unique_name == ':1.1'
+
+    with pytest.raises(DBusError, match='ServiceUnknown'):
+        connection.call('org.freedesktop.Notifications', '/org/freedesktop/Notifications',
+                        'org.freedesktop.Notifications', 'GetServerInformation')
+    connection.close()
+    bus.close()
+
+
+@patch('src.utils.feedback.subprocess.run')
+@patch('src.utils.feedback.get_os_type', return_value=OSType.LINUX)
+def test_feedback_notify_prefers_bus(_os, mock_run, bus, monkeypatch):
+    """Test feedback.notify uses the bus and only falls back to notify-send without it."""
+    monkeypatch.delenv('DBUS_SESSION_BUS_ADDRESS', raising=False)
+    with patch.object(feedback, '_notifier', DBusNotifier(bus.address)):
+        feedback.notify("Voice to Code", "Listening")
+    assert len(bus.notifications) == 1
+    mock_run.assert_not_called()
+
+    with patch.object(feedback, '_notifier', DBusNotifier(address=None)), \
+         patch('src.utils.feedback._which', return_value='/usr/bin/notify-send'):
+        feedback.notify("Voice to Code", "Listening")
+    mock_run.assert_called_once_with(['/usr/bin/notify-send', "Voice to Code", "Listening"], check=True, capture_output=True)
@@ -0,0 +1,125 @@
+"""Tests for MemoryWatchdog."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.metrics.metrics_registry import MetricsRegistry
+from src.utils.memory_watchdog import DOWNGRADED, NORMAL, RELEASED, MemoryWatchdog
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def memory():
+    """Patch memory readings; set memory['rss'] / memory['available'] in tests."""
+    values = {'rss': 1000 * MB, 'available': 8000 * MB}
+    with patch('src.utils.memory_watchdog.get_process_rss_bytes', side_effect=lambda: values['rss']), \
+         patch('src.utils.memory_watchdog.get_available_memory_bytes', side_effect=lambda: values['available']), \
+         patch('src.utils.memory_watchdog.release_memory') as release:
+        values['release'] = release
+        yield values
+
+
+def _make_watchdog(**kwargs):
+    transcriber = Mock()
+    transcriber.model_name = 'large'
+    options = {'max_rss_bytes': 4000 * MB, 'min_available_bytes': 1000 * MB, 'restore_delay': 60.0}
+    options.update(kwargs)
+    return MemoryWatchdog(transcriber, Mock(), 'base', metrics=MetricsRegistry(), **options)
+
+
+def test_no_action_without_pressure(memory):
+    """Watchdog should only record gauges when memory is fine."""
+    watchdog = _make_watchdog()
+
+    watchdog.check(now=0.0)
+
+    assert watchdog.state == NORMAL
+    memory['release'].assert_not_called()
+    watchdog.transcriber.switch_model.assert_not_called()
+    assert watchdog.metrics.get('voice_to_code_memory_available_bytes') == 8000 * MB
+
+
+def test_escalates_from_release_to_downgrade(memory):
+    """Watchdog should release caches first, then switch to the fallback model."""
+    watchdog = _make_watchdog()
+    memory['available'] = 500 * MB
+
+    watchdog.check(now=0.0)
+    assert watchdog.state == RELEASED
+    memory['release'].assert_called_once()
+    watchdog.transcriber.switch_model.assert_not_called()
+
+    watchdog.check(now=5.0)
+    assert watchdog.state == DOWNGRADED
+    watchdog.transcriber.switch_model.assert_called_once_with('base')
+    assert watchdog.original_model == 'large'
+    assert watchdog.metrics.get('voice_to_code_memory_actions_total', labels={'action': 'downgrade_model'}) == 1
+
+
+def test_release_clears_when_pressure_subsides(memory):
+    """Releasing caches alone should return to normal once pressure is gone."""
+    watchdog = _make_watchdog()
+    memory['rss'] = 5000 * MB
+    watchdog.check(now=0.0)
+
+    memory['rss'] = 3000 * MB
+    watchdog.check(now=5.0)
+
+    assert watchdog.state == NORMAL
+    watchdog.transcriber.switch_model.assert_not_called()
+
+
+def test_restores_original_model_after_delay(memory):
+    """Original model should come back once pressure stays away and it fits again."""
+    watchdog = _make_watchdog()
+    memory['available'] = 500 * MB
+    watchdog.check(now=0.0)
+    watchdog.check(now=5.0)
+    watchdog.transcriber.model_name = 'base'
+
+    # Downgrade freed 2 GB of RSS; plenty of memory available again
+    memory['rss'] = 1000 * MB
+    memory['available'] = 6000 * MB
+    watchdog._rss_before_downgrade = 3000 * MB
+    watchdog.check(now=10.0)
+    watchdog.check(now=30.0)
+    watchdog.transcriber.switch_model.assert_called_once_with('base')
+
+    watchdog.check(now=70.0)
+
+    watchdog.transcriber.switch_model.assert_called_with('large')
+    assert watchdog.state == NORMAL
+
+
+def test_does_not_restore_when_model_would_not_fit(memory):
+    """Restoring should wait while the original model would cross a threshold again."""
+    watchdog = _make_watchdog()
+    memory['available'] = 500 * MB
+    watchdog.check(now=0.0)
+    watchdog.check(now=5.0)
+    watchdog.transcriber.model_name = 'base'
+
+    # Original model needs 2 GB, leaving less than the floor plus headroom
+    memory['rss'] = 1000 * MB
+    memory['available'] = 3000 * MB
+    watchdog._rss_before_downgrade = 3000 * MB
+    watchdog.check(now=10.0)
+    watchdog.check(now=100.0)
+
+    watchdog.transcriber.switch_model.assert_called_once_with('base')
+    assert watchdog.state == DOWNGRADED
+
+
+def test_no_downgrade_without_fallback(memory):
+    """Watchdog should stop at releasing caches when no fallback model is configured."""
+    watchdog = _make_watchdog()
+    watchdog.fallback_model = None
+    memory['rss'] = 5000 * MB
+
+    watchdog.check(now=0.0)
+    watchdog.check(now=5.0)
+
+    assert watchdog.state == RELEASED
+    watchdog.transcriber.switch_model.assert_not_called()
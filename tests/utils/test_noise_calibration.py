@@ -0,0 +1,83 @@
+"""Tests for noise calibration and the calibration cache."""
+
+import struct
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from src.utils.noise_calibration import (
+    CALIBRATION_MAX_AGE,
+    Calibration,
+    CalibrationCache,
+    chunk_energy,
+    measure_noise_floor,
+    time_of_day_bucket,
+)
+
+
+def _pcm16(*samples):
+    return struct.pack(f'={len(samples)}h', *samples)
+
+
+def test_time_of_day_bucket():
+    """Hours should map to four buckets."""
+    assert time_of_day_bucket(datetime(2024, 1, 1, 3)) == 'night'
+    assert time_of_day_bucket(datetime(2024, 1, 1, 9)) == 'morning'
+    assert time_of_day_bucket(datetime(2024, 1, 1, 12)) == 'afternoon'
+    assert time_of_day_bucket(datetime(2024, 1, 1, 23)) == 'evening'
+
+
+def test_chunk_energy_is_rms():
+    """Chunk energy should be the root mean square of the samples."""
+    assert chunk_energy(_pcm16(3, -3, 3, -3), 2) == 3.0
+    assert chunk_energy(b'', 2) == 0.0
+
+
+def test_measure_noise_floor_ignores_short_spikes():
+    """A single loud chunk should not raise the noise floor."""
+    chunks = [_pcm16(10, -10)] * 19 + [_pcm16(5000, -5000)]
+    source = MagicMock(SAMPLE_RATE=16000, CHUNK=800, SAMPLE_WIDTH=2)
+    source.stream.read.side_effect = chunks
+
+    assert measure_noise_floor(source, 1.0) == 10.0
+    assert source.stream.read.call_count == 20
+
+
+def test_cache_round_trip(tmp_path):
+    """Stored calibrations should be returned for the same device and bucket."""
+    cache = CalibrationCache(tmp_path / 'calibration.json')
+    calibration = Calibration(noise_floor=40.0, energy_threshold=60.0, calibrated_at=1000.0)
+
+    cache.put('USB Mic', 'morning', calibration)
+
+    assert CalibrationCache(tmp_path / 'calibration.json').get('USB Mic', 'morning') == calibration
+    assert cache.get('Built-in Mic', 'morning') is None
+
+
+def test_cache_falls_back_to_latest_other_bucket(tmp_path):
+    """A device calibrated at another time of day should reuse its newest calibration."""
+    cache = CalibrationCache(tmp_path / 'calibration.json')
+    cache.put('USB Mic', 'night', Calibration(10.0, 15.0, calibrated_at=1000.0))
+    cache.put('USB Mic', 'evening', Calibration(30.0, 45.0, calibrated_at=2000.0))
+
+    assert cache.get('USB Mic', 'morning').energy_threshold == 45.0
+
+
+def test_cache_ignores_corrupt_file(tmp_path, capsys):
+    """An unreadable cache file should behave as empty and be replaced on save."""
+    path = tmp_path / 'calibration.json'
+    path.write_text('{not json')
+    cache = CalibrationCache(path)
+
+    assert cache.get('USB Mic', 'morning') is None
+    assert 'WARNING' in capsys.readouterr().err
+
+    cache.put('USB Mic', 'morning', Calibration(1.0, 1.5, 0.0))
+    assert cache.get('USB Mic', 'morning') is not None
+
+
+def test_calibration_staleness():
+    """Calibrations older than the maximum age should be redone."""
+    now = time.time()
+    assert not Calibration(1.0, 1.5, calibrated_at=now).is_stale(now)
+    assert Calibration(1.0, 1.5, calibrated_at=now - CALIBRATION_MAX_AGE - 1).is_stale(now)
@@ -0,0 +1,57 @@
+"""Tests for the durable transcript outbox."""
+
+import sqlite3
+import time
+
+from src.utils.outbox import RETENTION_SECONDS, Outbox
+
+
+def test_pending_until_delivered(tmp_path):
+    """Test items stay pending, oldest first, until marked delivered or discarded."""
+    outbox = Outbox(tmp_path / 'outbox.db')
+    first = outbox.add('work', 'one', {'text': 'one', 'confidence': 0.9})
+    second = outbox.add('review', 'two', {'text': 'two'})
+    third = outbox.add('work', 'three', {'text': 'three'})
+
+    assert [item.id for item in outbox.pending()] == [first, second, third]
+    assert [item.text for item in outbox.pending('work')] == ['one', 'three']
+    assert outbox.pending('work')[0].record == {'text': 'one', 'confidence': 0.9}
+
+    outbox.mark_delivered(first)
+    outbox.discard(second)
+    outbox.record_attempt(third)
+
+    assert [(item.id, item.attempts) for item in outbox.pending()] == [(third, 1)]
+    assert outbox.pending_count() == 1
+    outbox.close()
+
+
+def test_survives_reopening(tmp_path):
+    """Test pending items are still there after the app restarts."""
+    path = tmp_path / 'nested' / 'outbox.db'
+    outbox = Outbox(path)
+    outbox.add('work', 'unsent', {})
+    outbox.close()
+
+    reopened = Outbox(path)
+
+    assert [item.text for item in reopened.pending()] == ['unsent']
+    assert reopened._db.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    reopened.close()
+
+
+def test_old_finished_items_are_removed(tmp_path):
+    """Test delivered items past the retention period are pruned on open, pending ones kept."""
+    path = tmp_path / 'outbox.db'
+    outbox = Outbox(path)
+    delivered = outbox.add('work', 'old', {})
+    outbox.add('work', 'still pending', {})
+    outbox.mark_delivered(delivered)
+    outbox._db.execute('UPDATE items SET updated_at = ?', (time.time() - RETENTION_SECONDS - 1,))
+    outbox.close()
+
+    reopened = Outbox(path)
+
+    with sqlite3.connect(path) as db:
+        assert [row[0] for row in db.execute('SELECT text FROM items')] == ['still pending']
+    reopened.close()
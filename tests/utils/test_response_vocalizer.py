@@ -0,0 +1,44 @@
+"""Tests for local response vocalization."""
+
+from unittest.mock import Mock
+
+from src.utils.response_vocalizer import ResponseVocalizer, extract_response
+
+TURN = """\
+> fix the failing login test
+✻ Thinking… (3s · esc to interrupt)
+✻ Thinking… (4s · esc to interrupt)
+⏺ Read(tests/test_login.py)
+  ⎿  Read 42 lines
+⏺ The test expected the old redirect URL. I updated the assertion to match the new route.
+⏺ The test expected the old redirect URL. I updated the assertion to match the new route.
+│ Running the suite again now. All 18 login tests pass. │
+╭──────────────────────────────╮
+│ >                            │
+╰──────────────────────────────╯
+  ? for shortcuts
+"""
+
+
+def test_extract_response_speaks_closing_sentences():
+    """Test prompt echo, spinners, tool lines, borders and redraw repeats are skipped."""
+    assert extract_response(TURN, 'fix the failing login test') == "Running the suite again now. All 18 login tests pass."
+    assert extract_response(TURN, 'fix the failing login test', max_sentences=3).startswith("I updated the assertion")
+
+
+def test_extract_response_without_prose():
+    """Test output with nothing worth saying gives nothing to speak."""
+    assert extract_response("✻ Working…\n⏺ Bash(ls)\n  ⎿  src tests\n") == ''
+
+
+def test_vocalizer_speaks_only_while_enabled():
+    """Test turns are spoken only after vocalization is switched on."""
+    speak = Mock()
+    vocalizer = ResponseVocalizer(speak, Mock())
+
+    vocalizer.on_turn_end('work', 'fix it', TURN)
+    speak.assert_not_called()
+
+    vocalizer.set_enabled(True)
+    vocalizer.on_turn_end('work', 'fix it', TURN)
+    speak.assert_called_once_with("Running the suite again now. All 18 login tests pass.")
@@ -0,0 +1,76 @@
+"""Tests for SamplingProfiler."""
+
+import threading
+
+import pytest
+
+from src.utils.sampling_profiler import SamplingProfiler
+
+
+def _busy_loop(stop_event):
+    while not stop_event.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def busy_thread():
+    """Run a named thread that keeps the CPU busy."""
+    stop_event = threading.Event()
+    thread = threading.Thread(target=_busy_loop, args=(stop_event,), name='busy-worker')
+    thread.start()
+    yield thread
+    stop_event.set()
+    thread.join()
+
+
+def test_profile_writes_collapsed_stacks(tmp_path, busy_thread):
+    """Profiler should write collapsed stacks including other threads."""
+    profiler = SamplingProfiler(output_dir=tmp_path, interval=0.001)
+    done = threading.Event()
+    results = []
+    
+    profiler.start(0.2, on_complete=lambda r: (results.append(r), done.set()))
+    assert done.wait(5)
+    
+    result = results[0]
+    collapsed = result.collapsed_path.read_text()
+    assert result.sample_count > 0
+    assert any(line.startswith('busy-worker;') and '_busy_loop' in line for line in collapsed.splitlines())
+    # Every line ends with an integer count
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in collapsed.splitlines())
+
+
+def test_profile_writes_summary(tmp_path, busy_thread):
+    """Summary should list threads and top functions."""
+    profiler = SamplingProfiler(output_dir=tmp_path, interval=0.001)
+    profiler.start(0.1)
+    profiler.stop()
+    
+    summaries = list(tmp_path.glob('profile-*-summary.txt'))
+    assert len(summaries) == 1
+    summary = summaries[0].read_text()
+    assert 'busy-worker' in summary
+    assert 'functions by self samples' in summary
+    assert 'functions by total samples' in summary
+
+
+def test_start_rejects_non_positive_duration(tmp_path):
+    """Duration must be positive."""
+    profiler = SamplingProfiler(output_dir=tmp_path)
+    
+    with pytest.raises(ValueError):
+        profiler.start(0)
+
+
+def test_start_rejects_concurrent_runs(tmp_path):
+    """Only one profile can be recorded at a time."""
+    profiler = SamplingProfiler(output_dir=tmp_path)
+    profiler.start(5)
+    try:
+        assert profiler.is_running()
+        with pytest.raises(RuntimeError):
+            profiler.start(1)
+    finally:
+        profiler.stop()
+    
+    assert not profiler.is_running()
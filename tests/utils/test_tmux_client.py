@@ -0,0 +1,139 @@
+"""Tests for the tmux control-mode client."""
+
+import os
+import shutil
+import subprocess
+import time
+import uuid
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.utils.tmux_client import TmuxClient, TmuxCommandError, quote_argument
+
+requires_tmux = pytest.mark.skipif(shutil.which('tmux') is None, reason="tmux not installed")
+
+
+def _start_server(socket_name):
+    """Start a private tmux server with one session to send keys to."""
+    env = {k: v for k, v in os.environ.items() if k != 'TMUX'}
+    command = ['tmux', '-L', socket_name, '-f', '/dev/null', 'new-session', '-d', '-s', 'target', 'cat']
+    # A server that was just killed may still be shutting down
+    return subprocess.run(command, capture_output=True, env=env).returncode == 0
+
+
+@pytest.fixture
+def tmux_server():
+    """Private tmux server per test; yields the socket name."""
+    # A fresh name, so a test never starts while the previous test's server is still shutting down
+    socket_name = f'voice-to-code-test-{os.getpid()}-{uuid.uuid4().hex[:8]}'
+    assert _start_server(socket_name)
+    yield socket_name
+    subprocess.run(['tmux', '-L', socket_name, 'kill-server'], capture_output=True)
+
+
+def _capture(socket_name, session):
+    result = subprocess.run(['tmux', '-L', socket_name, 'capture-pane', '-p', '-t', session],
+                            capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_quote_argument_escapes_parser_syntax():
+    """Test arguments are double-quoted with tmux's special characters escaped."""
+    assert quote_argument('plain') == '"plain"'
+    assert quote_argument('say "hi" $HOME \\ ;') == '"say \\"hi\\" \\$HOME \\\\ ;"'
+    assert quote_argument('a\nb') == '"a\\nb"'
+
+
+def test_command_error_is_called_process_error():
+    """Test failures can still be caught as subprocess.CalledProcessError."""
+    assert issubclass(TmuxCommandError, subprocess.CalledProcessError)
+
+
+@patch('src.utils.tmux_client.subprocess.run')
+@patch('src.utils.tmux_client.subprocess.Popen', side_effect=FileNotFoundError)
+def test_falls_back_to_subprocess_without_control_mode(mock_popen, mock_run):
+    """Test commands run as separate tmux processes when control mode can't start."""
+    mock_run.return_value = Mock(returncode=0, stdout='one\ntwo\n')
+    client = TmuxClient()
+
+    assert client.run('list-sessions') == ['one', 'two']
+    mock_run.assert_called_once_with(['tmux', 'list-sessions'], capture_output=True, text=True)
+
+    mock_run.return_value = Mock(returncode=1, stdout='', stderr="can't find session", args=['tmux'])
+    with pytest.raises(TmuxCommandError):
+        client.run('send-keys', '-t', 'missing', 'Enter')
+    # Control mode is not retried on every command
+    assert mock_popen.call_count == 1
+
+
+@requires_tmux
+def test_sends_keys_over_control_connection(tmux_server):
+    """Test pipelined commands reach the target pane literally and in order."""
+    client = TmuxClient(socket_name=tmux_server)
+    try:
+        text = 'echo "$HOME" ~ #{pane_id} ; \\done'
+        outputs = client.run_many([
+            ['send-keys', '-t', 'target', '-l', text],
+            ['send-keys', '-t', 'target', 'Enter'],
+            ['display-message', '-p', '-t', 'target', '#{session_name}'],
+        ])
+
+        assert outputs == [[], [], ['target']]
+        assert _wait_for(lambda: text in _capture(tmux_server, 'target'))
+    finally:
+        client.close()
+
+
+@requires_tmux
+def test_reports_command_errors(tmux_server):
+    """Test a failing command raises with tmux's message and leaves the connection usable."""
+    client = TmuxClient(socket_name=tmux_server)
+    try:
+        with pytest.raises(TmuxCommandError) as excinfo:
+            client.run('send-keys', '-t', 'no-such-session', 'Enter')
+        assert 'no-such-session' in excinfo.value.stderr
+
+        assert client.run('display-message', '-p', '-t', 'target', 'ok') == ['ok']
+    finally:
+        client.close()
+
+
+@requires_tmux
+def test_reconnects_after_server_restart(tmux_server):
+    """Test the next command reconnects when the tmux server has gone away."""
+    client = TmuxClient(socket_name=tmux_server)
+    try:
+        client.run('display-message', '-p', 'first')
+        subprocess.run(['tmux', '-L', tmux_server, 'kill-server'], check=True)
+        assert _wait_for(lambda: _start_server(tmux_server))
+
+        assert _wait_for(lambda: not client._connection.alive)
+        assert client.run('display-message', '-p', '-t', 'target', 'again') == ['again']
+    finally:
+        client.close()
+
+
+@requires_tmux
+def test_close_removes_control_session(tmux_server):
+    """Test the dedicated control session disappears with the client."""
+    client = TmuxClient(session_name='control', socket_name=tmux_server)
+    client.run('display-message', '-p', 'x')
+    assert 'control' in client.run('list-sessions', '-F', '#{session_name}')
+
+    client.close()
+
+    def control_gone():
+        result = subprocess.run(['tmux', '-L', tmux_server, 'list-sessions', '-F', '#{session_name}'],
+                                capture_output=True, text=True)
+        return 'control' not in result.stdout.split()
+    assert _wait_for(control_gone)
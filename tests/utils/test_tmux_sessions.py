@@ -0,0 +1,159 @@
+"""Tests for live tmux session discovery."""
+
+import os
+import shutil
+import subprocess
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from src.utils.tmux_client import TmuxClient, TmuxCommandError
+from src.utils.tmux_sessions import TmuxPane, TmuxSessionRegistry, parse_panes
+
+requires_tmux = pytest.mark.skipif(shutil.which('tmux') is None, reason="tmux not installed")
+
+
+def _line(session, window_index, window_name, pane_index, pane_id):
+    return '\t'.join([session, str(window_index), window_name, str(pane_index), pane_id])
+
+
+def _registry(lines):
+    client = Mock(session_name='voice-to-code-control')
+    client.run.return_value = lines
+    registry = TmuxSessionRegistry(client)
+    registry.refresh()
+    return registry
+
+
+def test_parse_panes_skips_malformed_lines():
+    """Test list-panes output is parsed and unexpected lines are ignored."""
+    panes = parse_panes([_line('work', 1, 'editor', 0, '%3'), 'garbage', _line('x', 'y', 'z', 0, '%1')])
+
+    assert panes == [TmuxPane('work', 1, 'editor', 0, '%3')]
+    assert panes[0].target == 'work:1.0'
+
+
+def test_targets_list_sessions_then_panes_of_split_sessions():
+    """Test sessions come first, with pane targets only for sessions that have several panes."""
+    registry = _registry([
+        _line('work', 0, 'agent', 0, '%1'),
+        _line('work', 0, 'agent', 1, '%2'),
+        _line('ai-voice-input', 0, 'amp', 0, '%3'),
+        _line('voice-to-code-control', 0, 'bash', 0, '%4'),
+    ])
+
+    assert registry.targets() == ['ai-voice-input', 'work', 'work:0.0', 'work:0.1']
+
+
+def test_is_known_resolves_targets_like_tmux():
+    """Test cached validation of session, window and pane targets."""
+    registry = _registry([
+        _line('ai-voice-input', 0, 'amp', 0, '%1'),
+        _line('work', 2, 'editor', 1, '%2'),
+    ])
+
+    assert registry.is_known('ai-voice-input') is True
+    assert registry.is_known('ai') is True  # unique prefix
+    assert registry.is_known('w*') is True  # glob
+    assert registry.is_known('work:editor') is True
+    assert registry.is_known('work:2.1') is True
+    assert registry.is_known('work:2.0') is False
+    assert registry.is_known('missing') is False
+    assert registry.is_known('%2') is None  # ids are not checked
+
+
+def test_is_known_is_unknown_until_tmux_answers():
+    """Test validation doesn't reject anything while tmux can't be reached."""
+    client = Mock(session_name='control')
+    client.run.side_effect = TmuxCommandError(1, ['tmux'], stderr='no server running')
+    registry = TmuxSessionRegistry(client)
+
+    assert registry.refresh() is False
+    assert registry.is_known('anything') is None
+    assert registry.targets() == []
+
+
+def test_is_known_is_unknown_without_control_mode():
+    """Test a list read without notifications is offered but never used to refuse a target."""
+    registry = _registry([_line('work', 0, 'agent', 0, '%1')])
+    registry.client.is_connected.return_value = False
+
+    assert registry.targets() == ['work']
+    assert registry.is_known('work') is None
+    assert registry.is_known('started-since') is None
+
+
+def test_notifications_trigger_refresh_and_change_callback():
+    """Test a session notification re-reads the pane list and reports the change."""
+    client = Mock(session_name='control')
+    client.run.return_value = [_line('one', 0, 'w', 0, '%1')]
+    changes = []
+    changed = threading.Event()
+    registry = TmuxSessionRegistry(client, on_change=lambda targets: (changes.append(targets), changed.set()))
+
+    registry.start()
+    try:
+        assert changed.wait(2)
+        listener = client.add_listener.call_args[0][0]
+
+        changed.clear()
+        client.run.return_value = [_line('one', 0, 'w', 0, '%1'), _line('two', 0, 'w', 0, '%2')]
+        listener('%sessions-changed')
+        assert changed.wait(2)
+        assert changes[-1] == ['one', 'two']
+
+        # Pane output and unrelated notifications don't cause a refresh
+        calls = client.run.call_count
+        listener('%output %1 hello')
+        listener('%client-session-changed x $1 one')
+        assert client.run.call_count == calls
+    finally:
+        registry.stop()
+    client.remove_listener.assert_called_once_with(listener)
+
+
+def test_exit_notification_forgets_panes():
+    """Test a lost connection makes validation unknown instead of stale."""
+    registry = _registry([_line('one', 0, 'w', 0, '%1')])
+
+    registry._on_notification('%exit')
+
+    assert registry.is_known('missing') is None
+
+
+@requires_tmux
+def test_discovers_sessions_live():
+    """Test sessions created and killed on a real server show up without polling."""
+    socket_name = f'voice-to-code-sessions-{os.getpid()}'
+    env = {k: v for k, v in os.environ.items() if k != 'TMUX'}
+    tmux = ['tmux', '-L', socket_name, '-f', '/dev/null']
+    subprocess.run([*tmux, 'new-session', '-d', '-s', 'first', 'cat'], check=True, env=env)
+    client = TmuxClient(session_name='control', socket_name=socket_name)
+    updates = []
+    updated = threading.Condition()
+
+    def on_change(targets):
+        with updated:
+            updates.append(targets)
+            updated.notify_all()
+
+    registry = TmuxSessionRegistry(client, on_change=on_change)
+    try:
+        registry.start()
+        with updated:
+            assert updated.wait_for(lambda: updates and updates[-1] == ['first'], 3)
+
+        subprocess.run([*tmux, 'new-session', '-d', '-s', 'second', 'cat'], check=True, env=env)
+        with updated:
+            assert updated.wait_for(lambda: updates[-1] == ['first', 'second'], 3)
+        assert registry.is_known('second') is True
+
+        subprocess.run([*tmux, 'kill-session', '-t', 'first'], check=True)
+        with updated:
+            assert updated.wait_for(lambda: updates[-1] == ['second'], 3)
+        assert registry.is_known('first') is False
+    finally:
+        registry.stop()
+        client.close()
+        subprocess.run([*tmux, 'kill-server'], capture_output=True)
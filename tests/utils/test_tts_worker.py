@@ -0,0 +1,132 @@
+"""Tests for TtsWorker class."""
+
+import threading
+
+from src.metrics.metrics_registry import MetricsRegistry
+from src.utils.tts_worker import NORMAL, URGENT, TtsWorker
+
+
+class FakeEngine:
+    """Synthesizer and player recording what they were asked to do."""
+
+    def __init__(self):
+        self.synthesized = []
+        self.played = []
+        self.hold = False  # Keep playing until stopped or released
+        self.release = threading.Event()
+        self.playing = threading.Event()
+
+    def synthesize(self, text, path):
+        self.synthesized.append(text)
+        path.write_bytes(text.encode())
+        return True
+
+    def play(self, path, stop):
+        self.played.append(path.read_text())
+        self.playing.set()
+        while self.hold and not stop.is_set() and not self.release.is_set():
+            stop.wait(0.01)
+
+
+def _worker(tmp_path, engine, **kwargs):
+    return TtsWorker(tmp_path / 'cache', engine.synthesize, engine.play, engine='fake', metrics=MetricsRegistry(), **kwargs)
+
+
+def test_repeated_phrases_play_from_cache(tmp_path):
+    """Test a phrase is synthesized once and replayed from disk afterwards."""
+    engine = FakeEngine()
+    worker = _worker(tmp_path, engine)
+
+    worker.say("Voice to Code starting")
+    worker.say("Voice to Code starting")
+    assert worker.wait_until_done(2)
+
+    assert engine.synthesized == ["Voice to Code starting"]
+    assert engine.played == ["Voice to Code starting"] * 2
+    assert worker.metrics.get('voice_to_code_tts_messages_total', {'source': 'cache'}) == 1
+    assert worker.cache_path("Voice to Code starting").exists()
+    worker.close()
+
+
+def test_uncached_messages_leave_nothing_behind(tmp_path):
+    """Test a message said with cache=False is synthesized each time and its audio deleted after playback."""
+    engine = FakeEngine()
+    played_from = []
+    engine_play = engine.play
+    engine.play = lambda path, stop: (played_from.append(path), engine_play(path, stop))
+    worker = _worker(tmp_path, engine)
+
+    worker.say("The tests pass.", cache=False)
+    worker.say("The tests pass.", cache=False)
+    assert worker.wait_until_done(2)
+
+    assert engine.synthesized == ["The tests pass."] * 2
+    assert engine.played == ["The tests pass."] * 2
+    assert not worker.cache_path("The tests pass.").exists()
+    assert not any(path.exists() for path in played_from)
+    assert not (tmp_path / 'cache').exists() or not any((tmp_path / 'cache').iterdir())
+    worker.close()
+
+
+def test_urgent_messages_go_first(tmp_path):
+    """Test queued urgent messages are spoken before normal ones."""
+    engine = FakeEngine()
+    engine.hold = True
+    worker = _worker(tmp_path, engine)
+
+    worker.say("first")
+    assert engine.playing.wait(2)
+    worker.say("later", priority=NORMAL)
+    worker.say("urgent", priority=URGENT)
+    engine.release.set()
+    assert worker.wait_until_done(2)
+
+    assert engine.played == ["first", "urgent", "later"]
+    worker.close()
+
+
+def test_interrupt_cuts_off_stale_messages(tmp_path):
+    """Test an interrupting message stops the one playing and drops queued ones, but not urgent ones."""
+    engine = FakeEngine()
+    engine.hold = True
+    worker = _worker(tmp_path, engine)
+
+    worker.say("old response")
+    assert engine.playing.wait(2)
+    worker.say("queued response")
+    worker.say("status", priority=URGENT)
+    worker.say("new response", interrupt=True)
+    engine.release.set()
+    assert worker.wait_until_done(2)
+
+    assert engine.played == ["old response", "status", "new response"]
+    assert worker.metrics.get('voice_to_code_tts_interrupted_total') == 2
+    worker.close()
+
+
+def test_cache_keeps_most_recent_phrases(tmp_path):
+    """Test the least recently spoken phrases are removed beyond max_cache_entries."""
+    engine = FakeEngine()
+    worker = _worker(tmp_path, engine, max_cache_entries=2)
+
+    for message in ("one", "two", "three"):
+        worker.say(message)
+        assert worker.wait_until_done(2)
+
+    assert not worker.cache_path("one").exists()
+    assert worker.cache_path("three").exists()
+    worker.close()
+
+
+def test_failed_synthesis_is_skipped(tmp_path, capsys):
+    """Test a message the engine can't synthesize is reported and nothing is cached."""
+    engine = FakeEngine()
+    worker = TtsWorker(tmp_path / 'cache', lambda text, path: False, engine.play, metrics=MetricsRegistry())
+
+    worker.say("hello")
+    assert worker.wait_until_done(2)
+
+    assert engine.played == []
+    assert not worker.cache_path("hello").exists()
+    assert "speech synthesis failed" in capsys.readouterr().err
+    worker.close()